@@ -32,6 +32,9 @@ class _PhoneDirectoryRequired(TypedDict):
 class PhoneDirectoryEntry(_PhoneDirectoryRequired, total=False):
     alias: str
     persona_key: str
+    # Prompt for a first reply spoken right after the greeting, with no
+    # caller input (pre-generated by core/ready_queue.py)
+    opener: str
 
 
 OPERATOR_NUMBER = "555-0000"
@@ -115,7 +118,8 @@ PHONE_DIRECTORY: dict[str, PhoneDirectoryEntry] = {
         "name": "Dial-A-Joke",
         "alias": "JOKE",
         "type": "feature",
-        "greeting": "Welcome to Dial-A-Joke! Want to hear a joke?",
+        "greeting": "Welcome to Dial-A-Joke! Here's one for you.",
+        "opener": "Tell me a joke. Make it funny and appropriate for all ages.",
     },
     "555-8748": {
         "feature": "trivia",
@@ -174,6 +178,7 @@ PHONE_DIRECTORY: dict[str, PhoneDirectoryEntry] = {
         "alias": "COMP",
         "type": "feature",
         "greeting": "Welcome to the Compliment Line. You're amazing, and here's why.",
+        "opener": "Give me a compliment.",
     },
     "555-7627": {
         "feature": "roast",
@@ -5,7 +5,10 @@ __all__ = [
     "PHONE_DIRECTORY_BLOCK",
     "FEATURE_PROMPTS",
     "PERSONA_PROMPTS",
+    "TURN_BUDGETS",
     "get_system_prompt",
+    "system_prompt_variants",
+    "turn_budget",
 ]
 
 # Base system prompt for all personas
@@ -826,6 +829,19 @@ PERSONA_PROMPTS = {
     "conspiracy": PERSONA_CONSPIRACY,
 }
 
+# Per-turn generation budgets for prompts whose replies run longer or shorter
+# than LLM_MAX_TOKENS / LLM_SPOKEN_SECONDS_TARGET allow, by label:
+# (max_tokens, spoken seconds). Streaming generation ends at the first
+# sentence end past the spoken target; 0 seconds disables that stop.
+TURN_BUDGETS: dict[str, tuple[int, float]] = {
+    "feature:stories": (500, 150.0),  # 2-3 minutes when read aloud
+    "feature:news": (300, 60.0),  # Several headlines
+    "feature:madlibs": (250, 45.0),  # Reads the finished story back
+    "feature:recipe": (250, 45.0),  # Ingredients and steps
+    "feature:time_temp": (60, 8.0),
+    "feature:calculator": (80, 12.0),
+}
+
 
 def get_system_prompt(feature: str | None = None, persona: str | None = None) -> str:
     """Get the appropriate system prompt for a feature or persona.
@@ -852,3 +868,38 @@ def get_system_prompt(feature: str | None = None, persona: str | None = None) ->
         prompt_parts.append(OPERATOR_PROMPT)
 
     return "\n\n".join(prompt_parts)
+
+
+def system_prompt_variants() -> dict[str, str]:
+    """Every distinct system prompt a session can switch to, by label.
+
+    Labels are "operator", "feature:<name>" and "persona:<name>". Features
+    whose prompt is the operator's are folded into "operator".
+
+    Returns:
+        Label -> full system prompt, operator first.
+    """
+    variants = {"operator": get_system_prompt()}
+    seen = set(variants.values())
+    for label, prompt in (
+        *((f"feature:{name}", get_system_prompt(feature=name)) for name in FEATURE_PROMPTS),
+        *((f"persona:{name}", get_system_prompt(persona=name)) for name in PERSONA_PROMPTS),
+    ):
+        if prompt not in seen:
+            seen.add(prompt)
+            variants[label] = prompt
+    return variants
+
+
+def turn_budget(label: str | None, max_tokens: int, spoken_seconds: float) -> tuple[int, float]:
+    """Generation budget for one turn of a prompt.
+
+    Args:
+        label: Prompt label ("feature:stories"), or None.
+        max_tokens: Default token cap.
+        spoken_seconds: Default spoken-duration target.
+
+    Returns:
+        (max_tokens, spoken seconds) for the label.
+    """
+    return TURN_BUDGETS.get(label or "", (max_tokens, spoken_seconds))
@@ -134,6 +134,13 @@ class STTSettings(BaseSettings):
     vad_filter: bool = True
     initial_prompt: str | None = None
 
+    # Transcript cache for short repeated utterances ("yes", "another one",
+    # line noise). Keyed by an acoustic fingerprint; a hit skips the backend.
+    result_cache_enabled: bool = False
+    result_cache_max_entries: int = 256
+    result_cache_max_seconds: float = 2.0  # Only cache utterances this short
+    result_cache_similarity: float = 0.97  # Cosine threshold for a match
+
 
 class LLMSettings(BaseSettings):
     """Language Model configuration.
@@ -157,6 +164,16 @@ class LLMSettings(BaseSettings):
 
     model_config = SettingsConfigDict(env_prefix="LLM_", env_file=".env", env_file_encoding="utf-8", extra="ignore")
 
+    # Server API: "ollama" (native API, default) or "openai" for any
+    # OpenAI-compatible /v1/chat/completions server (llama.cpp's
+    # llama-server, vLLM), with host pointing at it, e.g.
+    # http://10.10.10.11:8080. llama-server's slots (-np) each cache one
+    # prompt prefix like OLLAMA_NUM_PARALLEL, and speculative decoding
+    # (-md draft.gguf) is configured on the server alone.
+    backend: Literal["ollama", "openai"] = "ollama"
+    api_key: str = ""  # Bearer token, for OpenAI-compatible servers that need one
+    cache_prompt: bool = True  # llama.cpp: reuse the slot's cached prompt prefix
+
     # Ollama settings - default to Pi #2 (pi-ollama)
     # Change to localhost:11434 if running single-Pi setup
     host: str = "http://10.10.10.11:11434"
@@ -179,9 +196,74 @@ class LLMSettings(BaseSettings):
     # Streaming: overlap LLM generation with TTS for lower perceived latency
     streaming_enabled: bool = True
 
-    # Keep model loaded (prevent unloading between calls)
+    # Streaming early stop: end generation at the first sentence end once the
+    # reply would take this long to speak (0 = off). Closing the stream
+    # cancels generation on the server, freeing it for other calls.
+    # Per-prompt overrides (and max_tokens): TURN_BUDGETS in config/prompts.py
+    spoken_seconds_target: float = 12.0
+    speech_words_per_second: float = 2.5  # Kokoro at speed 1.0 (~150 wpm)
+
+    # Keep model loaded (prevent unloading between calls; Ollama only)
     keep_alive: str = "24h"
 
+    # Conversation history, trimmed to keep Ollama's cached prompt prefix
+    # stable (see ConversationContext): "block" drops history_trim_block
+    # exchanges at once, "summary" also keeps a short rolling summary of
+    # them, "sliding" drops one exchange per turn (re-evaluates everything)
+    max_history: int = 10  # Exchanges (user + assistant pairs) kept
+    history_policy: Literal["sliding", "block", "summary"] = "block"
+    history_trim_block: int = 5
+    # Token cap on the same history (0 = message count only). System prompt
+    # (~300-600 tokens) + history + max_tokens must stay inside Ollama's
+    # num_ctx (2048 by default), or Ollama shifts the context itself and the
+    # cached prefix is lost.
+    history_token_budget: int = 800
+
+    # Tokenizer for token accounting: a tokenizer.json path or a Hugging Face
+    # repo id (needs the `tokenizers` package). Empty = word-based estimate,
+    # calibrated against Ollama's prompt_eval_count.
+    tokenizer: str = ""
+
+    # Prompt-prefix warmup: keep the most-used system prompts evaluated in
+    # Ollama's prompt cache so the first caller of a feature doesn't pay a
+    # cold prompt eval. warmup_slots must match OLLAMA_NUM_PARALLEL on the
+    # LLM host (each parallel slot holds one prompt prefix).
+    warmup_enabled: bool = True
+    warmup_slots: int = 1
+    warmup_idle_seconds: float = 30.0  # Only warm after this long without requests
+    warmup_poll_interval: float = 60.0  # Reload check / re-warm interval
+    warmup_usage_path: str = "cache/llm_prompt_usage.json"  # Persisted usage ranking
+
+    # Request scheduler (services/llm_scheduler.py): at most max_in_flight
+    # requests reach the server at once (match OLLAMA_NUM_PARALLEL, 0 = no
+    # limit); the rest queue here, callers' first turns and turns of at most
+    # short_turn_tokens ahead of longer ones, and pre-generation last
+    max_in_flight: int = 1
+    short_turn_tokens: int = 80
+
+    # Response cache (services/response_cache.py): replies to short, repeated
+    # requests on these prompt labels ("feature:x" / "persona:x", comma-
+    # separated) are reused across callers, response_cache_variants per
+    # request, rotated so callers don't all hear the same reply. Lines where
+    # callers answer the reply (trivia) gain nothing from it
+    response_cache_enabled: bool = True
+    response_cache_labels: str = (
+        "feature:jokes,feature:fortune,feature:horoscope,feature:stories,"
+        "feature:compliment,feature:would_you_rather,feature:dictionary,feature:recipe"
+    )
+    response_cache_variants: int = 3
+    response_cache_ttl: float = 21600.0  # Seconds a reply is reused (6h)
+    response_cache_max_keys: int = 256
+    response_cache_audio_mb: float = 32.0  # Rendered audio kept for instant replay
+
+    # Ready queue (core/ready_queue.py): lines with an "opener" in the phone
+    # directory (Dial-A-Joke) keep first replies generated and rendered ahead
+    # of time, filled only while no call is active
+    ready_queue_enabled: bool = True
+    ready_queue_depth: int = 3  # Replies kept per line
+    ready_queue_max_age: float = 21600.0  # Seconds before a reply is replaced
+    ready_queue_idle_seconds: float = 10.0  # Quiet time after a call before filling
+
 
 class TTSSettings(BaseSettings):
     """Text-to-Speech configuration.
@@ -206,6 +288,33 @@ class TTSSettings(BaseSettings):
     # Run tts_server.py on Pi #2 to handle synthesis
     remote_host: str = "http://10.10.10.11:10200"
     remote_timeout: float = 10.0  # Timeout for remote TTS calls
+    # Stream raw PCM from /synthesize/stream as clauses are synthesized
+    # (falls back to base64 JSON /synthesize on servers without it)
+    remote_streaming: bool = True
+    # "telephone": the server resamples to the output rate and applies the
+    # telephone band-pass, so 8kHz audio crosses the network (6x fewer bytes
+    # than 24kHz float32, 12x with mulaw). "raw": 24kHz model output.
+    remote_output: Literal["telephone", "raw"] = "telephone"
+    remote_encoding: Literal["f32le", "s16le", "mulaw"] = "s16le"  # Wire sample format
+
+    # Connection pool: keep-alive connections opened at startup and re-warmed
+    # while idle, so a sentence never waits on a TCP handshake
+    remote_pool_size: int = 8  # Max open connections to the TTS server
+    remote_warm_connections: int = 2
+    remote_keepalive: float = 60.0  # Idle seconds (tts_server keeps 75s)
+    remote_connect_timeout: float = 2.0
+
+    # Streaming resilience: no audio for remote_stall_timeout seconds means
+    # the server has stalled. With remote_hedge, a duplicate request is sent
+    # when the first audio is later than the p95 first-byte latency.
+    remote_stall_timeout: float = 3.0
+    remote_hedge: bool = False
+
+    # When the server fails or stalls: "clip" plays remote_fallback_phrase
+    # (rendered at startup), "local" synthesizes with a local Kokoro model
+    # (needs the model files and ~300MB RAM), "none" plays silence
+    remote_fallback: Literal["none", "clip", "local"] = "clip"
+    remote_fallback_phrase: str = "One moment please."
 
     # Kokoro-82M settings (for local mode or remote server)
     # Use quantized models for better performance:
@@ -219,9 +328,39 @@ class TTSSettings(BaseSettings):
     # Synthesis settings
     speed: float = 1.0
 
-    # Sentence chunking for streaming
+    # Worker pool: independent model instances synthesizing in parallel.
+    # Each loads its own ONNX session (~300MB RAM for FP32, less for int8).
+    workers: int = 1
+    intra_op_threads: int = 0  # ONNX threads per instance; 0 = cores / workers
+
+    # Word -> phoneme LRU in front of espeak G2P; sentences whose words are
+    # all cached skip G2P and go to the model as phonemes. 0 disables.
+    phoneme_cache_size: int = 20000
+
+    # Segment streaming: split sentences at clause breaks so playback starts
+    # after the first clause is synthesized. 0 disables splitting.
+    segment_min_chars: int = 20
+
+    # Streaming responses: sentences synthesized ahead of playback, so the
+    # next sentence is ready when the current one finishes playing.
+    # 0 synthesizes each sentence only after the previous one has played.
+    lookahead_sentences: int = 2
+
+    # Persistent cache of rendered 8kHz audio for fixed phrases (greetings,
+    # prompts, goodbye). Keyed by text, voice, speed and model fingerprint.
+    phrase_cache_enabled: bool = True
+    phrase_cache_dir: str = "cache/tts"
+    phrase_cache_memory_entries: int = 64  # Memory-mapped entries kept open
+
+    # Sentence chunking for streaming (SentenceBuffer): a reply's first piece
+    # ends at a clause break so speech starts early; later pieces end at
+    # sentence ends. Text without one is cut at max_sentence_length
+    # characters or after max_sentence_wait seconds (0 = no time limit).
     min_sentence_length: int = 10
-    sentence_delimiters: str = ".!?,"
+    sentence_delimiters: str = ".!?"
+    clause_delimiters: str = ",;:"
+    max_sentence_length: int = 200
+    max_sentence_wait: float = 3.0
 
 
 class TimeoutSettings(BaseSettings):
@@ -15,6 +15,7 @@ from scipy import signal
 from scipy.signal import resample_poly
 
 from config.settings import AudioSettings
+from services.tts_stream import OutputStream, telephone_filter_sos
 
 
 class AudioProcessor:
@@ -38,18 +39,11 @@ class AudioProcessor:
         Returns:
             SOS filter coefficients array.
         """
-        nyquist = self.settings.output_sample_rate / 2
-        low = self.settings.telephone_lowcut / nyquist
-        high = self.settings.telephone_highcut / nyquist
-
-        # Clamp to valid range
-        low = max(0.001, min(low, 0.99))
-        high = max(low + 0.001, min(high, 0.99))
-
-        # 4th order Butterworth bandpass using SOS format
-        # SOS provides better numerical stability than transfer function (b, a)
-        sos = signal.butter(4, [low, high], btype="band", output="sos")
-        return sos
+        return telephone_filter_sos(
+            self.settings.output_sample_rate,
+            self.settings.telephone_lowcut,
+            self.settings.telephone_highcut,
+        )
 
     def bytes_to_samples(self, audio_bytes: bytes) -> NDArray[np.int16]:
         """Convert raw audio bytes to numpy array.
@@ -213,12 +207,19 @@ class AudioProcessor:
         # Normalize to float32 [-1.0, 1.0]
         return self.normalize_samples(resampled)
 
-    def process_for_output(self, samples: NDArray, from_rate: int = 24000) -> bytes:
+    def process_for_output(
+        self,
+        samples: NDArray,
+        from_rate: int = 24000,
+        band_pass: bool = True,
+    ) -> bytes:
         """Process TTS audio for output to Asterisk.
 
         Args:
             samples: Audio samples from TTS.
             from_rate: Sample rate of input (default 24kHz for Kokoro).
+            band_pass: Apply the telephone filter. False for audio the TTS
+                server has already rendered for the telephone.
 
         Returns:
             Processed audio bytes (8kHz, 16-bit PCM) ready for Asterisk.
@@ -230,7 +231,7 @@ class AudioProcessor:
         resampled = self.resample(float_samples, from_rate, 8000)
 
         # Apply telephone filter for authentic sound
-        filtered = self.apply_telephone_filter(resampled)
+        filtered = self.apply_telephone_filter(resampled) if band_pass else resampled
 
         # Convert to int16
         if filtered.dtype != np.int16:
@@ -240,6 +241,26 @@ class AudioProcessor:
 
         return self.samples_to_bytes(int_samples)
 
+    def create_output_stream(
+        self,
+        from_rate: int = 24000,
+        band_pass: bool = True,
+    ) -> OutputStream:
+        """Create a stateful output processor for audio arriving in segments.
+
+        Args:
+            from_rate: Sample rate of the incoming TTS audio.
+            band_pass: Apply the telephone filter (see process_for_output).
+
+        Returns:
+            OutputStream that converts segments to output bytes seamlessly.
+        """
+        return OutputStream(
+            from_rate,
+            self.settings.output_sample_rate,
+            self._telephone_filter_sos if band_pass else None,
+        )
+
     def chunk_audio(
         self,
         audio_bytes: bytes,
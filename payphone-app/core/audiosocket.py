@@ -203,6 +203,8 @@ class AudioSocketProtocol:
         )
         self._running = False
         self._read_task: asyncio.Task | None = None
+        self._end_callbacks: list[Callable[[], None]] = []
+        self._ended = False
 
     @property
     def call_id(self) -> str | None:
@@ -248,6 +250,30 @@ class AudioSocketProtocol:
         self._read_task = asyncio.create_task(self._reader_loop())
         return True
 
+    def add_end_callback(self, callback: Callable[[], None]) -> None:
+        """Call callback() once when the call ends.
+
+        Runs as soon as the caller hangs up or the connection is lost, so
+        work on the call's behalf (LLM generation) can stop while the
+        conversation loop is still awaiting it. Also runs on a local
+        hangup or stop().
+        """
+        if self._ended:
+            callback()
+        else:
+            self._end_callbacks.append(callback)
+
+    def _notify_end(self) -> None:
+        if self._ended:
+            return
+        self._ended = True
+        for callback in self._end_callbacks:
+            try:
+                callback()
+            except Exception as e:
+                logger.error(f"Call end callback failed: {e}")
+        self._end_callbacks.clear()
+
     async def stop(self) -> None:
         """Stop the protocol handler and clean up."""
         self._running = False
@@ -257,11 +283,18 @@ class AudioSocketProtocol:
                 await self._read_task
             except asyncio.CancelledError:
                 pass
+        self._notify_end()
         await self.connection.close()
         logger.info(f"Call ended: {self.connection.call_id}")
 
     async def _reader_loop(self) -> None:
         """Background task to read messages and dispatch to queues."""
+        try:
+            await self._read_messages()
+        finally:
+            self._notify_end()
+
+    async def _read_messages(self) -> None:
         while self._running:
             msg = await self.connection.read_message()
             if msg is None:
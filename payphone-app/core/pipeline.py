@@ -16,14 +16,24 @@ from numpy.typing import NDArray
 
 from config.settings import Settings
 from core.audio_processor import AudioProcessor, AudioBuffer
+from core.ready_queue import Opener, ReadyQueue, directory_openers
 from services.vad import SileroVAD, SpeechState
 from services.stt import WhisperSTT
-from services.llm import OllamaClient, SentenceBuffer, ConversationContext
-from services.tts import KokoroTTS, get_voice_for_feature
+from services.llm import LLMClient, SentenceBuffer, ConversationContext
+from services.tts import (
+    PRIORITY_FIRST,
+    PRIORITY_NORMAL,
+    FallbackAudio,
+    KokoroTTS,
+    RemoteTTS,
+    get_voice_for_feature,
+)
+from services.tts_cache import create_phrase_cache
 
 if TYPE_CHECKING:
     from core.session import Session
     from core.audiosocket import AudioSocketProtocol
+    from services.response_cache import CachedReply
 
 logger = logging.getLogger(__name__)
 
@@ -43,8 +53,8 @@ class VoicePipeline:
         self,
         vad: SileroVAD,
         stt: WhisperSTT,
-        llm: OllamaClient,
-        tts: KokoroTTS,
+        llm: LLMClient,
+        tts: KokoroTTS | RemoteTTS,
         settings: Settings,
     ):
         self.vad = vad
@@ -56,6 +66,93 @@ class VoicePipeline:
         # Audio processor for conversions
         self.audio_processor = AudioProcessor(settings.audio)
 
+        # Rendered-audio cache for fixed phrases (None if disabled/unavailable)
+        self.phrase_cache = create_phrase_cache(settings.tts, settings.audio)
+
+        # Pre-generated first replies for lines with an opener (None if
+        # disabled); the application starts it and reports calls to it
+        openers = directory_openers()
+        llm.opener_prompts = {opener.prompt for opener in openers.values()}
+        self.ready_queue: ReadyQueue | None = None
+        if settings.llm.ready_queue_enabled:
+            self.ready_queue = ReadyQueue(
+                openers,
+                self._generate_opener,
+                lambda text, voice: self.render_audio(
+                    text, voice, PRIORITY_NORMAL, fallback=False
+                ),
+                depth=settings.llm.ready_queue_depth,
+                max_age=settings.llm.ready_queue_max_age,
+                idle_seconds=settings.llm.ready_queue_idle_seconds,
+            )
+
+    async def render_audio(
+        self,
+        text: str,
+        voice: str,
+        priority: int = PRIORITY_FIRST,
+        fallback: bool = True,
+    ) -> bytes:
+        """Render text to telephone audio in one piece.
+
+        Args:
+            text: Text to render.
+            voice: Voice to use.
+            priority: TTS scheduling priority.
+            fallback: Whether to return RemoteTTS fallback audio when the
+                server failed; if False, returns empty audio instead.
+
+        Returns:
+            Processed audio (8kHz, 16-bit PCM), empty if nothing was synthesized.
+        """
+        output_bytes, is_fallback = await self._render(text, voice, priority)
+        return output_bytes if fallback or not is_fallback else b""
+
+    async def _render(self, text: str, voice: str, priority: int) -> tuple[bytes, bool]:
+        """Render text to telephone audio, and whether it is fallback audio."""
+        audio = await self.tts.synthesize(text, voice=voice, priority=priority)
+        if len(audio) == 0:
+            return b"", False
+        output_bytes = self.audio_processor.process_for_output(
+            audio,
+            from_rate=self.tts.sample_rate,
+            band_pass=not self.tts.telephone_output,
+        )
+        return output_bytes, isinstance(audio, FallbackAudio)
+
+    async def render_phrase(self, text: str, voice: str) -> bytes:
+        """Render text to telephone audio, using the phrase cache if available.
+
+        Args:
+            text: Fixed phrase to render.
+            voice: Voice to use.
+
+        Returns:
+            Processed audio (8kHz, 16-bit PCM); a memoryview on cache hits.
+            Fallback audio from a failed server is played but not cached.
+        """
+        speed = self.settings.tts.speed
+        cache = self.phrase_cache
+
+        if cache is not None:
+            cached = cache.get(text, voice, speed)
+            if cached is not None:
+                return cached
+
+        output_bytes, is_fallback = await self._render(text, voice, PRIORITY_FIRST)
+        if cache is not None and output_bytes and not is_fallback:
+            cache.put(text, voice, speed, output_bytes)
+        return output_bytes
+
+    async def _generate_opener(self, opener: Opener) -> str:
+        """Generate a line's first reply for the ready queue ("" on failure)."""
+        response = await self.llm.generate(
+            opener.prompt, system_prompt=opener.system_prompt, label=opener.label,
+            background=True,
+        )
+        # Timeouts come back as an apology with nothing generated
+        return response.text if response.tokens_generated else ""
+
     async def listen_and_transcribe(
         self,
         session: "Session",
@@ -187,7 +284,14 @@ class VoicePipeline:
         response = await self.llm.generate(
             prompt=transcript,
             context=session.context,
+            label=session.prompt_label,
+            owner=session.call_id,
         )
+        # speak() plays a cached reply's rendered audio, if it has any
+        session.cached_reply = response.cached_reply
+        if response.cached_reply is not None:
+            logger.info(f"Cached response: '{response.text[:100]}'")
+            return response.text
 
         logger.info(
             f"LLM response ({response.generation_time_ms:.0f}ms): "
@@ -196,6 +300,42 @@ class VoicePipeline:
 
         return response.text
 
+    async def speak_opener(
+        self,
+        session: "Session",
+        prompt: str,
+        check_barge_in: bool = True,
+    ) -> bool:
+        """Speak a line's first reply, pre-generated if the ready queue has one.
+
+        Without a ready reply the opener prompt is generated live, like any
+        caller request.
+
+        Args:
+            session: Current call session (already switched to the line).
+            prompt: The line's opener prompt.
+            check_barge_in: Whether to check for user interruption.
+
+        Returns:
+            True if playback completed, False if interrupted.
+        """
+        label = session.prompt_label
+        ready = self.ready_queue.take(label) if self.ready_queue is not None else None
+        if ready is None:
+            logger.debug(f"No ready opener for {label}, generating")
+            if self.settings.llm.streaming_enabled:
+                _, completed = await self.generate_and_speak_streaming(
+                    session, prompt, check_barge_in=check_barge_in
+                )
+                return completed
+            response = await self.generate_response(session, prompt)
+            return await self.speak(session, response, check_barge_in=check_barge_in)
+
+        logger.info(f"Ready opener for {label}: '{ready.text[:80]}'")
+        session.context.add_user_message(prompt)
+        session.context.add_assistant_message(ready.text)
+        return await self.speak(session, ready.text, check_barge_in=check_barge_in, reply=ready)
+
     async def _monitor_barge_in(self, session: "Session") -> None:
         """Monitor for DTMF and voice input during speech playback.
 
@@ -269,6 +409,8 @@ class VoicePipeline:
         session: "Session",
         text: str,
         check_barge_in: bool = True,
+        cacheable: bool = False,
+        reply: "CachedReply | None" = None,
     ) -> bool:
         """Synthesize and play text as speech.
 
@@ -276,10 +418,20 @@ class VoicePipeline:
             session: Current call session.
             text: Text to speak.
             check_barge_in: Whether to check for user interruption.
+            cacheable: Text is a fixed phrase (greeting, prompt); serve it
+                from the phrase cache and skip synthesis on a hit.
+            reply: Response-cache reply being spoken (default: the
+                session's cached_reply if text is its text); plays its
+                rendered audio, or keeps the audio for the next hit.
 
         Returns:
             True if playback completed, False if interrupted.
         """
+        if reply is None and session.cached_reply is not None:
+            if session.cached_reply.text == text:
+                reply = session.cached_reply
+        session.cached_reply = None
+
         if not text or not text.strip():
             return True
 
@@ -303,18 +455,6 @@ class VoicePipeline:
                 persona=session.current_persona,
             )
 
-            # Synthesize entire text
-            audio = await self.tts.synthesize(text, voice=voice)
-
-            if len(audio) == 0:
-                return True
-
-            # Process for output: 24kHz → 8kHz + telephone filter
-            output_bytes = self.audio_processor.process_for_output(
-                audio,
-                from_rate=self.tts.sample_rate,
-            )
-
             # Build a stop callback that checks barge-in and session state
             def _should_stop_speaking():
                 if check_barge_in and session.barge_in_requested:
@@ -323,9 +463,22 @@ class VoicePipeline:
                     return True
                 return False
 
-            success = await self.send_audio(
-                session.protocol, output_bytes, should_stop=_should_stop_speaking
-            )
+            if reply is not None:
+                success = await self._speak_cached_reply(
+                    session, reply, voice, _should_stop_speaking
+                )
+            elif cacheable:
+                output_bytes = await self.render_phrase(text, voice)
+                if len(output_bytes) == 0:
+                    return True
+                success = await self.send_audio(
+                    session.protocol, output_bytes, should_stop=_should_stop_speaking
+                )
+            else:
+                # Stream segments: playback starts after the first clause
+                success = await self._speak_segments(
+                    session, text, voice, PRIORITY_FIRST, _should_stop_speaking
+                )
 
             if not success and check_barge_in and session.barge_in_requested:
                 logger.debug("Playback interrupted by barge-in")
@@ -346,19 +499,27 @@ class VoicePipeline:
         session: "Session",
         text_generator: AsyncIterator[str],
         check_barge_in: bool = True,
+        on_interrupt: Callable[[], None] | None = None,
     ) -> bool:
         """Synthesize and play streaming text with overlapped LLM+TTS.
 
-        Uses a producer-consumer pattern where:
+        Three concurrent stages:
         - Producer: LLM tokens stream into sentence buffer, complete sentences queued
-        - Consumer: Background task synthesizes and plays sentences concurrently
+        - Synthesis: renders up to tts.lookahead_sentences sentences ahead of
+          playback into an audio queue
+        - Playback: drains the audio queue to the caller in real time
 
-        This overlaps LLM generation with TTS synthesis, reducing latency by ~30%.
+        Synthesis of sentence k+1 overlaps playback of sentence k, so there's
+        no dead air between sentences. Barge-in cancels synthesis and playback
+        and discards any audio rendered ahead.
 
         Args:
             session: Current call session.
             text_generator: Async generator yielding text tokens.
             check_barge_in: Whether to check for user interruption.
+            on_interrupt: Called when barge-in or hangup stops playback,
+                to stop the text generator, which may be waiting on the
+                LLM, from producing more.
 
         Returns:
             True if playback completed, False if interrupted.
@@ -373,6 +534,9 @@ class VoicePipeline:
         sentence_buffer = SentenceBuffer(
             min_length=self.settings.tts.min_sentence_length,
             delimiters=self.settings.tts.sentence_delimiters,
+            clause_delimiters=self.settings.tts.clause_delimiters,
+            max_length=self.settings.tts.max_sentence_length,
+            max_wait=self.settings.tts.max_sentence_wait,
         )
 
         voice = get_voice_for_feature(
@@ -380,48 +544,117 @@ class VoicePipeline:
             persona=session.current_persona,
         )
 
-        # Queue for sentences ready for TTS (bounded to prevent memory growth)
-        sentence_queue: asyncio.Queue[str | None] = asyncio.Queue(maxsize=5)
+        # Sentences waiting for synthesis. Unbounded so the producer never
+        # blocks on a stopped consumer; memory is bounded by the lookahead
+        # below, since text is tiny next to rendered audio.
+        sentence_queue: asyncio.Queue[str | None] = asyncio.Queue()
+
+        # Rendered audio in frames; (b"", True) marks the end of a sentence
+        # and None the end of the stream. Each slot of `ahead` is one
+        # sentence rendered (or rendering) but not yet fully played: the
+        # one playing plus up to lookahead_sentences behind it.
+        audio_queue: asyncio.Queue[tuple[bytes, bool] | None] = asyncio.Queue()
+        ahead = asyncio.Semaphore(max(0, self.settings.tts.lookahead_sentences) + 1)
+
         playback_error = False
         interrupted = False
 
-        async def tts_consumer() -> None:
-            """Background task that consumes sentences and plays them."""
-            nonlocal playback_error, interrupted
+        def _should_stop_speaking():
+            if check_barge_in and session.barge_in_requested:
+                return True
+            if not session.is_active:
+                return True
+            return False
 
-            while True:
-                try:
+        async def synthesis_stage() -> None:
+            """Render queued sentences ahead of playback."""
+            nonlocal playback_error
+            priority = PRIORITY_FIRST
+            try:
+                while True:
                     sentence = await sentence_queue.get()
 
                     # None signals end of stream
-                    if sentence is None:
+                    if sentence is None or _should_stop_speaking():
                         break
+                    if not sentence.strip():
+                        continue
 
-                    # Check for barge-in before each sentence
-                    if check_barge_in and session.barge_in_requested:
-                        interrupted = True
-                        break
+                    # Wait until at most K sentences are rendered ahead
+                    await ahead.acquire()
+                    rendered = self._render_segments(session, sentence, voice, priority)
+                    try:
+                        async for pcm in rendered:
+                            audio_queue.put_nowait((pcm, False))
+                    finally:
+                        # Cancels any segment prefetch still in flight
+                        await rendered.aclose()
+                    audio_queue.put_nowait((b"", True))
+                    priority = PRIORITY_NORMAL
 
-                    # Synthesize and send
-                    if not await self._send_sentence(session, sentence, voice):
-                        playback_error = True
+            except asyncio.CancelledError:
+                pass
+            except Exception as e:
+                logger.error(f"TTS synthesis error: {e}")
+                playback_error = True
+            finally:
+                audio_queue.put_nowait(None)
+
+        async def playback_stage() -> None:
+            """Play rendered audio; on interrupt, stop synthesis and drop what's ahead."""
+            nonlocal playback_error, interrupted
+            while True:
+                try:
+                    # Poll so a barge-in is noticed while synthesis is running
+                    item = await asyncio.wait_for(audio_queue.get(), timeout=0.05)
+                except asyncio.TimeoutError:
+                    if _should_stop_speaking():
+                        interrupted = True
                         break
+                    continue
 
-                except asyncio.CancelledError:
+                if item is None:
                     break
-                except Exception as e:
-                    logger.error(f"TTS consumer error: {e}")
-                    playback_error = True
+
+                pcm, sentence_done = item
+                if sentence_done:
+                    ahead.release()
+                    continue
+
+                if not await self.send_audio(
+                    session.protocol, pcm, should_stop=_should_stop_speaking
+                ):
+                    if _should_stop_speaking():
+                        interrupted = True
+                    else:
+                        playback_error = True
                     break
 
+            if interrupted and on_interrupt is not None:
+                on_interrupt()
+            if synthesis_task.done():
+                return
+            synthesis_task.cancel()
+            try:
+                await synthesis_task
+            except asyncio.CancelledError:
+                pass
+            dropped = 0
+            while not audio_queue.empty():
+                item = audio_queue.get_nowait()
+                if item is not None:
+                    dropped += len(item[0])
+            if dropped:
+                logger.debug(f"Discarded {dropped} bytes of pre-rendered audio")
+
         # Start barge-in monitoring (DTMF + voice)
         if check_barge_in:
             barge_in_monitor_task = asyncio.create_task(
                 self._monitor_barge_in(session)
             )
 
-        # Start TTS consumer task
-        consumer_task = asyncio.create_task(tts_consumer())
+        synthesis_task = asyncio.create_task(synthesis_stage())
+        playback_task = asyncio.create_task(playback_stage())
 
         try:
             async for token in text_generator:
@@ -430,37 +663,30 @@ class VoicePipeline:
                     interrupted = True
                     break
 
-                if playback_error:
+                if playback_error or playback_task.done():
                     break
 
                 # Add token to sentence buffer
                 sentence = sentence_buffer.add_token(token)
 
                 if sentence:
-                    # Queue sentence for TTS (may block briefly if queue is full)
-                    await sentence_queue.put(sentence)
+                    sentence_queue.put_nowait(sentence)
 
             # Flush remaining text
             if not interrupted and not playback_error:
-                remaining = sentence_buffer.flush()
-                if remaining:
-                    await sentence_queue.put(remaining)
+                while remaining := sentence_buffer.flush():
+                    sentence_queue.put_nowait(remaining)
 
             # Signal end of stream
-            await sentence_queue.put(None)
+            sentence_queue.put_nowait(None)
 
-            # Wait for TTS to finish playing all queued sentences
-            await consumer_task
+            if interrupted:
+                synthesis_task.cancel()
 
-            return not playback_error and not interrupted
+            # Wait for playback to finish all queued sentences
+            await playback_task
 
-        except asyncio.CancelledError:
-            consumer_task.cancel()
-            try:
-                await consumer_task
-            except asyncio.CancelledError:
-                pass
-            raise
+            return not playback_error and not interrupted
 
         finally:
             session.is_speaking = False
@@ -470,56 +696,139 @@ class VoicePipeline:
                     await barge_in_monitor_task
                 except asyncio.CancelledError:
                     pass
-            # Ensure consumer is cleaned up
-            if not consumer_task.done():
-                consumer_task.cancel()
-                try:
-                    await consumer_task
-                except asyncio.CancelledError:
-                    pass
+            # Ensure both stages are cleaned up (also on cancellation)
+            for task in (playback_task, synthesis_task):
+                if not task.done():
+                    task.cancel()
+                    try:
+                        await task
+                    except asyncio.CancelledError:
+                        pass
+
+    async def _render_segments(
+        self,
+        session: "Session",
+        text: str,
+        voice: str,
+        priority: int,
+        on_fallback: Callable[[], None] | None = None,
+    ) -> AsyncIterator[bytes]:
+        """Synthesize text as clause segments, yielding telephone audio as it's ready.
+
+        Segments go through a stateful output stream (resample + telephone
+        filter) so they join without clicks, and are yielded in whole
+        AudioSocket frames (the final tail may be shorter). Time from
+        request to the first segment's audio is recorded as the session's
+        TTS time-to-first-byte.
+
+        Args:
+            session: Current call session.
+            text: Text to speak.
+            voice: Voice to use.
+            priority: TTS scheduling priority for the first segment.
+            on_fallback: Called if any of the audio is RemoteTTS fallback
+                audio rather than the text.
+
+        Yields:
+            Processed audio (8kHz, 16-bit PCM).
+        """
+        output = self.audio_processor.create_output_stream(
+            self.tts.sample_rate, band_pass=not self.tts.telephone_output
+        )
+        frame_bytes = self.settings.audio.chunk_size
+        pending = b""
+        started = time.perf_counter()
+        first_segment = True
+
+        segments = self.tts.synthesize_stream(text, voice=voice, priority=priority)
+        try:
+            async for audio in segments:
+                if first_segment:
+                    session.metrics.record_tts_ttfb((time.perf_counter() - started) * 1000)
+                    first_segment = False
+                if on_fallback is not None and isinstance(audio, FallbackAudio):
+                    on_fallback()
+
+                pending += output.process(audio)
+                whole = len(pending) - len(pending) % frame_bytes
+                if whole:
+                    yield pending[:whole]
+                    pending = pending[whole:]
+        finally:
+            await segments.aclose()
 
-    async def _send_sentence(
+        if first_segment:
+            return  # Nothing synthesized (empty text)
+
+        pending += output.flush()
+        if pending:
+            yield pending
+
+    async def _speak_segments(
         self,
         session: "Session",
-        sentence: str,
+        text: str,
         voice: str,
+        priority: int,
+        should_stop: Callable[[], bool],
+        collect: list[bytes] | None = None,
+        on_fallback: Callable[[], None] | None = None,
     ) -> bool:
-        """Synthesize and send a single sentence.
+        """Synthesize text as clause segments, playing each as soon as it's ready.
 
         Args:
             session: Current call session.
-            sentence: Sentence to speak.
+            text: Text to speak.
             voice: Voice to use.
+            priority: TTS scheduling priority for the first segment.
+            should_stop: Callback that returns True to abort playback.
+            collect: If given, rendered audio is appended to it.
+            on_fallback: Called if any of the audio is RemoteTTS fallback
+                audio rather than the text.
 
         Returns:
             True if sent successfully, False if interrupted or error.
         """
-        if not sentence.strip():
-            return True
-
-        # Synthesize
-        audio = await self.tts.synthesize(sentence, voice=voice)
-        if len(audio) == 0:
-            return True
+        rendered = self._render_segments(session, text, voice, priority, on_fallback)
+        try:
+            async for pcm in rendered:
+                if collect is not None:
+                    collect.append(pcm)
+                if not await self.send_audio(session.protocol, pcm, should_stop=should_stop):
+                    return False
+        finally:
+            await rendered.aclose()
+        return True
 
-        # Process for output
-        output_bytes = self.audio_processor.process_for_output(
-            audio,
-            from_rate=self.tts.sample_rate,
-        )
+    async def _speak_cached_reply(
+        self,
+        session: "Session",
+        reply: "CachedReply",
+        voice: str,
+        should_stop: Callable[[], bool],
+    ) -> bool:
+        """Play a response-cache reply, rendering it only the first time.
 
-        # Build stop callback for mid-sentence interrupt
-        def _should_stop_speaking():
-            if session.barge_in_requested:
-                return True
-            if not session.is_active:
-                return True
-            return False
+        The first playback synthesizes segments as usual and, if it runs to
+        the end, keeps the audio on the reply so later hits in the same
+        voice play with no synthesis at all. Fallback audio from a failed
+        TTS server is not kept.
 
-        # Send with interrupt support
-        return await self.send_audio(
-            session.protocol, output_bytes, should_stop=_should_stop_speaking
+        Returns:
+            True if sent successfully, False if interrupted or error.
+        """
+        if reply.audio is not None and reply.voice == voice:
+            return await self.send_audio(session.protocol, reply.audio, should_stop=should_stop)
+
+        rendered: list[bytes] = []
+        fell_back: list[bool] = []
+        success = await self._speak_segments(
+            session, reply.text, voice, PRIORITY_FIRST, should_stop, collect=rendered,
+            on_fallback=lambda: fell_back.append(True),
         )
+        if success and not fell_back and self.llm.reply_cache is not None:
+            self.llm.reply_cache.attach_audio(reply, voice, b"".join(rendered))
+        return success
 
     async def generate_and_speak_streaming(
         self,
@@ -547,11 +856,30 @@ class VoicePipeline:
         first_sentence_time: float | None = None
         stream_start = time.perf_counter()
 
+        # Repeated requests are answered from the response cache: no LLM
+        # call, and no synthesis once the reply's audio has been rendered
+        label = session.prompt_label
+        reply = self.llm.lookup_reply(transcript, label, session.context)
+        if reply is not None:
+            completed = await self.speak(
+                session, reply.text, check_barge_in=check_barge_in, reply=reply
+            )
+            elapsed_ms = (time.perf_counter() - stream_start) * 1000
+            logger.info(f"Cached response ({elapsed_ms:.0f}ms total): '{reply.text[:80]}'")
+            return reply.text, completed
+
         text_generator = self.llm.generate_streaming(
             prompt=transcript,
             context=session.context,
+            label=label,
+            owner=session.call_id,
         )
 
+        def cancel_generation() -> None:
+            # Ends the stream at once, even mid-token: frees the server slot
+            # and records the partial reply in context
+            self.llm.cancel_requests(session.call_id)
+
         async def collecting_generator() -> AsyncIterator[str]:
             """Wraps the LLM stream to collect tokens and track first sentence."""
             nonlocal first_sentence_time
@@ -564,9 +892,10 @@ class VoicePipeline:
                 session,
                 collecting_generator(),
                 check_barge_in=check_barge_in,
+                on_interrupt=cancel_generation,
             )
         finally:
-            # Close the LLM stream promptly (terminates Ollama HTTP connection)
+            # Close the LLM stream promptly (terminates the server HTTP connection)
             await text_generator.aclose()
 
         full_response = "".join(collected_tokens)
@@ -594,7 +923,7 @@ class VoicePipeline:
 
         Args:
             protocol: AudioSocket protocol handler.
-            audio_bytes: Processed audio bytes (8kHz, 16-bit PCM).
+            audio_bytes: Processed audio (8kHz, 16-bit PCM), bytes or memoryview.
             should_stop: Optional callback that returns True to abort playback.
 
         Returns:
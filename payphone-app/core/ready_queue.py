@@ -0,0 +1,276 @@
+"""Ready queue of pre-generated first replies.
+
+Some lines open with a reply that needs nothing from the caller:
+Dial-A-Joke tells a joke right after its greeting. These lines have an
+"opener" prompt in the phone directory, and ReadyQueue keeps `depth`
+replies per line generated and rendered to telephone audio ahead of
+time, so the opener plays straight after the greeting with no LLM or
+TTS latency.
+
+Filling only happens in idle time: while no call is active and
+idle_seconds after the last call ended, one reply at a time. A call
+starting cancels an in-flight fill, so live calls never wait behind one
+for the LLM or TTS. Replies older than max_age are replaced on the next
+idle pass, so the jokes keep changing; until then they are still served.
+"""
+
+__all__ = ["Opener", "ReadyQueue", "directory_openers"]
+
+import asyncio
+import logging
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+
+from config.phone_directory import PHONE_DIRECTORY
+from config.prompts import get_system_prompt
+from services.response_cache import CachedReply
+from services.tts import get_voice_for_feature
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Opener:
+    """A line's first reply, as generated without caller input."""
+
+    label: str  # Prompt label of the line ("feature:jokes", "persona:sage")
+    prompt: str  # User prompt sent for the first reply
+    system_prompt: str
+    voice: str
+
+
+def directory_openers() -> dict[str, Opener]:
+    """Openers of the phone directory's lines, by prompt label."""
+    openers = {}
+    for entry in PHONE_DIRECTORY.values():
+        prompt = entry.get("opener")
+        if not prompt:
+            continue
+        if entry["type"] == "persona":
+            persona = entry["persona_key"]
+            label = f"persona:{persona}"
+            system_prompt = get_system_prompt(persona=persona)
+            voice = get_voice_for_feature(feature=entry["feature"], persona=persona)
+        else:
+            label = f"feature:{entry['feature']}"
+            system_prompt = get_system_prompt(feature=entry["feature"])
+            voice = get_voice_for_feature(feature=entry["feature"])
+        openers[label] = Opener(label, prompt, system_prompt, voice)
+    return openers
+
+
+class ReadyQueue:
+    """Keeps pre-generated, pre-rendered first replies topped up.
+
+    The application calls call_started() / call_finished() around every
+    call; filling runs in the background task.
+    """
+
+    def __init__(
+        self,
+        openers: dict[str, Opener],
+        generate: Callable[[Opener], Awaitable[str]],
+        render: Callable[[str, str], Awaitable[bytes]],
+        depth: int = 3,
+        max_age: float = 21600.0,
+        idle_seconds: float = 10.0,
+        poll_interval: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Initialize the queue.
+
+        Args:
+            openers: Lines to keep replies for, by prompt label.
+            generate: Coroutine returning an opener's reply text ("" on
+                failure).
+            render: Coroutine rendering (text, voice) to telephone audio.
+            depth: Replies kept per line.
+            max_age: Seconds before a reply is replaced.
+            idle_seconds: Quiet time after a call before filling.
+            poll_interval: Seconds between fill passes.
+            clock: Time source (for tests).
+        """
+        self._openers = openers
+        self._generate = generate
+        self._render = render
+        self.depth = max(1, depth)
+        self._max_age = max_age
+        self._idle_seconds = idle_seconds
+        self._poll_interval = poll_interval
+        self._clock = clock
+
+        self._queues: dict[str, deque[CachedReply]] = {label: deque() for label in openers}
+        self._active_calls = 0
+        self._last_call = float("-inf")
+        self._task: asyncio.Task | None = None
+        self._filling: asyncio.Task | None = None
+        self._preempting = False
+        self._wake = asyncio.Event()
+
+        self.generated = 0
+        self.served = 0
+        self.misses = 0
+        self.preempted = 0
+        self.replaced = 0
+
+    # ------------------------------------------------------------------
+    # Hooks for the application
+    # ------------------------------------------------------------------
+
+    def call_started(self) -> None:
+        """A call began: cancel any in-flight fill."""
+        self._active_calls += 1
+        if self._filling is not None and not self._filling.done():
+            self._preempting = True
+            self._filling.cancel()
+            self.preempted += 1
+
+    def call_finished(self) -> None:
+        """A call ended."""
+        self._active_calls = max(0, self._active_calls - 1)
+        self._last_call = self._clock()
+
+    def take(self, label: str) -> CachedReply | None:
+        """Take the oldest ready reply for a line, or None if it has none."""
+        queue = self._queues.get(label)
+        if queue is None:
+            return None
+        if not queue:
+            self.misses += 1
+            return None
+        self.served += 1
+        reply = queue.popleft()
+        reply.served += 1
+        return reply
+
+    def is_idle(self) -> bool:
+        """Whether filling may run (no calls, and quiet for idle_seconds)."""
+        return (
+            self._active_calls == 0
+            and self._clock() - self._last_call >= self._idle_seconds
+        )
+
+    # ------------------------------------------------------------------
+    # Filling
+    # ------------------------------------------------------------------
+
+    def start(self) -> None:
+        """Start the background fill task."""
+        if self._task is None and self._openers:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop filling."""
+        for task in (self._filling, self._task):
+            if task is not None and not task.done():
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._task = self._filling = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.fill_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Ready queue fill failed: {e}")
+            try:
+                await asyncio.wait_for(self._wake.wait(), self._poll_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+
+    def _next_label(self) -> str | None:
+        """The line most in need of a reply, or None if all are full and fresh."""
+        cutoff = self._clock() - self._max_age
+        best, best_fill = None, self.depth
+        for label, queue in self._queues.items():
+            fresh = sum(1 for reply in queue if reply.stored_at >= cutoff)
+            if fresh < best_fill:
+                best, best_fill = label, fresh
+        return best
+
+    async def fill_once(self) -> int:
+        """Fill while idle, one reply at a time, until every line is full.
+
+        Returns:
+            Number of replies added.
+        """
+        added = 0
+        while self.is_idle():
+            label = self._next_label()
+            if label is None:
+                break
+            if not await self._fill(label):
+                break
+            added += 1
+        if added:
+            logger.debug(f"Ready queue: {self.stats()['lines']}")
+        return added
+
+    async def _fill(self, label: str) -> bool:
+        """Generate and render one reply for a line.
+
+        Returns:
+            True if a reply was added, False if cancelled or failed.
+        """
+        self._filling = asyncio.create_task(self._make(self._openers[label]))
+        try:
+            reply = await self._filling
+        except asyncio.CancelledError:
+            if not self._preempting:
+                raise  # We are being stopped
+            self._preempting = False
+            return False
+        except Exception as e:
+            logger.warning(f"Pre-generation failed for {label}: {e}")
+            return False
+        finally:
+            self._filling = None
+
+        if reply is None:
+            return False
+        queue = self._queues[label]
+        queue.append(reply)
+        if len(queue) > self.depth:
+            queue.popleft()  # Replaces the stalest reply
+            self.replaced += 1
+        self.generated += 1
+        return True
+
+    async def _make(self, opener: Opener) -> CachedReply | None:
+        text = (await self._generate(opener)).strip()
+        if not text:
+            return None
+        audio = await self._render(text, opener.voice)
+        if not audio:
+            return None
+        return CachedReply(
+            text=text, stored_at=self._clock(), audio=bytes(audio), voice=opener.voice
+        )
+
+    def stats(self) -> dict:
+        """Fill levels and staleness per line, plus counters."""
+        now = self._clock()
+        lines = {
+            label: {
+                "ready": len(queue),
+                "depth": self.depth,
+                "oldest_age": round(now - queue[0].stored_at, 1) if queue else None,
+            }
+            for label, queue in self._queues.items()
+        }
+        return {
+            "lines": lines,
+            "generated": self.generated,
+            "served": self.served,
+            "misses": self.misses,
+            "preempted": self.preempted,
+            "replaced": self.replaced,
+        }
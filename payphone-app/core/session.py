@@ -22,6 +22,7 @@ from typing import TYPE_CHECKING
 from config.prompts import get_system_prompt
 from config.settings import Settings
 from services.llm import ConversationContext, Message
+from services.token_budget import token_counter
 import numpy as np
 from numpy.typing import NDArray
 
@@ -29,6 +30,7 @@ from services.vad import VADSessionState
 
 if TYPE_CHECKING:
     from core.audiosocket import AudioSocketProtocol
+    from services.response_cache import CachedReply
     from services.vad import VADModel
 
 logger = logging.getLogger(__name__)
@@ -49,12 +51,30 @@ class SessionMetrics:
     first_sentence_latency_ms: float | None = None
     features_used: list[str] = field(default_factory=list)
 
+    # TTS time-to-first-byte: request to first synthesized segment, per sentence
+    tts_ttfb_count: int = 0
+    tts_ttfb_total_ms: float = 0.0
+    tts_ttfb_max_ms: float = 0.0
+
     @property
     def duration_seconds(self) -> float:
         """Get total call duration in seconds."""
         end = self.end_time or time.time()
         return end - self.start_time
 
+    @property
+    def tts_ttfb_avg_ms(self) -> float | None:
+        """Average TTS time-to-first-byte, or None before any synthesis."""
+        if self.tts_ttfb_count == 0:
+            return None
+        return self.tts_ttfb_total_ms / self.tts_ttfb_count
+
+    def record_tts_ttfb(self, ms: float) -> None:
+        """Record one sentence's TTS time-to-first-byte."""
+        self.tts_ttfb_count += 1
+        self.tts_ttfb_total_ms += ms
+        self.tts_ttfb_max_ms = max(self.tts_ttfb_max_ms, ms)
+
     def add_feature(self, feature: str) -> None:
         """Record feature usage."""
         if feature not in self.features_used:
@@ -107,8 +127,18 @@ class Session:
     is_speaking: bool = False
     barge_in_requested: bool = False
 
+    # Reply last served from the LLM response cache, until it is spoken
+    # (lets speak() play its already-rendered audio)
+    cached_reply: "CachedReply | None" = None
+
     def __post_init__(self):
         """Initialize session-specific state."""
+        self.context.max_history = self.settings.llm.max_history
+        self.context.history_policy = self.settings.llm.history_policy
+        self.context.trim_block = self.settings.llm.history_trim_block
+        self.context.token_budget = self.settings.llm.history_token_budget
+        self.context.token_counter = token_counter(self.settings.llm.tokenizer)
+
         # Set up conversation context with default system prompt
         system_prompt = get_system_prompt(feature=self.current_feature)
         self._update_system_prompt(system_prompt)
@@ -179,6 +209,15 @@ class Session:
         self.dtmf_buffer = ""
         return result
 
+    @property
+    def prompt_label(self) -> str:
+        """Label of the active system prompt ("persona:x", "feature:x" or "operator")."""
+        if self.current_persona:
+            return f"persona:{self.current_persona}"
+        if self.current_feature != "operator":
+            return f"feature:{self.current_feature}"
+        return "operator"
+
     def switch_feature(self, feature: str) -> None:
         """Switch to a different feature.
 
@@ -299,9 +338,24 @@ class SessionManager:
                 # This prevents large conversation histories from lingering
                 session.context.clear()
 
+                ttfb = session.metrics.tts_ttfb_avg_ms
+                ttfb_summary = (
+                    f", TTS TTFB avg {ttfb:.0f}ms max {session.metrics.tts_ttfb_max_ms:.0f}ms"
+                    if ttfb is not None
+                    else ""
+                )
+                evals = session.context.prompt_eval_counts
+                eval_summary = (
+                    f", LLM prompt eval {sum(evals)} tokens over {len(evals)} turns"
+                    if evals
+                    else ""
+                )
+                waits = session.context.queue_waits_ms
+                wait_summary = f", LLM queue wait max {max(waits):.0f}ms" if waits else ""
                 logger.info(
                     f"Removed session: {call_id} "
-                    f"(duration: {session.metrics.duration_seconds:.1f}s)"
+                    f"(duration: {session.metrics.duration_seconds:.1f}s"
+                    f"{ttfb_summary}{eval_summary}{wait_summary})"
                 )
 
     @property
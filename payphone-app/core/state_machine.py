@@ -35,6 +35,22 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+# Fixed phrases spoken by the state machine. Kept at module level so they
+# can be pre-rendered into the TTS phrase cache.
+OPERATOR_GREETING = (
+    "Welcome to the AI Payphone! "
+    "I'm your operator. You can talk to me naturally, "
+    "or dial a number for specific services. "
+    "Press star at any time to return to this menu. "
+    "How can I help you today?"
+)
+MENU_RETURN_PROMPT = "Returning to the main menu. How can I help you?"
+TIMEOUT_PROMPT = "Are you still there? Say something or press any key to continue."
+GOODBYE_MESSAGE = (
+    "Thanks for calling the AI Payphone! "
+    "Have a great day. Goodbye!"
+)
+
 
 def _get_greeting(feature: str) -> str:
     """Look up greeting for a feature from the phone directory.
@@ -50,6 +66,12 @@ def _get_greeting(feature: str) -> str:
     return f"Welcome to {feature.replace('_', ' ').title()}!"
 
 
+def _get_opener(feature: str) -> str | None:
+    """Look up a line's opener prompt (a first reply with no caller input)."""
+    number = FEATURE_TO_NUMBER.get(feature)
+    return PHONE_DIRECTORY[number].get("opener") if number else None
+
+
 class State(Enum):
     """Conversation states.
 
@@ -240,7 +262,9 @@ class StateMachine:
             # Not-in-service recording, then hang up
             self.transition_to(State.SPEAKING, "play_not_in_service")
             await pipeline.play_sound(self.session, "sit_intercept")
-            await pipeline.speak(self.session, DEFAULT_GREETING_NOT_IN_SERVICE)
+            await pipeline.speak(
+                self.session, DEFAULT_GREETING_NOT_IN_SERVICE, cacheable=True
+            )
             self.transition_to(State.GOODBYE, "invalid_number")
             return
 
@@ -251,21 +275,14 @@ class StateMachine:
             # Play feature-specific greeting
             greeting = _get_greeting(self._route_result.feature)
             self.transition_to(State.SPEAKING, "play_greeting")
-            await pipeline.speak(self.session, greeting)
+            if await pipeline.speak(self.session, greeting, cacheable=True):
+                await self._play_opener(self._route_result.feature, pipeline)
             self.transition_to(State.LISTENING, "greeting_complete")
             return
 
         # Default operator greeting
-        greeting = (
-            "Welcome to the AI Payphone! "
-            "I'm your operator. You can talk to me naturally, "
-            "or dial a number for specific services. "
-            "Press star at any time to return to this menu. "
-            "How can I help you today?"
-        )
-
         self.transition_to(State.SPEAKING, "play_greeting")
-        await pipeline.speak(self.session, greeting)
+        await pipeline.speak(self.session, OPERATOR_GREETING, cacheable=True)
         self.transition_to(State.LISTENING, "greeting_complete")
 
     async def _handle_main_menu(self, pipeline: "VoicePipeline") -> None:
@@ -340,10 +357,7 @@ class StateMachine:
 
         if any(word in lower_transcript for word in ["menu", "main menu", "go back"]):
             self.session.switch_feature("operator")
-            await pipeline.speak(
-                self.session,
-                "Returning to the main menu. How can I help you?",
-            )
+            await pipeline.speak(self.session, MENU_RETURN_PROMPT, cacheable=True)
             self.transition_to(State.LISTENING, "menu_return")
             return
 
@@ -392,10 +406,7 @@ class StateMachine:
         if digit == "*":
             self._route_result = None
             self.session.switch_feature("operator")
-            await pipeline.speak(
-                self.session,
-                "Returning to the main menu. How can I help you?",
-            )
+            await pipeline.speak(self.session, MENU_RETURN_PROMPT, cacheable=True)
             self.transition_to(State.LISTENING, "menu_return")
             return
 
@@ -425,7 +436,9 @@ class StateMachine:
 
         if result.entry_type == "invalid":
             await pipeline.play_sound(self.session, "sit_intercept")
-            await pipeline.speak(self.session, DEFAULT_GREETING_NOT_IN_SERVICE)
+            await pipeline.speak(
+                self.session, DEFAULT_GREETING_NOT_IN_SERVICE, cacheable=True
+            )
             self.transition_to(State.LISTENING, "invalid_number")
             return
 
@@ -433,9 +446,24 @@ class StateMachine:
         self._apply_route(result)
         self._route_result = result
         greeting = _get_greeting(result.feature)
-        await pipeline.speak(self.session, greeting)
+        if await pipeline.speak(self.session, greeting, cacheable=True):
+            await self._play_opener(result.feature, pipeline)
         self.transition_to(State.LISTENING, f"feature_{result.feature}")
 
+    async def _play_opener(self, feature: str, pipeline: "VoicePipeline") -> None:
+        """Speak the line's opener, if it has one, right after its greeting.
+
+        Args:
+            feature: Routed feature.
+            pipeline: Voice pipeline.
+        """
+        opener = _get_opener(feature)
+        if opener is None:
+            return
+        self.session.metrics.llm_calls += 1
+        self.session.metrics.tts_calls += 1
+        await pipeline.speak_opener(self.session, opener)
+
     def _apply_route(self, result: RouteResult) -> None:
         """Apply a route result to the session.
 
@@ -455,10 +483,7 @@ class StateMachine:
         if not self._timeout_prompted:
             # First timeout - prompt user
             self._timeout_prompted = True
-            await pipeline.speak(
-                self.session,
-                "Are you still there? Say something or press any key to continue.",
-            )
+            await pipeline.speak(self.session, TIMEOUT_PROMPT, cacheable=True)
             self._silence_start = time.time()
             self.transition_to(State.LISTENING, "timeout_prompt")
         else:
@@ -470,13 +495,8 @@ class StateMachine:
 
     async def _play_goodbye(self, pipeline: "VoicePipeline") -> None:
         """Play goodbye message."""
-        goodbye = (
-            "Thanks for calling the AI Payphone! "
-            "Have a great day. Goodbye!"
-        )
-
         self.transition_to(State.SPEAKING, "play_goodbye")
-        await pipeline.speak(self.session, goodbye)
+        await pipeline.speak(self.session, GOODBYE_MESSAGE, cacheable=True)
 
     async def handle_timeout(self) -> None:
         """Called when a timeout occurs during listening."""
@@ -91,7 +91,7 @@ class BaseFeature(ABC):
         # Play greeting
         greeting = self.get_greeting()
         if greeting:
-            await pipeline.speak(session, greeting)
+            await pipeline.speak(session, greeting, cacheable=True)
 
     async def on_exit(self, session: "Session") -> None:
         """Called when user exits this feature.
@@ -67,6 +67,7 @@ class JokesFeature(ConversationalFeature):
                     await pipeline.speak(
                         session,
                         "Want to hear another one? Just say yes or press 1.",
+                        cacheable=True,
                     )
                 continue
 
@@ -91,9 +92,9 @@ class JokesFeature(ConversationalFeature):
 
                 # Follow up
                 if self._jokes_told < 3:
-                    await pipeline.speak(session, "Want to hear another one?")
+                    await pipeline.speak(session, "Want to hear another one?", cacheable=True)
                 else:
-                    await pipeline.speak(session, "Another? I've got plenty more!")
+                    await pipeline.speak(session, "Another? I've got plenty more!", cacheable=True)
 
             else:
                 # Handle other requests
@@ -85,6 +85,7 @@ class OperatorFeature(ConversationalFeature):
                 await pipeline.speak(
                     session,
                     "Is there anything else I can help you with?",
+                    cacheable=True,
                 )
                 continue
 
@@ -93,6 +94,7 @@ class OperatorFeature(ConversationalFeature):
                 await pipeline.speak(
                     session,
                     "Thanks for calling! Have a wonderful day!",
+                    cacheable=True,
                 )
                 await session.hangup()
                 break
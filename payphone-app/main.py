@@ -19,8 +19,8 @@ from core.state_machine import StateMachine, State
 from features.registry import FeatureRegistry
 from services.vad import SileroVAD
 from services.stt import WhisperSTT
-from services.llm import OllamaClient
-from services.tts import KokoroTTS
+from services.llm import LLMClient
+from services.tts import create_tts
 
 # Configure logging
 logging.basicConfig(
@@ -72,13 +72,14 @@ class PayphoneApplication:
             await self._stt.initialize()
 
             # Initialize LLM
-            logger.info(f"Connecting to Ollama: {self.settings.llm.model}...")
-            self._llm = OllamaClient(self.settings.llm)
+            llm = self.settings.llm
+            logger.info(f"Connecting to LLM ({llm.backend}): {llm.model}...")
+            self._llm = LLMClient(self.settings.llm)
             await self._llm.initialize()
 
             # Initialize TTS
-            logger.info("Loading Kokoro TTS...")
-            self._tts = KokoroTTS(self.settings.tts)
+            logger.info(f"Loading Kokoro TTS ({self.settings.tts.mode})...")
+            self._tts = create_tts(self.settings.tts, self.settings.audio)
             await self._tts.initialize()
 
         except Exception:
@@ -123,6 +124,11 @@ class PayphoneApplication:
         dialed_extension = protocol.dialed_extension
         logger.info(f"Handling call: {call_id} (extension: {dialed_extension})")
 
+        # Pre-generation yields the LLM and TTS to live calls
+        ready_queue = self._pipeline.ready_queue
+        if ready_queue is not None:
+            ready_queue.call_started()
+
         session = None
         try:
             # Route based on dialed extension
@@ -137,6 +143,7 @@ class PayphoneApplication:
                 settings=self.settings,
                 dialed_extension=dialed_extension,
             )
+            protocol.add_end_callback(lambda: self._call_ended(session))
 
             # Acquire exclusive VAD model from pool for this session
             session.vad_model = await self._vad.acquire_model()
@@ -156,12 +163,31 @@ class PayphoneApplication:
         except Exception as e:
             logger.exception(f"Error handling call {call_id}: {e}")
         finally:
-            # Release VAD model back to pool
-            if session is not None and session.vad_model is not None:
-                await self._vad.release_model(session.vad_model)
-                session.vad_model = None
-            await protocol.stop()
-            logger.info(f"Call completed: {call_id}")
+            try:
+                # Release VAD model back to pool
+                if session is not None and session.vad_model is not None:
+                    await self._vad.release_model(session.vad_model)
+                    session.vad_model = None
+                await protocol.stop()
+            finally:
+                # Runs even if cleanup fails: a missed call_finished() would
+                # pause pre-generation for good
+                if self._llm is not None:
+                    self._llm.cancel_requests(call_id)
+                if ready_queue is not None:
+                    ready_queue.call_finished()
+                logger.info(f"Call completed: {call_id}")
+
+    def _call_ended(self, session) -> None:
+        """The caller hung up (or the connection dropped): stop work for the call.
+
+        The conversation loop may be waiting on the LLM; cancelling the
+        call's requests frees their server slots for other callers now,
+        not when generation finishes.
+        """
+        session.is_active = False
+        if self._llm is not None:
+            self._llm.cancel_requests(session.call_id)
 
     async def _run_conversation(self, session, state_machine) -> None:
         """Run the main conversation loop for a call."""
@@ -204,6 +230,10 @@ class PayphoneApplication:
         # Initialize services
         await self.initialize_services()
 
+        # Pre-generate first replies (Dial-A-Joke) while no calls are active
+        if self._pipeline.ready_queue is not None:
+            self._pipeline.ready_queue.start()
+
         # Set up connection handler
         self.server.set_handler(self.handle_call)
 
@@ -218,6 +248,8 @@ class PayphoneApplication:
         """Stop the application."""
         logger.info("Shutting down AI Payphone application...")
         await self.server.stop()
+        if self._pipeline is not None and self._pipeline.ready_queue is not None:
+            await self._pipeline.ready_queue.stop()
 
         # Clean up services
         if self._vad is not None:
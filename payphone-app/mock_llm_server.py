@@ -0,0 +1,457 @@
+#!/usr/bin/env python3
+"""Mock LLM server streaming scripted replies at configurable rates.
+
+For latency tests of the voice pipeline without a model: it serves both
+APIs the app speaks, so either backend can point at it.
+
+Usage:
+    python mock_llm_server.py
+
+    # 5 tokens/s generation, 50 tokens/s prompt eval, two cache slots
+    MOCK_LLM_TPS=5 MOCK_LLM_PROMPT_TPS=50 MOCK_LLM_SLOTS=2 python mock_llm_server.py
+
+    # Point the app at it
+    LLM_BACKEND=openai LLM_HOST=http://127.0.0.1:8081 python main.py
+    LLM_BACKEND=ollama LLM_HOST=http://127.0.0.1:8081 python main.py
+
+Replies come from MOCK_LLM_SCRIPT (a text file, one reply per line) in
+turn, or from a built-in list. Timing follows a real server:
+
+- Prompt eval takes MOCK_LLM_TTFT_MS plus the uncached prompt tokens at
+  MOCK_LLM_PROMPT_TPS (0 = instant). Each of MOCK_LLM_SLOTS slots keeps
+  the last prompt it evaluated; a request takes the slot with the longest
+  matching prefix and only evaluates the rest, like llama.cpp's slots and
+  OLLAMA_NUM_PARALLEL. Requests beyond the slot count queue.
+- Reply tokens (words and punctuation) stream at MOCK_LLM_TPS.
+- A client disconnecting cancels its generation at once, freeing the slot.
+- Token counts are reported as each API does: prompt_eval_count and
+  load_duration (Ollama), usage with cached_tokens and llama.cpp-style
+  timings (OpenAI-compatible).
+
+The server exposes:
+    POST /v1/chat/completions - OpenAI-compatible chat (SSE when streaming)
+    GET  /v1/models           - The mock model
+    GET  /health              - 200 when "loaded", 503 after unload()
+    POST /api/chat            - Ollama chat (NDJSON when streaming)
+    GET  /api/tags, /api/ps   - Ollama model lists
+
+Standard library only; HTTP/1.1 with one request per connection.
+"""
+
+import asyncio
+import itertools
+import json
+import logging
+import os
+import re
+import time
+from collections.abc import AsyncIterator, Awaitable
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+
+logger = logging.getLogger("mock_llm_server")
+
+HOST = os.environ.get("MOCK_LLM_HOST", "127.0.0.1")
+PORT = int(os.environ.get("MOCK_LLM_PORT", "8081"))
+
+DEFAULT_REPLIES = [
+    "Hello there, caller! How can I help you today?",
+    "Sure thing. Let me connect you to the joke line, "
+    "just dial five five five, five six five three.",
+    "Why did the phone wear glasses? It lost its contacts!",
+]
+
+# Prompt tokens (for prefix matching) and reply tokens (with leading space)
+_PROMPT_PIECE = re.compile(r"\w+|[^\w\s]")
+_REPLY_PIECE = re.compile(r"\s*(?:\w+|[^\w\s])")
+
+
+@dataclass
+class _Completion:
+    """Timing and counts of one mock generation."""
+
+    prompt_tokens: int
+    cached_tokens: int
+    load_seconds: float = 0.0
+    generated: int = 0
+    prompt_seconds: float = 0.0
+    finish_reason: str = "stop"
+
+    @property
+    def prompt_eval_count(self) -> int:
+        return self.prompt_tokens - self.cached_tokens
+
+
+class MockLLMServer:
+    """Scripted OpenAI-compatible and Ollama chat server."""
+
+    def __init__(
+        self,
+        replies: list[str] | None = None,
+        tokens_per_second: float = 20.0,
+        prompt_tokens_per_second: float = 0.0,
+        first_token_ms: float = 0.0,
+        slots: int = 1,
+        load_ms: float = 0.0,
+        model: str = "mock",
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ):
+        """Initialize the server.
+
+        Args:
+            replies: Replies served in turn (default: DEFAULT_REPLIES).
+            tokens_per_second: Reply streaming rate.
+            prompt_tokens_per_second: Prompt eval rate for uncached tokens
+                (0 = instant).
+            first_token_ms: Fixed latency before the first token.
+            slots: Prompt cache slots (and concurrent generations).
+            load_ms: Model load time paid by the first request after
+                unload().
+            model: Model name served.
+            host: Bind address.
+            port: Bind port (0 = any free port, see .port).
+        """
+        self._replies = itertools.cycle(replies or DEFAULT_REPLIES)
+        self.tokens_per_second = tokens_per_second
+        self.prompt_tokens_per_second = prompt_tokens_per_second
+        self.first_token_ms = first_token_ms
+        self.load_ms = load_ms
+        self.model = model
+        self._host = host
+        self._port = port
+        self._slots: list[list[str]] = [[] for _ in range(max(1, slots))]
+        self._slot_used = [0.0] * len(self._slots)
+        self._busy = asyncio.Semaphore(len(self._slots))
+        self._server: asyncio.AbstractServer | None = None
+        self.loaded = True
+        self.requests = 0
+        self.aborted = 0  # Generations cut short by the client disconnecting
+        self.generating = 0  # Slots currently generating
+
+    @property
+    def port(self) -> int:
+        """Bound port (after start())."""
+        if self._server is not None:
+            return self._server.sockets[0].getsockname()[1]
+        return self._port
+
+    @property
+    def url(self) -> str:
+        return f"http://{self._host}:{self.port}"
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(self._handle, self._host, self._port)
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    def unload(self) -> None:
+        """Simulate the model being unloaded: every slot is emptied."""
+        self.loaded = False
+        self._slots = [[] for _ in self._slots]
+
+    # ------------------------------------------------------------------
+    # Generation
+    # ------------------------------------------------------------------
+
+    def _claim_slot(self, prompt: list[str]) -> int:
+        """Take the slot sharing the longest prefix; return cached tokens."""
+        best, best_common = 0, -1
+        for index, cached in enumerate(self._slots):
+            common = 0
+            for a, b in zip(prompt, cached, strict=False):  # Common prefix
+                if a != b:
+                    break
+                common += 1
+            better = common > best_common or (
+                common == best_common and self._slot_used[index] < self._slot_used[best]
+            )
+            if better:
+                best, best_common = index, common
+        self._slots[best] = prompt
+        self._slot_used[best] = time.monotonic()
+        return best_common
+
+    async def _generate(
+        self, messages: list[dict], max_tokens: int | None, completion: list
+    ) -> AsyncIterator[str]:
+        """Yield reply tokens with realistic timing; completion[0] gets stats."""
+        prompt = [  # ChatML-style template: four tokens around each message
+            piece
+            for m in messages
+            for piece in (
+                "<|im_start|>",
+                m.get("role"),
+                "\n",
+                *_PROMPT_PIECE.findall(str(m.get("content", ""))),
+                "<|im_end|>",
+            )
+        ]
+        reply = _REPLY_PIECE.findall(next(self._replies))
+        async with self._busy:
+            self.requests += 1
+            self.generating += 1
+            try:
+                stats = _Completion(prompt_tokens=len(prompt), cached_tokens=0)
+                if not self.loaded:
+                    stats.load_seconds = self.load_ms / 1000
+                    await asyncio.sleep(stats.load_seconds)
+                    self.loaded = True
+                stats.cached_tokens = self._claim_slot(prompt)
+                completion.append(stats)
+
+                delay = self.first_token_ms / 1000
+                if self.prompt_tokens_per_second > 0:
+                    delay += stats.prompt_eval_count / self.prompt_tokens_per_second
+                await asyncio.sleep(delay)
+                stats.prompt_seconds = delay
+
+                if max_tokens is not None and len(reply) > max_tokens:
+                    reply = reply[:max_tokens]
+                    stats.finish_reason = "length"
+                interval = 1 / self.tokens_per_second if self.tokens_per_second > 0 else 0.0
+                try:
+                    for index, token in enumerate(reply):
+                        if index:
+                            await asyncio.sleep(interval)
+                        stats.generated += 1
+                        yield token
+                finally:
+                    if stats.generated < len(reply):
+                        self.aborted += 1  # Client gone before the reply ended
+            finally:
+                self.generating -= 1  # The slot is free again
+
+    # ------------------------------------------------------------------
+    # HTTP
+    # ------------------------------------------------------------------
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            request_line = await reader.readline()
+            if not request_line:
+                return
+            method, target, _ = request_line.decode("latin-1").split(" ", 2)
+            headers = {}
+            while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+                name, _, value = line.decode("latin-1").partition(":")
+                headers[name.strip().lower()] = value.strip()
+            raw = await reader.readexactly(int(headers.get("content-length", "0")))
+            body = json.loads(raw) if raw else {}
+            await self._until_disconnect(
+                self._route(method, target.split("?")[0], body, writer), reader
+            )
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except Exception as e:
+            logger.exception(f"Mock request failed: {e}")
+        finally:
+            writer.close()
+
+    async def _until_disconnect(
+        self, handler: Awaitable[None], reader: asyncio.StreamReader
+    ) -> None:
+        """Run a request's handler, cancelling it if the client disconnects.
+
+        Like Ollama and llama.cpp, which stop generating as soon as the
+        client goes away rather than when the next token fails to send.
+        """
+        handling = asyncio.ensure_future(handler)
+        gone = asyncio.ensure_future(reader.read(1))  # b"" once the client closes
+        try:
+            await asyncio.wait((handling, gone), return_when=asyncio.FIRST_COMPLETED)
+            if not handling.done() and gone.result() == b"":
+                handling.cancel()
+            try:
+                await handling
+            except asyncio.CancelledError:
+                if not gone.done():
+                    raise  # We are being cancelled
+        finally:
+            gone.cancel()
+
+    async def _route(
+        self, method: str, path: str, body: dict, writer: asyncio.StreamWriter
+    ) -> None:
+        model_entry = {"name": self.model, "model": self.model}
+        if method == "GET" and path == "/health":
+            status = 200 if self.loaded else 503
+            await _send_json(writer, {"status": "ok" if self.loaded else "unloaded"}, status)
+        elif method == "GET" and path == "/v1/models":
+            models = [{"id": self.model, "object": "model"}]
+            await _send_json(writer, {"object": "list", "data": models})
+        elif method == "GET" and path == "/api/tags":
+            await _send_json(writer, {"models": [model_entry]})
+        elif method == "GET" and path == "/api/ps":
+            await _send_json(writer, {"models": [model_entry] if self.loaded else []})
+        elif method == "POST" and path == "/v1/chat/completions":
+            await self._openai_chat(body, writer)
+        elif method == "POST" and path == "/api/chat":
+            await self._ollama_chat(body, writer)
+        else:
+            await _send_json(writer, {"error": f"no route for {method} {path}"}, 404)
+
+    async def _openai_chat(self, body: dict, writer: asyncio.StreamWriter) -> None:
+        completion: list[_Completion] = []
+        max_tokens = body.get("max_tokens") or body.get("max_completion_tokens")
+        tokens = self._generate(body.get("messages", []), max_tokens, completion)
+        base = {"id": f"mock-{self.requests}", "created": int(time.time()), "model": self.model}
+
+        if not body.get("stream"):
+            text = "".join([token async for token in tokens])
+            stats = completion[0]
+            await _send_json(writer, {
+                **base,
+                "object": "chat.completion",
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": text},
+                    "finish_reason": stats.finish_reason,
+                }],
+                "usage": _openai_usage(stats),
+                "timings": _openai_timings(stats),
+            })
+            return
+
+        await _start_stream(writer, "text/event-stream")
+        chunk = {**base, "object": "chat.completion.chunk"}
+        try:
+            async for token in tokens:
+                choice = {"index": 0, "delta": {"content": token}, "finish_reason": None}
+                await _send_chunk(writer, _sse({**chunk, "choices": [choice]}))
+        finally:
+            await tokens.aclose()  # Client gone: stop generating
+        stats = completion[0]
+        final = {"index": 0, "delta": {}, "finish_reason": stats.finish_reason}
+        timings = _openai_timings(stats)
+        await _send_chunk(writer, _sse({**chunk, "choices": [final], "timings": timings}))
+        if (body.get("stream_options") or {}).get("include_usage"):
+            await _send_chunk(writer, _sse({**chunk, "choices": [], "usage": _openai_usage(stats)}))
+        await _send_chunk(writer, b"data: [DONE]\n\n")
+        await _end_stream(writer)
+
+    async def _ollama_chat(self, body: dict, writer: asyncio.StreamWriter) -> None:
+        completion: list[_Completion] = []
+        max_tokens = (body.get("options") or {}).get("num_predict")
+        tokens = self._generate(body.get("messages", []), max_tokens, completion)
+        start = time.perf_counter()
+
+        def part(content: str, done: bool) -> dict:
+            data = {
+                "model": self.model,
+                "created_at": datetime.now(timezone.utc).isoformat(),
+                "message": {"role": "assistant", "content": content},
+                "done": done,
+            }
+            if done:
+                stats = completion[0]
+                data.update({
+                    "done_reason": stats.finish_reason,
+                    "total_duration": int((time.perf_counter() - start) * 1e9),
+                    "load_duration": int(stats.load_seconds * 1e9),
+                    "prompt_eval_count": stats.prompt_eval_count,
+                    "prompt_eval_duration": int(stats.prompt_seconds * 1e9),
+                    "eval_count": stats.generated,
+                })
+            return data
+
+        if not body.get("stream", True):  # Ollama streams unless told not to
+            text = "".join([token async for token in tokens])
+            await _send_json(writer, part(text, done=True))
+            return
+
+        await _start_stream(writer, "application/x-ndjson")
+        try:
+            async for token in tokens:
+                await _send_chunk(writer, json.dumps(part(token, done=False)).encode() + b"\n")
+        finally:
+            await tokens.aclose()  # Client gone: stop generating
+        await _send_chunk(writer, json.dumps(part("", done=True)).encode() + b"\n")
+        await _end_stream(writer)
+
+
+def _openai_usage(stats: _Completion) -> dict:
+    return {
+        "prompt_tokens": stats.prompt_tokens,
+        "completion_tokens": stats.generated,
+        "total_tokens": stats.prompt_tokens + stats.generated,
+        "prompt_tokens_details": {"cached_tokens": stats.cached_tokens},
+    }
+
+
+def _openai_timings(stats: _Completion) -> dict:
+    """llama.cpp server's per-request timings."""
+    return {
+        "prompt_n": stats.prompt_eval_count,
+        "cache_n": stats.cached_tokens,
+        "prompt_ms": stats.prompt_seconds * 1000,
+        "predicted_n": stats.generated,
+    }
+
+
+def _sse(data: dict) -> bytes:
+    return f"data: {json.dumps(data)}\n\n".encode()
+
+
+_REASONS = {200: "OK", 404: "Not Found", 503: "Service Unavailable"}
+
+
+async def _send_json(writer: asyncio.StreamWriter, data: dict, status: int = 200) -> None:
+    payload = json.dumps(data).encode()
+    writer.write(
+        f"HTTP/1.1 {status} {_REASONS[status]}\r\n"
+        f"Content-Type: application/json\r\nContent-Length: {len(payload)}\r\n"
+        "Connection: close\r\n\r\n".encode() + payload
+    )
+    await writer.drain()
+
+
+async def _start_stream(writer: asyncio.StreamWriter, content_type: str) -> None:
+    writer.write(
+        f"HTTP/1.1 200 OK\r\nContent-Type: {content_type}\r\n"
+        "Transfer-Encoding: chunked\r\nConnection: close\r\n\r\n".encode()
+    )
+    await writer.drain()
+
+
+async def _send_chunk(writer: asyncio.StreamWriter, data: bytes) -> None:
+    writer.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+    await writer.drain()
+
+
+async def _end_stream(writer: asyncio.StreamWriter) -> None:
+    writer.write(b"0\r\n\r\n")
+    await writer.drain()
+
+
+async def _serve() -> None:
+    script = os.environ.get("MOCK_LLM_SCRIPT")
+    replies = None
+    if script:
+        replies = [line.strip() for line in Path(script).read_text().splitlines() if line.strip()]
+    server = MockLLMServer(
+        replies=replies,
+        tokens_per_second=float(os.environ.get("MOCK_LLM_TPS", "20")),
+        prompt_tokens_per_second=float(os.environ.get("MOCK_LLM_PROMPT_TPS", "0")),
+        first_token_ms=float(os.environ.get("MOCK_LLM_TTFT_MS", "0")),
+        slots=int(os.environ.get("MOCK_LLM_SLOTS", "1")),
+        model=os.environ.get("MOCK_LLM_MODEL", "mock"),
+        host=HOST,
+        port=PORT,
+    )
+    await server.start()
+    logger.info(f"Mock LLM server on {server.url} (model {server.model!r})")
+    await asyncio.Event().wait()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    try:
+        asyncio.run(_serve())
+    except KeyboardInterrupt:
+        pass
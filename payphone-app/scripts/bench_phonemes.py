@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""Measure the Kokoro front-end (G2P) time the phoneme cache saves.
+
+Phonemizes every sentence of the fixed phrases (operator prompts, phone
+directory greetings) with espeak directly, as Kokoro.create() does, and
+then through PhonemeCache: a cold pass (every sentence is new) followed by
+warm passes. Only the text -> phoneme step is timed; the ONNX model is not
+loaded, so no model files are needed, just kokoro-onnx and espeak-ng.
+
+Warm passes over the same phrases are the best case. --shuffle recombines
+words from the corpus into new sentences, which is closer to LLM replies:
+known vocabulary, unseen sentences.
+
+Usage:
+    cd payphone-app
+    python3 scripts/bench_phonemes.py
+    python3 scripts/bench_phonemes.py --passes 5 --shuffle
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import re
+import statistics
+import sys
+import time
+from pathlib import Path
+
+APP_ROOT = Path(__file__).resolve().parent.parent
+if str(APP_ROOT) not in sys.path:
+    sys.path.insert(0, str(APP_ROOT))
+
+from config.phone_directory import PHONE_DIRECTORY  # noqa: E402
+from core.state_machine import (  # noqa: E402
+    GOODBYE_MESSAGE,
+    MENU_RETURN_PROMPT,
+    OPERATOR_GREETING,
+    TIMEOUT_PROMPT,
+)
+from services.phonemes import PhonemeCache  # noqa: E402
+
+_SENTENCE = re.compile(r"(?<=[.!?])\s+")
+
+
+def collect_sentences() -> list[str]:
+    """Sentences of the fixed phrases, in a stable order."""
+    phrases = [OPERATOR_GREETING, MENU_RETURN_PROMPT, TIMEOUT_PROMPT, GOODBYE_MESSAGE]
+    phrases += [entry["greeting"] for entry in PHONE_DIRECTORY.values()]
+    sentences = []
+    for phrase in phrases:
+        sentences += [s for s in _SENTENCE.split(phrase.strip()) if s]
+    return list(dict.fromkeys(sentences))
+
+
+def shuffled_sentences(sentences: list[str], count: int, seed: int = 0) -> list[str]:
+    """New sentences built from the corpus vocabulary."""
+    rng = random.Random(seed)
+    words = [w for s in sentences for w in re.findall(r"[A-Za-z']+", s)]
+    return [
+        " ".join(rng.choice(words) for _ in range(rng.randint(5, 14))).capitalize() + "."
+        for _ in range(count)
+    ]
+
+
+def time_each(fn, sentences: list[str]) -> list[float]:
+    """Per-sentence wall time of fn, in milliseconds."""
+    times = []
+    for sentence in sentences:
+        start = time.perf_counter()
+        fn(sentence)
+        times.append((time.perf_counter() - start) * 1000)
+    return times
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--passes", type=int, default=3, help="Warm passes (default 3)")
+    parser.add_argument("--lang", default="en-us", help="espeak language (default en-us)")
+    parser.add_argument(
+        "--shuffle", action="store_true", help="Warm passes use recombined sentences"
+    )
+    args = parser.parse_args()
+
+    try:
+        from kokoro_onnx.tokenizer import Tokenizer
+    except ImportError:
+        print("kokoro-onnx is not installed: pip install kokoro-onnx", file=sys.stderr)
+        return 1
+
+    tokenizer = Tokenizer()
+
+    def g2p(text: str) -> str:
+        return tokenizer.phonemize(text, args.lang)
+
+    sentences = collect_sentences()
+    g2p(sentences[0])  # Load espeak before timing
+
+    cache = PhonemeCache(g2p)
+    direct = time_each(g2p, sentences)
+    cold = time_each(cache.phonemize, sentences)
+
+    warm_direct: list[float] = []
+    warm: list[float] = []
+    for index in range(args.passes):
+        batch = sentences
+        if args.shuffle:
+            batch = shuffled_sentences(sentences, len(sentences), seed=index)
+        warm_direct += time_each(g2p, batch)
+        warm += time_each(cache.phonemize, batch)
+
+    def row(label: str, times: list[float]) -> str:
+        return (
+            f"  {label:<22} mean {statistics.mean(times):7.3f} ms   "
+            f"median {statistics.median(times):7.3f} ms"
+        )
+
+    shuffled = " (shuffled)" if args.shuffle else ""
+    print(f"{len(sentences)} sentences, {args.passes} warm pass(es){shuffled}")
+    print(row("espeak (cold corpus)", direct))
+    print(row("cache, cold", cold))
+    print(row("espeak (warm corpus)", warm_direct))
+    print(row("cache, warm", warm))
+
+    saved = statistics.mean(warm_direct) - statistics.mean(warm)
+    print(f"  Front-end time saved:  {saved:.3f} ms per sentence")
+    print(f"  Cache: {cache.stats()}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
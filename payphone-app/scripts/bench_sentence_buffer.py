@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""Compare SentenceBuffer's splitting and speed on recorded token streams.
+
+Feeds each stream in tests/data/token_streams.jsonl through the current
+SentenceBuffer (with the TTS settings' delimiters and limits) and through
+the previous policy (a string buffer cut at any of ".!?," with no length
+limit), then reports per policy:
+
+- time per token spent in add_token()
+- characters and tokens until the first piece (the caller waits on it)
+- piece count, mean length, and fragments under 20 characters, which
+  Kokoro phrases poorly
+
+--record captures a new stream from the configured LLM server (settings
+from .env, as the app uses them) and appends it to the streams file, so
+the fixtures can follow a model change.
+
+Usage:
+    cd payphone-app
+    python3 scripts/bench_sentence_buffer.py
+    python3 scripts/bench_sentence_buffer.py --passes 200
+    python3 scripts/bench_sentence_buffer.py --record "Tell me a joke" --label feature:jokes
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import re
+import statistics
+import sys
+import time
+from pathlib import Path
+
+APP_ROOT = Path(__file__).resolve().parent.parent
+if str(APP_ROOT) not in sys.path:
+    sys.path.insert(0, str(APP_ROOT))
+
+from services.llm import SentenceBuffer  # noqa: E402
+
+STREAMS = APP_ROOT / "tests" / "data" / "token_streams.jsonl"
+FRAGMENT = 20  # Pieces shorter than this are fragments
+
+
+class LegacySentenceBuffer:
+    """The previous SentenceBuffer: cut at the first delimiter past min_length."""
+
+    def __init__(self, min_length: int = 10, delimiters: str = ".!?,"):
+        self.min_length = min_length
+        self._pattern = re.compile(f"[{re.escape(delimiters)}]")
+        self._buffer = ""
+
+    def add_token(self, token: str) -> str | None:
+        search_from = max(0, len(self._buffer) - 1)
+        self._buffer += token
+        match = self._pattern.search(self._buffer, search_from)
+        if match and match.end() >= self.min_length:
+            sentence = self._buffer[: match.end()].strip()
+            remainder = self._buffer[match.end():].lstrip()
+            if len(sentence) >= self.min_length:
+                self._buffer = remainder
+                return sentence
+            self._buffer = sentence + " " + remainder if remainder else sentence
+        return None
+
+    def flush(self) -> str | None:
+        text = self._buffer.strip()
+        self._buffer = ""
+        return text or None
+
+
+def load_streams(path: Path) -> list[dict]:
+    """Streams as {"label", "tokens"} dicts."""
+    return [json.loads(line) for line in path.read_text().splitlines() if line.strip()]
+
+
+def run(make_buffer, tokens: list[str]) -> tuple[list[str], int]:
+    """Pieces of one stream, and the token index the first piece came at."""
+    buffer = make_buffer()
+    pieces, first_token = [], len(tokens)
+    for index, token in enumerate(tokens):
+        piece = buffer.add_token(token)
+        if piece:
+            if not pieces:
+                first_token = index + 1
+            pieces.append(piece)
+    while tail := buffer.flush():
+        pieces.append(tail)
+    return pieces, first_token
+
+
+def time_per_token(make_buffer, streams: list[dict], passes: int) -> float:
+    """Mean add_token() time in microseconds."""
+    tokens = sum(len(stream["tokens"]) for stream in streams) * passes
+    start = time.perf_counter()
+    for _ in range(passes):
+        for stream in streams:
+            buffer = make_buffer()
+            for token in stream["tokens"]:
+                buffer.add_token(token)
+            while buffer.flush():
+                pass
+    return (time.perf_counter() - start) / tokens * 1e6
+
+
+def report(name: str, make_buffer, streams: list[dict], passes: int, verbose: bool) -> None:
+    first_chars, first_tokens, lengths = [], [], []
+    for stream in streams:
+        pieces, first_token = run(make_buffer, stream["tokens"])
+        first_chars.append(len(pieces[0]) if pieces else 0)
+        first_tokens.append(first_token)
+        lengths += [len(piece) for piece in pieces]
+        if verbose:
+            print(f"  [{stream['label']}]")
+            for piece in pieces:
+                print(f"    {piece!r}")
+    fragments = sum(1 for length in lengths if length < FRAGMENT)
+    print(f"{name}")
+    print(f"  add_token:         {time_per_token(make_buffer, streams, passes):7.2f} us/token")
+    print(
+        f"  First piece:       {statistics.mean(first_chars):7.1f} chars, "
+        f"token {statistics.mean(first_tokens):.1f} (mean)"
+    )
+    print(f"  Pieces:            {len(lengths):7d}, mean {statistics.mean(lengths):.1f} chars")
+    print(f"  Fragments (<{FRAGMENT}):  {fragments:7d} ({fragments / len(lengths):.0%})\n")
+
+
+async def record(prompt: str) -> list[str]:
+    """Stream a reply to prompt from the configured LLM server."""
+    from config.prompts import BASE_SYSTEM_PROMPT
+    from config.settings import get_settings
+    from services.llm import create_backend
+
+    settings = get_settings().llm
+    backend = create_backend(settings)
+    await backend.connect()
+    messages = [
+        {"role": "system", "content": BASE_SYSTEM_PROMPT},
+        {"role": "user", "content": prompt},
+    ]
+    tokens = []
+    try:
+        async for chunk in backend.stream(messages, settings.max_tokens):
+            if chunk.content:
+                tokens.append(chunk.content)
+    finally:
+        await backend.close()
+    return tokens
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--streams", type=Path, default=STREAMS, help="Token streams (JSONL)")
+    parser.add_argument("--passes", type=int, default=100, help="Timing passes (default 100)")
+    parser.add_argument("--verbose", action="store_true", help="Print every piece")
+    parser.add_argument("--record", metavar="PROMPT", help="Record a stream and append it")
+    parser.add_argument("--label", default="recorded", help="Label for --record")
+    args = parser.parse_args()
+
+    if args.record:
+        tokens = asyncio.run(record(args.record))
+        with args.streams.open("a") as f:
+            f.write(json.dumps({"label": args.label, "tokens": tokens}) + "\n")
+        print(f"Appended {len(tokens)} tokens to {args.streams}: {''.join(tokens)!r}")
+        return 0
+
+    from config.settings import TTSSettings
+
+    tts = TTSSettings()
+    streams = load_streams(args.streams)
+    total = sum(len(stream["tokens"]) for stream in streams)
+    print(f"{len(streams)} streams, {total} tokens, {args.passes} timing pass(es)\n")
+
+    report(
+        "Previous (cut at .!?, anywhere)",
+        LegacySentenceBuffer,
+        streams,
+        args.passes,
+        args.verbose,
+    )
+    report(
+        f"SentenceBuffer (clauses first, max {tts.max_sentence_length} chars)",
+        lambda: SentenceBuffer(
+            min_length=tts.min_sentence_length,
+            delimiters=tts.sentence_delimiters,
+            clause_delimiters=tts.clause_delimiters,
+            max_length=tts.max_sentence_length,
+        ),
+        streams,
+        args.passes,
+        args.verbose,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""Pre-render every greeting and fixed phrase into the TTS phrase cache.
+
+Walks the phone directory greetings, the birthday greeting, the state
+machine's fixed phrases (operator greeting, not-in-service, timeout prompt,
+menu return, goodbye) and every registered feature's get_greeting(). Each
+phrase is synthesized with the voice get_voice_for_feature() would pick at
+runtime, resampled and telephone-filtered, and stored in the same
+content-addressed cache VoicePipeline reads. After a run, first-contact
+audio needs no TTS work at all.
+
+Phrases whose voice depends on where the caller is when they're spoken
+(goodbye, timeout, not-in-service) are rendered in every mapped voice.
+
+Rendering runs in a process pool; each worker loads its own Kokoro model.
+Phrases already in the cache are skipped unless --force is given.
+
+Usage:
+    cd payphone-app
+    python3 scripts/prerender_phrases.py                # 2 workers
+    python3 scripts/prerender_phrases.py --workers 4
+    python3 scripts/prerender_phrases.py --dry-run      # list phrases only
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+APP_ROOT = Path(__file__).resolve().parent.parent
+if str(APP_ROOT) not in sys.path:
+    sys.path.insert(0, str(APP_ROOT))
+
+from config.phone_directory import (  # noqa: E402
+    BIRTHDAY_GREETING,
+    DEFAULT_GREETING_NOT_IN_SERVICE,
+    PHONE_DIRECTORY,
+)
+from config.settings import get_settings  # noqa: E402
+from core.state_machine import (  # noqa: E402
+    GOODBYE_MESSAGE,
+    MENU_RETURN_PROMPT,
+    OPERATOR_GREETING,
+    TIMEOUT_PROMPT,
+)
+from features.registry import FeatureRegistry  # noqa: E402
+from services.tts import VOICE_MAP, get_voice_for_feature  # noqa: E402
+from services.tts_cache import create_phrase_cache  # noqa: E402
+
+
+def collect_phrases() -> list[tuple[str, str]]:
+    """Collect every (text, voice) pair spoken without the LLM.
+
+    Returns:
+        Deduplicated list of (text, voice) pairs in a stable order.
+    """
+    # Calls start on the operator; direct-dial personas without their own
+    # voice keep the operator's, exactly as Session.switch_persona() does
+    start_feature = "operator"
+    all_voices = sorted(set(VOICE_MAP.values()) | {get_voice_for_feature()})
+
+    phrases: list[tuple[str, str]] = []
+
+    # Operator greeting and menu return are always in the operator voice
+    operator_voice = get_voice_for_feature(feature="operator")
+    phrases.append((OPERATOR_GREETING, operator_voice))
+    phrases.append((MENU_RETURN_PROMPT, operator_voice))
+
+    # Phone directory greetings, in the voice the route switches to
+    for entry in PHONE_DIRECTORY.values():
+        if entry["type"] == "persona":
+            voice = get_voice_for_feature(feature=start_feature, persona=entry.get("persona_key"))
+        else:
+            voice = get_voice_for_feature(feature=entry["feature"])
+        phrases.append((entry["greeting"], voice))
+
+    phrases.append((BIRTHDAY_GREETING, get_voice_for_feature(feature="easter_birthday")))
+
+    # Feature module greetings (FeatureRegistry-based features)
+    FeatureRegistry.auto_discover()
+    for dial_code in sorted(FeatureRegistry.list_features()):
+        feature_class = FeatureRegistry.get(dial_code)
+        greeting = feature_class().get_greeting()
+        if greeting:
+            voice = get_voice_for_feature(feature=feature_class.system_prompt_key)
+            phrases.append((greeting, voice))
+
+    # Spoken in whatever voice the caller's current feature/persona uses
+    for text in (DEFAULT_GREETING_NOT_IN_SERVICE, TIMEOUT_PROMPT, GOODBYE_MESSAGE):
+        for voice in all_voices:
+            phrases.append((text, voice))
+
+    return list(dict.fromkeys(phrases))
+
+
+# Per-process state, set up once by _init_worker()
+_worker: dict = {}
+
+
+def _init_worker() -> None:
+    """Load the TTS model, audio processor and cache in a pool worker."""
+    from core.audio_processor import AudioProcessor
+    from services.tts import KokoroTTS
+
+    settings = get_settings()
+    # Parallelism comes from the process pool; one model per worker
+    tts = KokoroTTS(settings.tts.model_copy(update={"workers": 1}))
+    tts._load_model()
+    if tts._model is None:
+        raise RuntimeError("Kokoro model could not be loaded")
+
+    _worker["settings"] = settings
+    _worker["tts"] = tts
+    _worker["processor"] = AudioProcessor(settings.audio)
+    _worker["cache"] = create_phrase_cache(settings.tts, settings.audio)
+
+
+def _render(text: str, voice: str) -> tuple[float, int]:
+    """Render one phrase into the cache (runs in a pool worker).
+
+    Returns:
+        Tuple of (render seconds, PCM bytes written).
+    """
+    start = time.perf_counter()
+    settings = _worker["settings"]
+    tts = _worker["tts"]
+
+    audio = tts._synthesize_kokoro(text, voice, settings.tts.speed)
+    pcm = _worker["processor"].process_for_output(audio, from_rate=tts.sample_rate)
+    _worker["cache"].put(text, voice, settings.tts.speed, pcm)
+
+    return time.perf_counter() - start, len(pcm)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Pre-render greetings and fixed phrases into the TTS phrase cache"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=2,
+        help="Worker processes, each with its own model (default: 2)",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Re-render phrases that are already cached",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="List phrases and voices without rendering",
+    )
+    args = parser.parse_args()
+
+    settings = get_settings()
+    if settings.tts.mode == "remote":
+        print("TTS mode is remote; phrases are cached by the client at runtime.")
+        print("Pre-rendering needs local model files (TTS_MODE=local).")
+        sys.exit(1)
+
+    cache = create_phrase_cache(settings.tts, settings.audio)
+    if cache is None:
+        print("Phrase cache is disabled or the Kokoro model files were not found:")
+        print(f"  model:  {settings.tts.model_path}")
+        print(f"  voices: {settings.tts.voices_path}")
+        sys.exit(1)
+
+    phrases = collect_phrases()
+    speed = settings.tts.speed
+    todo = [
+        (text, voice)
+        for text, voice in phrases
+        if args.force or not cache.contains(text, voice, speed)
+    ]
+
+    print(f"Phrase cache: {cache.cache_dir}/")
+    print(f"{len(phrases)} phrases, {len(phrases) - len(todo)} already cached, "
+          f"{len(todo)} to render")
+
+    if args.dry_run:
+        for text, voice in todo:
+            print(f"  [{voice:<10s}] {text[:70]}")
+        return
+
+    if todo:
+        print(f"Rendering with {args.workers} worker(s)...")
+        print()
+
+    render_start = time.perf_counter()
+    cpu_seconds = 0.0
+    rendered_bytes = 0
+    failures = 0
+
+    if todo:
+        with ProcessPoolExecutor(max_workers=args.workers, initializer=_init_worker) as pool:
+            futures = {pool.submit(_render, text, voice): (text, voice) for text, voice in todo}
+            for done, future in enumerate(as_completed(futures), start=1):
+                text, voice = futures[future]
+                try:
+                    seconds, size = future.result()
+                except Exception as e:
+                    failures += 1
+                    print(f"  FAILED [{voice}] {text[:50]}: {e}")
+                    continue
+                cpu_seconds += seconds
+                rendered_bytes += size
+                print(f"  [{done:>3d}/{len(todo)}] {seconds:5.2f}s  [{voice:<10s}] {text[:50]}")
+
+    wall_seconds = time.perf_counter() - render_start
+    count, total_bytes = cache.disk_usage()
+    audio_seconds = total_bytes / (settings.audio.output_sample_rate * 2)
+
+    print()
+    print(f"Rendered {len(todo) - failures} phrases in {wall_seconds:.1f}s "
+          f"({cpu_seconds:.1f}s synthesis across workers, {rendered_bytes:,d} bytes)")
+    print(f"Cache: {count} entries, {total_bytes:,d} bytes ({audio_seconds:.0f}s of audio)")
+
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
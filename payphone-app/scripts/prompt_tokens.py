@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""Rank the system prompts in config/prompts.py by token count.
+
+Lists every distinct full system prompt a session can use (base rules +
+phone directory for the operator + feature/persona prompt), largest first,
+then the components they are built from. Prompt eval time scales with
+these counts whenever a prompt is not in Ollama's cache.
+
+Counts come from the model's tokenizer when --tokenizer is given (needs
+the `tokenizers` package), otherwise from the word-based estimator (no
+calibration here, so expect +-15%).
+
+Usage:
+    cd payphone-app
+    python3 scripts/prompt_tokens.py
+    python3 scripts/prompt_tokens.py --tokenizer HuggingFaceTB/SmolLM3-3B --top 10
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+APP_ROOT = Path(__file__).resolve().parent.parent
+if str(APP_ROOT) not in sys.path:
+    sys.path.insert(0, str(APP_ROOT))
+
+from config.prompts import (  # noqa: E402
+    BASE_SYSTEM_PROMPT,
+    FEATURE_PROMPTS,
+    PERSONA_PROMPTS,
+    PHONE_DIRECTORY_BLOCK,
+    system_prompt_variants,
+)
+from services.token_budget import MESSAGE_OVERHEAD, TokenCounter  # noqa: E402
+
+
+def components() -> dict[str, str]:
+    """Prompt building blocks, by label."""
+    parts = {"base": BASE_SYSTEM_PROMPT, "phone_directory": PHONE_DIRECTORY_BLOCK}
+    parts.update({f"feature:{name}": prompt for name, prompt in FEATURE_PROMPTS.items()})
+    parts.update({f"persona:{name}": prompt for name, prompt in PERSONA_PROMPTS.items()})
+    return parts
+
+
+def rank(counter: TokenCounter, prompts: dict[str, str]) -> list[tuple[int, str, str]]:
+    """(tokens, label, prompt) sorted largest first."""
+    return sorted(
+        ((counter.count(prompt), label, prompt) for label, prompt in prompts.items()),
+        key=lambda row: (-row[0], row[1]),
+    )
+
+
+def print_table(title: str, rows: list[tuple[int, str, str]], top: int, eval_rate: float) -> None:
+    print(title)
+    print(f"  {'tokens':>6}  {'chars':>6}  {'eval s':>6}  label")
+    for tokens, label, prompt in rows[:top]:
+        print(f"  {tokens:6d}  {len(prompt):6d}  {tokens / eval_rate:6.1f}  {label}")
+    total = sum(tokens for tokens, _, _ in rows)
+    print(f"  {len(rows)} prompts, mean {total / len(rows):.0f} tokens\n")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tokenizer", default="", help="tokenizer.json path or HF repo id")
+    parser.add_argument("--top", type=int, default=1000, help="Rows per table (default all)")
+    parser.add_argument(
+        "--eval-rate",
+        type=float,
+        default=25.0,
+        help="Prompt eval tokens/s on the LLM host, for the eval column (default 25, Pi 5)",
+    )
+    args = parser.parse_args()
+
+    counter = TokenCounter(args.tokenizer)
+    print(f"Token counts from: {counter.backend}\n")
+
+    # Full prompts as sent: one system message plus its template overhead
+    full = [
+        (tokens + MESSAGE_OVERHEAD, label, prompt)
+        for tokens, label, prompt in rank(counter, system_prompt_variants())
+    ]
+    print_table("Full system prompts", full, args.top, args.eval_rate)
+    print_table("Components", rank(counter, components()), args.top, args.eval_rate)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
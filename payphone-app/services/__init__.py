@@ -1,8 +1,25 @@
-"""AI services for the voice pipeline."""
+"""AI services for the voice pipeline.
 
-from services.vad import SileroVAD
-from services.stt import WhisperSTT
-from services.llm import OllamaClient
-from services.tts import KokoroTTS
+Service classes are imported lazily so that lightweight modules (e.g.
+services.tts_pool, used by the standalone tts_server.py) can be imported
+without pulling in every service's dependencies.
+"""
 
-__all__ = ["SileroVAD", "WhisperSTT", "OllamaClient", "KokoroTTS"]
+import importlib
+
+__all__ = ["SileroVAD", "WhisperSTT", "LLMClient", "OllamaClient", "KokoroTTS"]
+
+_LAZY_IMPORTS = {
+    "SileroVAD": "services.vad",
+    "WhisperSTT": "services.stt",
+    "LLMClient": "services.llm",
+    "OllamaClient": "services.llm",
+    "KokoroTTS": "services.tts",
+}
+
+
+def __getattr__(name: str):
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(module_name), name)
@@ -1,30 +1,63 @@
-"""Language Model service using Ollama.
+"""Language Model service using Ollama or an OpenAI-compatible server.
 
-Provides async interface to local LLMs via Ollama with streaming support
-for low-latency responses. Default: SmolLM3-3B for best instruction-following
-(IFEval 76.7). Fallback: Qwen3-4B-instruct for deeper reasoning.
+Provides async interface to local LLMs with streaming support for
+low-latency responses. The server API is an LLMBackend: Ollama (default)
+or OpenAI-compatible /v1/chat/completions (llama.cpp server, vLLM).
+Default: SmolLM3-3B for best instruction-following (IFEval 76.7).
+Fallback: Qwen3-4B-instruct for deeper reasoning.
 """
 
 __all__ = [
     "Message",
     "LLMResponse",
     "ConversationContext",
+    "ChatChunk",
+    "LLMBackend",
+    "OllamaBackend",
+    "OpenAIBackend",
+    "create_backend",
+    "LLMClient",
     "OllamaClient",
     "SentenceBuffer",
 ]
 
 import asyncio
+import json
 import logging
 import re
 import time
 from dataclasses import dataclass, field
-from typing import AsyncIterator
+from typing import AsyncIterator, Callable, Protocol
 
 from config.settings import LLMSettings
-from config.prompts import get_system_prompt
+from config.prompts import get_system_prompt, system_prompt_variants, turn_budget
+from services.llm_scheduler import (
+    PRIORITY_BACKGROUND,
+    PRIORITY_FIRST_TURN,
+    PRIORITY_NORMAL,
+    PRIORITY_SHORT,
+    LLMScheduler,
+    RequestCancelledError,
+    Ticket,
+)
+from services.prompt_warmup import RELOAD_SECONDS, PromptWarmer
+from services.response_cache import CachedReply, ResponseCache
+from services.token_budget import MESSAGE_OVERHEAD, TokenCounter, token_counter
 
 logger = logging.getLogger(__name__)
 
+# Sentence-final punctuation, where a stream may be stopped early
+_SENTENCE_ENDS = (".", "!", "?")
+
+# Words whose trailing period doesn't end a sentence (SentenceBuffer)
+_ABBREVIATIONS = frozenset(
+    {"mr", "mrs", "ms", "dr", "st", "jr", "sr", "mt", "vs", "prof", "e.g", "i.e"}
+)
+# Closing quotes and brackets, kept with the piece they close
+_CLOSERS = "\u201d\u2019)]"
+# Pairs a piece may leave open (not ‘’: ’ is also an apostrophe)
+_PAIRS = (("\u201c", "\u201d"), ("(", ")"), ("[", "]"))
+
 
 @dataclass
 class Message:
@@ -42,6 +75,9 @@ class LLMResponse:
     tokens_generated: int
     generation_time_ms: float
     model: str
+    prompt_eval_count: int = 0  # Prompt tokens evaluated (not served from cache)
+    queue_wait_ms: float = 0.0  # Time queued in the LLMScheduler before the server
+    cached_reply: CachedReply | None = None  # Set when served from the response cache
 
 
 @dataclass
@@ -50,10 +86,41 @@ class ConversationContext:
 
     Optimized to avoid unnecessary list copies during history trimming.
     System messages are preserved at the front of the list.
+
+    Ollama reuses the KV cache for the longest unchanged token prefix of
+    the prompt, so how history is trimmed decides how much is re-evaluated
+    on the next turn (history of H tokens, exchanges of ~E tokens):
+
+    - "sliding": drop the oldest exchange on every turn past max_history.
+      The first history message changes every turn, so every turn
+      re-evaluates all H tokens.
+    - "block" (default): once past max_history, drop trim_block exchanges
+      at once. One turn re-evaluates the remaining H - trim_block * E
+      tokens, then trim_block turns only evaluate their new messages.
+    - "summary": trim like "block", but fold the dropped exchanges into a
+      short rolling summary (extractive, no LLM call) shown ahead of the
+      first kept message. Same re-evaluation cadence as "block" plus the
+      summary's tokens, in exchange for remembering earlier topics.
+
+    max_history is a message count; token_budget (if set) also caps the
+    history's tokens, so a few long exchanges can't blow up prompt eval.
+    Trimming to the budget follows the same policy.
+
+    Each turn's prompt_eval_count (tokens Ollama actually evaluated) is
+    recorded in prompt_eval_counts, so policies can be compared on real
+    calls. Each turn's wait for a server slot is in queue_waits_ms.
     """
 
     messages: list[Message] = field(default_factory=list)
     max_history: int = 10  # Keep last N exchanges (user + assistant pairs)
+    history_policy: str = "block"  # "sliding", "block" or "summary"
+    trim_block: int = 5  # Exchanges dropped at once by "block" / "summary"
+    summary: str = ""  # Rolling summary of trimmed exchanges ("summary")
+    summary_max_chars: int = 300
+    prompt_eval_counts: list[int] = field(default_factory=list)
+    queue_waits_ms: list[float] = field(default_factory=list)
+    token_budget: int = 0  # History tokens kept (0 = count limit only)
+    token_counter: TokenCounter | None = None  # Default: shared estimator
     _non_system_count: int = field(default=0, repr=False)
 
     def add_user_message(self, content: str) -> None:
@@ -72,11 +139,12 @@ class ConversationContext:
         """Keep only the last max_history exchanges (excluding system).
 
         Optimized to only rebuild list when actually needed, and tracks
-        non-system count incrementally to avoid O(n) counting.
+        non-system count incrementally to avoid O(n) counting. With a
+        token_budget, history is then also trimmed to that many tokens.
         """
         max_non_system = self.max_history * 2  # pairs of user + assistant
 
-        if self._non_system_count <= max_non_system:
+        if self._non_system_count <= max_non_system and not self.token_budget:
             return  # No trimming needed
 
         # Find where non-system messages start
@@ -90,85 +158,556 @@ class ConversationContext:
             self._non_system_count = 0
             return
 
-        # Keep system messages + last N non-system messages
-        keep_count = max_non_system
-        trim_start = len(self.messages) - keep_count
-        if trim_start > system_end_idx:
-            self.messages = self.messages[:system_end_idx] + self.messages[trim_start:]
-            self._non_system_count = keep_count
+        if self._non_system_count > max_non_system:
+            if self.history_policy == "sliding":
+                # Keep system messages + last N non-system messages
+                keep_count = max_non_system
+            else:
+                # Drop a whole block so the kept prefix stays stable for
+                # the next trim_block turns
+                keep_count = max(1, max_non_system - 2 * self._block())
+            self._drop_history(system_end_idx, len(self.messages) - keep_count)
+
+        if self.token_budget:
+            self._trim_to_token_budget(system_end_idx)
+
+    def _block(self) -> int:
+        """Exchanges dropped at once by "block" / "summary"."""
+        return max(1, min(self.trim_block, self.max_history // 2))
+
+    def _trim_to_token_budget(self, system_end_idx: int) -> None:
+        """Drop the oldest history until it fits in token_budget.
+
+        "sliding" trims to just under the budget; "block" / "summary" trim
+        to the same low watermark as count trimming (budget scaled by
+        (max_history - trim_block) / max_history), so the kept prefix stays
+        stable for several turns.
+        """
+        counter = self.token_counter or token_counter()
+        history = self.messages[system_end_idx:]
+        costs = [counter.count(m.content) + MESSAGE_OVERHEAD for m in history]
+        total = sum(costs) + (counter.count(self.summary) if self.summary else 0)
+        if total <= self.token_budget:
+            return
+
+        target = self.token_budget
+        if self.history_policy != "sliding":
+            target = self.token_budget * (self.max_history - self._block()) // self.max_history
+        drop = 0
+        while drop < len(history) - 1 and total > target:
+            total -= costs[drop]
+            drop += 1
+        self._drop_history(system_end_idx, system_end_idx + drop)
+
+    def _drop_history(self, system_end_idx: int, trim_start: int) -> None:
+        """Drop history before trim_start (kept history starts on a user
+        message except with "sliding"), folding it into the summary."""
+        trim_start = max(system_end_idx, trim_start)
+        if self.history_policy != "sliding":
+            while trim_start < len(self.messages) - 1 and self.messages[trim_start].role != "user":
+                trim_start += 1
+        if trim_start <= system_end_idx:
+            return
+
+        if self.history_policy == "summary":
+            self._fold_into_summary(self.messages[system_end_idx:trim_start])
+        self.messages = self.messages[:system_end_idx] + self.messages[trim_start:]
+        self._non_system_count = len(self.messages) - system_end_idx
+
+    def _fold_into_summary(self, dropped: list[Message]) -> None:
+        """Append what the caller said in dropped messages to the summary."""
+        said = []
+        for message in dropped:
+            if message.role != "user":
+                continue
+            text = message.content.strip()
+            said.append(text if len(text) <= 60 else text[:57].rstrip() + "...")
+        if not said:
+            return
+        summary = "; ".join(filter(None, [self.summary, *said]))
+        if len(summary) > self.summary_max_chars:
+            # Oldest topics go first
+            summary = "..." + summary[-(self.summary_max_chars - 3):]
+        self.summary = summary
+
+    def record_prompt_eval(self, count: int) -> None:
+        """Record one turn's prompt_eval_count from Ollama."""
+        self.prompt_eval_counts.append(count)
+
+    def record_queue_wait(self, wait_ms: float) -> None:
+        """Record one turn's wait for an LLM server slot."""
+        self.queue_waits_ms.append(wait_ms)
 
     def get_messages_for_api(self) -> list[dict]:
-        """Get messages formatted for Ollama API."""
-        return [{"role": m.role, "content": m.content} for m in self.messages]
+        """Get messages formatted for Ollama API.
+
+        A rolling summary is prefixed to the first history message (not
+        added as a message of its own, which some chat templates reject),
+        so it changes only when a block is trimmed.
+        """
+        api_messages = [{"role": m.role, "content": m.content} for m in self.messages]
+        if self.summary:
+            prefix = f"(Earlier in this call the caller said: {self.summary})\n"
+            for message in api_messages:
+                if message["role"] == "user":
+                    message["content"] = prefix + message["content"]
+                    break
+        return api_messages
 
     def clear(self) -> None:
         """Clear conversation history (keeps system message if present)."""
         self.messages = [m for m in self.messages if m.role == "system"]
         self._non_system_count = 0
+        self.summary = ""
 
 
-class OllamaClient:
-    """Async client for Ollama LLM API with streaming support."""
+@dataclass
+class ChatChunk:
+    """A piece of a chat response, normalized across backends.
+
+    Streams yield content chunks and end with one done=True chunk that
+    carries the statistics; non-streaming chat returns a single done chunk.
+    """
 
-    def __init__(self, settings: LLMSettings | None = None):
+    content: str
+    done: bool = False
+    prompt_eval_count: int = 0  # Prompt tokens evaluated (not served from cache)
+    prompt_tokens: int = 0  # Whole prompt, cached or not (0 if not reported)
+    eval_count: int = 0  # Tokens generated
+    load_seconds: float = 0.0  # Model load time before this request
+
+
+class LLMBackend(Protocol):
+    """Protocol for LLM server APIs (Ollama, OpenAI-compatible)."""
+
+    async def connect(self) -> None: ...
+    async def close(self) -> None: ...
+    async def chat(self, messages: list[dict], max_tokens: int) -> ChatChunk: ...
+    def stream(self, messages: list[dict], max_tokens: int) -> AsyncIterator[ChatChunk]: ...
+    async def is_loaded(self) -> bool: ...
+
+
+class OllamaBackend:
+    """Ollama's native /api/chat via the ollama package."""
+
+    def __init__(self, settings: LLMSettings):
+        self.settings = settings
+        self._client = None
+
+    async def connect(self) -> None:
+        """Create the client and make sure the model is available."""
+        import ollama
+
+        logger.info(f"Connecting to Ollama at {self.settings.host}")
+        self._client = ollama.AsyncClient(host=self.settings.host)
+
+        # Verify model is available
+        models = await self._client.list()
+        model_names = [m.model for m in models.models]
+
+        # Check if our model (or variant) is available
+        model_base = self.settings.model.split(":")[0]
+        if not any(model_base in name for name in model_names):
+            logger.warning(
+                f"Model {self.settings.model} not found. "
+                f"Available: {model_names}. Attempting to pull..."
+            )
+            await self._client.pull(self.settings.model)
+
+    async def close(self) -> None:
+        self._client = None
+
+    def _options(self, max_tokens: int) -> dict:
+        return {
+            "temperature": self.settings.temperature,
+            "top_p": self.settings.top_p,
+            "num_predict": max_tokens,
+        }
+
+    async def chat(self, messages: list[dict], max_tokens: int) -> ChatChunk:
+        response = await self._client.chat(
+            model=self.settings.model,
+            messages=messages,
+            options=self._options(max_tokens),
+            keep_alive=self.settings.keep_alive,
+        )
+        return _ollama_chunk(response)
+
+    async def stream(self, messages: list[dict], max_tokens: int) -> AsyncIterator[ChatChunk]:
+        stream = await self._client.chat(
+            model=self.settings.model,
+            messages=messages,
+            stream=True,
+            options=self._options(max_tokens),
+            keep_alive=self.settings.keep_alive,
+        )
+        try:
+            async for part in stream:
+                yield _ollama_chunk(part)
+        finally:
+            # Closes the HTTP response when the caller stops early; Ollama
+            # then cancels the generation
+            await stream.aclose()
+
+    async def is_loaded(self) -> bool:
+        """Whether Ollama currently has our model in memory."""
+        running = await self._client.ps()
+        names = {self.settings.model, f"{self.settings.model}:latest"}
+        return any(m.model in names or m.name in names for m in running.models)
+
+
+def _ollama_chunk(part) -> ChatChunk:
+    """ChatChunk from an Ollama chat response (or stream part)."""
+    return ChatChunk(
+        content=part["message"]["content"],
+        done=bool(part.get("done", True)),
+        prompt_eval_count=part.get("prompt_eval_count") or 0,
+        eval_count=part.get("eval_count") or 0,
+        load_seconds=(part.get("load_duration") or 0) / 1e9,
+    )
+
+
+class OpenAIBackend:
+    """OpenAI-compatible /v1/chat/completions (llama.cpp server, vLLM).
+
+    Streams server-sent events over a pooled httpx connection. Prompt eval
+    is read from llama.cpp's timings (prompt_n), else from usage
+    (prompt_tokens minus cached_tokens, as vLLM reports it). With
+    settings.cache_prompt, llama.cpp reuses the matching slot's KV cache
+    for the prompt prefix; other servers ignore the field.
+    """
+
+    def __init__(self, settings: LLMSettings):
+        self.settings = settings
+        self._client = None
+
+    async def connect(self) -> None:
+        """Create the HTTP client and check the server lists models."""
+        import httpx
+
+        base_url = self.settings.host.rstrip("/").removesuffix("/v1") + "/v1"
+        logger.info(f"Connecting to OpenAI-compatible server at {base_url}")
+        headers = {}
+        if self.settings.api_key:
+            headers["Authorization"] = f"Bearer {self.settings.api_key}"
+        # No read timeout: the client applies first-token / inter-token
+        # timeouts itself, and cold prompt eval can take ~20s
+        self._client = httpx.AsyncClient(
+            base_url=base_url, headers=headers, timeout=httpx.Timeout(None, connect=5.0)
+        )
+
+        response = await self._client.get("/models")
+        response.raise_for_status()
+        model_ids = [m.get("id", "") for m in response.json().get("data", [])]
+        if self.settings.model not in model_ids:
+            # llama.cpp serves one model whatever name is requested
+            logger.info(f"Model {self.settings.model} not listed (serving {model_ids})")
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def _body(self, messages: list[dict], max_tokens: int, stream: bool) -> dict:
+        body = {
+            "model": self.settings.model,
+            "messages": messages,
+            "temperature": self.settings.temperature,
+            "top_p": self.settings.top_p,
+            "max_tokens": max_tokens,
+            "stream": stream,
+        }
+        if stream:
+            body["stream_options"] = {"include_usage": True}
+        if self.settings.cache_prompt:
+            body["cache_prompt"] = True
+        return body
+
+    async def chat(self, messages: list[dict], max_tokens: int) -> ChatChunk:
+        response = await self._client.post(
+            "/chat/completions", json=self._body(messages, max_tokens, stream=False)
+        )
+        response.raise_for_status()
+        data = response.json()
+        chunk = ChatChunk(content=data["choices"][0]["message"]["content"] or "", done=True)
+        _openai_stats(data, chunk)
+        return chunk
+
+    async def stream(self, messages: list[dict], max_tokens: int) -> AsyncIterator[ChatChunk]:
+        final = ChatChunk(content="", done=True)
+        async with self._client.stream(
+            "POST", "/chat/completions", json=self._body(messages, max_tokens, stream=True)
+        ) as response:
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                if not line.startswith("data:"):
+                    continue  # Blank separators and SSE comments
+                payload = line[5:].strip()
+                if payload == "[DONE]":
+                    break
+                data = json.loads(payload)
+                for choice in data.get("choices") or []:
+                    content = (choice.get("delta") or {}).get("content")
+                    if content:
+                        yield ChatChunk(content=content)
+                _openai_stats(data, final)
+        yield final
+
+    async def is_loaded(self) -> bool:
+        """Whether the server is up with its model loaded (GET /health)."""
+        try:
+            base = str(self._client.base_url).rstrip("/").removesuffix("/v1")
+            response = await self._client.get(f"{base}/health")
+            return response.status_code == 200
+        except Exception:
+            return False
+
+
+def _openai_stats(data: dict, chunk: ChatChunk) -> None:
+    """Copy token statistics from an OpenAI-style response into chunk."""
+    usage = data.get("usage") or {}
+    timings = data.get("timings") or {}
+    if usage:
+        chunk.prompt_tokens = usage.get("prompt_tokens") or 0
+        chunk.eval_count = usage.get("completion_tokens") or 0
+        cached = (usage.get("prompt_tokens_details") or {}).get("cached_tokens") or 0
+        chunk.prompt_eval_count = max(0, chunk.prompt_tokens - cached)
+    if "prompt_n" in timings:
+        # llama.cpp: tokens actually evaluated, excluding the cached prefix
+        chunk.prompt_eval_count = timings["prompt_n"]
+        chunk.eval_count = timings.get("predicted_n", chunk.eval_count)
+
+
+def create_backend(settings: LLMSettings) -> LLMBackend:
+    """Backend for settings.backend ("ollama" or "openai")."""
+    if settings.backend == "openai":
+        return OpenAIBackend(settings)
+    return OllamaBackend(settings)
+
+
+class LLMClient:
+    """Async LLM client with streaming support, over an LLMBackend.
+
+    The backend (settings.backend) speaks the server's API; this class owns
+    message building, timeouts, conversation context and prompt warmup.
+
+    With settings.warmup_enabled, a PromptWarmer keeps the most-used
+    feature and persona system prompts hot in the server's prompt cache
+    (Ollama's parallel slots, or llama.cpp's -np slots) and re-warms them
+    after the model reloads.
+
+    With settings.response_cache_enabled, replies to short requests on the
+    labels in settings.response_cache_labels are kept in a ResponseCache
+    and reused across callers (see generate()'s label).
+
+    Each turn's token cap and spoken-length target come from the prompt's
+    label (config/prompts.py TURN_BUDGETS, else settings.max_tokens and
+    settings.spoken_seconds_target). Streaming stops at the first sentence
+    end past the target and closes the stream, which cancels generation on
+    the server; generation_stats() totals the tokens saved.
+
+    Every server request goes through an LLMScheduler, which sends at most
+    settings.max_in_flight at once and admits the rest by priority: a
+    caller's first turn, then short turns, then other turns, then warmup
+    and pre-generation. Requests pass the call ID as owner, so
+    cancel_requests() can free a hung-up call's slot.
+    """
+
+    def __init__(self, settings: LLMSettings | None = None, backend: LLMBackend | None = None):
         if settings is None:
             settings = LLMSettings()
         self.settings = settings
 
-        self._client = None
+        self._backend = backend if backend is not None else create_backend(settings)
         self._initialized = False
+        self._warmer: PromptWarmer | None = None
+        self._tokens = token_counter(settings.tokenizer)
+        self.scheduler = LLMScheduler(settings.max_in_flight)
+
+        self.streams = 0
+        self.early_stops = 0
+        self.tokens_streamed = 0
+        self.tokens_saved = 0  # Upper bound: budget left when streams were stopped
+
+        self.reply_cache: ResponseCache | None = None
+        self._cache_labels: set[str] = set()
+        # Lines' opener prompts, cached even when normalized to nothing
+        self.opener_prompts: set[str] = set()
+        if settings.response_cache_enabled:
+            self.reply_cache = ResponseCache(
+                variants=settings.response_cache_variants,
+                ttl_seconds=settings.response_cache_ttl,
+                max_keys=settings.response_cache_max_keys,
+                max_audio_bytes=int(settings.response_cache_audio_mb * 1024 * 1024),
+            )
+            self._cache_labels = {
+                label.strip() for label in settings.response_cache_labels.split(",")
+            }
 
     async def initialize(self) -> None:
-        """Initialize the Ollama client and verify connection."""
+        """Connect to the LLM server and warm up the model."""
         if self._initialized:
             return
 
-        logger.info(f"Connecting to Ollama at {self.settings.host}")
-
         try:
-            import ollama
-
-            # Create async client
-            self._client = ollama.AsyncClient(host=self.settings.host)
-
-            # Verify model is available
-            models = await self._client.list()
-            model_names = [m.model for m in models.models]
+            await self._backend.connect()
 
-            # Check if our model (or variant) is available
-            model_base = self.settings.model.split(":")[0]
-            if not any(model_base in name for name in model_names):
-                logger.warning(
-                    f"Model {self.settings.model} not found. "
-                    f"Available: {model_names}. Attempting to pull..."
-                )
-                await self._client.pull(self.settings.model)
-
-            # Warm up the model with the operator system prompt so Ollama
-            # caches the prompt prefix. Without this, the first real call
-            # pays ~20-25s for cold prompt eval on Pi 5 CPU.
+            # Warm up the model with the most-used system prompt (the
+            # operator's until there is usage history) so the server caches
+            # the prompt prefix. Without this, the first real call pays
+            # ~20-25s for cold prompt eval on Pi 5 CPU.
             logger.info(f"Warming up model: {self.settings.model}")
-            warmup_messages = [
-                {"role": "system", "content": get_system_prompt()},
-                {"role": "user", "content": "Hello"},
-            ]
-            await self._client.chat(
-                model=self.settings.model,
-                messages=warmup_messages,
-                options={"num_predict": 1},
-                keep_alive=self.settings.keep_alive,
-            )
+            if self.settings.warmup_enabled:
+                self._warmer = PromptWarmer(
+                    system_prompt_variants(),
+                    self._warm_prompt,
+                    is_loaded=self._backend.is_loaded,
+                    slots=self.settings.warmup_slots,
+                    idle_seconds=self.settings.warmup_idle_seconds,
+                    poll_interval=self.settings.warmup_poll_interval,
+                    usage_path=self.settings.warmup_usage_path,
+                )
+                await self._warmer.warm_now(self._warmer.plan()[0])
+                # The rest of the hot set warms in the background when idle
+                self._warmer.start()
+            else:
+                await self._warm_prompt(get_system_prompt())
 
             self._initialized = True
-            logger.info("Ollama client initialized successfully")
+            logger.info("LLM client initialized successfully")
 
         except Exception as e:
-            logger.error(f"Failed to initialize Ollama client: {e}")
+            logger.error(f"Failed to initialize LLM client: {e}")
             raise
 
+    async def _warm_prompt(self, system_prompt: str) -> float:
+        """Evaluate a system prompt into the server's prompt cache.
+
+        Returns:
+            The response's model load time in seconds (large if the model
+            had to be loaded).
+        """
+        messages = [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": "Hello"},
+        ]
+        ticket = await self.scheduler.acquire(PRIORITY_BACKGROUND)
+        try:
+            response = await self._backend.chat(messages, max_tokens=1)
+        finally:
+            self.scheduler.release(ticket)
+        self._observe_prompt_eval(messages, response)
+        return response.load_seconds
+
+    def _observe_prompt_eval(self, messages: list[dict], response: ChatChunk) -> None:
+        """Log prompt eval against the prompt's size.
+
+        Calibrates the token estimator when the server reports the whole
+        prompt's size, or when the whole prompt was evaluated.
+        """
+        if response.prompt_tokens:
+            self._tokens.calibrate(messages, response.prompt_tokens)
+        elif response.load_seconds > RELOAD_SECONDS:
+            # Freshly loaded model: nothing was cached
+            self._tokens.calibrate(messages, response.prompt_eval_count)
+        prompt_tokens = self._tokens.count_messages(messages)
+        logger.debug(f"Prompt eval: {response.prompt_eval_count} of ~{prompt_tokens} tokens")
+
+    def warmup_stats(self) -> dict:
+        """Prompt warmup statistics (empty when warmup is disabled)."""
+        return self._warmer.stats() if self._warmer is not None else {}
+
+    def _reply_key(
+        self, prompt: str, label: str | None, context: ConversationContext | None
+    ) -> tuple | None:
+        """Response cache key for a request, or None if it isn't cached."""
+        if self.reply_cache is None or label not in self._cache_labels:
+            return None
+        last_reply = None
+        if context is not None and any(m.role != "system" for m in context.messages):
+            replies = [m.content for m in context.messages if m.role == "assistant"]
+            last_reply = replies[-1] if replies else ""
+        return self.reply_cache.key(
+            label, prompt, last_reply, opener=prompt in self.opener_prompts
+        )
+
+    def _serve_cached(
+        self, key: tuple | None, prompt: str, context: ConversationContext | None
+    ) -> CachedReply | None:
+        """Serve a cached reply under key, recording the exchange in context."""
+        if key is None:
+            return None
+        heard = [m.content for m in context.messages if m.role == "assistant"] if context else []
+        reply = self.reply_cache.get(key, avoid=heard)
+        if reply is not None and context:
+            context.add_user_message(prompt)
+            context.add_assistant_message(reply.text)
+        return reply
+
+    def lookup_reply(
+        self, prompt: str, label: str, context: ConversationContext | None = None
+    ) -> CachedReply | None:
+        """Serve a reply to prompt from the response cache, without generating.
+
+        On a hit the exchange is added to context as if it were generated.
+
+        Args:
+            prompt: User prompt/question.
+            label: Prompt label of the session ("feature:jokes", ...).
+            context: Optional conversation context.
+
+        Returns:
+            The cached reply (its audio may already be rendered), or None.
+        """
+        return self._serve_cached(self._reply_key(prompt, label, context), prompt, context)
+
+    def _budget(self, label: str | None) -> tuple[int, float]:
+        """(max_tokens, spoken seconds target) for a turn of the labelled prompt."""
+        return turn_budget(label, self.settings.max_tokens, self.settings.spoken_seconds_target)
+
+    def _priority(
+        self, context: ConversationContext | None, max_tokens: int, background: bool
+    ) -> int:
+        """Scheduler priority of a request."""
+        if background:
+            return PRIORITY_BACKGROUND
+        if context is not None and not any(m.role == "assistant" for m in context.messages):
+            return PRIORITY_FIRST_TURN
+        if max_tokens <= self.settings.short_turn_tokens:
+            return PRIORITY_SHORT
+        return PRIORITY_NORMAL
+
+    def cancel_requests(self, owner: str) -> int:
+        """Cancel a call's queued and in-flight requests (on hangup).
+
+        Returns:
+            Number of requests cancelled.
+        """
+        return self.scheduler.cancel(owner)
+
+    def scheduler_stats(self) -> dict:
+        """LLM request scheduler statistics (slots, queue, waits by priority)."""
+        return self.scheduler.stats()
+
+    def generation_stats(self) -> dict:
+        """Streaming turn statistics, including tokens saved by early stops."""
+        return {
+            "streams": self.streams,
+            "early_stops": self.early_stops,
+            "tokens_streamed": self.tokens_streamed,
+            "tokens_saved": self.tokens_saved,
+        }
+
+    def reply_cache_stats(self) -> dict:
+        """Response cache statistics (empty when the cache is disabled)."""
+        return self.reply_cache.stats() if self.reply_cache is not None else {}
+
     async def cleanup(self) -> None:
         """Clean up resources."""
-        self._client = None
+        if self._warmer is not None:
+            await self._warmer.stop()
+            self._warmer = None
+        await self._backend.close()
         self._initialized = False
 
     async def generate(
@@ -176,6 +715,9 @@ class OllamaClient:
         prompt: str,
         system_prompt: str | None = None,
         context: ConversationContext | None = None,
+        label: str | None = None,
+        background: bool = False,
+        owner: str | None = None,
     ) -> LLMResponse:
         """Generate a response from the LLM.
 
@@ -183,6 +725,13 @@ class OllamaClient:
             prompt: User prompt/question.
             system_prompt: Optional system prompt override.
             context: Optional conversation context for multi-turn.
+            label: Prompt label of the session ("feature:jokes"); selects
+                the turn's token budget, and serves and stores the reply in
+                the response cache if the label is cached.
+            background: Not on behalf of a caller (pre-generation): always
+                generates fresh, runs behind callers' requests, and the
+                system prompt is not counted as used for warmup ranking.
+            owner: Call ID, for cancel_requests().
 
         Returns:
             LLMResponse with generated text and metadata.
@@ -192,6 +741,17 @@ class OllamaClient:
 
         start_time = time.perf_counter()
 
+        cache_key = self._reply_key(prompt, label, context) if not background else None
+        cached = self._serve_cached(cache_key, prompt, context)
+        if cached is not None:
+            return LLMResponse(
+                text=cached.text,
+                tokens_generated=0,
+                generation_time_ms=(time.perf_counter() - start_time) * 1000,
+                model=self.settings.model,
+                cached_reply=cached,
+            )
+
         # Build messages
         messages = []
 
@@ -207,34 +767,52 @@ class OllamaClient:
         # Add current prompt
         messages.append({"role": "user", "content": prompt})
 
+        if self._warmer is not None:
+            self._warmer.request_started()
+        load_seconds = 0.0
+        ticket: Ticket | None = None
+
         try:
+            max_tokens, _ = self._budget(label)
+            ticket = await self.scheduler.acquire(
+                self._priority(context, max_tokens, background), owner
+            )
+            queue_wait_ms = ticket.wait_seconds * 1000
             response = await asyncio.wait_for(
-                self._client.chat(
-                    model=self.settings.model,
-                    messages=messages,
-                    options={
-                        "temperature": self.settings.temperature,
-                        "top_p": self.settings.top_p,
-                        "num_predict": self.settings.max_tokens,
-                    },
-                    keep_alive=self.settings.keep_alive,
-                ),
+                ticket.guard(self._backend.chat(messages, max_tokens)),
                 timeout=self.settings.timeout,
             )
 
             elapsed_ms = (time.perf_counter() - start_time) * 1000
-            text = response["message"]["content"]
+            text = response.content
+            load_seconds = response.load_seconds
+            self._observe_prompt_eval(messages, response)
 
             # Update context if provided
             if context:
+                context.record_prompt_eval(response.prompt_eval_count)
+                context.record_queue_wait(queue_wait_ms)
                 context.add_user_message(prompt)
                 context.add_assistant_message(text)
+            if cache_key is not None:
+                self.reply_cache.put(cache_key, text)
 
             return LLMResponse(
                 text=text,
-                tokens_generated=response.get("eval_count", 0),
+                tokens_generated=response.eval_count,
                 generation_time_ms=elapsed_ms,
                 model=self.settings.model,
+                prompt_eval_count=response.prompt_eval_count,
+                queue_wait_ms=queue_wait_ms,
+            )
+
+        except RequestCancelledError:
+            logger.debug("LLM request cancelled")
+            return LLMResponse(
+                text="",
+                tokens_generated=0,
+                generation_time_ms=(time.perf_counter() - start_time) * 1000,
+                model=self.settings.model,
             )
 
         except asyncio.TimeoutError:
@@ -246,18 +824,41 @@ class OllamaClient:
                 model=self.settings.model,
             )
 
+        finally:
+            if ticket is not None:
+                self.scheduler.release(ticket)
+            if self._warmer is not None:
+                self._warmer.request_finished(
+                    _system_content(messages), load_seconds, count_usage=not background
+                )
+
     async def generate_streaming(
         self,
         prompt: str,
         system_prompt: str | None = None,
         context: ConversationContext | None = None,
+        label: str | None = None,
+        owner: str | None = None,
     ) -> AsyncIterator[str]:
         """Generate a streaming response from the LLM.
 
+        The stream ends early at the first sentence end once the reply would
+        take the turn's spoken-seconds target to say.
+
         Args:
             prompt: User prompt/question.
             system_prompt: Optional system prompt override.
             context: Optional conversation context.
+            label: Prompt label of the session ("feature:jokes"); selects
+                the turn's budget, and stores the completed reply in the
+                response cache if the label is cached. Serving is up to the
+                caller (lookup_reply() first), which can then play the
+                reply's rendered audio.
+            owner: Call ID, for cancel_requests(). A cancelled stream ends
+                without an apology.
+
+        However the stream ends (including aclose() or cancellation), the
+        reply so far is added to context and the server stops generating.
 
         Yields:
             Token strings as they're generated.
@@ -278,6 +879,9 @@ class OllamaClient:
             messages.extend(context_msgs)
 
         messages.append({"role": "user", "content": prompt})
+        cache_key = self._reply_key(prompt, label, context)
+        max_tokens, spoken_target = self._budget(label)
+        priority = self._priority(context, max_tokens, False)
 
         # Add user message to context before streaming so it's preserved
         # even if the stream fails (timeout, connection error, etc.)
@@ -288,29 +892,25 @@ class OllamaClient:
         response_parts: list[str] = []
         last_token_time = time.perf_counter()
         is_first_token = True
-
+        finished = False
+        stopped_early = False
+
+        if self._warmer is not None:
+            self._warmer.request_started()
+        load_seconds = 0.0
+        ticket: Ticket | None = None
+        stream_iter = None
+
+        # Iterate with per-token timeouts. The `async for` pattern blocks
+        # indefinitely on __anext__(), so a slow first token (e.g. 20s
+        # prompt eval on Pi 5) would never hit the timeout check inside the
+        # loop body. Manual iteration with wait_for ensures we bail out
+        # promptly.
         try:
-            stream = await asyncio.wait_for(
-                self._client.chat(
-                    model=self.settings.model,
-                    messages=messages,
-                    stream=True,
-                    options={
-                        "temperature": self.settings.temperature,
-                        "top_p": self.settings.top_p,
-                        "num_predict": self.settings.max_tokens,
-                    },
-                    keep_alive=self.settings.keep_alive,
-                ),
-                timeout=self.settings.first_token_timeout,
-            )
-
-            # Iterate with per-token timeouts. The `async for` pattern
-            # blocks indefinitely on __anext__(), so a slow first token
-            # (e.g. 20s prompt eval on Pi 5) would never hit the timeout
-            # check inside the loop body. Manual iteration with wait_for
-            # ensures we bail out promptly.
-            stream_iter = stream.__aiter__()
+            ticket = await self.scheduler.acquire(priority, owner)
+            if context:
+                context.record_queue_wait(ticket.wait_seconds * 1000)
+            stream_iter = self._backend.stream(messages, max_tokens).__aiter__()
             while True:
                 token_timeout = (
                     self.settings.first_token_timeout if is_first_token
@@ -319,7 +919,7 @@ class OllamaClient:
 
                 try:
                     part = await asyncio.wait_for(
-                        stream_iter.__anext__(),
+                        ticket.guard(stream_iter.__anext__()),
                         timeout=token_timeout,
                     )
                 except StopAsyncIteration:
@@ -335,18 +935,37 @@ class OllamaClient:
 
                 last_token_time = time.perf_counter()
                 is_first_token = False
-                token = part["message"]["content"]
-                response_parts.append(token)
-                yield token
-
-            # Add assistant message only after successful completion
-            if context and response_parts:
-                context.add_assistant_message("".join(response_parts))
+                if part.done:
+                    finished = True
+                    load_seconds = part.load_seconds
+                    self._observe_prompt_eval(messages, part)
+                    if context:
+                        context.record_prompt_eval(part.prompt_eval_count)
+                if part.content:
+                    response_parts.append(part.content)
+                    yield part.content
+
+                    # Long enough for a phone turn: stop at this sentence end.
+                    # Closing the stream (finally) cancels it on the server.
+                    if (
+                        spoken_target
+                        and not part.done
+                        and part.content.rstrip().rstrip("\"')").endswith(_SENTENCE_ENDS)
+                        and self._spoken_seconds(response_parts) >= spoken_target
+                    ):
+                        finished = stopped_early = True
+                        break
+
+            if finished and cache_key is not None:
+                self.reply_cache.put(cache_key, "".join(response_parts))
 
         except asyncio.TimeoutError:
             logger.warning(f"LLM streaming timed out after {self.settings.timeout}s")
             yield "I'm sorry, I'm taking too long to respond."
 
+        except RequestCancelledError:
+            logger.debug("LLM stream cancelled")
+
         except asyncio.CancelledError:
             # Task was cancelled - re-raise to allow proper cleanup
             raise
@@ -356,7 +975,7 @@ class OllamaClient:
             yield "I'm sorry, I lost connection. Please try again."
 
         except (KeyError, TypeError, ValueError) as e:
-            # Malformed response from Ollama
+            # Malformed response from the server
             logger.error(f"Invalid response in streaming generation: {e}")
             yield "I'm sorry, I received an invalid response. Please try again."
 
@@ -365,6 +984,35 @@ class OllamaClient:
             logger.exception(f"Unexpected error in streaming generation: {e}")
             yield "I'm sorry, I encountered an error. Please try again."
 
+        finally:
+            # Also when cut short (barge-in, hangup, aclose()): the context
+            # keeps what was said so far
+            if context and response_parts:
+                context.add_assistant_message("".join(response_parts))
+            # Release the server connection of an abandoned stream, which
+            # makes the server stop generating
+            if stream_iter is not None:
+                await stream_iter.aclose()
+            if ticket is not None:
+                self.scheduler.release(ticket)
+            self._record_stream(len(response_parts), max_tokens, stopped_early)
+            if self._warmer is not None:
+                self._warmer.request_finished(_system_content(messages), load_seconds)
+
+    def _spoken_seconds(self, parts: list[str]) -> float:
+        """Estimated time to speak the text so far."""
+        return len("".join(parts).split()) / self.settings.speech_words_per_second
+
+    def _record_stream(self, tokens: int, max_tokens: int, stopped_early: bool) -> None:
+        """Count a streaming turn (one token per streamed chunk)."""
+        self.streams += 1
+        self.tokens_streamed += tokens
+        if stopped_early:
+            saved = max(0, max_tokens - tokens)
+            self.early_stops += 1
+            self.tokens_saved += saved
+            logger.info(f"Stopped generation early: {tokens} tokens, up to {saved} saved")
+
     async def generate_for_feature(
         self,
         prompt: str,
@@ -404,7 +1052,10 @@ class OllamaClient:
         return await self.generate(prompt, system_prompt, context)
 
     async def health_check(self) -> bool:
-        """Check if Ollama is reachable and model is loaded.
+        """Check if the LLM server is reachable and the model is loaded.
+
+        Asks the backend rather than generating, which would replace a
+        warmed prompt in one of the server's cache slots.
 
         Returns:
             True if healthy, False otherwise.
@@ -412,88 +1063,298 @@ class OllamaClient:
         try:
             if not self._initialized:
                 return False
-
-            # Quick generation test
-            response = await asyncio.wait_for(
-                self._client.generate(
-                    model=self.settings.model,
-                    prompt="Hi",
-                    options={"num_predict": 1},
-                ),
-                timeout=5.0,
-            )
-            return bool(response.get("response"))
+            return await asyncio.wait_for(self._backend.is_loaded(), timeout=5.0)
 
         except Exception as e:
             logger.error(f"Health check failed: {e}")
             return False
 
 
-class SentenceBuffer:
-    """Buffer for collecting LLM tokens into complete sentences for TTS.
+# Original name, kept for existing imports
+OllamaClient = LLMClient
+
+
+def _system_content(messages: list[dict]) -> str | None:
+    """System prompt of an API message list, if it has one."""
+    if messages and messages[0]["role"] == "system":
+        return messages[0]["content"]
+    return None
 
-    This enables streaming TTS by yielding complete sentences as they
-    form from the token stream.
 
-    Uses incremental search position tracking to achieve O(n) total complexity
-    instead of O(n²) from searching the entire buffer on each token.
+class SentenceBuffer:
+    """Collects LLM tokens into pieces of text for TTS.
+
+    The first piece of a reply is what the caller waits on in silence, so
+    it is emitted at the first clause break (clause_delimiters) or sentence
+    end once min_length characters are in. Later pieces end at sentence
+    ends (delimiters), which Kokoro phrases best. Text without one is
+    force-emitted once it reaches max_length characters, or has been
+    buffered for max_wait seconds (checked as tokens arrive), cut at the
+    last clause break, else the last space. No piece is longer than
+    max_length unless a single token is.
+
+    A delimiter right after a digit is held until the next character
+    shows it isn't inside a number ("3.5", "3:45", "10,000"); a period
+    after a title ("Dr.") or a lowercase initial ("e.g.") is no boundary.
+    Closing quotes and brackets stay with the piece they close, as do
+    repeated sentence ends ("?!", "..."). A piece that leaves a quote or
+    bracket open and ends exactly at the end of the buffered text is held
+    until the next token, so a closer arriving there still joins it.
+
+    Tokens are kept as a list of chunks and only each new token is scanned
+    for boundaries, so a token costs O(len(token)); the chunks are joined
+    once per emitted piece.
     """
 
     def __init__(
         self,
         min_length: int = 10,
-        delimiters: str = ".!?,",
+        delimiters: str = ".!?",
+        clause_delimiters: str = ",;:",
+        max_length: int = 200,
+        max_wait: float = 0.0,
+        clock: Callable[[], float] = time.monotonic,
     ):
+        """Initialize the buffer.
+
+        Args:
+            min_length: Shortest piece emitted at a boundary.
+            delimiters: Sentence-ending characters.
+            clause_delimiters: Clause breaks, where the first piece may end.
+            max_length: Characters buffered before a piece is forced out.
+            max_wait: Seconds a piece may buffer before it is forced out
+                (0 = no time limit).
+            clock: Time source (for tests).
+        """
         self.min_length = min_length
         self.delimiters = delimiters
-        # Pre-compile regex for efficient sentence boundary detection
-        escaped_delims = re.escape(delimiters)
-        self._sentence_pattern = re.compile(f"[{escaped_delims}]")
-        self._buffer = ""
+        self.clause_delimiters = clause_delimiters
+        self.max_length = max_length
+        self.max_wait = max_wait
+        self._clock = clock
+        marks = re.escape(delimiters + clause_delimiters)
+        self._marks = re.compile(f"[{marks}]" if marks else r"(?!)")
+        self._emitted = 0
+        self._open_quote = False  # Odd number of '"' emitted so far
+        self._pending: str | None = None  # Piece waiting for the next token
+        self._ready: list[str] = []  # Cut pieces not yet returned
+        self._reset()
+
+    def _reset(self) -> None:
+        self._chunks: list[str] = []
+        self._length = 0
+        self._last_char = ""
+        self._started = 0.0
+        # Buffer offsets just past a boundary (0 = none yet)
+        self._sentence_cut = 0  # First sentence end at or past min_length
+        self._clause_cut = 0  # First clause break at or past min_length
+        self._last_break = 0  # Last clause break or sentence end
+        self._last_space = 0  # Last whitespace
+        self._held: tuple[int, str] | None = None  # Delimiter after a digit, at the end
+
+    def _boundary(self, end: int, char: str) -> None:
+        if end <= self.max_length:
+            self._last_break = end
+        if end < self.min_length:
+            return
+        if char in self.delimiters:
+            if not self._sentence_cut:
+                self._sentence_cut = end
+        elif not self._clause_cut:
+            self._clause_cut = end
+
+    def _scan(self, text: str, base: int) -> None:
+        """Record the boundaries in text, which starts at buffer offset base."""
+        if base + len(text) <= self.max_length:
+            space = text.rfind(" ")
+        else:
+            # Only spaces within max_length are cut points
+            space = text.rfind(" ", 0, max(0, self.max_length - base + 1))
+        if space >= 0:
+            self._last_space = base + space
+        if self._marks.search(text) is None:  # Most tokens
+            self._last_char = text[-1]
+            return
+        for match in self._marks.finditer(text):
+            char = match.group()
+            end = base + match.end()
+            prev = text[match.start() - 1] if match.start() else self._last_char
+            if prev.isdigit():
+                if match.end() == len(text):
+                    self._held = (end, char)  # Decided by the next token
+                    continue
+                if text[match.end()].isdigit():
+                    continue  # Inside a number
+            if char == "." and self._abbreviation(text, match.start()):
+                continue
+            self._boundary(end, char)
+        self._last_char = text[-1]
+
+    def _abbreviation(self, text: str, dot: int) -> bool:
+        """Whether the period at text[dot] follows an abbreviation."""
+        space = text.rfind(" ", 0, dot)
+        word = text[space + 1:dot]
+        if space < 0 and text is self._chunks[-1]:
+            # The word started in earlier tokens
+            for chunk in reversed(self._chunks[-4:-1]):
+                space = chunk.rfind(" ")
+                word = chunk[space + 1:] + word
+                if space >= 0:
+                    break
+        if len(word) == 1:
+            return word.islower()
+        return word.lower() in _ABBREVIATIONS
 
     def add_token(self, token: str) -> str | None:
-        """Add a token and return a sentence if one is complete.
+        """Add a token and return a piece of text if one is ready.
+
+        A token that completes several pieces returns the first; the others
+        come from the following calls, or from flush().
 
         Args:
             token: Token string from LLM.
 
         Returns:
-            Complete sentence if available, None otherwise.
+            Text to speak, or None to keep buffering.
         """
-        # Track position before adding token - search from just before new content
-        # to catch delimiters at word boundaries
-        search_from = max(0, len(self._buffer) - 1)
-        self._buffer += token
+        if self._pending is not None:
+            if not token.strip():
+                return self._next()
+            piece, token = self._release(token)
+            self._ready.append(piece)
+        if not self._chunks:
+            # Closers of the last piece that arrived after it was emitted
+            token = token.lstrip()
+            if self._open_quote and token.startswith('"'):
+                self._open_quote = False
+                token = token[1:].lstrip()
+            token = token.lstrip(_CLOSERS + " ")
+            if token:
+                self._started = self._clock()
+        if not token:
+            return self._next()
+
+        if self._held is not None:
+            if not token[0].isdigit():
+                self._boundary(*self._held)
+            self._held = None
+
+        base = self._length
+        self._chunks.append(token)
+        self._length += len(token)
+        self._scan(token, base)
+
+        while self._chunks:
+            cut = self._sentence_cut
+            if not self._emitted and self._clause_cut:
+                cut = min(cut or self._clause_cut, self._clause_cut)
+            if not cut or cut > self.max_length:
+                if self._length >= self.max_length or (
+                    self.max_wait > 0 and self._overdue()
+                ):
+                    cut = self._forced_cut()
+                else:
+                    break
+            self._emit(cut)
+        return self._next()
 
-        # Search only from where new content was added (O(token_len) not O(buffer_len))
-        match = self._sentence_pattern.search(self._buffer, search_from)
-        if match and match.end() >= self.min_length:
-            # Extract sentence up to and including delimiter
-            sentence = self._buffer[: match.end()].strip()
-            remainder = self._buffer[match.end() :].lstrip()
+    def _next(self) -> str | None:
+        return self._ready.pop(0) if self._ready else None
 
-            if len(sentence) >= self.min_length:
-                self._buffer = remainder
-                return sentence
+    def _release(self, token: str) -> tuple[str, str]:
+        """Give the held piece the closers token starts with.
 
-            # Sentence too short after strip — prepend back to buffer
-            # so the text is preserved and becomes part of the next sentence
-            self._buffer = sentence + " " + remainder if remainder else sentence
+        Returns the piece and the rest of the token.
+        """
+        piece = self._pending
+        self._pending = None
+        token = token.lstrip()
+        room = self.max_length - len(piece)
+        end = 0
+        while end < len(token) and end < room:
+            char = token[end]
+            if char == '"':
+                if not self._open_quote:
+                    break
+                self._open_quote = False
+            elif char not in _CLOSERS and char not in self.delimiters:
+                break
+            end += 1
+        return piece + token[:end], token[end:]
+
+    def _overdue(self) -> bool:
+        return (
+            self._length >= self.min_length
+            and self._clock() - self._started >= self.max_wait
+        )
 
-        return None
+    def _forced_cut(self) -> int:
+        """Where to cut a piece with no sentence end."""
+        for cut in (self._last_break, self._last_space):
+            if cut >= self.min_length:
+                return cut
+        return min(self._length, self.max_length)
+
+    def _emit(self, cut: int) -> None:
+        """Cut the buffer at cut, queueing (or holding) the piece before it."""
+        text = "".join(self._chunks)
+        quotes = text.count('"', 0, cut) % 2 == 1
+        # Take closers and repeated sentence ends already buffered after the cut
+        end = min(len(text), self.max_length)
+        while cut < end and (
+            text[cut] in _CLOSERS
+            or text[cut] in self.delimiters
+            or (text[cut] == '"' and quotes != self._open_quote)
+        ):
+            quotes ^= text[cut] == '"'
+            cut += 1
+        self._open_quote ^= quotes
+        piece = text[:cut].strip()
+        rest = text[cut:].lstrip()
+        self._reset()
+        if rest:
+            # Rarely more than the tail of the last token
+            self._chunks.append(rest)
+            self._length = len(rest)
+            self._started = self._clock()
+            self._scan(rest, 0)
+        if not piece:
+            return
+        self._emitted += 1
+        if cut == len(text) and (
+            self._open_quote or any(piece.count(o) > piece.count(c) for o, c in _PAIRS)
+        ):
+            # Nothing follows yet: the next token may start with its closer
+            self._pending = piece
+        else:
+            self._ready.append(piece)
 
     def flush(self) -> str | None:
-        """Get any remaining text in the buffer.
+        """Get the next piece of the text left at the end of a reply.
+
+        Text longer than max_length is cut like any other, so call this
+        until it returns None.
 
         Returns:
             Remaining text or None if empty.
         """
-        if self._buffer.strip():
-            result = self._buffer.strip()
-            self._buffer = ""
-            return result
-        return None
+        if self._pending is not None:
+            # The buffer is empty while a piece is held
+            self._ready.append(self._pending)
+            self._pending = None
+        while self._length > self.max_length:
+            self._emit(self._forced_cut())
+        text = "".join(self._chunks).strip()
+        self._reset()
+        if text:
+            self._emitted += 1
+            self._ready.append(text)
+        return self._next()
 
     def clear(self) -> None:
-        """Clear the buffer."""
-        self._buffer = ""
+        """Clear the buffer (the next piece is a reply's first again)."""
+        self._reset()
+        self._emitted = 0
+        self._open_quote = False
+        self._pending = None
+        self._ready.clear()
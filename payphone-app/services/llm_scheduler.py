@@ -0,0 +1,244 @@
+"""Priority scheduler for LLM requests across calls.
+
+The LLM server runs a fixed number of generations at once (Ollama's
+OLLAMA_NUM_PARALLEL, llama.cpp's -np) and queues the rest internally in
+arrival order, so a caller waiting on a first reply can sit behind other
+calls' long stories. LLMScheduler keeps that queue on our side instead:
+at most max_in_flight requests reach the server, and waiting requests
+are admitted by priority, FIFO within a priority.
+
+Priorities, most urgent first:
+
+- PRIORITY_FIRST_TURN: the caller hasn't heard a reply yet.
+- PRIORITY_SHORT: turns with a small token budget (Time & Temp), which
+  free their slot quickly.
+- PRIORITY_NORMAL: everything else on behalf of a caller.
+- PRIORITY_BACKGROUND: prompt warmup and ready queue pre-generation.
+
+Requests carry an owner (the call ID). cancel(owner) drops the owner's
+queued requests and signals its running ones, which stop at their next
+await on the server (see Ticket.guard()), so a hung-up call frees its
+slot for the next caller. A request whose task is cancelled while queued
+leaves the queue the same way.
+
+Queue waits are recorded per priority and returned on each Ticket.
+"""
+
+__all__ = [
+    "PRIORITY_BACKGROUND",
+    "PRIORITY_FIRST_TURN",
+    "PRIORITY_NORMAL",
+    "PRIORITY_SHORT",
+    "LLMScheduler",
+    "RequestCancelledError",
+    "Ticket",
+]
+
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from typing import TypeVar
+
+from services.metrics import Histogram
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+PRIORITY_FIRST_TURN = 0  # Caller waiting on their first reply
+PRIORITY_SHORT = 1  # Small token budget: frees the slot quickly
+PRIORITY_NORMAL = 2
+PRIORITY_BACKGROUND = 3  # Warmup and pre-generation: no caller waiting
+
+
+class RequestCancelledError(Exception):
+    """The request was cancelled by LLMScheduler.cancel()."""
+
+
+@dataclass(eq=False)
+class Ticket:
+    """One request's place in the scheduler."""
+
+    priority: int
+    owner: str | None
+    queued_at: float
+    started_at: float | None = None
+    _cancel: asyncio.Event = field(default_factory=asyncio.Event, repr=False)
+    _cancel_wait: asyncio.Task | None = field(default=None, repr=False)
+
+    @property
+    def cancelled(self) -> bool:
+        """Whether cancel() was called for this request's owner."""
+        return self._cancel.is_set()
+
+    @property
+    def wait_seconds(self) -> float:
+        """Time spent queued before reaching the server."""
+        return (self.started_at or self.queued_at) - self.queued_at
+
+    async def guard(self, awaitable: Awaitable[T]) -> T:
+        """Await a server call, abandoning it if the request is cancelled.
+
+        Raises:
+            RequestCancelledError: If cancelled before or while awaiting. The
+                server call is cancelled with it.
+        """
+        if self.cancelled:
+            if asyncio.iscoroutine(awaitable):
+                awaitable.close()
+            raise RequestCancelledError()
+        call = asyncio.ensure_future(awaitable)
+        if self._cancel_wait is None:
+            # One waiter per request, shared by every guarded call (tokens)
+            self._cancel_wait = asyncio.create_task(self._cancel.wait())
+        try:
+            await asyncio.wait((call, self._cancel_wait), return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            if not call.done():
+                call.cancel()
+                try:
+                    await call
+                except BaseException:
+                    pass
+        if call.cancelled():
+            raise RequestCancelledError()
+        return call.result()
+
+
+class LLMScheduler:
+    """Admits LLM requests to the server by priority, max_in_flight at a time.
+
+    Use acquire() / release() around each server call (release in a
+    finally). max_in_flight <= 0 admits everything at once, which only
+    adds queue-wait accounting.
+    """
+
+    def __init__(self, max_in_flight: int = 1, clock: Callable[[], float] = time.perf_counter):
+        """Initialize the scheduler.
+
+        Args:
+            max_in_flight: Requests sent to the server at once; match the
+                server's parallel slots (OLLAMA_NUM_PARALLEL).
+            clock: Time source (for tests).
+        """
+        self.max_in_flight = max_in_flight
+        self._clock = clock
+        self._seq = itertools.count()
+        self._waiting: list[tuple[int, int, Ticket, asyncio.Future]] = []
+        self._running: set[Ticket] = set()
+
+        self.requests = 0
+        self.cancelled = 0
+        self.max_queue_depth = 0
+        self._wait: dict[int, Histogram] = {}
+
+    @property
+    def queued(self) -> int:
+        """Requests waiting for a slot."""
+        return sum(1 for *_, future in self._waiting if not future.done())
+
+    @property
+    def in_flight(self) -> int:
+        """Requests currently at the server."""
+        return len(self._running)
+
+    def _has_slot(self) -> bool:
+        return self.max_in_flight <= 0 or len(self._running) < self.max_in_flight
+
+    async def acquire(self, priority: int = PRIORITY_NORMAL, owner: str | None = None) -> Ticket:
+        """Wait for a slot at the server.
+
+        Args:
+            priority: One of the PRIORITY_* constants (lower runs first).
+            owner: Call ID the request belongs to, for cancel().
+
+        Returns:
+            The request's Ticket, to pass to release().
+
+        Raises:
+            RequestCancelledError: If the owner was cancelled while queued.
+        """
+        ticket = Ticket(priority, owner, self._clock())
+        self.requests += 1
+        if self._has_slot() and not self.queued:
+            self._start(ticket)
+            return ticket
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiting, (priority, next(self._seq), ticket, future))
+        self.max_queue_depth = max(self.max_queue_depth, self.queued)
+        try:
+            await future
+        except BaseException:
+            if future.done() and not future.cancelled() and future.exception() is None:
+                self.release(ticket)  # Admitted just as our task was cancelled
+            else:
+                future.cancel()  # Leaves the queue
+            raise
+        return ticket
+
+    def release(self, ticket: Ticket) -> None:
+        """Free a ticket's slot and admit the next waiting request."""
+        if ticket._cancel_wait is not None:
+            ticket._cancel_wait.cancel()
+            ticket._cancel_wait = None
+        if ticket not in self._running:
+            return
+        self._running.discard(ticket)
+        self._dispatch()
+
+    def _start(self, ticket: Ticket) -> None:
+        ticket.started_at = self._clock()
+        self._running.add(ticket)
+        self._wait.setdefault(ticket.priority, Histogram()).observe(ticket.wait_seconds)
+
+    def _dispatch(self) -> None:
+        while self._waiting and self._has_slot():
+            *_, ticket, future = heapq.heappop(self._waiting)
+            if future.done():
+                continue  # Cancelled while queued
+            self._start(ticket)
+            future.set_result(None)
+
+    def cancel(self, owner: str) -> int:
+        """Cancel an owner's queued and running requests.
+
+        Queued requests raise RequestCancelledError from acquire(); running ones
+        from their Ticket.guard().
+
+        Returns:
+            Number of requests cancelled.
+        """
+        count = 0
+        for *_, ticket, future in self._waiting:
+            if ticket.owner == owner and not future.done():
+                ticket._cancel.set()
+                future.set_exception(RequestCancelledError())
+                count += 1
+        for ticket in self._running:
+            if ticket.owner == owner and not ticket.cancelled:
+                ticket._cancel.set()
+                count += 1
+        if count:
+            self.cancelled += count
+            logger.debug(f"Cancelled {count} LLM request(s) of call {owner}")
+        return count
+
+    def stats(self) -> dict:
+        """Slot use, queue depth and queue waits by priority."""
+        return {
+            "max_in_flight": self.max_in_flight,
+            "in_flight": self.in_flight,
+            "queued": self.queued,
+            "max_queue_depth": self.max_queue_depth,
+            "requests": self.requests,
+            "cancelled": self.cancelled,
+            "avg_wait_ms": {
+                priority: round(histogram.mean * 1000, 1)
+                for priority, histogram in sorted(self._wait.items())
+            },
+        }
@@ -0,0 +1,60 @@
+"""Histograms for the /metrics endpoints.
+
+Shared by the TTS worker pool, the TTS server and the LLM scheduler.
+Standard library only, so tts_server.py can use it without the rest of
+the app's dependencies.
+"""
+
+__all__ = [
+    "LATENCY_BUCKETS",
+    "Histogram",
+]
+
+# Default buckets, in seconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Histogram:
+    """Cumulative histogram, rendered in the Prometheus text format."""
+
+    def __init__(self, buckets: tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        """Record one observation."""
+        self.count += 1
+        self.sum += value
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[index] += 1
+
+    @property
+    def mean(self) -> float:
+        """Mean of all observations (0 when empty)."""
+        return self.sum / self.count if self.count else 0.0
+
+    @staticmethod
+    def render(name: str, help_text: str, series: dict[str, "Histogram"]) -> list[str]:
+        """Render histograms sharing a metric name.
+
+        Args:
+            name: Metric name.
+            help_text: HELP line text.
+            series: Label string (e.g. 'priority="0"', or "") -> Histogram.
+
+        Returns:
+            Exposition-format lines.
+        """
+        lines = [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+        for labels, histogram in series.items():
+            prefix = f"{labels}," if labels else ""
+            for bound, count in zip(histogram.buckets, histogram.counts, strict=True):
+                lines.append(f'{name}_bucket{{{prefix}le="{bound}"}} {count}')
+            lines.append(f'{name}_bucket{{{prefix}le="+Inf"}} {histogram.count}')
+            suffix = f"{{{labels}}}" if labels else ""
+            lines.append(f"{name}_sum{suffix} {histogram.sum:.6f}")
+            lines.append(f"{name}_count{suffix} {histogram.count}")
+        return lines
@@ -0,0 +1,184 @@
+"""Word-level phoneme memoization for the Kokoro front-end.
+
+Kokoro.create() runs espeak-ng G2P (text -> phonemes) on every call, and
+that front-end step is a noticeable share of a short sentence's synthesis
+time. LLM replies reuse most of their vocabulary (persona catchphrases,
+directory names, "the", "you", "call"), so PhonemeCache memoizes
+phonemes per word and assembles a sentence from the cache when every word
+is known. Synthesis then goes through Kokoro's phoneme input
+(create(..., is_phonemes=True)), skipping G2P entirely.
+
+Words are learned in context: a sentence with an unknown word is
+phonemized whole (one G2P call, so stress and linking come from the full
+sentence) and, when espeak returns one phoneme word per input word, every
+word is cached from that output. espeak's pronunciation of a word changes
+with what follows it ("the" is ðɪ before a vowel and ðə otherwise, "at
+any" flaps to æɾ), so a word is cached separately before a vowel, a
+consonant and a pause. Function-word stress that espeak derives from the
+whole sentence can still differ slightly in assembled sentences.
+Sentences with numbers or symbols, which espeak expands based on context,
+are never assembled; they are cached as whole sentences instead.
+
+Standard library only, so tts_server.py can use it without the rest of
+the app's dependencies.
+"""
+
+__all__ = ["PhonemeCache", "kokoro_g2p"]
+
+import re
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from typing import Any
+
+# Words (with inner apostrophes or hyphens) and single punctuation marks
+_TOKEN = re.compile(r"[A-Za-z]+(?:['’-][A-Za-z]+)*|\S")
+
+# Punctuation espeak keeps attached to the end of the previous word
+_TRAILING = frozenset(",.!?;:")
+
+
+def kokoro_g2p(model: Any, lang: str = "en-us") -> Callable[[str], str]:
+    """The G2P step Kokoro.create() runs, as a standalone function.
+
+    Args:
+        model: kokoro_onnx.Kokoro instance (or anything with .tokenizer).
+        lang: espeak language code.
+
+    Returns:
+        Function text -> phoneme string, identical to Kokoro's own.
+    """
+    tokenizer = model.tokenizer
+    return lambda text: tokenizer.phonemize(text, lang)
+
+
+def _word_keys(tokens: list[str]) -> list[str]:
+    """Cache key per word token: the word plus what follows it."""
+    keys = []
+    for index, token in enumerate(tokens):
+        if not token[0].isalpha():
+            continue
+        # Acronyms ("US", "FBI") are spelled out; other words ignore case
+        word = token if len(token) > 1 and token.isupper() else token.lower()
+        following = tokens[index + 1] if index + 1 < len(tokens) else ""
+        if not following[:1].isalpha():
+            context = "|"  # Pause: punctuation or end of text
+        elif following[0] in "AEIOUaeiou":
+            context = "|v"
+        else:
+            context = "|c"
+        keys.append(word + context)
+    return keys
+
+
+class PhonemeCache:
+    """LRU cache of word -> phonemes in front of a G2P function.
+
+    Thread-safe: pool workers phonemize concurrently. G2P runs outside the
+    lock, so two workers missing on the same word may both compute it.
+    """
+
+    def __init__(
+        self,
+        g2p: Callable[[str], str],
+        max_words: int = 20000,
+        max_sentences: int = 512,
+    ):
+        """Initialize the cache.
+
+        Args:
+            g2p: Blocking function text -> phoneme string (kokoro_g2p()).
+            max_words: Most words kept.
+            max_sentences: Most whole sentences kept (those that can't be
+                assembled from words).
+        """
+        self._g2p = g2p
+        self._max_words = max_words
+        self._max_sentences = max_sentences
+        self._words: OrderedDict[str, str] = OrderedDict()
+        self._sentences: OrderedDict[str, str] = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0  # Sentences served without G2P
+        self.misses = 0  # Sentences that ran G2P
+
+    def phonemize(self, text: str) -> str:
+        """Phonemes for text, from the cache when possible.
+
+        Args:
+            text: Sentence or clause to phonemize.
+
+        Returns:
+            Phoneme string for Kokoro.create(..., is_phonemes=True).
+        """
+        text = text.strip()
+        if not text:
+            return ""
+
+        tokens = _TOKEN.findall(text)
+        keys = _word_keys(tokens)
+        assemblable = tokens[0][0].isalpha() and all(
+            token[0].isalpha() or token in _TRAILING for token in tokens
+        )
+
+        with self._lock:
+            if assemblable:
+                phonemes = self._assemble(tokens, keys)
+            else:
+                phonemes = self._sentences.get(text)
+                if phonemes is not None:
+                    self._sentences.move_to_end(text)
+            if phonemes is not None:
+                self.hits += 1
+                return phonemes
+
+        phonemes = self._g2p(text)
+
+        with self._lock:
+            self.misses += 1
+            if assemblable:
+                self._learn(keys, phonemes)
+            else:
+                self._sentences[text] = phonemes
+                if len(self._sentences) > self._max_sentences:
+                    self._sentences.popitem(last=False)
+        return phonemes
+
+    def _assemble(self, tokens: list[str], keys: list[str]) -> str | None:
+        """Join cached word phonemes, or None if any word is unknown."""
+        pieces: list[str] = []
+        word_keys = iter(keys)
+        for token in tokens:
+            if token in _TRAILING:
+                pieces[-1] += token
+                continue
+            key = next(word_keys)
+            phonemes = self._words.get(key)
+            if phonemes is None:
+                return None
+            self._words.move_to_end(key)
+            pieces.append(phonemes)
+        return " ".join(pieces)
+
+    def _learn(self, keys: list[str], phonemes: str) -> None:
+        """Cache each word's phonemes from a whole-sentence G2P result."""
+        parts = [part.rstrip("".join(_TRAILING)) for part in phonemes.split()]
+        parts = [part for part in parts if part]
+        if len(parts) != len(keys):
+            return  # espeak merged or split words ("with the"); nothing to align
+
+        for key, part in zip(keys, parts, strict=True):
+            self._words[key] = part
+        while len(self._words) > self._max_words:
+            self._words.popitem(last=False)
+
+    def stats(self) -> dict:
+        """Snapshot of cache statistics."""
+        total = self.hits + self.misses
+        return {
+            "words": len(self._words),
+            "sentences": len(self._sentences),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 3) if total else 0.0,
+        }
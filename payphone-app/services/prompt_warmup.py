@@ -0,0 +1,288 @@
+"""Background warmup of system-prompt prefixes in Ollama's prompt cache.
+
+A cold system prompt costs ~20-25s of prompt eval on the Pi. Each of
+Ollama's parallel slots (OLLAMA_NUM_PARALLEL) keeps the KV cache of the
+last prompt it evaluated, and a new request reuses the longest matching
+prefix. Whichever prompt a slot last saw is therefore "hot"; every other
+prompt pays for the tokens after the shared BASE_SYSTEM_PROMPT.
+
+PromptWarmer keeps the most-used prompts hot:
+
+- Usage is counted per prompt (by label: "operator", "feature:jokes",
+  "persona:grandma") on every real request and persisted as JSON, so the
+  ranking survives restarts.
+- The hot set models the slots as an LRU of `slots` prompts: real
+  requests and warmups move a prompt to the front.
+- When the client has been idle for idle_seconds, the top `slots` prompts
+  by usage that are not hot are warmed one at a time (num_predict=1).
+  A real request cancels an in-flight warmup, so callers never queue
+  behind one.
+- A model reload empties every slot. It shows up as a large
+  load_duration on any response, or as the model missing from Ollama's
+  loaded list (polled every poll_interval); either marks all prompts cold
+  and the hot set is re-warmed.
+
+With one slot (Ollama's default) only the top prompt stays hot; raise
+OLLAMA_NUM_PARALLEL on the LLM host and LLM_WARMUP_SLOTS together to keep
+more features warm.
+"""
+
+__all__ = ["PromptWarmer"]
+
+import asyncio
+import json
+import logging
+import os
+import tempfile
+import time
+from collections import Counter, OrderedDict
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# A response whose load_duration exceeds this loaded the model from disk,
+# which starts every slot empty (a loaded model answers in milliseconds)
+RELOAD_SECONDS = 1.0
+
+# Hot-set entry for a request whose system prompt isn't a known variant
+_OTHER = "<other>"
+
+
+class PromptWarmer:
+    """Schedules warmups of the most-used system prompts.
+
+    The owning client calls request_started() / request_finished() around
+    every real request; everything else runs in the background task.
+    """
+
+    def __init__(
+        self,
+        prompts: dict[str, str],
+        warm: Callable[[str], Awaitable[float]],
+        is_loaded: Callable[[], Awaitable[bool]] | None = None,
+        slots: int = 1,
+        idle_seconds: float = 30.0,
+        poll_interval: float = 60.0,
+        usage_path: str | Path | None = None,
+    ):
+        """Initialize the warmer.
+
+        Args:
+            prompts: Label -> system prompt, in default priority order
+                (used to break ties in usage).
+            warm: Coroutine that evaluates one system prompt and returns
+                the response's load_duration in seconds.
+            is_loaded: Coroutine reporting whether the model is loaded, or
+                None to rely on load_duration alone.
+            slots: Prompts Ollama can hold at once (OLLAMA_NUM_PARALLEL).
+            idle_seconds: Quiet time after a real request before warming.
+            poll_interval: Seconds between scheduling passes.
+            usage_path: JSON file for usage counts, or None for memory only.
+        """
+        self._prompts = prompts
+        self._labels = {prompt: label for label, prompt in reversed(prompts.items())}
+        self._order = {label: index for index, label in enumerate(prompts)}
+        self._warm = warm
+        self._is_loaded = is_loaded
+        self.slots = max(1, slots)
+        self._idle_seconds = idle_seconds
+        self._poll_interval = poll_interval
+        self._usage_path = Path(usage_path) if usage_path else None
+
+        self._usage: Counter[str] = Counter()
+        self._usage_dirty = False
+        self._hot: OrderedDict[str, None] = OrderedDict()  # Most recent last
+        self._active = 0
+        self._last_request = 0.0
+        self._task: asyncio.Task | None = None
+        self._warming: asyncio.Task | None = None
+        self._preempting = False
+        self._wake = asyncio.Event()
+
+        self.warmups = 0
+        self.preempted = 0
+        self.reloads = 0
+
+        self._load_usage()
+
+    # ------------------------------------------------------------------
+    # Hooks for the client
+    # ------------------------------------------------------------------
+
+    def label_for(self, system_prompt: str | None) -> str | None:
+        """Label of a known system prompt, or None."""
+        return self._labels.get(system_prompt) if system_prompt else None
+
+    def request_started(self) -> None:
+        """A real request is about to run: cancel any in-flight warmup."""
+        self._active += 1
+        if self._warming is not None and not self._warming.done():
+            self._preempting = True
+            self._warming.cancel()
+            self.preempted += 1
+
+    def request_finished(
+        self, system_prompt: str | None, load_seconds: float = 0.0, count_usage: bool = True
+    ) -> None:
+        """A real request finished.
+
+        Args:
+            system_prompt: The request's system prompt.
+            load_seconds: The response's load_duration, in seconds.
+            count_usage: Count the prompt as used (False for background
+                requests, which still take a slot).
+        """
+        self._active = max(0, self._active - 1)
+        self._last_request = time.monotonic()
+        if load_seconds > RELOAD_SECONDS:
+            self._mark_cold("model reloaded during a request")
+
+        label = self.label_for(system_prompt)
+        if label is not None:
+            if count_usage:
+                self._usage[label] += 1
+                self._usage_dirty = True
+            self._touch(label)
+        elif system_prompt:
+            self._touch(_OTHER)  # Unknown prompt still took a slot
+
+    def is_hot(self, label: str) -> bool:
+        """Whether the prompt is believed to be in one of Ollama's slots."""
+        return label in self._hot
+
+    # ------------------------------------------------------------------
+    # Scheduling
+    # ------------------------------------------------------------------
+
+    def plan(self) -> list[str]:
+        """Labels that should be hot, most important first."""
+        ranked = sorted(self._prompts, key=lambda label: (-self._usage[label], self._order[label]))
+        return ranked[: self.slots]
+
+    def start(self) -> None:
+        """Start the background scheduling task."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop scheduling and persist usage counts."""
+        for task in (self._warming, self._task):
+            if task is not None and not task.done():
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._task = self._warming = None
+        self.save_usage()
+
+    async def warm_now(self, label: str) -> bool:
+        """Warm one prompt immediately (startup, or from the scheduler).
+
+        Returns:
+            True if the warmup completed, False if cancelled or failed.
+        """
+        self._warming = asyncio.create_task(self._warm(self._prompts[label]))
+        try:
+            load_seconds = await self._warming
+        except asyncio.CancelledError:
+            if not self._preempting:
+                raise  # We are being stopped
+            self._preempting = False
+            return False
+        except Exception as e:
+            logger.warning(f"Prompt warmup failed for {label}: {e}")
+            return False
+        finally:
+            self._warming = None
+
+        if load_seconds > RELOAD_SECONDS:
+            self._mark_cold("model loaded by warmup")
+        self._touch(label)
+        self.warmups += 1
+        logger.debug(f"Warmed prompt prefix: {label}")
+        return True
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self._schedule_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Prompt warmup pass failed: {e}")
+            try:
+                await asyncio.wait_for(self._wake.wait(), self._poll_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+
+    async def _schedule_once(self) -> None:
+        """One pass: check for a reload, then warm what is cold (if idle)."""
+        if self._is_loaded is not None and self._hot and not await self._is_loaded():
+            self._mark_cold("model unloaded")
+
+        self.save_usage()
+
+        for label in self.plan():
+            if self._active or time.monotonic() - self._last_request < self._idle_seconds:
+                return
+            if label in self._hot:
+                continue
+            if not await self.warm_now(label):
+                return
+
+    def _touch(self, label: str) -> None:
+        self._hot[label] = None
+        self._hot.move_to_end(label)
+        while len(self._hot) > self.slots:
+            self._hot.popitem(last=False)
+
+    def _mark_cold(self, reason: str) -> None:
+        if self._hot:
+            logger.info(f"Prompt cache cold ({reason}); re-warming {self.plan()}")
+        self._hot.clear()
+        self.reloads += 1
+        self._wake.set()
+
+    # ------------------------------------------------------------------
+    # Usage persistence
+    # ------------------------------------------------------------------
+
+    def _load_usage(self) -> None:
+        if self._usage_path is None or not self._usage_path.exists():
+            return
+        try:
+            counts = json.loads(self._usage_path.read_text())
+            self._usage.update(
+                {label: int(count) for label, count in counts.items() if label in self._prompts}
+            )
+        except (OSError, ValueError, AttributeError) as e:
+            logger.warning(f"Ignoring unreadable prompt usage file {self._usage_path}: {e}")
+
+    def save_usage(self) -> None:
+        """Write usage counts if they changed (atomic replace)."""
+        if self._usage_path is None or not self._usage_dirty:
+            return
+        try:
+            self._usage_path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self._usage_path.parent, suffix=".tmp")
+            with os.fdopen(fd, "w") as f:
+                json.dump(dict(self._usage.most_common()), f, indent=1)
+            os.replace(tmp_path, self._usage_path)
+            self._usage_dirty = False
+        except OSError as e:
+            logger.warning(f"Could not save prompt usage to {self._usage_path}: {e}")
+
+    def stats(self) -> dict:
+        """Snapshot of warmup statistics."""
+        return {
+            "slots": self.slots,
+            "hot": list(reversed(self._hot)),
+            "plan": self.plan(),
+            "warmups": self.warmups,
+            "preempted": self.preempted,
+            "reloads": self.reloads,
+            "usage": dict(self._usage.most_common(10)),
+        }
@@ -0,0 +1,230 @@
+"""Response cache for repeatable requests.
+
+"Tell me a joke" on the jokes line and "what's my fortune" on the fortune
+line are asked by caller after caller, and each one costs a full LLM
+generation (seconds on a Pi 5) plus synthesis of the reply. This cache
+holds generated replies per request so later callers are answered
+instantly.
+
+Requests are keyed by (prompt label, normalized prompt, last reply).
+Normalization lowercases, drops punctuation and filler words, and folds
+plurals, so "Um, can you tell me a joke please?" and "tell me jokes"
+share a key. Later turns are keyed on a digest of the reply the caller
+just heard, since "true" or "another" answers that reply; they only
+share a key when that reply came from the cache too. Long prompts are
+not cached: they are specific to the caller. Neither are prompts with
+nothing left after normalization ("hello?", "go ahead"), except a
+line's opener.
+
+Each key holds up to `variants` different replies. A key misses until it
+is full, so the first callers generate fresh replies; after that callers
+rotate through the variants (least-served first, never a reply already
+heard on the same call), so not everyone hears the same joke. Replies
+expire after `ttl_seconds`, so the set keeps refreshing.
+
+Once a reply has been spoken, its rendered telephone audio is attached
+to it (bounded by `max_audio_bytes` overall), so a later hit plays with
+no synthesis at all.
+"""
+
+__all__ = ["CachedReply", "ResponseCache", "normalize_request"]
+
+import hashlib
+import re
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable, Iterable
+from dataclasses import dataclass
+
+# Words that don't change what is being asked
+_FILLER = frozenset(
+    """
+    a an the um uh er ah hmm oh ok okay so well yeah please
+    can could would will you your i me my we us just like to want wanna
+    hear give tell get some one another go ahead let lets now again
+    """.split()
+)
+
+_WORD = re.compile(r"[a-z0-9]+")
+
+MAX_WORDS = 8  # Longer requests (after normalization) are not cached
+
+
+def normalize_request(text: str) -> str | None:
+    """Reduce a request to its content words.
+
+    Args:
+        text: Prompt or transcript.
+
+    Returns:
+        Space-joined content words ("" for a bare "tell me one"), or None
+        if the request is too long to be a repeatable one.
+    """
+    words = []
+    for word in _WORD.findall(text.lower().replace("'", "")):
+        if word in _FILLER:
+            continue
+        if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+            word = word[:-1]
+        words.append(word)
+    if len(words) > MAX_WORDS:
+        return None
+    return " ".join(words)
+
+
+@dataclass
+class CachedReply:
+    """One cached reply to a request."""
+
+    text: str
+    stored_at: float
+    served: int = 0
+    audio: bytes | None = None  # Rendered telephone audio, once spoken
+    voice: str | None = None  # Voice the audio was rendered with
+
+
+class ResponseCache:
+    """Multi-variant reply cache with TTL and LRU eviction."""
+
+    def __init__(
+        self,
+        variants: int = 3,
+        ttl_seconds: float = 21600.0,
+        max_keys: int = 256,
+        max_audio_bytes: int = 32 * 1024 * 1024,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Initialize the cache.
+
+        Args:
+            variants: Replies kept (and generated before serving) per key.
+            ttl_seconds: Lifetime of a reply.
+            max_keys: Keys kept; least recently used are evicted.
+            max_audio_bytes: Cap on attached audio across all replies.
+            clock: Time source (for tests).
+        """
+        self.variants = max(1, variants)
+        self.ttl_seconds = ttl_seconds
+        self.max_keys = max_keys
+        self.max_audio_bytes = max_audio_bytes
+        self._clock = clock
+        self._entries: OrderedDict[Hashable, list[CachedReply]] = OrderedDict()
+        self._audio_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(
+        label: str, prompt: str, last_reply: str | None = None, opener: bool = False
+    ) -> tuple | None:
+        """Cache key for a request, or None if it isn't cacheable.
+
+        Args:
+            label: Prompt label of the line.
+            prompt: The caller's request.
+            last_reply: Reply the caller heard last; None on the first turn.
+            opener: Whether prompt is the line's opener, which is cached
+                even if nothing is left of it after normalization.
+        """
+        normalized = normalize_request(prompt)
+        if normalized is None or (not normalized and not opener):
+            return None
+        if last_reply is None:
+            return (label, normalized, "")
+        digest = hashlib.sha1(last_reply.encode("utf-8")).hexdigest()[:16]
+        return (label, normalized, digest)
+
+    def _live(self, key: Hashable) -> list[CachedReply]:
+        """Replies under key, with expired ones dropped."""
+        replies = self._entries.get(key)
+        if replies is None:
+            return []
+        cutoff = self._clock() - self.ttl_seconds
+        for reply in [r for r in replies if r.stored_at < cutoff]:
+            self._drop_audio(reply)
+            replies.remove(reply)
+        if not replies:
+            del self._entries[key]
+        return replies
+
+    def get(self, key: Hashable, avoid: Iterable[str] = ()) -> CachedReply | None:
+        """Serve a reply for key.
+
+        Args:
+            key: Key from key().
+            avoid: Reply texts the caller has already heard.
+
+        Returns:
+            The least-served eligible reply, or None until the key holds
+            `variants` replies (the caller should generate and put()).
+        """
+        replies = self._live(key)
+        avoid = set(avoid)
+        candidates = [r for r in replies if r.text not in avoid]
+        if len(replies) < self.variants or not candidates:
+            self.misses += 1
+            return None
+
+        reply = min(candidates, key=lambda r: r.served)
+        reply.served += 1
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return reply
+
+    def put(self, key: Hashable, text: str) -> None:
+        """Store a generated reply, replacing the key's oldest if full."""
+        text = text.strip()
+        if not text:
+            return
+        replies = self._live(key)
+        if any(r.text == text for r in replies):
+            return
+        if not replies:
+            self._entries[key] = replies
+        replies.append(CachedReply(text=text, stored_at=self._clock()))
+        while len(replies) > self.variants:
+            self._drop_audio(replies.pop(0))
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_keys:
+            _, evicted = self._entries.popitem(last=False)
+            for reply in evicted:
+                self._drop_audio(reply)
+
+    def attach_audio(self, reply: CachedReply, voice: str, audio: bytes) -> None:
+        """Keep a reply's rendered audio for instant playback on later hits.
+
+        Drops audio of the least recently used replies to stay within
+        max_audio_bytes.
+        """
+        if len(audio) > self.max_audio_bytes:
+            return
+        if not any(reply is r for replies in self._entries.values() for r in replies):
+            return  # Expired or evicted while it was being spoken
+        self._drop_audio(reply)
+        reply.audio = bytes(audio)
+        reply.voice = voice
+        self._audio_bytes += len(reply.audio)
+
+        for replies in self._entries.values():
+            if self._audio_bytes <= self.max_audio_bytes:
+                break
+            for other in replies:
+                if other is not reply:
+                    self._drop_audio(other)
+
+    def _drop_audio(self, reply: CachedReply) -> None:
+        if reply.audio is not None:
+            self._audio_bytes -= len(reply.audio)
+            reply.audio = None
+            reply.voice = None
+
+    def stats(self) -> dict:
+        """Cache statistics."""
+        return {
+            "keys": len(self._entries),
+            "replies": sum(len(replies) for replies in self._entries.values()),
+            "audio_bytes": self._audio_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
@@ -14,6 +14,7 @@ is not installed.
 __all__ = [
     "STTBackend",
     "TranscriptionResult",
+    "TranscriptCache",
     "WyomingSTTClient",
     "WhisperSTT",
     "STTService",
@@ -22,7 +23,8 @@ __all__ = [
 import asyncio
 import json
 import logging
-from dataclasses import dataclass
+from collections import OrderedDict
+from dataclasses import dataclass, replace
 from enum import Enum
 from pathlib import Path
 from typing import AsyncIterator, Literal
@@ -51,6 +53,7 @@ class TranscriptionResult:
     language: str
     confidence: float
     duration_seconds: float
+    failed: bool = False  # The backend errored; the empty text isn't a transcript
 
     # Whisper hallucination tokens that appear on silence/noise
     _HALLUCINATION_PATTERNS = frozenset([
@@ -197,6 +200,7 @@ class WyomingSTTClient:
                     language=language,
                     confidence=0.0,
                     duration_seconds=duration,
+                    failed=True,
                 )
 
             if not isinstance(event, dict):
@@ -206,6 +210,7 @@ class WyomingSTTClient:
                     language=language,
                     confidence=0.0,
                     duration_seconds=duration,
+                    failed=True,
                 )
 
             event_type = event.get("type")
@@ -236,6 +241,7 @@ class WyomingSTTClient:
                 language=language,
                 confidence=0.0,
                 duration_seconds=duration,
+                failed=True,
             )
 
         except asyncio.CancelledError:
@@ -330,6 +336,174 @@ class WyomingSTTClient:
         return None
 
 
+# TranscriptCache fingerprint: (duration bucket, quantized vector) key, unit vector
+_CacheKey = tuple[int, bytes]
+_Fingerprint = tuple[_CacheKey, NDArray[np.float32]]
+
+
+class TranscriptCache:
+    """Acoustic-fingerprint cache for short, repeated utterances.
+
+    Payphone callers say the same few things constantly ("yes", "another
+    one", "operator"), and line noise produces the same empty result over
+    and over. This cache returns a previous TranscriptionResult when a new
+    short utterance is acoustically near-identical to one already
+    transcribed, skipping the STT backend entirely.
+
+    Fingerprint: log energies in 16 mel-spaced telephone bands (100-3800 Hz)
+    over the energy-trimmed utterance, mean-normalized per band (removes
+    line gain), resampled to 24 time slices and unit-normalized. Entries
+    are keyed by the quantized fingerprint plus a trimmed-duration bucket.
+    A hit requires cosine similarity >= `similarity` against an entry in
+    the same or an adjacent duration bucket. Memory is bounded by LRU
+    eviction at `max_entries`.
+    """
+
+    N_BANDS = 16
+    N_SLICES = 24
+    FRAME = 400  # 25ms at 16kHz
+    HOP = 160  # 10ms at 16kHz
+    DURATION_BUCKET_S = 0.15
+
+    def __init__(
+        self,
+        max_entries: int = 256,
+        max_seconds: float = 2.0,
+        similarity: float = 0.97,
+        sample_rate: int = 16000,
+    ):
+        self.max_entries = max_entries
+        self.max_seconds = max_seconds
+        self.similarity = similarity
+        self.sample_rate = sample_rate
+
+        self._entries: OrderedDict[
+            _CacheKey, tuple[NDArray[np.float32], TranscriptionResult]
+        ] = OrderedDict()
+        self._buckets: dict[int, set[_CacheKey]] = {}
+        self._window = np.hanning(self.FRAME).astype(np.float32)
+        self._bands = self._make_bands()
+        self.hits = 0
+        self.misses = 0
+
+    def _make_bands(self) -> NDArray[np.float32]:
+        """Triangular mel-spaced band matrix, shape (n_freqs, N_BANDS)."""
+        n_freqs = self.FRAME // 2 + 1
+        freqs = np.linspace(0, self.sample_rate / 2, n_freqs)
+        mel_lo, mel_hi = (2595.0 * np.log10(1.0 + f / 700.0) for f in (100.0, 3800.0))
+        edges = 700.0 * (10.0 ** (np.linspace(mel_lo, mel_hi, self.N_BANDS + 2) / 2595.0) - 1.0)
+        bands = np.zeros((n_freqs, self.N_BANDS), dtype=np.float32)
+        for i in range(self.N_BANDS):
+            lo, mid, hi = edges[i], edges[i + 1], edges[i + 2]
+            rise = (freqs - lo) / (mid - lo)
+            fall = (hi - freqs) / (hi - mid)
+            bands[:, i] = np.clip(np.minimum(rise, fall), 0.0, None)
+        return bands / np.maximum(bands.sum(axis=0, keepdims=True), 1e-9)
+
+    def fingerprint(self, audio: NDArray[np.float32]) -> _Fingerprint | None:
+        """Compute (key, unit vector) for audio, or None if not cacheable.
+
+        Returns None for utterances longer than max_seconds or digital silence.
+        """
+        if len(audio) > self.max_seconds * self.sample_rate or len(audio) < self.FRAME:
+            return None
+
+        # Trim leading/trailing blocks near the line noise floor or more
+        # than 30 dB below the peak, so padding doesn't shift the key
+        n_blocks = len(audio) // self.HOP
+        blocks = audio[: n_blocks * self.HOP].reshape(n_blocks, self.HOP)
+        block_energy = np.square(blocks).mean(axis=1)
+        peak = float(block_energy.max())
+        if peak < 1e-8:
+            return None
+        floor = float(np.percentile(block_energy, 10))
+        active = np.flatnonzero(block_energy >= max(peak * 1e-3, floor * 10.0))
+        start = active[0] * self.HOP
+        stop = min(len(audio), (active[-1] + 1) * self.HOP)
+        trimmed = audio[start:stop]
+        if len(trimmed) < self.FRAME:
+            trimmed = np.pad(trimmed, (0, self.FRAME - len(trimmed)))
+
+        # Band log-energies per frame
+        n_frames = 1 + (len(trimmed) - self.FRAME) // self.HOP
+        frames = np.lib.stride_tricks.as_strided(
+            trimmed,
+            shape=(n_frames, self.FRAME),
+            strides=(trimmed.strides[0] * self.HOP, trimmed.strides[0]),
+            writeable=False,
+        )
+        spectrum = np.fft.rfft(frames * self._window, axis=-1)
+        power = (spectrum.real**2 + spectrum.imag**2).astype(np.float32)
+        features = np.log(power @ self._bands + 1e-10)  # (n_frames, N_BANDS)
+        features -= features.mean(axis=0, keepdims=True)
+
+        # Resample to a fixed number of time slices
+        pos = np.linspace(0, n_frames - 1, self.N_SLICES)
+        lo = np.floor(pos).astype(int)
+        hi = np.minimum(lo + 1, n_frames - 1)
+        frac = (pos - lo)[:, np.newaxis]
+        vector = ((1.0 - frac) * features[lo] + frac * features[hi]).ravel()
+
+        vector -= vector.mean()
+        norm = float(np.linalg.norm(vector))
+        if norm < 1e-6:
+            return None
+        vector = (vector / norm).astype(np.float32)
+
+        bucket = int(round(len(trimmed) / self.sample_rate / self.DURATION_BUCKET_S))
+        quantized = np.clip(np.round(vector * 32), -127, 127).astype(np.int8).tobytes()
+        return (bucket, quantized), vector
+
+    def get(self, fingerprint: _Fingerprint) -> TranscriptionResult | None:
+        """Return the cached result for a near-identical fingerprint, if any."""
+        key, vector = fingerprint
+        best_key, best_score = None, self.similarity
+        if key in self._entries:
+            best_key = key
+        else:
+            bucket = key[0]
+            for neighbor in (bucket - 1, bucket, bucket + 1):
+                for candidate in self._buckets.get(neighbor, ()):
+                    score = float(np.dot(vector, self._entries[candidate][0]))
+                    if score >= best_score:
+                        best_key, best_score = candidate, score
+
+        if best_key is None:
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(best_key)
+        self.hits += 1
+        return self._entries[best_key][1]
+
+    def put(
+        self,
+        fingerprint: _Fingerprint,
+        result: TranscriptionResult,
+    ) -> None:
+        """Store a backend result (including empty results for noise)."""
+        key, vector = fingerprint
+        if key not in self._entries:
+            self._buckets.setdefault(key[0], set()).add(key)
+        self._entries[key] = (vector, result)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_entries:
+            old_key, _ = self._entries.popitem(last=False)
+            bucket = self._buckets[old_key[0]]
+            bucket.discard(old_key)
+            if not bucket:
+                del self._buckets[old_key[0]]
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        self._entries.clear()
+        self._buckets.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
 class WhisperSTT:
     """Speech-to-Text service with pluggable backends.
 
@@ -357,6 +531,15 @@ class WhisperSTT:
         self._initialized = False
         self._device: str = "cpu"
 
+        # Optional cache for short, repeated utterances (yes/no/noise)
+        self._result_cache: TranscriptCache | None = None
+        if settings.result_cache_enabled:
+            self._result_cache = TranscriptCache(
+                max_entries=settings.result_cache_max_entries,
+                max_seconds=settings.result_cache_max_seconds,
+                similarity=settings.result_cache_similarity,
+            )
+
     async def initialize(self) -> None:
         """Initialize the STT service.
 
@@ -580,7 +763,29 @@ class WhisperSTT:
                 duration_seconds=0.0,
             )
 
-        # Route to appropriate backend
+        fingerprint = None
+        if self._result_cache is not None:
+            fingerprint = self._result_cache.fingerprint(audio)
+            if fingerprint is not None:
+                cached = self._result_cache.get(fingerprint)
+                if cached is not None:
+                    logger.debug(f"STT result cache hit: '{cached.text}'")
+                    return replace(cached, duration_seconds=len(audio) / 16000)
+
+        result = await self._transcribe_backend(audio, sample_rate)
+
+        # A failed result (e.g. Wyoming error) would silence repeats once
+        # cached; an empty transcript of noise is cached like any other
+        if fingerprint is not None and not result.failed:
+            self._result_cache.put(fingerprint, result)
+        return result
+
+    async def _transcribe_backend(
+        self,
+        audio: NDArray[np.float32],
+        sample_rate: int,
+    ) -> TranscriptionResult:
+        """Route audio to the active backend."""
         if self._backend == STTBackend.MOONSHINE:
             loop = asyncio.get_running_loop()
             return await loop.run_in_executor(
@@ -0,0 +1,148 @@
+"""Token accounting for system prompts and conversation history.
+
+Prompt eval is the dominant CPU cost on the LLM box, yet prompts are
+written as prose and history is limited by message count. TokenCounter
+puts a token figure on both:
+
+- With a tokenizer (LLM_TOKENIZER: a tokenizer.json path, or a Hugging
+  Face repo id) and the optional `tokenizers` package, counts are exact
+  for the text (chat-template tokens are estimated per message).
+- Otherwise a word/piece estimator is used. It self-calibrates: when a
+  response proves the whole prompt was evaluated (the model had just been
+  loaded, so nothing was cached), Ollama's prompt_eval_count is compared
+  with the estimate and the scale is nudged toward it.
+
+Counts are cached per string, so the ~40 system prompts are counted once.
+"""
+
+__all__ = ["MESSAGE_OVERHEAD", "TokenCounter", "token_counter"]
+
+import functools
+import logging
+import re
+import threading
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+# Chat-template tokens around each message (role header, separators)
+MESSAGE_OVERHEAD = 4
+
+# Estimator pieces: words, digit runs (BPE vocabularies split numbers
+# into groups of up to three digits), and single symbols
+_PIECE = re.compile(r"[A-Za-z]+|\d{1,3}|[^\sA-Za-z\d]")
+
+# Letters per extra token in long words (common words are one token)
+_LETTERS_PER_TOKEN = 6
+
+# How far one calibration observation moves the scale
+_CALIBRATION_RATE = 0.3
+
+
+def _estimate(text: str) -> float:
+    """Unscaled token estimate."""
+    tokens = 0.0
+    for piece in _PIECE.findall(text):
+        if piece[0].isalpha():
+            tokens += 1 + (len(piece) - 1) // _LETTERS_PER_TOKEN
+        else:
+            tokens += 1
+    return tokens
+
+
+class TokenCounter:
+    """Counts tokens with the model's tokenizer or a calibrated estimate."""
+
+    def __init__(self, tokenizer: str = "", cache_size: int = 4096):
+        """Initialize the counter.
+
+        Args:
+            tokenizer: Path to a tokenizer.json, or a Hugging Face repo id;
+                empty to use the estimator.
+            cache_size: Distinct strings whose counts are kept.
+        """
+        self._tokenizer = _load_tokenizer(tokenizer) if tokenizer else None
+        self._cache_size = cache_size
+        self._cache: OrderedDict[str, int] = OrderedDict()
+        self._lock = threading.Lock()
+        self.scale = 1.0  # Estimator correction from calibration
+        self.calibrations = 0
+
+    @property
+    def backend(self) -> str:
+        """"tokenizer" (exact) or "estimate"."""
+        return "tokenizer" if self._tokenizer is not None else "estimate"
+
+    def count(self, text: str) -> int:
+        """Tokens in text (cached per string)."""
+        with self._lock:
+            cached = self._cache.get(text)
+            if cached is not None:
+                self._cache.move_to_end(text)
+                return cached
+
+        if self._tokenizer is not None:
+            tokens = len(self._tokenizer.encode(text, add_special_tokens=False).ids)
+        else:
+            tokens = round(_estimate(text) * self.scale)
+
+        with self._lock:
+            self._cache[text] = tokens
+            if len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+        return tokens
+
+    def count_messages(self, messages: list[dict]) -> int:
+        """Tokens for a chat message list, including template overhead."""
+        return sum(self.count(m["content"]) + MESSAGE_OVERHEAD for m in messages)
+
+    def calibrate(self, messages: list[dict], prompt_eval_count: int) -> None:
+        """Fit the estimator to a prompt Ollama evaluated in full.
+
+        Only call with a prompt_eval_count that covers the whole prompt
+        (e.g. the response's load_duration shows a fresh model load).
+
+        Args:
+            messages: Messages of the request.
+            prompt_eval_count: Tokens Ollama evaluated for them.
+        """
+        if self._tokenizer is not None or prompt_eval_count <= 0:
+            return
+        overhead = MESSAGE_OVERHEAD * len(messages)
+        raw = sum(_estimate(m["content"]) for m in messages)
+        if raw <= 0 or prompt_eval_count <= overhead:
+            return
+
+        observed = (prompt_eval_count - overhead) / raw
+        with self._lock:
+            self.scale += _CALIBRATION_RATE * (observed - self.scale)
+            self._cache.clear()  # Cached counts used the old scale
+            self.calibrations += 1
+        logger.debug(f"Token estimator scale now {self.scale:.3f} ({prompt_eval_count} observed)")
+
+
+def _load_tokenizer(spec: str):
+    """Load a tokenizers.Tokenizer, or None (estimator) if unavailable."""
+    try:
+        from tokenizers import Tokenizer
+    except ImportError:
+        logger.warning("tokenizers not installed; estimating token counts")
+        return None
+
+    try:
+        if spec.endswith(".json"):
+            return Tokenizer.from_file(spec)
+        return Tokenizer.from_pretrained(spec)
+    except Exception as e:
+        logger.warning(f"Could not load tokenizer {spec!r} ({e}); estimating token counts")
+        return None
+
+
+@functools.cache
+def token_counter(tokenizer: str = "") -> TokenCounter:
+    """Shared TokenCounter per tokenizer spec.
+
+    Sessions and the LLM client share one instance, so calibration and the
+    per-string cache benefit every caller.
+    """
+    return TokenCounter(tokenizer)
@@ -14,28 +14,54 @@ Speed fallback: Piper v1.4.1 for ultra-responsive moments (10-20x real-time).
 """
 
 __all__ = [
+    "PRIORITY_FIRST",
+    "PRIORITY_NORMAL",
     "TTSResult",
+    "FallbackAudio",
     "KokoroTTS",
     "RemoteTTS",
     "create_tts",
     "VOICE_MAP",
     "get_voice_for_feature",
+    "split_segments",
 ]
 
 import asyncio
 import base64
 import logging
+from collections import deque
 from dataclasses import dataclass
 from pathlib import Path
-from typing import AsyncIterator, Protocol
+from typing import TYPE_CHECKING, Any, AsyncIterator, Protocol
 
 import numpy as np
 from numpy.typing import NDArray
 
 from config.settings import TTSSettings
 
+if TYPE_CHECKING:
+    from config.settings import AudioSettings
+from services.phonemes import PhonemeCache, kokoro_g2p
+from services.tts_pool import (
+    PRIORITY_FIRST,
+    PRIORITY_NORMAL,
+    TTSWorkerPool,
+    load_kokoro_instances,
+)
+from services.tts_stream import (
+    ENCODINGS,
+    OutputStream,
+    decode_pcm,
+    split_segments,
+    stream_segments,
+    telephone_filter_sos,
+)
+
 logger = logging.getLogger(__name__)
 
+# RemoteTTS hedging: first-byte latencies kept, and needed before hedging
+_LATENCY_WINDOW = 200
+_HEDGE_MIN_SAMPLES = 20
 
 class TTSProtocol(Protocol):
     """Protocol for TTS implementations."""
@@ -43,10 +69,23 @@ class TTSProtocol(Protocol):
     async def initialize(self) -> None: ...
     async def cleanup(self) -> None: ...
     async def synthesize(
-        self, text: str, voice: str | None = None, speed: float | None = None
+        self,
+        text: str,
+        voice: str | None = None,
+        speed: float | None = None,
+        priority: int = PRIORITY_NORMAL,
     ) -> NDArray[np.float32]: ...
+    def synthesize_stream(
+        self,
+        text: str,
+        voice: str | None = None,
+        speed: float | None = None,
+        priority: int = PRIORITY_NORMAL,
+    ) -> AsyncIterator[NDArray[np.float32]]: ...
     @property
     def sample_rate(self) -> int: ...
+    @property
+    def telephone_output(self) -> bool: ...
 
 
 @dataclass
@@ -59,14 +98,29 @@ class TTSResult:
     text: str
 
 
+class FallbackAudio(np.ndarray):
+    """Audio played in place of a failed or stalled remote synthesis.
+
+    RemoteTTS returns its fallback (local synthesis or the "one moment
+    please" clip) as a view of this type, so callers can tell it apart
+    from the requested text and keep it out of audio caches.
+    """
+
+
 class KokoroTTS:
     """Kokoro-82M based Text-to-Speech service.
 
     Provides fast, high-quality TTS optimized for real-time voice applications.
     Outputs 24kHz audio by default.
 
-    Thread-safe: Uses asyncio.Lock to prevent concurrent synthesis calls
-    from corrupting model state during multi-call scenarios.
+    Concurrency: settings.workers model instances run behind a priority
+    queue (TTSWorkerPool). Each instance is used by one job at a time, so
+    concurrent calls synthesize in parallel up to the worker count, and
+    first sentences of a turn are scheduled ahead of later ones.
+
+    G2P: phonemes come from a PhonemeCache shared by all instances and
+    are passed to the model directly, so espeak only runs for sentences
+    with words it hasn't seen (settings.phoneme_cache_size=0 disables).
     """
 
     def __init__(self, settings: TTSSettings | None = None):
@@ -74,39 +128,46 @@ class KokoroTTS:
             settings = TTSSettings()
         self.settings = settings
 
-        self._model = None
+        self._model = None  # First instance (voice listing, direct use)
+        self._models: list = []
         self._voices = None
         self._initialized = False
         self._sample_rate = 24000  # Kokoro outputs 24kHz
-        self._lock: asyncio.Lock | None = None  # Created on first use
+        self._pool: TTSWorkerPool | None = None
+        self._phonemes: PhonemeCache | None = None
 
     async def initialize(self) -> None:
         """Initialize the Kokoro TTS model."""
         if self._initialized:
             return
 
-        # Create lock eagerly to avoid race condition with lazy init
-        self._lock = asyncio.Lock()
-
         logger.info("Loading Kokoro TTS model...")
 
         # Load model in executor to avoid blocking
         loop = asyncio.get_running_loop()
         await loop.run_in_executor(None, self._load_model)
 
+        if self._models:
+            self._pool = TTSWorkerPool(self._models, self._synthesize_with)
+            self._pool.start()
+
         self._initialized = True
         logger.info("Kokoro TTS model loaded successfully")
 
     def _load_model(self) -> None:
-        """Load the Kokoro model (blocking)."""
+        """Load the Kokoro model instances (blocking)."""
         try:
-            from kokoro_onnx import Kokoro
-
-            # Load model and voices
-            self._model = Kokoro(
+            self._models = load_kokoro_instances(
                 self.settings.model_path,
                 self.settings.voices_path,
+                count=self.settings.workers,
+                intra_op_threads=self.settings.intra_op_threads,
             )
+            self._model = self._models[0]
+            if self.settings.phoneme_cache_size > 0:
+                self._phonemes = PhonemeCache(
+                    kokoro_g2p(self._model), max_words=self.settings.phoneme_cache_size
+                )
 
             logger.info(f"Available voices: {self._model.get_voices()}")
 
@@ -116,14 +177,20 @@ class KokoroTTS:
                 "Install with: pip install kokoro-onnx"
             )
             self._model = None
+            self._models = []
 
         except FileNotFoundError as e:
             logger.warning(f"Kokoro model files not found: {e}. Using fallback TTS.")
             self._model = None
+            self._models = []
 
     async def cleanup(self) -> None:
         """Clean up resources."""
+        if self._pool is not None:
+            await self._pool.shutdown()
+            self._pool = None
         self._model = None
+        self._models = []
         self._initialized = False
 
     async def synthesize(
@@ -131,16 +198,19 @@ class KokoroTTS:
         text: str,
         voice: str | None = None,
         speed: float | None = None,
+        priority: int = PRIORITY_NORMAL,
     ) -> NDArray[np.float32]:
         """Synthesize text to audio.
 
-        Thread-safe: Acquires lock to prevent concurrent synthesis calls
-        from corrupting model state.
+        Runs on the next free model instance; waits in the worker pool's
+        priority queue when all instances are busy.
 
         Args:
             text: Text to synthesize.
             voice: Optional voice override.
             speed: Optional speed override (1.0 = normal).
+            priority: PRIORITY_FIRST for the first sentence of a turn,
+                PRIORITY_NORMAL otherwise.
 
         Returns:
             Audio samples as float32 array at 24kHz.
@@ -154,25 +224,49 @@ class KokoroTTS:
         voice = voice or self.settings.voice
         speed = speed or self.settings.speed
 
-        # Acquire lock to prevent concurrent synthesis corrupting model state
-        async with self._lock:
-            loop = asyncio.get_running_loop()
-
-            if self._model is not None:
-                audio = await loop.run_in_executor(
-                    None,
-                    self._synthesize_kokoro,
-                    text,
-                    voice,
-                    speed,
-                )
-            else:
-                # Fallback to silent audio (for testing without model)
-                logger.warning("Using silent fallback - no TTS model loaded")
-                duration = len(text) * 0.05  # ~50ms per character estimate
-                audio = np.zeros(int(duration * self._sample_rate), dtype=np.float32)
+        if self._pool is not None:
+            return await self._pool.submit(priority, text, voice, speed)
+
+        # Fallback to silent audio (for testing without model)
+        logger.warning("Using silent fallback - no TTS model loaded")
+        duration = len(text) * 0.05  # ~50ms per character estimate
+        return np.zeros(int(duration * self._sample_rate), dtype=np.float32)
+
+    async def synthesize_stream(
+        self,
+        text: str,
+        voice: str | None = None,
+        speed: float | None = None,
+        priority: int = PRIORITY_NORMAL,
+    ) -> AsyncIterator[NDArray[np.float32]]:
+        """Synthesize a sentence as a stream of clause segments.
+
+        The first segment is ready after synthesizing only its clause, not
+        the whole sentence. The next segment is synthesized while the
+        caller consumes the current one, so playback stays continuous.
+
+        Args:
+            text: Sentence to synthesize.
+            voice: Optional voice override.
+            speed: Optional speed override (1.0 = normal).
+            priority: Priority of the first segment; later segments are
+                PRIORITY_NORMAL since playback is already under way.
+
+        Yields:
+            Float32 audio segments at 24kHz.
+        """
+        if not text or not text.strip():
+            return
+
+        segments = split_segments(text, self.settings.segment_min_chars)
 
-        return audio
+        async def _synthesize(segment: str, segment_priority: int) -> NDArray[np.float32]:
+            return await self.synthesize(segment, voice, speed, segment_priority)
+
+        async for audio in stream_segments(
+            _synthesize, segments, priority, PRIORITY_NORMAL, self._sample_rate
+        ):
+            yield audio
 
     def _synthesize_kokoro(
         self,
@@ -180,12 +274,30 @@ class KokoroTTS:
         voice: str,
         speed: float,
     ) -> NDArray[np.float32]:
-        """Synchronous Kokoro synthesis (blocking)."""
-        samples, sample_rate = self._model.create(
-            text,
-            voice=voice,
-            speed=speed,
-        )
+        """Synchronous Kokoro synthesis on the first instance (blocking)."""
+        return self._synthesize_with(self._model, text, voice, speed)
+
+    def _synthesize_with(
+        self,
+        model,
+        text: str,
+        voice: str,
+        speed: float,
+    ) -> NDArray[np.float32]:
+        """Synchronous Kokoro synthesis on a given instance (blocking)."""
+        if self._phonemes is not None:
+            samples, sample_rate = model.create(
+                self._phonemes.phonemize(text),
+                voice=voice,
+                speed=speed,
+                is_phonemes=True,
+            )
+        else:
+            samples, sample_rate = model.create(
+                text,
+                voice=voice,
+                speed=speed,
+            )
 
         # Avoid unnecessary copy if already float32
         if samples.dtype == np.float32:
@@ -268,6 +380,19 @@ class KokoroTTS:
         """Get the output sample rate."""
         return self._sample_rate
 
+    @property
+    def telephone_output(self) -> bool:
+        """Whether audio is already telephone-rendered (never, for local synthesis)."""
+        return False
+
+    def pool_stats(self) -> dict:
+        """Worker pool statistics (empty when no model is loaded)."""
+        return self._pool.stats() if self._pool is not None else {}
+
+    def phoneme_stats(self) -> dict:
+        """Phoneme cache statistics (empty when the cache is disabled)."""
+        return self._phonemes.stats() if self._phonemes is not None else {}
+
     def get_available_voices(self) -> list[str]:
         """Get list of available voices."""
         if self._model is not None:
@@ -282,16 +407,51 @@ class RemoteTTS:
     Pi #1 CPU load by ~30% during speech output.
 
     The remote server should run tts_server.py and expose an HTTP endpoint.
+
+    With settings.remote_output="telephone" and audio_settings given, the
+    server also resamples to the output rate and applies the telephone
+    band-pass, so only 8kHz audio crosses the network and the pipeline
+    skips that processing (telephone_output is True).
+
+    Resilience (streaming servers):
+    - A tuned connection pool keeps remote_warm_connections keep-alive
+      connections open, re-warmed while idle, so requests skip the TCP
+      handshake.
+    - A request that fails before any audio is retried once. With
+      remote_hedge, a duplicate request is also sent when the first audio
+      is later than the p95 first-byte latency; the first to answer wins.
+    - If no audio arrives within remote_stall_timeout, or the server
+      fails, remote_fallback supplies audio instead of silence: a local
+      Kokoro model, or a "one moment please" clip rendered at startup.
     """
 
-    def __init__(self, settings: TTSSettings | None = None):
+    def __init__(
+        self,
+        settings: TTSSettings | None = None,
+        audio_settings: "AudioSettings | None" = None,
+    ):
         if settings is None:
             settings = TTSSettings()
         self.settings = settings
+        self.audio_settings = audio_settings
 
         self._session = None
         self._initialized = False
         self._sample_rate = 24000  # Kokoro outputs 24kHz
+        self._streaming = False  # Server offers /synthesize/stream
+        self._telephone = False  # Server renders telephone audio
+        self._warm_task: asyncio.Task | None = None
+
+        # Fallbacks for a failed or stalled server
+        self._local: KokoroTTS | None = None
+        self._fallback_clip: NDArray[np.float32] | None = None
+
+        # First-byte latency of recent requests (ms), for the hedge delay
+        self._first_byte_ms: deque[float] = deque(maxlen=_LATENCY_WINDOW)
+        self.retries = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+        self.fallbacks = 0
 
     async def initialize(self) -> None:
         """Initialize the HTTP client session."""
@@ -301,17 +461,47 @@ class RemoteTTS:
         try:
             import aiohttp
 
-            # Create persistent session for connection reuse
-            timeout = aiohttp.ClientTimeout(total=self.settings.remote_timeout)
-            self._session = aiohttp.ClientSession(timeout=timeout)
+            # Persistent session with a tuned keep-alive connection pool.
+            # Stalls on streamed audio are detected per read, not here.
+            connector = aiohttp.TCPConnector(
+                limit=self.settings.remote_pool_size,
+                ttl_dns_cache=300,
+                keepalive_timeout=self.settings.remote_keepalive,
+            )
+            timeout = aiohttp.ClientTimeout(
+                total=self.settings.remote_timeout,
+                sock_connect=self.settings.remote_connect_timeout,
+            )
+            self._session = aiohttp.ClientSession(connector=connector, timeout=timeout)
 
             # Test connection to remote server
             async with self._session.get(f"{self.settings.remote_host}/health") as resp:
                 if resp.status == 200:
                     data = await resp.json()
                     self._sample_rate = data.get("sample_rate", 24000)
+                    # Older servers don't report streaming; use JSON for those
+                    self._streaming = (
+                        self.settings.remote_streaming and data.get("streaming", False)
+                    )
+                    self._telephone = (
+                        self._streaming
+                        and self.settings.remote_output == "telephone"
+                        and self.audio_settings is not None
+                        and data.get("telephone", False)
+                    )
+                    if not self._streaming:
+                        wire = "JSON"
+                    elif self._telephone:
+                        wire = (
+                            f"streaming {self.settings.remote_encoding} at "
+                            f"{self.sample_rate}Hz, server-rendered"
+                        )
+                    else:
+                        wire = (
+                            f"streaming {self.settings.remote_encoding} at {self._sample_rate}Hz"
+                        )
                     logger.info(
-                        f"Connected to remote TTS server at {self.settings.remote_host}"
+                        f"Connected to remote TTS server at {self.settings.remote_host} ({wire})"
                     )
                 else:
                     raise ConnectionError(f"TTS server returned status {resp.status}")
@@ -324,11 +514,68 @@ class RemoteTTS:
             )
         except Exception as e:
             logger.error(f"Failed to connect to remote TTS server: {e}")
+            if self._session:
+                await self._session.close()
+                self._session = None
             raise
 
+        await self._warm_connections()
+        self._warm_task = asyncio.create_task(self._keep_warm())
+        await self._prepare_fallback()
+
+    async def _warm_connections(self) -> None:
+        """Open keep-alive connections with concurrent health checks."""
+
+        async def _ping() -> None:
+            async with self._session.get(f"{self.settings.remote_host}/health") as resp:
+                await resp.read()
+
+        count = self.settings.remote_warm_connections
+        if count > 0:
+            await asyncio.gather(*(_ping() for _ in range(count)), return_exceptions=True)
+
+    async def _keep_warm(self) -> None:
+        """Re-warm connections before the keep-alive timeout closes them."""
+        interval = max(1.0, self.settings.remote_keepalive / 2)
+        while True:
+            await asyncio.sleep(interval)
+            await self._warm_connections()
+
+    async def _prepare_fallback(self) -> None:
+        """Load the local model or render the clip used when the server fails."""
+        mode = self.settings.remote_fallback
+        if mode == "local":
+            local = KokoroTTS(self.settings)
+            await local.initialize()
+            if local._model is None:
+                logger.warning("Local TTS fallback unavailable: no Kokoro model")
+                await local.cleanup()
+            else:
+                self._local = local
+                logger.info("Remote TTS will fall back to local Kokoro")
+        elif mode == "clip" and self.settings.remote_fallback_phrase:
+            clip = await self.synthesize(self.settings.remote_fallback_phrase)
+            if len(clip) > 0:
+                self._fallback_clip = clip
+            else:
+                logger.warning("Could not render the remote TTS fallback clip")
+
     async def cleanup(self) -> None:
         """Clean up HTTP session."""
+        if self._warm_task is not None:
+            self._warm_task.cancel()
+            try:
+                await self._warm_task
+            except asyncio.CancelledError:
+                pass
+            self._warm_task = None
+        if self._local is not None:
+            await self._local.cleanup()
+            self._local = None
         if self._session:
+            stats = self.stats()
+            if stats["retries"] or stats["hedged"] or stats["fallbacks"]:
+                logger.info(f"Remote TTS stats: {stats}")
             await self._session.close()
             self._session = None
         self._initialized = False
@@ -338,6 +585,7 @@ class RemoteTTS:
         text: str,
         voice: str | None = None,
         speed: float | None = None,
+        priority: int = PRIORITY_NORMAL,
     ) -> NDArray[np.float32]:
         """Synthesize text via remote TTS server.
 
@@ -345,9 +593,12 @@ class RemoteTTS:
             text: Text to synthesize.
             voice: Optional voice override.
             speed: Optional speed override.
+            priority: Scheduling priority on the server's worker pool.
 
         Returns:
-            Audio samples as float32 array at 24kHz.
+            Audio samples as float32 array at sample_rate (24kHz, or the
+            telephone rate when server-rendered); a FallbackAudio if the
+            server failed or stalled.
         """
         if not self._initialized:
             raise RuntimeError("Remote TTS not initialized. Call initialize() first.")
@@ -355,18 +606,29 @@ class RemoteTTS:
         if not text or not text.strip():
             return np.array([], dtype=np.float32)
 
+        if self._streaming:
+            chunks = [
+                chunk async for chunk in self._stream(text, voice, speed, priority, split=False)
+            ]
+            if not chunks:
+                return np.array([], dtype=np.float32)
+            audio = np.concatenate(chunks)
+            if any(isinstance(chunk, FallbackAudio) for chunk in chunks):
+                return audio.view(FallbackAudio)
+            return audio
+
         voice = voice or self.settings.voice
         speed = speed or self.settings.speed
 
         try:
             async with self._session.post(
                 f"{self.settings.remote_host}/synthesize",
-                json={"text": text, "voice": voice, "speed": speed},
+                json={"text": text, "voice": voice, "speed": speed, "priority": priority},
             ) as resp:
                 if resp.status != 200:
                     error_text = await resp.text()
                     logger.error(f"Remote TTS error: {error_text}")
-                    return np.array([], dtype=np.float32)
+                    return await self._fallback(text, voice, speed, priority)
 
                 data = await resp.json()
 
@@ -380,11 +642,290 @@ class RemoteTTS:
             logger.error(
                 f"Remote TTS timed out after {self.settings.remote_timeout}s"
             )
-            return np.array([], dtype=np.float32)
+            return await self._fallback(text, voice, speed, priority)
 
         except Exception as e:
             logger.error(f"Remote TTS request failed: {e}")
-            return np.array([], dtype=np.float32)
+            return await self._fallback(text, voice, speed, priority)
+
+    async def synthesize_stream(
+        self,
+        text: str,
+        voice: str | None = None,
+        speed: float | None = None,
+        priority: int = PRIORITY_NORMAL,
+    ) -> AsyncIterator[NDArray[np.float32]]:
+        """Synthesize a sentence as a stream of audio chunks.
+
+        With a streaming server, the server splits the sentence into clause
+        segments and audio is yielded as it arrives, so playback starts
+        after the first clause. Otherwise the sentence is one JSON request.
+
+        Args:
+            text: Sentence to synthesize.
+            voice: Optional voice override.
+            speed: Optional speed override.
+            priority: Priority of the first segment on the server.
+
+        Yields:
+            Float32 audio chunks at the server's sample rate.
+        """
+        if not self._streaming:
+            audio = await self.synthesize(text, voice, speed, priority)
+            if len(audio) > 0:
+                yield audio
+            return
+
+        if not self._initialized:
+            raise RuntimeError("Remote TTS not initialized. Call initialize() first.")
+
+        if not text or not text.strip():
+            return
+
+        async for chunk in self._stream(text, voice, speed, priority, split=True):
+            yield chunk
+
+    def _stream_request(
+        self,
+        text: str,
+        voice: str,
+        speed: float,
+        priority: int,
+        split: bool,
+    ) -> dict:
+        """Build the JSON body for /synthesize/stream."""
+        body = {
+            "text": text,
+            "voice": voice,
+            "speed": speed,
+            "priority": priority,
+            "encoding": self.settings.remote_encoding,
+            "segment_min_chars": self.settings.segment_min_chars if split else 0,
+        }
+        if self._telephone:
+            body.update(
+                output="telephone",
+                output_sample_rate=self.audio_settings.output_sample_rate,
+                telephone_lowcut=self.audio_settings.telephone_lowcut,
+                telephone_highcut=self.audio_settings.telephone_highcut,
+            )
+        return body
+
+    async def _stream(
+        self,
+        text: str,
+        voice: str | None,
+        speed: float | None,
+        priority: int,
+        split: bool,
+    ) -> AsyncIterator[NDArray[np.float32]]:
+        """Read raw PCM from the server's /synthesize/stream endpoint.
+
+        Network reads don't respect sample boundaries, so a partial sample
+        at the end of a read is carried into the next one.
+
+        Args:
+            text: Text to synthesize.
+            voice: Optional voice override.
+            speed: Optional speed override.
+            priority: Scheduling priority on the server's worker pool.
+            split: Let the server split text into clause segments.
+
+        Yields:
+            Float32 audio chunks as they arrive. If the server fails or
+            stalls before any audio, yields FallbackAudio instead; after
+            audio has started, logs and stops.
+        """
+        voice = voice or self.settings.voice
+        speed = speed or self.settings.speed
+        body = self._stream_request(text, voice, speed, priority, split)
+
+        try:
+            resp, data = await self._open_stream(body)
+        except Exception as e:
+            logger.error(f"Remote TTS request failed: {e!r}")
+            audio = await self._fallback(text, voice, speed, priority)
+            if len(audio) > 0:
+                yield audio
+            return
+
+        yielded = False
+        failed = False
+        try:
+            encoding = resp.headers.get("X-Audio-Encoding", self.settings.remote_encoding)
+            sample_bytes = ENCODINGS[encoding]
+            remainder = b""
+            while data:
+                data = remainder + data
+                usable = len(data) - len(data) % sample_bytes
+                remainder = data[usable:]
+                if usable:
+                    yielded = True
+                    yield decode_pcm(data[:usable], encoding)
+                data = await asyncio.wait_for(
+                    resp.content.readany(), self.settings.remote_stall_timeout
+                )
+
+        except asyncio.TimeoutError:
+            failed = True
+            logger.error(
+                f"Remote TTS stream stalled for {self.settings.remote_stall_timeout}s"
+            )
+
+        except Exception as e:
+            failed = True
+            logger.error(f"Remote TTS stream failed: {e!r}")
+
+        finally:
+            # Returns the connection to the pool, or closes it if unread
+            resp.release()
+
+        if failed and not yielded:
+            # Server answered but failed before any audio. A clean end with
+            # no audio (text with nothing to say, e.g. "...") stays silent.
+            audio = await self._fallback(text, voice, speed, priority)
+            if len(audio) > 0:
+                yield audio
+
+    async def _open_stream(self, body: dict) -> tuple[Any, bytes]:
+        """Start a streaming request and wait for its first bytes.
+
+        Launches at most one extra attempt: immediately if the first fails
+        (e.g. a keep-alive connection the server had closed), or as a hedge
+        once the first is slower than the p95 first-byte latency.
+
+        Returns:
+            Tuple of (winning response, its first bytes).
+
+        Raises:
+            asyncio.TimeoutError: No attempt produced bytes within
+                remote_stall_timeout.
+            Exception: Every attempt failed (the last error).
+        """
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        deadline = started + self.settings.remote_stall_timeout
+        hedge_at = self._hedge_delay()
+        if hedge_at is not None:
+            hedge_at += started
+
+        primary = asyncio.ensure_future(self._attempt(body))
+        attempts = {primary}
+        launched = 1
+        last_error: Exception | None = None
+        try:
+            while attempts:
+                wake = deadline
+                if launched == 1 and hedge_at is not None:
+                    wake = min(wake, hedge_at)
+                done, _ = await asyncio.wait(
+                    attempts,
+                    timeout=max(0.0, wake - loop.time()),
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+
+                for task in done:
+                    attempts.discard(task)
+                    if task.exception() is not None:
+                        last_error = task.exception()
+                        continue
+                    self._first_byte_ms.append((loop.time() - started) * 1000)
+                    if task is not primary:
+                        self.hedge_wins += 1
+                    return task.result()
+
+                if loop.time() >= deadline:
+                    raise asyncio.TimeoutError(
+                        f"no audio within {self.settings.remote_stall_timeout}s"
+                    )
+
+                if launched == 1:
+                    if not attempts:
+                        self.retries += 1
+                    elif hedge_at is not None and loop.time() >= hedge_at:
+                        self.hedged += 1
+                    else:
+                        continue
+                    attempts.add(asyncio.ensure_future(self._attempt(body)))
+                    launched += 1
+
+            raise last_error or ConnectionError("all TTS requests failed")
+
+        finally:
+            # Drop losing attempts; close any that completed meanwhile
+            for task in attempts:
+                if not task.done():
+                    task.cancel()
+                elif not task.cancelled() and task.exception() is None:
+                    task.result()[0].close()
+
+    async def _attempt(self, body: dict) -> tuple[Any, bytes]:
+        """POST one streaming request and read its first bytes."""
+        resp = await self._session.post(
+            f"{self.settings.remote_host}/synthesize/stream", json=body
+        )
+        try:
+            if resp.status != 200:
+                error_text = await resp.text()
+                raise ConnectionError(f"TTS server returned status {resp.status}: {error_text}")
+            return resp, await resp.content.readany()
+        except BaseException:
+            resp.close()
+            raise
+
+    def _hedge_delay(self) -> float | None:
+        """Seconds before sending a hedged request (p95 first-byte latency)."""
+        if not self.settings.remote_hedge or len(self._first_byte_ms) < _HEDGE_MIN_SAMPLES:
+            return None
+        ordered = sorted(self._first_byte_ms)
+        return ordered[int(0.95 * (len(ordered) - 1))] / 1000
+
+    async def _fallback(
+        self,
+        text: str,
+        voice: str | None,
+        speed: float | None,
+        priority: int,
+    ) -> NDArray[np.float32]:
+        """Audio to play when the server failed or stalled.
+
+        Returns:
+            Local synthesis of the text or the fallback clip, in this
+            client's output format, as FallbackAudio; or empty audio.
+        """
+        if self._local is not None:
+            self.fallbacks += 1
+            audio = await self._local.synthesize(text, voice, speed, priority)
+            if self._telephone and len(audio) > 0:
+                # Match what the server would have sent: telephone-rendered audio
+                output = OutputStream(
+                    self._local.sample_rate,
+                    self.audio_settings.output_sample_rate,
+                    telephone_filter_sos(
+                        self.audio_settings.output_sample_rate,
+                        self.audio_settings.telephone_lowcut,
+                        self.audio_settings.telephone_highcut,
+                    ),
+                )
+                audio = decode_pcm(output.process(audio) + output.flush(), "s16le")
+            return audio.view(FallbackAudio)
+
+        if self._fallback_clip is not None:
+            self.fallbacks += 1
+            return self._fallback_clip.view(FallbackAudio)
+
+        return np.array([], dtype=np.float32)
+
+    def stats(self) -> dict:
+        """Snapshot of request resilience statistics."""
+        hedge_delay = self._hedge_delay()
+        return {
+            "retries": self.retries,
+            "hedged": self.hedged,
+            "hedge_wins": self.hedge_wins,
+            "fallbacks": self.fallbacks,
+            "hedge_delay_ms": round(hedge_delay * 1000, 1) if hedge_delay is not None else None,
+        }
 
     async def synthesize_to_result(
         self,
@@ -397,24 +938,36 @@ class RemoteTTS:
 
         return TTSResult(
             audio=audio,
-            sample_rate=self._sample_rate,
-            duration_seconds=len(audio) / self._sample_rate if len(audio) > 0 else 0,
+            sample_rate=self.sample_rate,
+            duration_seconds=len(audio) / self.sample_rate if len(audio) > 0 else 0,
             text=text,
         )
 
     @property
     def sample_rate(self) -> int:
-        """Get the output sample rate."""
+        """Get the output sample rate (the telephone rate when server-rendered)."""
+        if self._telephone:
+            return self.audio_settings.output_sample_rate
         return self._sample_rate
 
+    @property
+    def telephone_output(self) -> bool:
+        """Whether the server has already resampled and band-passed the audio."""
+        return self._telephone
+
 
-def create_tts(settings: TTSSettings | None = None) -> KokoroTTS | RemoteTTS:
+def create_tts(
+    settings: TTSSettings | None = None,
+    audio_settings: "AudioSettings | None" = None,
+) -> KokoroTTS | RemoteTTS:
     """Factory function to create the appropriate TTS instance.
 
     Creates either local KokoroTTS or RemoteTTS based on settings.mode.
 
     Args:
         settings: TTS settings. If None, uses defaults.
+        audio_settings: Output audio settings, for server-side telephone
+            rendering in remote mode.
 
     Returns:
         TTS instance (KokoroTTS or RemoteTTS).
@@ -424,7 +977,7 @@ def create_tts(settings: TTSSettings | None = None) -> KokoroTTS | RemoteTTS:
 
     if settings.mode == "remote":
         logger.info("Using remote TTS mode (Pi #2)")
-        return RemoteTTS(settings)
+        return RemoteTTS(settings, audio_settings)
     else:
         logger.info("Using local TTS mode (Kokoro)")
         return KokoroTTS(settings)
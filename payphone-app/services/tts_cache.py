@@ -0,0 +1,235 @@
+"""Persistent cache of rendered telephone audio for fixed phrases.
+
+Greetings, the not-in-service message, timeout prompts and goodbyes are
+spoken on every call with identical text and voice. Rendering them means a
+full Kokoro synthesis plus resample and telephone filter each time. This
+cache stores the final 8kHz int16 PCM (exactly what is sent to Asterisk)
+on disk, content-addressed by everything that affects the output:
+
+    sha256(text, voice, speed, model fingerprint, render settings)
+
+Reads are memory-mapped, so a hit is a page-cache lookup with no copy.
+A small in-memory LRU keeps the most recent maps open. Writes are atomic
+(temp file + rename), so several processes can fill the cache at once.
+"""
+
+__all__ = [
+    "PhraseCache",
+    "create_phrase_cache",
+    "model_fingerprint",
+]
+
+import hashlib
+import logging
+import mmap
+import os
+import tempfile
+from collections import OrderedDict
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from config.settings import AudioSettings, TTSSettings
+
+logger = logging.getLogger(__name__)
+
+# Bytes hashed from each end of a model file for its fingerprint
+_FINGERPRINT_SPAN = 1 << 20
+
+
+def model_fingerprint(*paths: str | Path) -> str | None:
+    """Fingerprint model files cheaply (name, size, first and last 1 MiB).
+
+    Hashing whole multi-hundred-MB ONNX files on every startup is too slow;
+    size plus head and tail bytes changes whenever the model is swapped.
+
+    Args:
+        paths: Model and voice files that determine synthesized output.
+
+    Returns:
+        Hex digest, or None if any file is missing (synthesis would fall
+        back to silence, which must never be cached).
+    """
+    digest = hashlib.sha256()
+    for path in paths:
+        path = Path(path)
+        try:
+            size = path.stat().st_size
+            with open(path, "rb") as f:
+                head = f.read(_FINGERPRINT_SPAN)
+                f.seek(max(0, size - _FINGERPRINT_SPAN))
+                tail = f.read(_FINGERPRINT_SPAN)
+        except OSError:
+            return None
+        digest.update(f"{path.name}:{size}:".encode())
+        digest.update(head)
+        digest.update(tail)
+    return digest.hexdigest()
+
+
+class PhraseCache:
+    """Content-addressed disk cache of rendered PCM with an in-memory LRU.
+
+    Values are raw 8kHz signed 16-bit mono PCM, ready for send_audio().
+    get() returns a read-only memoryview over a memory-mapped file, which
+    supports len(), slicing and bytes concatenation like bytes does.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str | Path,
+        model_id: str,
+        render_id: str = "",
+        max_memory_entries: int = 64,
+    ):
+        """Initialize the cache.
+
+        Args:
+            cache_dir: Directory for cached PCM files (created if missing).
+            model_id: Identifies the TTS model and voices (see model_fingerprint).
+            render_id: Identifies output processing (rate, telephone filter).
+            max_memory_entries: Number of memory maps kept open in the LRU.
+        """
+        self.cache_dir = Path(cache_dir)
+        self.model_id = model_id
+        self.render_id = render_id
+        self.max_memory_entries = max_memory_entries
+
+        self._memory: OrderedDict[str, memoryview] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def key(self, text: str, voice: str, speed: float) -> str:
+        """Compute the content address for a phrase."""
+        material = "\x1f".join(
+            [text.strip(), voice, f"{speed:.4f}", self.model_id, self.render_id]
+        )
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.pcm"
+
+    def get(self, text: str, voice: str, speed: float) -> memoryview | None:
+        """Look up rendered audio for a phrase.
+
+        Returns:
+            Read-only view of the cached PCM, or None on a miss.
+        """
+        key = self.key(text, voice, speed)
+
+        view = self._memory.get(key)
+        if view is not None:
+            self._memory.move_to_end(key)
+            self.hits += 1
+            return view
+
+        try:
+            with open(self._path(key), "rb") as f:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            # Missing file, or empty file (mmap of length 0 is invalid)
+            self.misses += 1
+            return None
+
+        view = memoryview(mapped)
+        self._remember(key, view)
+        self.hits += 1
+        return view
+
+    def put(self, text: str, voice: str, speed: float, pcm: bytes) -> None:
+        """Store rendered audio for a phrase. Empty audio is not stored."""
+        if not pcm:
+            return
+
+        key = self.key(text, voice, speed)
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        # Atomic publish: concurrent writers of the same key produce
+        # identical content, so the last rename winning is harmless
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(pcm)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Failed to write phrase cache entry {path}: {e}")
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            return
+
+        self._memory.pop(key, None)
+
+    def contains(self, text: str, voice: str, speed: float) -> bool:
+        """Check whether a phrase is cached, without counting a hit or miss."""
+        key = self.key(text, voice, speed)
+        return key in self._memory or self._path(key).exists()
+
+    def _remember(self, key: str, view: memoryview) -> None:
+        self._memory[key] = view
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            # Dropping the last reference unmaps the file
+            self._memory.popitem(last=False)
+
+    def disk_usage(self) -> tuple[int, int]:
+        """Return (entry count, total bytes) of the on-disk cache."""
+        count = 0
+        total = 0
+        for path in self.cache_dir.glob("*/*.pcm"):
+            count += 1
+            total += path.stat().st_size
+        return count, total
+
+
+def create_phrase_cache(
+    tts_settings: "TTSSettings",
+    audio_settings: "AudioSettings",
+) -> PhraseCache | None:
+    """Create the phrase cache described by settings, if enabled.
+
+    The model fingerprint covers the local model and voice files. In remote
+    mode the server's files aren't visible, so the host and model name stand
+    in for them. The render id covers the output rate and telephone filter
+    (and whether the server applies it), since cached audio is stored
+    post-processing.
+
+    Args:
+        tts_settings: TTS settings (cache options, model paths, mode).
+        audio_settings: Audio settings (output rate, telephone band).
+
+    Returns:
+        PhraseCache, or None if disabled or the model files are missing.
+    """
+    if not tts_settings.phrase_cache_enabled:
+        return None
+
+    if tts_settings.mode == "remote":
+        model_id = f"remote:{tts_settings.remote_host}:{tts_settings.model_path}"
+    else:
+        model_id = model_fingerprint(tts_settings.model_path, tts_settings.voices_path)
+        if model_id is None:
+            logger.info("Phrase cache disabled: TTS model files not found")
+            return None
+
+    render_id = (
+        f"{audio_settings.output_sample_rate}:"
+        f"{audio_settings.telephone_lowcut}-{audio_settings.telephone_highcut}"
+    )
+    if tts_settings.mode == "remote" and tts_settings.remote_output == "telephone":
+        # Server-side rendering filters causally; keep its output separate
+        render_id += ":server"
+    try:
+        return PhraseCache(
+            tts_settings.phrase_cache_dir,
+            model_id=model_id,
+            render_id=render_id,
+            max_memory_entries=tts_settings.phrase_cache_memory_entries,
+        )
+    except OSError as e:
+        logger.warning(f"Phrase cache disabled: {e}")
+        return None
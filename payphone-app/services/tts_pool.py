@@ -0,0 +1,330 @@
+"""Prioritized worker pool for Kokoro synthesis.
+
+A single Kokoro instance behind a global lock makes every caller's
+sentences synthesize strictly one after another, so tail latency grows
+linearly with the number of concurrent calls. This module runs N model
+instances (each its own ONNX Runtime session with a share of the CPU
+cores as intra-op threads) behind one priority queue.
+
+The first sentence of a turn is what the caller is waiting on in
+silence; later sentences are synthesized while earlier ones play. Jobs
+submitted with PRIORITY_FIRST therefore jump ahead of queued
+PRIORITY_NORMAL jobs from any call; within a priority, jobs run FIFO.
+
+Micro-batching: given a batch_fn, a worker that picks up a job waits up
+to batch_window_ms for more to arrive and runs them as one batched model
+call. Without one, each job goes to the next free instance as soon as
+it is queued, which is the right dispatch for models that can't batch.
+
+Queue waits and batch sizes are recorded in Histograms for /metrics.
+
+Standard library only at import time, so tts_server.py can use it
+without the rest of the app's dependencies.
+"""
+
+__all__ = [
+    "PRIORITY_FIRST",
+    "PRIORITY_NORMAL",
+    "TTSWorkerPool",
+    "load_kokoro_instances",
+]
+
+import asyncio
+import itertools
+import logging
+import os
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+from services.metrics import Histogram
+
+logger = logging.getLogger(__name__)
+
+PRIORITY_FIRST = 0  # First sentence of a turn: the caller is waiting
+PRIORITY_NORMAL = 1  # Later sentences: synthesized while earlier ones play
+
+# Histogram buckets for batch sizes, in jobs
+BATCH_BUCKETS = (1, 2, 3, 4, 6, 8, 16)
+
+
+def load_kokoro_instances(
+    model_path: str,
+    voices_path: str,
+    count: int = 1,
+    intra_op_threads: int = 0,
+) -> list[Any]:
+    """Load independent Kokoro instances, one ONNX session each.
+
+    Args:
+        model_path: Path to the Kokoro ONNX model.
+        voices_path: Path to the voices file.
+        count: Number of instances to load.
+        intra_op_threads: ONNX intra-op threads per session. 0 splits the
+            CPU cores evenly across instances.
+
+    Returns:
+        List of kokoro_onnx.Kokoro instances.
+
+    Raises:
+        ImportError: If kokoro-onnx (or onnxruntime) is not installed.
+        FileNotFoundError: If model files are missing.
+    """
+    from kokoro_onnx import Kokoro
+
+    count = max(1, count)
+    if intra_op_threads <= 0:
+        intra_op_threads = max(1, (os.cpu_count() or 1) // count)
+
+    try:
+        import onnxruntime as ort
+    except ImportError:
+        ort = None
+
+    if ort is None or not hasattr(Kokoro, "from_session"):
+        # Older kokoro-onnx: no session control, default threading
+        return [Kokoro(model_path, voices_path) for _ in range(count)]
+
+    if not os.path.exists(model_path):
+        raise FileNotFoundError(model_path)
+
+    instances = []
+    for _ in range(count):
+        options = ort.SessionOptions()
+        options.intra_op_num_threads = intra_op_threads
+        options.inter_op_num_threads = 1
+        session = ort.InferenceSession(
+            model_path, sess_options=options, providers=["CPUExecutionProvider"]
+        )
+        instances.append(Kokoro.from_session(session, voices_path))
+
+    logger.info(
+        f"Loaded {count} Kokoro instance(s), {intra_op_threads} intra-op thread(s) each"
+    )
+    return instances
+
+
+class TTSWorkerPool:
+    """Runs synthesis jobs on N model instances in priority order.
+
+    Each instance is owned by one worker task and only ever used from one
+    thread at a time, so models need not be thread-safe. A job cancelled
+    while queued is skipped; one cancelled while running finishes on its
+    worker (ONNX can't be interrupted) and its result is dropped.
+    """
+
+    def __init__(
+        self,
+        models: list[Any],
+        fn: Callable[..., Any],
+        batch_fn: Callable[[Any, list[tuple]], list[Any]] | None = None,
+        max_batch: int = 1,
+        batch_window_ms: float = 0.0,
+    ):
+        """Initialize the pool.
+
+        Args:
+            models: Model instances, one per worker.
+            fn: Blocking function called as fn(model, *args) in a worker thread.
+            batch_fn: Optional blocking function called as
+                batch_fn(model, [args, ...]) for two or more jobs, returning
+                one result per job in order.
+            max_batch: Most jobs per batch_fn call.
+            batch_window_ms: How long a worker holding one job waits for
+                more before running (only with batch_fn).
+        """
+        if not models:
+            raise ValueError("TTSWorkerPool needs at least one model instance")
+        self._models = models
+        self._fn = fn
+        self._batch_fn = batch_fn if max_batch > 1 else None
+        self._max_batch = max_batch
+        self._batch_window = batch_window_ms / 1000
+        self._queue: asyncio.PriorityQueue | None = None
+        self._executor: ThreadPoolExecutor | None = None
+        self._workers: list[asyncio.Task] = []
+        self._seq = itertools.count()
+
+        self._jobs = 0
+        self._busy = 0
+        self._max_queue_depth = 0
+        self._wait: dict[int, Histogram] = {}
+        self._batch_sizes = Histogram(BATCH_BUCKETS)
+
+    @property
+    def size(self) -> int:
+        """Number of model instances (parallel jobs)."""
+        return len(self._models)
+
+    def start(self) -> None:
+        """Start worker tasks on the running event loop."""
+        if self._workers:
+            return
+        self._queue = asyncio.PriorityQueue()
+        self._executor = ThreadPoolExecutor(
+            max_workers=len(self._models), thread_name_prefix="tts-worker"
+        )
+        self._workers = [
+            asyncio.create_task(self._worker(model)) for model in self._models
+        ]
+
+    async def submit(self, priority: int, *args: Any) -> Any:
+        """Queue a job and wait for its result.
+
+        Args:
+            priority: PRIORITY_FIRST or PRIORITY_NORMAL (lower runs first).
+            args: Arguments passed to fn after the model.
+
+        Returns:
+            Whatever fn returns.
+        """
+        if self._queue is None:
+            self.start()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((priority, next(self._seq), time.perf_counter(), future, args))
+        self._max_queue_depth = max(self._max_queue_depth, self._queue.qsize())
+        return await future
+
+    async def _worker(self, model: Any) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            jobs = [await self._queue.get()]
+            if self._batch_fn is not None:
+                await self._collect_batch(jobs)
+
+            # Skip jobs whose submitter gave up (cancelled) while queued
+            jobs = [job for job in jobs if not job[3].done()]
+            if not jobs:
+                continue
+
+            now = time.perf_counter()
+            for priority, _, queued_at, _, _ in jobs:
+                self._wait.setdefault(priority, Histogram()).observe(now - queued_at)
+            self._batch_sizes.observe(len(jobs))
+
+            self._busy += 1
+            try:
+                if len(jobs) == 1:
+                    ok, outcome = await loop.run_in_executor(
+                        self._executor, self._call, model, jobs[0][4]
+                    )
+                    outcomes = [(ok, outcome)]
+                else:
+                    outcomes = await loop.run_in_executor(
+                        self._executor, self._call_batch, model, [job[4] for job in jobs]
+                    )
+            finally:
+                self._busy -= 1
+                self._jobs += len(jobs)
+
+            for (_, _, _, future, _), (ok, outcome) in zip(jobs, outcomes, strict=True):
+                if not future.done():
+                    if ok:
+                        future.set_result(outcome)
+                    else:
+                        future.set_exception(outcome)
+
+    async def _collect_batch(self, jobs: list[tuple]) -> None:
+        """Add jobs arriving within the batch window to jobs (in place)."""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self._batch_window
+        while len(jobs) < self._max_batch:
+            if not self._queue.empty():
+                jobs.append(self._queue.get_nowait())
+                continue
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                jobs.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+
+    def _call(self, model: Any, args: tuple) -> tuple[bool, Any]:
+        """Run fn in the worker thread, capturing any exception there.
+
+        Capturing in the thread keeps the worker coroutine's frame out of
+        the exception's traceback, so a caller clearing traceback frames
+        can't finalize the worker.
+        """
+        try:
+            return True, self._fn(model, *args)
+        except Exception as e:
+            return False, e
+
+    def _call_batch(self, model: Any, batch: list[tuple]) -> list[tuple[bool, Any]]:
+        """Run batch_fn in the worker thread; one failure fails the batch."""
+        try:
+            results = self._batch_fn(model, batch)
+            if len(results) != len(batch):
+                raise RuntimeError(
+                    f"batch_fn returned {len(results)} results for {len(batch)} jobs"
+                )
+            return [(True, result) for result in results]
+        except Exception as e:
+            return [(False, e)] * len(batch)
+
+    def stats(self) -> dict:
+        """Snapshot of pool statistics."""
+        return {
+            "workers": len(self._models),
+            "busy": self._busy,
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "jobs": self._jobs,
+            "max_queue_depth": self._max_queue_depth,
+            "avg_wait_ms": {
+                priority: round(histogram.mean * 1000, 1)
+                for priority, histogram in sorted(self._wait.items())
+            },
+            "avg_batch_size": round(self._batch_sizes.mean, 2),
+        }
+
+    def metrics(self) -> list[str]:
+        """Pool metrics in the Prometheus text format."""
+        lines = [
+            "# HELP tts_workers Model instances in the pool.",
+            "# TYPE tts_workers gauge",
+            f"tts_workers {len(self._models)}",
+            "# HELP tts_workers_busy Instances currently synthesizing.",
+            "# TYPE tts_workers_busy gauge",
+            f"tts_workers_busy {self._busy}",
+            "# HELP tts_queue_depth Jobs waiting for an instance.",
+            "# TYPE tts_queue_depth gauge",
+            f"tts_queue_depth {self._queue.qsize() if self._queue is not None else 0}",
+            "# HELP tts_jobs_total Synthesis jobs completed.",
+            "# TYPE tts_jobs_total counter",
+            f"tts_jobs_total {self._jobs}",
+        ]
+        lines += Histogram.render(
+            "tts_queue_wait_seconds",
+            "Time jobs waited for an instance, by priority.",
+            {f'priority="{p}"': h for p, h in sorted(self._wait.items())},
+        )
+        lines += Histogram.render(
+            "tts_batch_size",
+            "Jobs per model call.",
+            {"": self._batch_sizes},
+        )
+        return lines
+
+    async def shutdown(self) -> None:
+        """Stop workers and release the executor."""
+        for task in self._workers:
+            task.cancel()
+        for task in self._workers:
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._workers = []
+        if self._queue is not None:
+            # Fail anything still waiting so callers don't hang
+            while not self._queue.empty():
+                *_, future, _args = self._queue.get_nowait()
+                if not future.done():
+                    future.set_exception(RuntimeError("TTS worker pool shut down"))
+            self._queue = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
@@ -0,0 +1,308 @@
+"""Clause-segment streaming and PCM wire encoding for synthesized speech.
+
+Shared by KokoroTTS (local synthesis), tts_server.py (remote synthesis)
+and RemoteTTS (the client of tts_server.py):
+
+- split_segments() / stream_segments(): split a sentence at clause breaks
+  and synthesize it segment by segment, prefetching the next segment while
+  the current one is consumed.
+- encode_pcm() / decode_pcm(): raw PCM encodings for the binary streaming
+  endpoint, which sends audio as a plain byte stream instead of base64
+  inside JSON.
+- OutputStream: incremental resample + telephone band-pass, used by the
+  pipeline for local synthesis and by the server to render 8kHz telephone
+  audio before it crosses the network.
+
+Standard library, numpy and scipy only, so tts_server.py can use it
+without the rest of the app's dependencies.
+"""
+
+__all__ = [
+    "ENCODINGS",
+    "OutputStream",
+    "SEGMENT_GAP_SECONDS",
+    "decode_pcm",
+    "encode_pcm",
+    "split_segments",
+    "stream_segments",
+    "telephone_filter_sos",
+]
+
+import asyncio
+import re
+from collections.abc import AsyncIterator, Awaitable, Callable
+from math import gcd
+
+import numpy as np
+from numpy.typing import NDArray
+from scipy import signal
+
+# Clause boundaries where a sentence can be split for segment streaming
+_CLAUSE_BREAK = re.compile(r"(?<=[,;:\u2014])\s+")
+
+# Pause inserted after a clause segment (Kokoro trims segment edges, which
+# would otherwise swallow the comma pause)
+SEGMENT_GAP_SECONDS = 0.08
+
+# Wire encodings for streamed audio: name -> bytes per sample
+ENCODINGS = {
+    "f32le": 4,  # float32, lossless
+    "s16le": 2,  # int16, half the bytes; inaudible loss for telephone output
+    "mulaw": 1,  # G.711 mu-law, the telephone network's own 8-bit encoding
+}
+
+# G.711 mu-law constants, on 14-bit magnitudes
+_MULAW_BIAS = 33
+_MULAW_CLIP = 8158  # Largest magnitude that stays in the top segment
+
+
+def split_segments(text: str, min_chars: int = 20) -> list[str]:
+    """Split a sentence into clause segments for incremental synthesis.
+
+    Splits after commas, semicolons, colons and dashes, then merges pieces
+    shorter than min_chars into their neighbour so segments stay long
+    enough to carry natural prosody.
+
+    Args:
+        text: Sentence to split.
+        min_chars: Minimum segment length; 0 disables splitting.
+
+    Returns:
+        Non-empty list of segments that join (with spaces) back to text.
+    """
+    text = text.strip()
+    if min_chars <= 0 or len(text) < 2 * min_chars:
+        return [text]
+
+    segments: list[str] = []
+    for piece in _CLAUSE_BREAK.split(text):
+        if segments and len(segments[-1]) < min_chars:
+            segments[-1] = f"{segments[-1]} {piece}"
+        else:
+            segments.append(piece)
+
+    # A short trailing piece joins the previous segment
+    if len(segments) > 1 and len(segments[-1]) < min_chars:
+        tail = segments.pop()
+        segments[-1] = f"{segments[-1]} {tail}"
+    return segments
+
+
+async def stream_segments(
+    synthesize: Callable[[str, int], Awaitable[NDArray[np.float32]]],
+    segments: list[str],
+    priority: int,
+    later_priority: int,
+    sample_rate: int,
+) -> AsyncIterator[NDArray[np.float32]]:
+    """Synthesize segments in order, prefetching the next one.
+
+    Args:
+        synthesize: Coroutine function (text, priority) -> float32 audio.
+        segments: Segments from split_segments().
+        priority: Priority of the first segment.
+        later_priority: Priority of later segments (playback is under way).
+        sample_rate: Sample rate of the synthesized audio, for the gap.
+
+    Yields:
+        Float32 audio per segment, with a short pause after all but the last.
+    """
+    gap = np.zeros(int(SEGMENT_GAP_SECONDS * sample_rate), dtype=np.float32)
+
+    pending = asyncio.ensure_future(synthesize(segments[0], priority))
+    try:
+        for index in range(len(segments)):
+            audio = await pending
+            is_last = index == len(segments) - 1
+            if not is_last:
+                pending = asyncio.ensure_future(
+                    synthesize(segments[index + 1], later_priority)
+                )
+            if len(audio) > 0:
+                yield audio if is_last else np.concatenate([audio, gap])
+    finally:
+        if not pending.done():
+            pending.cancel()
+
+
+def encode_pcm(audio: NDArray, encoding: str) -> bytes:
+    """Encode audio for the wire.
+
+    Args:
+        audio: Float32 samples in [-1, 1], or int16 samples.
+        encoding: One of ENCODINGS.
+
+    Raises:
+        ValueError: If encoding is not one of ENCODINGS.
+    """
+    if encoding not in ENCODINGS:
+        raise ValueError(f"Unknown PCM encoding: {encoding}")
+
+    if audio.dtype == np.int16:
+        if encoding == "f32le":
+            return (audio.astype("<f4") / 32768.0).tobytes()
+        pcm16 = audio
+    elif encoding == "f32le":
+        return audio.astype("<f4").tobytes()
+    else:
+        pcm16 = (np.clip(audio, -1.0, 1.0) * 32767).astype(np.int16)
+
+    if encoding == "s16le":
+        return pcm16.astype("<i2").tobytes()
+    return _mulaw_encode(pcm16).tobytes()
+
+
+def decode_pcm(data: bytes, encoding: str) -> NDArray[np.float32]:
+    """Decode wire PCM (a whole number of samples) to float32.
+
+    Raises:
+        ValueError: If encoding is not one of ENCODINGS.
+    """
+    if encoding == "f32le":
+        return np.frombuffer(data, dtype="<f4").astype(np.float32)
+    if encoding == "s16le":
+        return np.frombuffer(data, dtype="<i2").astype(np.float32) / 32768.0
+    if encoding == "mulaw":
+        return _mulaw_decode(np.frombuffer(data, dtype=np.uint8)).astype(np.float32) / 32768.0
+    raise ValueError(f"Unknown PCM encoding: {encoding}")
+
+
+def _mulaw_encode(pcm16: NDArray[np.int16]) -> NDArray[np.uint8]:
+    """G.711 mu-law encode (same output as the removed audioop.lin2ulaw)."""
+    # 14-bit magnitude, as in the G.711 reference implementation
+    samples = pcm16.astype(np.int32) >> 2
+    negative = samples < 0
+    magnitude = np.minimum(np.abs(samples), _MULAW_CLIP) + _MULAW_BIAS
+    segment = np.floor(np.log2(magnitude)).astype(np.int32) - 5
+    code = (segment << 4) | ((magnitude >> (segment + 1)) & 0x0F)
+    return (code ^ np.where(negative, 0x7F, 0xFF)).astype(np.uint8)
+
+
+def _mulaw_decode(codes: NDArray[np.uint8]) -> NDArray[np.int16]:
+    """G.711 mu-law decode."""
+    codes = ~codes.astype(np.int32) & 0xFF
+    exponent = (codes >> 4) & 0x07
+    mantissa = codes & 0x0F
+    magnitude = (((mantissa << 3) + (_MULAW_BIAS << 2)) << exponent) - (_MULAW_BIAS << 2)
+    return np.where(codes & 0x80, -magnitude, magnitude).astype(np.int16)
+
+
+def telephone_filter_sos(sample_rate: int, lowcut: float, highcut: float) -> NDArray:
+    """Design the telephone band-pass as second-order sections.
+
+    Args:
+        sample_rate: Output sample rate.
+        lowcut: Lower band edge in Hz (300 for POTS).
+        highcut: Upper band edge in Hz (3400 for POTS).
+
+    Returns:
+        SOS filter coefficients array.
+    """
+    nyquist = sample_rate / 2
+    low = lowcut / nyquist
+    high = highcut / nyquist
+
+    # Clamp to valid range
+    low = max(0.001, min(low, 0.99))
+    high = max(low + 0.001, min(high, 0.99))
+
+    # 4th order Butterworth bandpass using SOS format
+    # SOS provides better numerical stability than transfer function (b, a)
+    return signal.butter(4, [low, high], btype="band", output="sos")
+
+
+class OutputStream:
+    """Incremental version of AudioProcessor.process_for_output().
+
+    process_for_output() resamples with resample_poly and filters with
+    zero-phase sosfiltfilt, both of which need the whole signal; applied
+    per segment they leave clicks at every boundary. This keeps filter
+    state across calls instead:
+
+    - Resampling uses the same Kaiser FIR as resample_poly, run through
+      lfilter with carried state and decimated with a tracked phase, so
+      segment outputs concatenate to the one-shot resample (up to float
+      rounding). The FIR's group delay is dropped from the front and
+      emitted by flush().
+    - The telephone band-pass runs causally (sosfilt with carried state).
+      Same magnitude band edges, with minimum-phase rather than zero-phase
+      response, which is inaudible on speech.
+    """
+
+    def __init__(self, from_rate: int, to_rate: int, sos: NDArray | None = None):
+        """Initialize the stream.
+
+        Args:
+            from_rate: Sample rate of the incoming audio.
+            to_rate: Output sample rate.
+            sos: Telephone band-pass (telephone_filter_sos()), or None to
+                skip filtering (audio already band-limited).
+        """
+        self._sos = sos
+        if sos is not None:
+            self._sos_zi = np.zeros((sos.shape[0], 2), dtype=np.float64)
+
+        g = gcd(from_rate, to_rate)
+        self._up = to_rate // g
+        self._down = from_rate // g
+
+        if self._up == self._down == 1:
+            self._fir = None
+            self._delay = 0
+        else:
+            # Identical design to scipy.signal.resample_poly's default
+            max_rate = max(self._up, self._down)
+            half_len = 10 * max_rate
+            self._fir = signal.firwin(
+                2 * half_len + 1, 1.0 / max_rate, window=("kaiser", 5.0)
+            ) * self._up
+            self._fir_zi = np.zeros(len(self._fir) - 1, dtype=np.float64)
+            self._delay = half_len  # Group delay, in upsampled samples
+
+        self._skip = self._delay
+        self._position = 0  # Samples emitted from the delay-compensated stream
+
+    def _resample(self, samples: NDArray) -> NDArray:
+        if self._fir is None:
+            return samples.astype(np.float64)
+
+        if self._up > 1:
+            upsampled = np.zeros(len(samples) * self._up, dtype=np.float64)
+            upsampled[:: self._up] = samples
+        else:
+            upsampled = samples.astype(np.float64)
+
+        filtered, self._fir_zi = signal.lfilter(self._fir, 1.0, upsampled, zi=self._fir_zi)
+
+        # Drop the FIR's group delay so output aligns with resample_poly
+        if self._skip:
+            dropped = min(self._skip, len(filtered))
+            filtered = filtered[dropped:]
+            self._skip -= dropped
+
+        start = (-self._position) % self._down
+        self._position += len(filtered)
+        return filtered[start :: self._down]
+
+    def process(self, samples: NDArray) -> bytes:
+        """Process one segment of TTS audio.
+
+        Args:
+            samples: Float32 audio at the stream's input rate.
+
+        Returns:
+            Output bytes (16-bit PCM at the output rate) for this segment.
+        """
+        resampled = self._resample(samples)
+        if len(resampled) == 0:
+            return b""
+        if self._sos is not None:
+            resampled, self._sos_zi = signal.sosfilt(self._sos, resampled, zi=self._sos_zi)
+        return (resampled * 32767.0).clip(-32768, 32767).astype(np.int16).tobytes()
+
+    def flush(self) -> bytes:
+        """Emit the tail held back by the resampling filter's delay."""
+        if self._fir is None:
+            return b""
+        tail_inputs = -(-self._delay // self._up)  # ceil
+        return self.process(np.zeros(tail_inputs, dtype=np.float32))
@@ -19,12 +19,20 @@ and their I/O shapes at runtime.
 Wyoming protocol events:
     Receive: audio-start, audio-chunk (binary payload), audio-stop
     Send: transcript (with text in data)
+    Also: npu-stats -> npu-stats (scheduler queue metrics, non-standard)
+
+Concurrent requests share the NPU through NPUScheduler, which interleaves
+encoder and decoder passes from different requests in FIFO order.
 
 Usage:
     python services/wyoming_whisper_server.py \\
         --hef /usr/local/hailo/resources/models/hailo10h/Whisper-Base.hef \\
         --model-dir ../models --port 10300
 
+    # Without the NPU: CPU reference (faster-whisper) or deterministic fake
+    python services/wyoming_whisper_server.py --engine cpu --cpu-model tiny
+    python services/wyoming_whisper_server.py --engine fake --fake-decoder-ms 20
+
 Dependencies (Pi #1):
     - hailo_platform (system package: python3-h10-hailort 5.1.1)
     - numpy, scipy (pip, already in venv)
@@ -37,10 +45,16 @@ import json
 import logging
 import signal
 import sys
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
+from typing import Protocol
 
 import numpy as np
+from scipy import fft as sp_fft
+from scipy import sparse
 
 logger = logging.getLogger("wyoming_whisper")
 
@@ -66,21 +80,37 @@ REPETITION_PENALTY = 1.5
 
 
 # ---------------------------------------------------------------------------
-# Mel spectrogram (pure numpy — no torch or librosa dependency)
+# Mel spectrogram (numpy + scipy.fft — no torch or librosa dependency)
 # ---------------------------------------------------------------------------
+N_FRAMES = N_SAMPLES // HOP_LENGTH  # 1000 encoder frames per 10s window
+_PAD = N_FFT // 2  # 200 samples of reflect padding (torch.stft center=True)
+
+
 class MelSpectrogram:
     """Compute log-mel spectrograms compatible with OpenAI Whisper.
 
-    Replicates Whisper's preprocessing using numpy FFT and a mel filterbank
-    computed from the HTK mel scale with Slaney normalization.
+    Replicates Whisper's preprocessing using scipy's float32 FFT and a mel
+    filterbank computed from the HTK mel scale with Slaney normalization.
+
+    The filterbank is ~98% zeros (each triangle spans a handful of FFT bins),
+    so it is applied as a CSR sparse matrix rather than a dense matmul.
+    Everything stays float32 end-to-end.
+
+    For streaming input use stream() to get a MelStream that computes frames
+    as audio chunks arrive; calling the object directly computes the whole
+    window in one shot.
     """
 
-    def __init__(self):
+    def __init__(self, workers: int = 1):
+        self.workers = workers
         self._filterbank = self._make_filterbank()
+        self._filterbank_sparse = sparse.csr_matrix(self._filterbank)
         # Periodic Hann window matching torch.hann_window(N_FFT)
         self._window = (0.5 - 0.5 * np.cos(
             2.0 * np.pi * np.arange(N_FFT) / N_FFT
         )).astype(np.float32)
+        # One reusable stream per thread for one-shot __call__
+        self._local = threading.local()
 
     @staticmethod
     def _make_filterbank() -> np.ndarray:
@@ -120,53 +150,288 @@ class MelSpectrogram:
 
         return fb
 
-    def __call__(self, audio: np.ndarray) -> np.ndarray:
+    def stream(self) -> "MelStream":
+        """Create an incremental mel computation for one utterance."""
+        return MelStream(self)
+
+    def __call__(self, audio: np.ndarray, out: np.ndarray | None = None) -> np.ndarray:
         """Convert audio to log-mel spectrogram.
 
         Args:
             audio: Float32 samples at 16kHz.
+            out: Optional reusable output buffer of shape (N_MELS, N_FRAMES).
 
         Returns:
             Log-mel spectrogram of shape (N_MELS, n_frames) where
             n_frames = N_SAMPLES // HOP_LENGTH (1000 for 10s).
         """
-        # Pad or trim to exactly CHUNK_LENGTH_S seconds
-        if len(audio) > N_SAMPLES:
-            audio = audio[:N_SAMPLES]
-        else:
-            audio = np.pad(audio, (0, max(0, N_SAMPLES - len(audio))))
+        stream = getattr(self._local, "stream", None)
+        if stream is None:
+            stream = self._local.stream = MelStream(self)
+        stream.reset()
+        stream.feed(audio)
+        return stream.finalize(out)
+
+    def _compute_frames(
+        self,
+        padded: np.ndarray,
+        start: int,
+        stop: int,
+        frame_buf: np.ndarray,
+        mel_power: np.ndarray,
+    ) -> None:
+        """Compute mel power for frames [start, stop) into mel_power rows."""
+        n = stop - start
+        if n <= 0:
+            return
+        stride = padded.strides[0]
+        frames = np.lib.stride_tricks.as_strided(
+            padded[start * HOP_LENGTH :],
+            shape=(n, N_FFT),
+            strides=(stride * HOP_LENGTH, stride),
+            writeable=False,
+        )
 
-        audio = audio.astype(np.float32)
+        # Window straight into the scratch buffer (no intermediate frame copy)
+        windowed = np.multiply(frames, self._window, out=frame_buf[:n])
+        spectrum = sp_fft.rfft(windowed, n=N_FFT, axis=-1, workers=self.workers)
 
-        # Reflect-pad signal (matching torch.stft center=True)
-        pad_len = N_FFT // 2  # 200
-        audio_padded = np.pad(audio, (pad_len, pad_len), mode="reflect")
+        # |X|^2 without the sqrt/square round trip of np.abs(...)**2
+        power = np.square(spectrum.real)
+        power += np.square(spectrum.imag)
 
-        # Frame the signal
-        n_frames = 1 + (len(audio_padded) - N_FFT) // HOP_LENGTH
-        frames = np.lib.stride_tricks.as_strided(
-            audio_padded,
-            shape=(n_frames, N_FFT),
-            strides=(audio_padded.strides[0] * HOP_LENGTH, audio_padded.strides[0]),
-        ).copy()  # copy to avoid stride issues with FFT
+        mel_power[start:stop] = (self._filterbank_sparse @ power.T).T
+
+
+class MelStream:
+    """Incremental log-mel computation for a single 10s Whisper window.
+
+    Frames are computed as soon as every sample under their FFT window has
+    arrived, so by the time the client sends audio-stop only the last few
+    frames (and the global log normalization) remain. Buffers are allocated
+    once and reused across reset() calls.
+
+    Produces exactly the same result as zero-padding/trimming the full
+    utterance to N_SAMPLES and running MelSpectrogram on it.
+    """
+
+    def __init__(self, mel: MelSpectrogram):
+        self._mel = mel
+        # Reflect-padded signal: [200 head reflection | N_SAMPLES audio | 200 tail]
+        self._padded = np.zeros(N_SAMPLES + 2 * _PAD, dtype=np.float32)
+        self._frame_buf = np.empty((N_FRAMES, N_FFT), dtype=np.float32)
+        # Frame-major so the encoder's channels-last (1, 1000, 80) input is a free view
+        self._mel_power = np.empty((N_FRAMES, N_MELS), dtype=np.float32)
+        self._num_samples = 0
+        self._frames_done = 0
+        self._head_ready = False
+
+    def reset(self) -> None:
+        """Clear state for a new utterance (keeps allocated buffers)."""
+        self._padded[: _PAD + self._num_samples] = 0.0
+        self._padded[_PAD + N_SAMPLES :] = 0.0
+        self._num_samples = 0
+        self._frames_done = 0
+        self._head_ready = False
+
+    @property
+    def num_samples(self) -> int:
+        """Samples accepted so far (capped at N_SAMPLES)."""
+        return self._num_samples
+
+    @property
+    def frames_ready(self) -> int:
+        """Frames whose mel power has already been computed."""
+        return self._frames_done
+
+    def feed(self, audio: np.ndarray) -> None:
+        """Append 16kHz float samples and compute every frame now complete.
+
+        Samples beyond N_SAMPLES are dropped, matching the one-shot trim.
+        """
+        room = N_SAMPLES - self._num_samples
+        take = min(room, len(audio))
+        if take > 0:
+            pos = _PAD + self._num_samples
+            self._padded[pos : pos + take] = audio[:take]
+            self._num_samples += take
+
+        if not self._head_ready:
+            if self._num_samples <= _PAD:
+                return  # Frame 0 needs x[1..200] for its reflection
+            self._fill_head()
+
+        # Frame t spans x[t*HOP - 200, t*HOP + 200); ready once those samples exist
+        ready = min(N_FRAMES, (self._num_samples - _PAD) // HOP_LENGTH + 1)
+        self._compute_until(ready)
+
+    def finalize(self, out: np.ndarray | None = None) -> np.ndarray:
+        """Finish the remaining frames and apply Whisper's log normalization.
+
+        Args:
+            out: Optional reusable buffer of shape (N_MELS, N_FRAMES).
+
+        Returns:
+            Log-mel spectrogram of shape (N_MELS, N_FRAMES). When out is not
+            given the result is a transposed view of frame-major memory, so
+            ``result.T`` is C-contiguous (N_FRAMES, N_MELS).
+        """
+        # Remaining samples are already zero (implicit zero-pad to N_SAMPLES)
+        if not self._head_ready:
+            self._fill_head()
+        # Tail reflection: padded[N+200+j] = x[N-2-j]
+        end = _PAD + N_SAMPLES
+        self._padded[end:] = self._padded[end - 2 : end - 2 - _PAD : -1]
+        self._compute_until(N_FRAMES)
+
+        if out is None:
+            out = np.empty((N_FRAMES, N_MELS), dtype=np.float32).T
+        log_spec = out.T  # (N_FRAMES, N_MELS) view matching _mel_power layout
+
+        # Log scale with Whisper normalization (in place)
+        np.maximum(self._mel_power, 1e-10, out=log_spec)
+        np.log10(log_spec, out=log_spec)
+        np.maximum(log_spec, log_spec.max() - 8.0, out=log_spec)
+        log_spec += 4.0
+        log_spec /= 4.0
+
+        return out
+
+    def _fill_head(self) -> None:
+        # Head reflection: padded[200-k] = x[k] for k in 1..200
+        self._padded[:_PAD] = self._padded[2 * _PAD : _PAD : -1]
+        self._head_ready = True
+
+    def _compute_until(self, stop: int) -> None:
+        if stop > self._frames_done:
+            self._mel._compute_frames(
+                self._padded,
+                self._frames_done,
+                stop,
+                self._frame_buf,
+                self._mel_power,
+            )
+            self._frames_done = stop
 
-        # Apply window and compute FFT
-        windowed = frames * self._window
-        spectrum = np.fft.rfft(windowed, n=N_FFT)  # (n_frames, n_freqs)
 
-        # Power spectrogram — drop last time frame to match Whisper
-        magnitudes = np.abs(spectrum[:-1]) ** 2  # (n_frames-1, n_freqs)
-        magnitudes = magnitudes.T  # (n_freqs, n_frames) = (201, 1000)
+# ---------------------------------------------------------------------------
+# NPU job scheduler
+# ---------------------------------------------------------------------------
+@dataclass
+class NPUSchedulerStats:
+    """Counters for the NPU job queue (snapshot via NPUScheduler.stats())."""
+
+    queue_depth: int = 0
+    max_queue_depth: int = 0
+    active_requests: int = 0
+    jobs_completed: dict[str, int] = field(default_factory=dict)
+    total_wait_ms: float = 0.0
+    max_wait_ms: float = 0.0
+    total_busy_ms: float = 0.0
+
+    def to_dict(self) -> dict:
+        completed = sum(self.jobs_completed.values())
+        return {
+            "queue_depth": self.queue_depth,
+            "max_queue_depth": self.max_queue_depth,
+            "active_requests": self.active_requests,
+            "jobs_completed": dict(self.jobs_completed),
+            "avg_wait_ms": round(self.total_wait_ms / completed, 2) if completed else 0.0,
+            "max_wait_ms": round(self.max_wait_ms, 2),
+            "total_busy_ms": round(self.total_busy_ms, 1),
+        }
+
+
+class NPUScheduler:
+    """FIFO scheduler that interleaves NPU jobs from concurrent requests.
+
+    All encoder and decoder passes run on a single dedicated thread, so
+    the NPU is never driven from two threads at once. Each request keeps at
+    most one job outstanding (the next decoder step depends on the previous
+    one's argmax), so FIFO order round-robins the NPU across requests:
+    request B's encoder runs between two of A's decoder steps rather than
+    after A's whole decode. CPU-side work happens off this thread and no
+    longer holds the NPU idle.
+    """
 
-        # Apply mel filterbank
-        mel_spec = self._filterbank @ magnitudes  # (80, 1000)
+    def __init__(self):
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="npu")
+        self._stats = NPUSchedulerStats()
+        self._stats_lock = threading.Lock()
 
-        # Log scale with Whisper normalization
-        log_spec = np.log10(np.maximum(mel_spec, 1e-10))
-        log_spec = np.maximum(log_spec, log_spec.max() - 8.0)
-        log_spec = (log_spec + 4.0) / 4.0
+    async def submit(self, kind: str, fn, *args):
+        """Queue an NPU job and wait for its result.
 
-        return log_spec.astype(np.float32)
+        Args:
+            kind: Job label for metrics ("encoder", "decoder").
+            fn: Blocking callable that drives the NPU.
+            *args: Arguments for fn.
+        """
+        enqueued = time.monotonic()
+        dequeued = False
+        with self._stats_lock:
+            self._stats.queue_depth += 1
+            self._stats.max_queue_depth = max(
+                self._stats.max_queue_depth, self._stats.queue_depth
+            )
+
+        def leave_queue():
+            # Runs exactly once: when the job starts, or if it is cancelled unrun
+            nonlocal dequeued
+            with self._stats_lock:
+                if not dequeued:
+                    dequeued = True
+                    self._stats.queue_depth -= 1
+
+        def run():
+            started = time.monotonic()
+            leave_queue()
+            try:
+                return fn(*args)
+            finally:
+                finished = time.monotonic()
+                wait_ms = (started - enqueued) * 1000
+                with self._stats_lock:
+                    stats = self._stats
+                    stats.jobs_completed[kind] = stats.jobs_completed.get(kind, 0) + 1
+                    stats.total_wait_ms += wait_ms
+                    stats.max_wait_ms = max(stats.max_wait_ms, wait_ms)
+                    stats.total_busy_ms += (finished - started) * 1000
+
+        future = self._executor.submit(run)
+        future.add_done_callback(lambda f: f.cancelled() and leave_queue())
+        # Cancelling the awaiting task cancels the job if it has not started
+        return await asyncio.wrap_future(future)
+
+    def request_started(self) -> None:
+        with self._stats_lock:
+            self._stats.active_requests += 1
+
+    def request_finished(self) -> None:
+        with self._stats_lock:
+            self._stats.active_requests -= 1
+
+    def stats(self) -> dict:
+        """Return a JSON-serializable snapshot of the queue metrics."""
+        with self._stats_lock:
+            return self._stats.to_dict()
+
+    def shutdown(self) -> None:
+        """Stop the NPU thread (waits for the running job)."""
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+
+def _advance(steps, result):
+    """Run a transcription generator up to its next NPU job (blocking).
+
+    Returns (job, None) for the next (kind, fn, args) job, or (None, text)
+    once the generator finishes. StopIteration cannot cross an executor
+    future, so it is unwrapped here.
+    """
+    try:
+        return steps.send(result), None
+    except StopIteration as done:
+        return None, done.value
 
 
 # ---------------------------------------------------------------------------
@@ -182,6 +447,7 @@ class HailoWhisperEngine:
 
     Also requires a CPU-side token embedding array:
         - token_embedding_weight_{variant}.npy  (vocab_size, d_model)
+    It is memory-mapped (converted once to a float32 sidecar if needed).
 
     Note: positional embeddings are baked into the HEF — no external
     positional embedding file is needed.
@@ -192,11 +458,12 @@ class HailoWhisperEngine:
         hef_path: Path,
         model_dir: Path,
         variant: str = "base",
+        mel_workers: int = 1,
     ):
         self.hef_path = Path(hef_path)
         self.model_dir = Path(model_dir)
         self.variant = variant
-        self._mel = MelSpectrogram()
+        self._mel = MelSpectrogram(workers=mel_workers)
 
         # CPU-side token embedding path
         self._token_embed_path = self.model_dir / f"token_embedding_weight_{variant}.npy"
@@ -216,7 +483,7 @@ class HailoWhisperEngine:
         self._encoder_output_name: str = ""
         self._encoder_input_shape: tuple = ()
         self._encoder_output_shape: tuple = ()
-        self._inference_lock = asyncio.Lock()
+        self.scheduler = NPUScheduler()
 
     def initialize(self) -> None:
         """Load models and prepare for inference. Call once at startup."""
@@ -235,8 +502,8 @@ class HailoWhisperEngine:
                 f"{self.variant}"
             )
 
-        # Load CPU-side token embedding array
-        self._token_embeddings = np.load(str(self._token_embed_path))
+        # Memory-map the CPU-side token embedding array
+        self._token_embeddings = self._load_token_embeddings()
         logger.info(f"Loaded token embeddings: {self._token_embeddings.shape}")
 
         # Load tokenizer (transformers already installed for Moonshine)
@@ -377,24 +644,134 @@ class HailoWhisperEngine:
             f"encoder={encoder_ng_name}, decoder={decoder_ng_name})"
         )
 
-    def transcribe_sync(self, audio: np.ndarray) -> str:
+    def _load_token_embeddings(self) -> np.ndarray:
+        """Memory-map the token embedding table as float32.
+
+        The table is vocab x d_model (~100 MB for base in float32), but a
+        transcription touches only a few dozen rows. Mapping it read-only
+        keeps just those pages resident. If the downloaded file is not
+        float32, a float32 copy is written next to it so per-step rows need
+        no cast. The copy is rebuilt when its shape differs from the
+        download's or it is older than it (the model was replaced).
+        """
+        table = np.load(str(self._token_embed_path), mmap_mode="r")
+        if table.dtype == np.float32 and table.flags["C_CONTIGUOUS"]:
+            return table
+
+        f32_path = self._token_embed_path.with_suffix(".float32.npy")
+        if f32_path.exists():
+            try:
+                cached = np.load(str(f32_path), mmap_mode="r")
+                fresh = cached.shape == table.shape and (
+                    f32_path.stat().st_mtime >= self._token_embed_path.stat().st_mtime
+                )
+            except (OSError, ValueError):
+                fresh = False
+            if fresh:
+                return cached
+            logger.info(f"Token embeddings changed, rebuilding {f32_path}")
+        logger.info(f"Converting token embeddings to float32: {f32_path}")
+        tmp_path = f32_path.with_suffix(".tmp")
+        try:
+            out = np.lib.format.open_memmap(
+                str(tmp_path), mode="w+", dtype=np.float32, shape=table.shape
+            )
+            # Convert in row blocks to avoid materializing the whole table
+            for i in range(0, table.shape[0], 4096):
+                out[i : i + 4096] = table[i : i + 4096]
+            out.flush()
+            del out
+            tmp_path.replace(f32_path)
+        except OSError as e:
+            logger.warning(
+                f"Could not write {f32_path} ({e}); keeping embeddings in RAM"
+            )
+            return np.ascontiguousarray(table, dtype=np.float32)
+
+        return np.load(str(f32_path), mmap_mode="r")
+
+    def create_mel_stream(self) -> MelStream:
+        """Create an incremental mel computation for streamed audio chunks."""
+        return self._mel.stream()
+
+    def transcribe_sync(
+        self,
+        audio: np.ndarray | None = None,
+        mel: np.ndarray | None = None,
+    ) -> str:
         """Transcribe audio using Hailo Whisper (blocking).
 
+        Runs every NPU job inline on the calling thread. The async
+        transcribe() runs the same steps through the NPU scheduler instead.
+
         Args:
             audio: Float32 audio at 16kHz, any length (padded/trimmed to 10s).
+            mel: Precomputed log-mel (80, 1000), e.g. from a MelStream.
+                When given, audio is ignored.
 
         Returns:
             Transcription text.
         """
-        start_time = time.monotonic()
+        if mel is None:
+            mel = self._mel(audio)
 
-        logger.debug(
-            f"Audio input: len={len(audio)}, min={audio.min():.4f}, "
-            f"max={audio.max():.4f}, rms={np.sqrt(np.mean(audio**2)):.4f}"
-        )
+        steps = self._transcription_steps(mel)
+        result = None
+        try:
+            while True:
+                _kind, fn, args = steps.send(result)
+                result = fn(*args)
+        except StopIteration as done:
+            return done.value
+
+    async def transcribe(
+        self,
+        audio: np.ndarray | None = None,
+        mel: np.ndarray | None = None,
+    ) -> str:
+        """Transcribe audio via the shared NPU scheduler.
+
+        CPU work (mel, embedding lookup, argmax) runs outside the NPU queue,
+        so encoder and decoder jobs from concurrent requests interleave on
+        the NPU instead of waiting for a whole request to finish. It runs in
+        the default executor rather than on the event loop, so it does not
+        stall the other connections' handlers between NPU jobs.
+        """
+        loop = asyncio.get_running_loop()
+        if mel is None:
+            mel = await loop.run_in_executor(None, self._mel, audio)
+
+        self.scheduler.request_started()
+        try:
+            steps = self._transcription_steps(mel)
+            advancing = None
+            result = None
+            try:
+                while True:
+                    # Shielded: cancelling must not abandon a running step
+                    advancing = loop.run_in_executor(None, _advance, steps, result)
+                    job, text = await asyncio.shield(advancing)
+                    if job is None:
+                        return text
+                    kind, fn, args = job
+                    result = await self.scheduler.submit(kind, fn, *args)
+            finally:
+                if advancing is not None and not advancing.done():
+                    # The generator can't be closed while it is executing
+                    await asyncio.wait([advancing])
+                steps.close()
+        finally:
+            self.scheduler.request_finished()
+
+    def _transcription_steps(self, mel: np.ndarray):
+        """Drive one transcription, yielding each NPU job to the caller.
 
-        # Audio -> mel spectrogram: (80, 1000)
-        mel = self._mel(audio)
+        Generator protocol: yields (kind, fn, args) for every NPU job and
+        receives fn(*args) back via send(). Returns the transcription text.
+        Keeping the control flow here lets the blocking and scheduled paths
+        share one implementation.
+        """
+        start_time = time.monotonic()
 
         logger.debug(
             f"Mel spectrogram: shape={mel.shape}, min={mel.min():.4f}, "
@@ -402,7 +779,8 @@ class HailoWhisperEngine:
         )
 
         # Reshape mel to match encoder HEF input shape
-        # HEF expects channels-last: (1, 1000, 80), mel is (80, 1000)
+        # HEF expects channels-last: (1, 1000, 80), mel is (80, 1000).
+        # MelSpectrogram output is frame-major, so this is a view, not a copy.
         mel_input = mel.T[np.newaxis, :, :]  # (1, 1000, 80)
         # If HEF shape differs, reshape to match
         if mel_input.shape != self._encoder_input_shape:
@@ -410,15 +788,7 @@ class HailoWhisperEngine:
         mel_input = np.ascontiguousarray(mel_input, dtype=np.float32)
 
         # --- Encoder inference (NPU) ---
-        enc_bindings = self._encoder_configured.create_bindings()
-        enc_bindings.input(self._encoder_input_name).set_buffer(mel_input)
-        enc_output = np.zeros(self._encoder_output_shape, dtype=np.float32)
-        enc_bindings.output(self._encoder_output_name).set_buffer(enc_output)
-
-        self._encoder_configured.run([enc_bindings], 30_000)
-        encoded_features = np.ascontiguousarray(
-            enc_bindings.output(self._encoder_output_name).get_buffer()
-        )
+        encoded_features = yield ("encoder", self._run_encoder, (mel_input,))
 
         encoder_ms = (time.monotonic() - start_time) * 1000
         logger.debug(
@@ -435,52 +805,30 @@ class HailoWhisperEngine:
         initial_tokens = [SOT_TOKEN, EN_TOKEN, TRANSCRIBE_TOKEN, NO_TIMESTAMPS_TOKEN]
         seq_len = self._decoder_seq_len
 
-        decoder_input_ids = np.zeros((1, seq_len), dtype=np.int64)
-        for i, tok in enumerate(initial_tokens):
-            decoder_input_ids[0, i] = tok
+        # CPU: token embedding lookup (positional embeddings are inside HEF).
+        # The buffer persists across steps and only the newly generated
+        # position is gathered each step. Unfilled positions hold token 0's
+        # embedding, matching the zero-padded input ids.
+        table = self._token_embeddings
+        token_embeds = np.empty((1, seq_len, table.shape[1]), dtype=np.float32)
+        token_embeds[0, :] = table[0]
+        token_embeds[0, : len(initial_tokens)] = table[initial_tokens]
 
         generated_tokens: list[int] = []
         num_initial = len(initial_tokens)
 
         for step in range(num_initial, seq_len):
-            # CPU: token embedding lookup (positional embeddings are inside HEF)
-            token_embeds = self._token_embeddings[decoder_input_ids[0]].astype(
-                np.float32
-            )  # (seq_len, d_model)
-            token_embeds = token_embeds[np.newaxis, :, :]  # (1, seq_len, d_model)
-
-            # Run decoder on NPU via InferModel bindings
-            dec_bindings = self._decoder_configured.create_bindings()
-            dec_bindings.input(self._enc_input_name).set_buffer(
-                np.ascontiguousarray(encoded_features)
-            )
-            dec_bindings.input(self._tok_input_name).set_buffer(
-                np.ascontiguousarray(token_embeds)
+            # NPU: one decoder pass
+            output_arrays = yield (
+                "decoder",
+                self._run_decoder,
+                (encoded_features, token_embeds),
             )
 
-            # Allocate output buffers
-            for name in self._decoder_output_names:
-                shape = tuple(self._decoder_model.output(name).shape)
-                dec_bindings.output(name).set_buffer(
-                    np.zeros(shape, dtype=np.float32)
-                )
-
-            self._decoder_configured.run([dec_bindings], 30_000)
-
-            # Concatenate split outputs along last axis to reconstruct full logits
-            # e.g. 4 x (1, 64, ~12966) -> (1, 64, 51865)
-            output_arrays = [
-                dec_bindings.output(name).get_buffer()
-                for name in self._decoder_output_names
-            ]
-            if len(output_arrays) > 1:
-                decoder_output = np.concatenate(output_arrays, axis=-1)
-            else:
-                decoder_output = output_arrays[0]
-
-            # Get logits for current token position
-            # decoder_output shape: (1, seq_len, vocab_size)
-            logits = decoder_output[0, step - 1].copy()
+            # Only the current position's logits are needed, so slice each
+            # split output before concatenating along the vocab axis
+            # e.g. 4 x (1, 64, ~12966) -> (51865,)
+            logits = np.concatenate([arr[0, step - 1] for arr in output_arrays])
 
             # Repetition penalty — discourage repeated tokens
             for tok in generated_tokens:
@@ -497,7 +845,7 @@ class HailoWhisperEngine:
                 break
 
             generated_tokens.append(next_token)
-            decoder_input_ids[0, step] = next_token
+            token_embeds[0, step] = table[next_token]
 
         decoder_ms = (time.monotonic() - decoder_start) * 1000
         total_ms = (time.monotonic() - start_time) * 1000
@@ -514,17 +862,53 @@ class HailoWhisperEngine:
 
         return text
 
-    async def transcribe(self, audio: np.ndarray) -> str:
-        """Transcribe audio (async wrapper — runs inference in thread pool).
+    def _run_encoder(self, mel_input: np.ndarray) -> np.ndarray:
+        """NPU job: encoder forward pass (blocking)."""
+        enc_bindings = self._encoder_configured.create_bindings()
+        enc_bindings.input(self._encoder_input_name).set_buffer(mel_input)
+        enc_output = np.zeros(self._encoder_output_shape, dtype=np.float32)
+        enc_bindings.output(self._encoder_output_name).set_buffer(enc_output)
+
+        self._encoder_configured.run([enc_bindings], 30_000)
+        return np.ascontiguousarray(
+            enc_bindings.output(self._encoder_output_name).get_buffer()
+        )
 
-        Uses a lock to serialize NPU access across concurrent connections.
+    def _run_decoder(
+        self,
+        encoded_features: np.ndarray,
+        token_embeds: np.ndarray,
+    ) -> list[np.ndarray]:
+        """NPU job: one decoder forward pass (blocking).
+
+        Returns:
+            The split logits outputs, in self._decoder_output_names order.
         """
-        async with self._inference_lock:
-            loop = asyncio.get_running_loop()
-            return await loop.run_in_executor(None, self.transcribe_sync, audio)
+        dec_bindings = self._decoder_configured.create_bindings()
+        dec_bindings.input(self._enc_input_name).set_buffer(
+            np.ascontiguousarray(encoded_features)
+        )
+        dec_bindings.input(self._tok_input_name).set_buffer(
+            np.ascontiguousarray(token_embeds)
+        )
+
+        # Allocate output buffers
+        for name in self._decoder_output_names:
+            shape = tuple(self._decoder_model.output(name).shape)
+            dec_bindings.output(name).set_buffer(
+                np.zeros(shape, dtype=np.float32)
+            )
+
+        self._decoder_configured.run([dec_bindings], 30_000)
+
+        return [
+            dec_bindings.output(name).get_buffer()
+            for name in self._decoder_output_names
+        ]
 
     def cleanup(self) -> None:
         """Release Hailo NPU resources."""
+        self.scheduler.shutdown()
         self._encoder_configured = None
         self._decoder_configured = None
         self._encoder_model = None
@@ -538,6 +922,175 @@ class HailoWhisperEngine:
         logger.info("Hailo resources released")
 
 
+# ---------------------------------------------------------------------------
+# Engine interface + CPU reference and fake engines (no NPU required)
+# ---------------------------------------------------------------------------
+class WhisperEngine(Protocol):
+    """Interface the Wyoming server needs from an STT engine."""
+
+    scheduler: NPUScheduler
+
+    def initialize(self) -> None: ...
+    def create_mel_stream(self) -> MelStream | None: ...
+    async def transcribe(
+        self, audio: np.ndarray | None = None, mel: np.ndarray | None = None
+    ) -> str: ...
+    def cleanup(self) -> None: ...
+
+
+class CPUWhisperEngine:
+    """Reference engine running faster-whisper (CTranslate2) on the CPU.
+
+    Lets the Wyoming server run on ordinary Linux boxes for load tests and
+    regression tests. Takes raw audio rather than a precomputed mel, so
+    create_mel_stream() returns None and the server buffers the request.
+    Jobs go through an NPUScheduler (single worker, FIFO) so queueing and
+    metrics behave like the Hailo engine.
+    """
+
+    def __init__(
+        self,
+        model: str = "tiny",
+        compute_type: str = "int8",
+        cpu_threads: int = 0,
+    ):
+        self.model_name = model
+        self.compute_type = compute_type
+        self.cpu_threads = cpu_threads
+        self._model = None
+        self.scheduler = NPUScheduler()
+
+    def initialize(self) -> None:
+        """Load the faster-whisper model."""
+        try:
+            from faster_whisper import WhisperModel
+        except ImportError:
+            raise ImportError(
+                "faster-whisper not found. Install with: pip install faster-whisper"
+            )
+
+        self._model = WhisperModel(
+            self.model_name,
+            device="cpu",
+            compute_type=self.compute_type,
+            cpu_threads=self.cpu_threads,
+        )
+        logger.info(
+            f"CPU Whisper engine initialized (model={self.model_name}, "
+            f"compute_type={self.compute_type})"
+        )
+
+    def create_mel_stream(self) -> None:
+        return None
+
+    def transcribe_sync(self, audio: np.ndarray) -> str:
+        """Transcribe audio with faster-whisper (blocking)."""
+        start_time = time.monotonic()
+        segments, _info = self._model.transcribe(
+            audio[:N_SAMPLES],
+            language="en",
+            beam_size=1,
+            without_timestamps=True,
+        )
+        text = " ".join(segment.text.strip() for segment in segments).strip()
+        logger.info(
+            f"Transcribed ({(time.monotonic() - start_time) * 1000:.0f}ms, cpu): "
+            f"{text[:100]}"
+        )
+        return text
+
+    async def transcribe(
+        self,
+        audio: np.ndarray | None = None,
+        mel: np.ndarray | None = None,
+    ) -> str:
+        if audio is None:
+            raise ValueError("CPUWhisperEngine needs raw audio, not a mel spectrogram")
+        self.scheduler.request_started()
+        try:
+            return await self.scheduler.submit("cpu", self.transcribe_sync, audio)
+        finally:
+            self.scheduler.request_finished()
+
+    def cleanup(self) -> None:
+        self.scheduler.shutdown()
+        self._model = None
+
+
+class FakeWhisperEngine:
+    """Deterministic engine with configurable latency, for CI and soak tests.
+
+    Mirrors the Hailo engine's job structure without any hardware: the mel
+    frontend runs for real, then one encoder job and one decoder job per
+    output token go through the NPU scheduler, each sleeping for the
+    configured latency. Always returns the configured text.
+    """
+
+    def __init__(
+        self,
+        text: str = "this is a test transcript",
+        encoder_ms: float = 50.0,
+        decoder_ms: float = 15.0,
+        mel_workers: int = 1,
+    ):
+        self.text = text
+        self.encoder_ms = encoder_ms
+        self.decoder_ms = decoder_ms
+        self._mel = MelSpectrogram(workers=mel_workers)
+        self.scheduler = NPUScheduler()
+
+    def initialize(self) -> None:
+        logger.info(
+            f"Fake Whisper engine initialized (encoder={self.encoder_ms}ms, "
+            f"decoder={self.decoder_ms}ms/token, text={self.text!r})"
+        )
+
+    def create_mel_stream(self) -> MelStream:
+        return self._mel.stream()
+
+    async def transcribe(
+        self,
+        audio: np.ndarray | None = None,
+        mel: np.ndarray | None = None,
+    ) -> str:
+        if mel is None:
+            loop = asyncio.get_running_loop()
+            mel = await loop.run_in_executor(None, self._mel, audio)
+
+        self.scheduler.request_started()
+        try:
+            await self.scheduler.submit("encoder", time.sleep, self.encoder_ms / 1000)
+            # One decoder pass per token, plus the pass that emits EOT
+            for _ in range(len(self.text.split()) + 1):
+                await self.scheduler.submit("decoder", time.sleep, self.decoder_ms / 1000)
+        finally:
+            self.scheduler.request_finished()
+        return self.text
+
+    def cleanup(self) -> None:
+        self.scheduler.shutdown()
+
+
+def create_engine(args: argparse.Namespace) -> WhisperEngine:
+    """Build the engine selected by --engine."""
+    if args.engine == "cpu":
+        return CPUWhisperEngine(
+            model=args.cpu_model,
+            compute_type=args.cpu_compute_type,
+            cpu_threads=args.cpu_threads,
+        )
+    if args.engine == "fake":
+        return FakeWhisperEngine(
+            text=args.fake_text,
+            encoder_ms=args.fake_encoder_ms,
+            decoder_ms=args.fake_decoder_ms,
+            mel_workers=args.mel_workers,
+        )
+    return HailoWhisperEngine(
+        args.hef, args.model_dir, args.variant, mel_workers=args.mel_workers
+    )
+
+
 # ---------------------------------------------------------------------------
 # Wyoming protocol server
 # ---------------------------------------------------------------------------
@@ -545,18 +1098,19 @@ class WyomingWhisperServer:
     """TCP server accepting Wyoming protocol connections for Whisper STT.
 
     Each connection receives audio via the Wyoming event protocol,
-    transcribes using the Hailo engine, and returns a transcript event.
+    transcribes using the configured engine, and returns a transcript event.
 
     Wyoming event format (JSON-lines):
         {"type": "event-type", "data": {...}}\\n
         For audio-chunk: data includes "payload_length", followed by raw bytes.
     """
 
-    def __init__(self, engine: HailoWhisperEngine, port: int = 10300):
+    def __init__(self, engine: WhisperEngine, port: int = 10300):
         self.engine = engine
         self.port = port
         self._server: asyncio.Server | None = None
         self._shutdown_event = asyncio.Event()
+        self._mel_streams: list[MelStream] = []
 
     async def start(self) -> None:
         """Start accepting connections."""
@@ -605,66 +1159,110 @@ class WyomingWhisperServer:
         reader: asyncio.StreamReader,
         writer: asyncio.StreamWriter,
     ) -> None:
-        """Process one STT request: receive audio, transcribe, send result."""
+        """Process one STT request: receive audio, transcribe, send result.
+
+        16kHz input is fed into a MelStream as chunks arrive, so most of the
+        mel spectrogram is already computed when audio-stop lands. Other
+        rates are buffered and resampled at the end.
+        """
         audio_chunks: list[bytes] = []
         sample_rate = SAMPLE_RATE
         started = False
+        mel_stream: MelStream | None = None
+        leftover = b""  # Odd trailing byte when a chunk splits a sample
 
-        while True:
-            event = await self._receive_event(reader)
-            if event is None:
-                return  # Client disconnected
-
-            event_type = event.get("type", "")
-            data = event.get("data", {})
-
-            if event_type == "audio-start":
-                sample_rate = data.get("rate", SAMPLE_RATE)
-                audio_chunks = []
-                started = True
-                logger.debug(
-                    f"Audio start: rate={sample_rate}, "
-                    f"width={data.get('width', 2)}, "
-                    f"channels={data.get('channels', 1)}"
-                )
-
-            elif event_type == "audio-chunk" and started:
-                payload = event.get("payload")
-                if payload:
-                    audio_chunks.append(payload)
-
-            elif event_type == "audio-stop" and started:
-                logger.debug(
-                    f"Audio stop: {len(audio_chunks)} chunks received"
-                )
-
-                # Combine PCM chunks and convert to float32
-                if audio_chunks:
-                    pcm_bytes = b"".join(audio_chunks)
-                    samples = np.frombuffer(pcm_bytes, dtype=np.int16)
-                    audio = samples.astype(np.float32) / 32768.0
+        try:
+            while True:
+                event = await self._receive_event(reader)
+                if event is None:
+                    return  # Client disconnected
+
+                event_type = event.get("type", "")
+                data = event.get("data", {})
+
+                if event_type == "npu-stats":
+                    await self._send_event(
+                        writer, "npu-stats", self.engine.scheduler.stats()
+                    )
+                    return
+
+                if event_type == "audio-start":
+                    sample_rate = data.get("rate", SAMPLE_RATE)
+                    audio_chunks = []
+                    leftover = b""
+                    started = True
+                    if sample_rate == SAMPLE_RATE:
+                        if mel_stream is None:
+                            mel_stream = self._acquire_mel_stream()
+                        if mel_stream is not None:
+                            mel_stream.reset()
+                    logger.debug(
+                        f"Audio start: rate={sample_rate}, "
+                        f"width={data.get('width', 2)}, "
+                        f"channels={data.get('channels', 1)}"
+                    )
+
+                elif event_type == "audio-chunk" and started:
+                    payload = event.get("payload")
+                    if not payload:
+                        continue
+                    if mel_stream is not None and sample_rate == SAMPLE_RATE:
+                        pcm = leftover + payload
+                        usable = len(pcm) - (len(pcm) % 2)
+                        leftover = pcm[usable:]
+                        samples = np.frombuffer(pcm[:usable], dtype=np.int16)
+                        mel_stream.feed(samples.astype(np.float32) / 32768.0)
+                    else:
+                        audio_chunks.append(payload)
 
-                    # Resample if not 16kHz
-                    if sample_rate != SAMPLE_RATE:
-                        audio = self._resample(audio, sample_rate)
+                elif event_type == "audio-stop" and started:
+                    logger.debug(
+                        f"Audio stop: {len(audio_chunks)} chunks received"
+                    )
 
-                    # Transcribe
+                    text = ""
                     try:
-                        text = await self.engine.transcribe(audio)
+                        if mel_stream is not None and sample_rate == SAMPLE_RATE:
+                            if mel_stream.num_samples > 0:
+                                # The last frames are computed off the event loop
+                                loop = asyncio.get_running_loop()
+                                mel = await loop.run_in_executor(None, mel_stream.finalize)
+                                text = await self.engine.transcribe(mel=mel)
+                        elif audio_chunks:
+                            # Combine PCM chunks and convert to float32
+                            pcm_bytes = b"".join(audio_chunks)
+                            samples = np.frombuffer(pcm_bytes, dtype=np.int16)
+                            audio = samples.astype(np.float32) / 32768.0
+
+                            # Resample if not 16kHz
+                            audio = self._resample(audio, sample_rate)
+                            text = await self.engine.transcribe(audio)
                     except Exception:
                         logger.exception("Transcription failed")
                         await self._send_event(
                             writer, "error", {"message": "Transcription failed"}
                         )
                         return
-                else:
-                    text = ""
 
-                # Send transcript
-                await self._send_event(
-                    writer, "transcript", {"text": text}
-                )
-                return  # One request per connection (matches client behavior)
+                    logger.debug(f"NPU scheduler: {self.engine.scheduler.stats()}")
+
+                    # Send transcript
+                    await self._send_event(
+                        writer, "transcript", {"text": text}
+                    )
+                    return  # One request per connection (matches client behavior)
+        finally:
+            if mel_stream is not None:
+                self._mel_streams.append(mel_stream)
+
+    def _acquire_mel_stream(self) -> MelStream | None:
+        """Take a pooled MelStream (buffers are reused across connections).
+
+        Returns None for engines that want raw audio instead of a mel.
+        """
+        if self._mel_streams:
+            return self._mel_streams.pop()
+        return self.engine.create_mel_stream()
 
     @staticmethod
     async def _receive_event(
@@ -735,6 +1333,14 @@ def main() -> None:
     parser = argparse.ArgumentParser(
         description="Wyoming protocol STT server using Hailo-10H Whisper"
     )
+    parser.add_argument(
+        "--engine",
+        type=str,
+        default="hailo",
+        choices=["hailo", "cpu", "fake"],
+        help="Inference engine: hailo (NPU), cpu (faster-whisper), "
+        "fake (deterministic, for tests) (default: hailo)",
+    )
     parser.add_argument(
         "--port",
         type=int,
@@ -760,6 +1366,49 @@ def main() -> None:
         choices=["tiny", "tiny.en", "base"],
         help="Whisper model variant (default: base)",
     )
+    parser.add_argument(
+        "--mel-workers",
+        type=int,
+        default=1,
+        help="scipy.fft worker threads for the mel frontend (default: 1)",
+    )
+    parser.add_argument(
+        "--cpu-model",
+        type=str,
+        default="tiny",
+        help="faster-whisper model for --engine cpu (default: tiny)",
+    )
+    parser.add_argument(
+        "--cpu-compute-type",
+        type=str,
+        default="int8",
+        choices=["int8", "float16", "float32"],
+        help="CTranslate2 compute type for --engine cpu (default: int8)",
+    )
+    parser.add_argument(
+        "--cpu-threads",
+        type=int,
+        default=0,
+        help="CPU threads for --engine cpu, 0 = library default (default: 0)",
+    )
+    parser.add_argument(
+        "--fake-text",
+        type=str,
+        default="this is a test transcript",
+        help="Transcript returned by --engine fake",
+    )
+    parser.add_argument(
+        "--fake-encoder-ms",
+        type=float,
+        default=50.0,
+        help="Simulated encoder latency for --engine fake (default: 50)",
+    )
+    parser.add_argument(
+        "--fake-decoder-ms",
+        type=float,
+        default=15.0,
+        help="Simulated per-token decoder latency for --engine fake (default: 15)",
+    )
     parser.add_argument(
         "--log-level",
         type=str,
@@ -776,12 +1425,14 @@ def main() -> None:
         handlers=[logging.StreamHandler(sys.stdout)],
     )
 
-    logger.info(f"Starting Wyoming Hailo Whisper server (variant={args.variant})")
-    logger.info(f"HEF: {args.hef}")
-    logger.info(f"Model directory: {args.model_dir}")
+    logger.info(f"Starting Wyoming Whisper server (engine={args.engine})")
+    if args.engine == "hailo":
+        logger.info(f"Variant: {args.variant}")
+        logger.info(f"HEF: {args.hef}")
+        logger.info(f"Model directory: {args.model_dir}")
 
-    # Initialize Hailo engine
-    engine = HailoWhisperEngine(args.hef, args.model_dir, args.variant)
+    # Initialize inference engine
+    engine = create_engine(args)
     try:
         engine.initialize()
     except FileNotFoundError as e:
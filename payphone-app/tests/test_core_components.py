@@ -41,6 +41,8 @@ def _load_modules():
     if "config.prompts" not in sys.modules:
         prompts_mod = types.ModuleType("config.prompts")
         prompts_mod.get_system_prompt = lambda **kw: "system prompt"
+        prompts_mod.system_prompt_variants = lambda: {"operator": "system prompt"}
+        prompts_mod.turn_budget = lambda label, max_tokens, seconds: (max_tokens, seconds)
         sys.modules["config.prompts"] = prompts_mod
 
     # Stub features.base so registry.py import doesn't fail
@@ -66,6 +68,7 @@ Message = llm_mod.Message
 ConversationContext = llm_mod.ConversationContext
 SentenceBuffer = llm_mod.SentenceBuffer
 FeatureRegistry = registry_mod.FeatureRegistry
+TokenCounter = sys.modules["services.token_budget"].TokenCounter
 BaseFeature = sys.modules["features.base"].BaseFeature
 
 
@@ -153,6 +156,232 @@ class TestConversationContext(unittest.TestCase):
         self.assertEqual(ctx.get_messages_for_api(), [])
 
 
+def _run_turns(ctx, turns):
+    """Simulate turns; return words re-evaluated per turn under prefix caching.
+
+    Words stand in for tokens; the cached prefix is the longest common
+    prefix with the previous turn's prompt, as in Ollama's KV cache.
+    """
+    previous: list[str] = []
+    evaluated = []
+    for i in range(turns):
+        messages = ctx.get_messages_for_api() + [{"role": "user", "content": f"question {i} here"}]
+        prompt = [word for m in messages for word in (m["role"], *m["content"].split())]
+        common = 0
+        while common < min(len(prompt), len(previous)) and prompt[common] == previous[common]:
+            common += 1
+        evaluated.append(len(prompt) - common)
+        ctx.add_user_message(f"question {i} here")
+        ctx.add_assistant_message(f"answer {i} is this")
+        previous = prompt + f"assistant answer {i} is this".split()
+    return evaluated
+
+
+class TestHistoryPolicies(unittest.TestCase):
+    """Cache-aware history trimming."""
+
+    def _ctx(self, policy, **kwargs):
+        ctx = ConversationContext(max_history=4, history_policy=policy, trim_block=2, **kwargs)
+        ctx.messages.append(Message(role="system", content="sys prompt " * 20))
+        return ctx
+
+    def test_sliding_drops_one_exchange_per_turn(self):
+        ctx = self._ctx("sliding")
+        _run_turns(ctx, 6)
+        contents = [m.content for m in ctx.messages if m.role != "system"]
+        self.assertEqual(contents[0], "question 2 here")
+        self.assertEqual(len(contents), 8)
+
+    def test_block_trims_to_low_watermark_on_user_boundary(self):
+        ctx = self._ctx("block")
+        _run_turns(ctx, 5)
+        history = [m for m in ctx.messages if m.role != "system"]
+        self.assertEqual(history[0].role, "user")
+        self.assertEqual(history[0].content, "question 3 here")
+        self.assertEqual(len(history), 4)
+        self.assertEqual(ctx.messages[0].role, "system")
+
+    def test_block_keeps_prefix_stable_between_trims(self):
+        ctx = self._ctx("block")
+        _run_turns(ctx, 5)
+        first = ctx.messages[1].content
+        _run_turns(ctx, 1)
+        self.assertEqual(ctx.messages[1].content, first)
+
+    def test_block_reevaluates_fewer_tokens_than_sliding(self):
+        sliding = sum(_run_turns(self._ctx("sliding"), 30))
+        block = sum(_run_turns(self._ctx("block"), 30))
+        summary = sum(_run_turns(self._ctx("summary"), 30))
+        self.assertLess(block, sliding * 0.6)
+        self.assertLess(summary, sliding)
+
+    def test_summary_folds_trimmed_user_messages(self):
+        ctx = self._ctx("summary")
+        _run_turns(ctx, 5)
+        self.assertEqual(ctx.summary, "question 0 here; question 1 here; question 2 here")
+        api = ctx.get_messages_for_api()
+        self.assertEqual(api[1]["role"], "user")
+        self.assertTrue(
+            api[1]["content"].startswith("(Earlier in this call the caller said: question 0")
+        )
+        self.assertTrue(api[1]["content"].endswith("\nquestion 3 here"))
+        # Stored messages are untouched
+        self.assertEqual(ctx.messages[1].content, "question 3 here")
+
+    def test_summary_is_bounded(self):
+        ctx = self._ctx("summary", summary_max_chars=40)
+        _run_turns(ctx, 20)
+        self.assertLessEqual(len(ctx.summary), 40)
+        self.assertTrue(ctx.summary.startswith("..."))
+
+    def test_clear_drops_summary(self):
+        ctx = self._ctx("summary")
+        _run_turns(ctx, 5)
+        ctx.clear()
+        self.assertEqual(ctx.summary, "")
+
+
+class TestHistoryTokenBudget(unittest.TestCase):
+    """History trimmed to a token budget (estimator: a word is one token)."""
+
+    def _ctx(self, policy, budget):
+        ctx = ConversationContext(
+            max_history=10,
+            history_policy=policy,
+            trim_block=5,
+            token_budget=budget,
+            token_counter=TokenCounter(),
+        )
+        ctx.messages.append(Message(role="system", content="sys prompt " * 20))
+        return ctx
+
+    def _history_tokens(self, ctx):
+        history = [m for m in ctx.messages if m.role != "system"]
+        return ctx.token_counter.count_messages([{"content": m.content} for m in history])
+
+    def test_sliding_stays_under_budget(self):
+        ctx = self._ctx("sliding", 40)
+        _run_turns(ctx, 8)
+        self.assertLessEqual(self._history_tokens(ctx), 40)
+        self.assertGreater(self._history_tokens(ctx), 40 - 15)  # Within one exchange
+        self.assertEqual(ctx.messages[0].role, "system")
+
+    def test_block_trims_to_low_watermark_on_user_boundary(self):
+        ctx = self._ctx("block", 60)
+        _run_turns(ctx, 8)
+        history = [m for m in ctx.messages if m.role != "system"]
+        self.assertEqual(history[0].role, "user")
+        self.assertLessEqual(self._history_tokens(ctx), 60)
+        # Trims to half the budget, then grows back: fewer trims than sliding
+        first = history[0].content
+        _run_turns(ctx, 1)
+        self.assertEqual(ctx.messages[1].content, first)
+
+    def test_block_budget_reevaluates_less_than_sliding(self):
+        sliding = sum(_run_turns(self._ctx("sliding", 60), 30))
+        block = sum(_run_turns(self._ctx("block", 60), 30))
+        self.assertLess(block, sliding * 0.6)
+
+    def test_newest_message_kept_even_if_over_budget(self):
+        ctx = self._ctx("block", 10)
+        ctx.add_user_message("word " * 50)
+        self.assertEqual(ctx.messages[-1].content, "word " * 50)
+
+    def test_summary_policy_folds_budget_trims(self):
+        ctx = self._ctx("summary", 40)
+        _run_turns(ctx, 6)
+        self.assertTrue(ctx.summary.startswith("question 0 here"))
+
+    def test_zero_budget_uses_count_only(self):
+        ctx = self._ctx("block", 0)
+        _run_turns(ctx, 10)
+        self.assertEqual(len([m for m in ctx.messages if m.role != "system"]), 20)
+
+
+class _FakeBackend:
+    async def chat(self, messages, max_tokens):
+        return llm_mod.ChatChunk("Sure.", done=True, eval_count=2, prompt_eval_count=37)
+
+
+class TestPromptEvalInstrumentation(unittest.TestCase):
+    def test_generate_records_prompt_eval_count(self):
+        import asyncio
+        from types import SimpleNamespace
+
+        settings = SimpleNamespace(
+            model="m", temperature=0.7, top_p=0.9, max_tokens=10, keep_alive="1h",
+            timeout=5.0, tokenizer="", response_cache_enabled=False,
+            spoken_seconds_target=0.0, max_in_flight=1, short_turn_tokens=80,
+        )
+        client = llm_mod.LLMClient(settings, backend=_FakeBackend())
+        client._initialized = True
+        ctx = ConversationContext()
+
+        response = asyncio.run(client.generate("hi", context=ctx))
+
+        self.assertEqual(response.prompt_eval_count, 37)
+        self.assertEqual(ctx.prompt_eval_counts, [37])
+
+    def test_full_prompt_eval_calibrates_estimator(self):
+        import asyncio
+        from types import SimpleNamespace
+
+        class _ReloadingBackend:
+            async def chat(self, messages, max_tokens):
+                # Model loaded from disk: every prompt token was evaluated
+                return llm_mod.ChatChunk("Sure.", done=True, prompt_eval_count=60, load_seconds=4.0)
+
+        settings = SimpleNamespace(
+            model="m", temperature=0.7, top_p=0.9, max_tokens=10, keep_alive="1h",
+            timeout=5.0, tokenizer="", response_cache_enabled=False,
+            spoken_seconds_target=0.0, max_in_flight=1, short_turn_tokens=80,
+        )
+        client = llm_mod.LLMClient(settings, backend=_ReloadingBackend())
+        client._initialized = True
+        client._tokens = TokenCounter()
+
+        # 2 messages x 4 overhead + 26 words; 60 observed -> scale toward 2
+        asyncio.run(client.generate("word " * 16, system_prompt="word " * 10))
+
+        self.assertEqual(client._tokens.calibrations, 1)
+        self.assertAlmostEqual(client._tokens.scale, 1.0 + 0.3 * ((60 - 8) / 26 - 1.0))
+
+
+    def test_max_tokens_follows_turn_budget(self):
+        import asyncio
+        from types import SimpleNamespace
+        from unittest import mock
+
+        budgets = {"feature:stories": (500, 150.0)}
+
+        def turn_budget(label, max_tokens, seconds):
+            return budgets.get(label, (max_tokens, seconds))
+
+        class _RecordingBackend:
+            def __init__(self):
+                self.max_tokens = []
+
+            async def chat(self, messages, max_tokens):
+                self.max_tokens.append(max_tokens)
+                return llm_mod.ChatChunk("Sure.", done=True)
+
+        settings = SimpleNamespace(
+            model="m", max_tokens=150, timeout=5.0, tokenizer="", response_cache_enabled=False,
+            spoken_seconds_target=12.0, max_in_flight=1, short_turn_tokens=80,
+        )
+        backend = _RecordingBackend()
+        client = llm_mod.LLMClient(settings, backend=backend)
+        client._initialized = True
+
+        async def run():
+            await client.generate("Tell me a story", label="feature:stories")
+            await client.generate("Hi", label="operator")
+
+        with mock.patch.object(llm_mod, "turn_budget", turn_budget):
+            asyncio.run(run())
+        self.assertEqual(backend.max_tokens, [500, 150])
+
+
 # ---------------------------------------------------------------------------
 # SentenceBuffer tests
 # ---------------------------------------------------------------------------
@@ -0,0 +1,253 @@
+"""Tests for the LLM backends (services/llm.py) against mock_llm_server.py."""
+
+import asyncio
+import importlib
+import sys
+import time
+import types
+import unittest
+from pathlib import Path
+
+
+def _load_modules():
+    """Load services.llm and mock_llm_server with settings stubbed."""
+    app_root = Path(__file__).resolve().parent.parent
+    if str(app_root) not in sys.path:
+        sys.path.insert(0, str(app_root))
+
+    for pkg in ("config", "services"):
+        if pkg not in sys.modules:
+            mod = types.ModuleType(pkg)
+            mod.__path__ = [str(app_root / pkg)]
+            sys.modules[pkg] = mod
+
+    if "config.settings" not in sys.modules:
+        settings_mod = types.ModuleType("config.settings")
+        settings_mod.LLMSettings = type("_FakeLLMSettings", (), {})
+        sys.modules["config.settings"] = settings_mod
+
+    return importlib.import_module("services.llm"), importlib.import_module("mock_llm_server")
+
+
+llm_mod, mock_mod = _load_modules()
+LLMClient = llm_mod.LLMClient
+ConversationContext = llm_mod.ConversationContext
+MockLLMServer = mock_mod.MockLLMServer
+
+try:
+    import ollama
+except ImportError:
+    ollama = None
+
+REPLY = "Hello there, caller! How can I help?"
+
+
+def _settings(backend, host, **overrides):
+    values = {
+        "backend": backend,
+        "host": host,
+        "model": "mock",
+        "api_key": "",
+        "cache_prompt": True,
+        "temperature": 0.7,
+        "top_p": 0.9,
+        "max_tokens": 150,
+        "timeout": 5.0,
+        "keep_alive": "1h",
+        "first_token_timeout": 5.0,
+        "inter_token_timeout": 5.0,
+        "tokenizer": "",
+        "warmup_enabled": False,
+        "response_cache_enabled": False,
+        "spoken_seconds_target": 0.0,
+        "speech_words_per_second": 2.5,
+        "max_in_flight": 1,
+        "short_turn_tokens": 80,
+    }
+    values.update(overrides)
+    return types.SimpleNamespace(**values)
+
+
+def _run(backend, scenario, server_kwargs=None, **settings):
+    """Run scenario(client, server) with a mock server and connected client."""
+
+    async def main():
+        server = MockLLMServer(replies=[REPLY], **(server_kwargs or {}))
+        await server.start()
+        client = LLMClient(_settings(backend, server.url, **settings))
+        try:
+            await client.initialize()
+            return await scenario(client, server)
+        finally:
+            await client.cleanup()
+            await server.stop()
+
+    return asyncio.run(main())
+
+
+async def _stream(client, prompt, **kwargs):
+    return [token async for token in client.generate_streaming(prompt, **kwargs)]
+
+
+async def _drain(stream):
+    return [token async for token in stream]
+
+
+class _BackendTests:
+    backend = ""
+
+    def test_streams_scripted_reply(self):
+        tokens = _run(self.backend, lambda client, _: _stream(client, "Hi"))
+        self.assertEqual("".join(tokens), REPLY)
+        self.assertGreater(len(tokens), 5)
+
+    def test_generate_non_streaming(self):
+        async def scenario(client, _):
+            return await client.generate("Hi", system_prompt="Be brief.")
+
+        response = _run(self.backend, scenario)
+        self.assertEqual(response.text, REPLY)
+        self.assertEqual(response.tokens_generated, 10)
+        self.assertGreater(response.prompt_eval_count, 0)
+
+    def test_prompt_eval_reflects_cached_prefix(self):
+        async def scenario(client, _):
+            ctx = ConversationContext()
+            await _stream(client, "Tell me a joke", system_prompt="Be brief. " * 20, context=ctx)
+            await _stream(client, "Another one", system_prompt="Be brief. " * 20, context=ctx)
+            return ctx.prompt_eval_counts
+
+        first, second = _run(self.backend, scenario)
+        self.assertGreater(first, 60)  # System prompt evaluated
+        self.assertLess(second, 30)  # Only the new turn
+
+    def test_token_rate_and_first_token_latency(self):
+        async def scenario(client, _):
+            start = time.perf_counter()
+            stream = client.generate_streaming("Hi")
+            await stream.__anext__()
+            first = time.perf_counter() - start
+            async for _ in stream:
+                pass
+            return first, time.perf_counter() - start
+
+        first, total = _run(
+            self.backend, scenario, {"tokens_per_second": 200, "first_token_ms": 50}
+        )
+        self.assertGreaterEqual(first, 0.05)
+        self.assertGreaterEqual(total, 0.05 + 10 / 200)
+
+    def test_max_tokens_truncates(self):
+        tokens = _run(self.backend, lambda client, _: _stream(client, "Hi"), max_tokens=3)
+        self.assertEqual("".join(tokens), "Hello there,")
+
+    def test_inter_token_timeout_abandons_stream(self):
+        tokens = _run(
+            self.backend,
+            lambda client, _: _stream(client, "Hi"),
+            {"tokens_per_second": 2},
+            inter_token_timeout=0.1,
+        )
+        self.assertEqual(tokens, ["Hello", " I need to pause here."])
+
+    def test_early_stop_at_sentence_end_cancels_generation(self):
+        async def scenario(client, server):
+            tokens = await _stream(client, "Hi")
+            for _ in range(50):  # The server notices the closed connection
+                if server.aborted:
+                    break
+                await asyncio.sleep(0.01)
+            return tokens, server.aborted, client.generation_stats()
+
+        tokens, aborted, stats = _run(
+            self.backend, scenario, {"tokens_per_second": 100}, spoken_seconds_target=1.0
+        )
+        # 3 words at 2.5 words/s pass the 1s target; stops at the "!"
+        self.assertEqual("".join(tokens), "Hello there, caller!")
+        self.assertEqual(aborted, 1)
+        self.assertEqual(stats["early_stops"], 1)
+        self.assertEqual(stats["tokens_saved"], 150 - len(tokens))
+
+    def test_no_early_stop_mid_sentence(self):
+        tokens = _run(
+            self.backend, lambda client, _: _stream(client, "Hi"), spoken_seconds_target=0.5
+        )
+        self.assertEqual("".join(tokens), "Hello there, caller!")  # Not "Hello there,"
+
+    def test_cancel_frees_server_slot_within_100ms(self):
+        async def scenario(client, server):
+            ctx = ConversationContext()
+            stream = client.generate_streaming("Hi", context=ctx, owner="call-1")
+            first = await stream.__anext__()
+            rest = asyncio.create_task(_drain(stream))
+            await asyncio.sleep(0.05)  # Waiting on the next token
+            start = time.perf_counter()
+            client.cancel_requests("call-1")
+            await rest
+            while server.generating and time.perf_counter() - start < 1.0:
+                await asyncio.sleep(0.005)
+            freed = time.perf_counter() - start
+            return first, freed, ctx, server, client.scheduler_stats()
+
+        first, freed, ctx, server, stats = _run(
+            self.backend, scenario, {"tokens_per_second": 2}
+        )
+        self.assertLess(freed, 0.1)
+        self.assertEqual((server.generating, server.aborted), (0, 1))
+        self.assertEqual(stats["in_flight"], 0)
+        self.assertEqual(ctx.messages[-1].content, first)  # Partial reply kept
+
+    def test_closing_stream_records_partial_reply(self):
+        async def scenario(client, server):
+            ctx = ConversationContext()
+            stream = client.generate_streaming("Hi", context=ctx)
+            tokens = [await stream.__anext__() for _ in range(3)]
+            await stream.aclose()  # Barge-in: the consumer stops reading
+            for _ in range(50):
+                if not server.generating:
+                    break
+                await asyncio.sleep(0.01)
+            return tokens, ctx, server.generating
+
+        tokens, ctx, generating = _run(self.backend, scenario, {"tokens_per_second": 5})
+        self.assertEqual([m.role for m in ctx.messages], ["user", "assistant"])
+        self.assertEqual(ctx.messages[-1].content, "".join(tokens))
+        self.assertEqual(generating, 0)
+
+    def test_health_follows_model_load(self):
+        async def scenario(client, server):
+            healthy = await client.health_check()
+            server.unload()
+            return healthy, await client.health_check()
+
+        self.assertEqual(_run(self.backend, scenario), (True, False))
+
+
+class TestOpenAIBackend(_BackendTests, unittest.TestCase):
+    backend = "openai"
+
+    def test_calibrates_estimator_from_reported_prompt_size(self):
+        async def scenario(client, _):
+            client._tokens = llm_mod.TokenCounter()
+            await client.generate("Hi", system_prompt="Be brief.")
+            return client._tokens.calibrations
+
+        self.assertEqual(_run(self.backend, scenario), 1)
+
+    def test_vllm_style_usage(self):
+        chunk = llm_mod.ChatChunk(content="", done=True)
+        usage = {"prompt_tokens": 120, "completion_tokens": 7,
+                 "prompt_tokens_details": {"cached_tokens": 100}}
+        llm_mod._openai_stats({"usage": usage}, chunk)
+        self.assertEqual(chunk.prompt_tokens, 120)
+        self.assertEqual(chunk.prompt_eval_count, 20)
+        self.assertEqual(chunk.eval_count, 7)
+
+
+@unittest.skipIf(ollama is None, "ollama not installed")
+class TestOllamaBackend(_BackendTests, unittest.TestCase):
+    backend = "ollama"
+
+
+if __name__ == "__main__":
+    unittest.main()
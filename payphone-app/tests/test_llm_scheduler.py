@@ -0,0 +1,222 @@
+"""Tests for the LLM request scheduler (services/llm_scheduler.py)."""
+
+import asyncio
+import importlib
+import sys
+import types
+import unittest
+from pathlib import Path
+
+
+def _load_modules():
+    """Load services.llm_scheduler and services.llm with settings stubbed."""
+    app_root = Path(__file__).resolve().parent.parent
+    if str(app_root) not in sys.path:
+        sys.path.insert(0, str(app_root))
+
+    for pkg in ("config", "services"):
+        if pkg not in sys.modules:
+            mod = types.ModuleType(pkg)
+            mod.__path__ = [str(app_root / pkg)]
+            sys.modules[pkg] = mod
+
+    if "config.settings" not in sys.modules:
+        settings_mod = types.ModuleType("config.settings")
+        settings_mod.LLMSettings = type("_FakeLLMSettings", (), {})
+        sys.modules["config.settings"] = settings_mod
+
+    return (
+        importlib.import_module("services.llm_scheduler"),
+        importlib.import_module("services.llm"),
+    )
+
+
+sched_mod, llm_mod = _load_modules()
+LLMScheduler = sched_mod.LLMScheduler
+RequestCancelledError = sched_mod.RequestCancelledError
+
+
+async def _request(scheduler, name, priority, order, owner=None, hold=None):
+    """Take a slot, note the order admitted, and hold it until hold is set."""
+    ticket = await scheduler.acquire(priority, owner)
+    try:
+        order.append(name)
+        if hold is not None:
+            await ticket.guard(hold.wait())
+    finally:
+        scheduler.release(ticket)
+
+
+class TestScheduling(unittest.TestCase):
+    def test_admits_by_priority_then_arrival(self):
+        async def scenario():
+            scheduler = LLMScheduler(max_in_flight=1)
+            order, hold = [], asyncio.Event()
+            first = asyncio.create_task(_request(scheduler, "running", 2, order, hold=hold))
+            await asyncio.sleep(0)
+            waiting = [
+                asyncio.create_task(_request(scheduler, name, priority, order))
+                for name, priority in [
+                    ("background", sched_mod.PRIORITY_BACKGROUND),
+                    ("normal", sched_mod.PRIORITY_NORMAL),
+                    ("first turn", sched_mod.PRIORITY_FIRST_TURN),
+                    ("short", sched_mod.PRIORITY_SHORT),
+                    ("normal 2", sched_mod.PRIORITY_NORMAL),
+                ]
+            ]
+            await asyncio.sleep(0)
+            self.assertEqual((scheduler.in_flight, scheduler.queued), (1, 5))
+            hold.set()
+            await asyncio.gather(first, *waiting)
+            return order, scheduler.stats()
+
+        order, stats = asyncio.run(scenario())
+        self.assertEqual(
+            order, ["running", "first turn", "short", "normal", "normal 2", "background"]
+        )
+        self.assertEqual(stats["max_queue_depth"], 5)
+        self.assertEqual((stats["in_flight"], stats["queued"]), (0, 0))
+
+    def test_limit_allows_parallel_requests(self):
+        async def scenario():
+            scheduler = LLMScheduler(max_in_flight=2)
+            order, hold = [], asyncio.Event()
+            tasks = [
+                asyncio.create_task(_request(scheduler, n, 2, order, hold=hold)) for n in "abc"
+            ]
+            await asyncio.sleep(0.01)
+            running = list(order)
+            hold.set()
+            await asyncio.gather(*tasks)
+            return running
+
+        self.assertEqual(asyncio.run(scenario()), ["a", "b"])
+
+    def test_queue_wait_is_recorded(self):
+        clock = [0.0]
+        scheduler = LLMScheduler(max_in_flight=1, clock=lambda: clock[0])
+
+        async def scenario():
+            held = await scheduler.acquire(2)
+            waiter = asyncio.create_task(scheduler.acquire(0))
+            await asyncio.sleep(0)
+            clock[0] = 0.25
+            scheduler.release(held)
+            return await waiter
+
+        ticket = asyncio.run(scenario())
+        self.assertAlmostEqual(ticket.wait_seconds, 0.25)
+        self.assertEqual(scheduler.stats()["avg_wait_ms"], {0: 250.0, 2: 0.0})
+
+
+class TestCancellation(unittest.TestCase):
+    def test_cancel_drops_queued_and_stops_running(self):
+        async def scenario():
+            scheduler = LLMScheduler(max_in_flight=1)
+            order = []
+            running = asyncio.create_task(
+                _request(scheduler, "a", 2, order, owner="call-1", hold=asyncio.Event())
+            )
+            await asyncio.sleep(0)
+            queued = asyncio.create_task(_request(scheduler, "b", 2, order, owner="call-1"))
+            other = asyncio.create_task(_request(scheduler, "c", 2, order, owner="call-2"))
+            await asyncio.sleep(0)
+
+            self.assertEqual(scheduler.cancel("call-1"), 2)
+            results = await asyncio.gather(running, queued, return_exceptions=True)
+            await other
+            return results, order, scheduler
+
+        results, order, scheduler = asyncio.run(scenario())
+        self.assertTrue(all(isinstance(r, RequestCancelledError) for r in results))
+        self.assertEqual(order, ["a", "c"])  # "b" never reached the server
+        self.assertEqual(scheduler.in_flight, 0)
+
+    def test_cancelled_task_leaves_the_queue(self):
+        async def scenario():
+            scheduler = LLMScheduler(max_in_flight=1)
+            held = await scheduler.acquire(2)
+            waiter = asyncio.create_task(scheduler.acquire(0))
+            await asyncio.sleep(0)
+            waiter.cancel()  # Barge-in: the consumer gave up
+            await asyncio.gather(waiter, return_exceptions=True)
+            queued = scheduler.queued
+            scheduler.release(held)
+            return queued, scheduler.in_flight
+
+        self.assertEqual(asyncio.run(scenario()), (0, 0))
+
+
+class _SlowBackend:
+    """Streams a long reply slowly, recording whether it was abandoned."""
+
+    def __init__(self):
+        self.closed = False
+
+    async def chat(self, messages, max_tokens):
+        return llm_mod.ChatChunk("Hi.", done=True)
+
+    async def stream(self, messages, max_tokens):
+        try:
+            for _ in range(100):
+                await asyncio.sleep(0.01)
+                yield llm_mod.ChatChunk("word ")
+            yield llm_mod.ChatChunk("", done=True)
+        finally:
+            self.closed = True
+
+
+def _client(backend):
+    settings = types.SimpleNamespace(
+        model="m", max_tokens=150, timeout=5.0, first_token_timeout=5.0,
+        inter_token_timeout=5.0, tokenizer="", response_cache_enabled=False,
+        spoken_seconds_target=0.0, max_in_flight=1, short_turn_tokens=80,
+    )
+    client = llm_mod.LLMClient(settings, backend=backend)
+    client._initialized = True
+    return client
+
+
+class TestClientScheduling(unittest.TestCase):
+    def test_hangup_frees_the_slot_for_the_next_call(self):
+        backend = _SlowBackend()
+        client = _client(backend)
+
+        async def consume(owner):
+            ctx = llm_mod.ConversationContext()
+            tokens = [t async for t in client.generate_streaming("Tell me", context=ctx,
+                                                                 owner=owner)]
+            return tokens, ctx
+
+        async def scenario():
+            long_call = asyncio.create_task(consume("call-1"))
+            await asyncio.sleep(0.05)
+            next_call = asyncio.create_task(
+                client.generate("Hello", context=llm_mod.ConversationContext(), owner="call-2")
+            )
+            await asyncio.sleep(0)
+            client.cancel_requests("call-1")
+            (tokens, _), response = await asyncio.gather(long_call, next_call)
+            return tokens, response
+
+        tokens, response = asyncio.run(scenario())
+        self.assertLess(len(tokens), 100)
+        self.assertNotIn("sorry", "".join(tokens).lower())  # No apology on hangup
+        self.assertTrue(backend.closed)
+        self.assertEqual(response.text, "Hi.")
+        self.assertGreater(response.queue_wait_ms, 0)
+        self.assertEqual(client.scheduler_stats()["cancelled"], 1)
+
+    def test_first_turn_outranks_later_turns(self):
+        client = _client(_SlowBackend())
+        ctx = llm_mod.ConversationContext()
+        self.assertEqual(client._priority(ctx, 150, False), sched_mod.PRIORITY_FIRST_TURN)
+        ctx.add_user_message("hi")
+        ctx.add_assistant_message("Hello!")
+        self.assertEqual(client._priority(ctx, 150, False), sched_mod.PRIORITY_NORMAL)
+        self.assertEqual(client._priority(ctx, 60, False), sched_mod.PRIORITY_SHORT)
+        self.assertEqual(client._priority(None, 60, True), sched_mod.PRIORITY_BACKGROUND)
+
+
+if __name__ == "__main__":
+    unittest.main()
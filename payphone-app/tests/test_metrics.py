@@ -0,0 +1,44 @@
+"""Tests for the /metrics histograms (services/metrics.py)."""
+
+import importlib
+import sys
+import types
+import unittest
+from pathlib import Path
+
+
+def _load_metrics():
+    """Load services.metrics without importing the services package."""
+    app_root = Path(__file__).resolve().parent.parent
+    if str(app_root) not in sys.path:
+        sys.path.insert(0, str(app_root))
+
+    if "services" not in sys.modules:
+        mod = types.ModuleType("services")
+        mod.__path__ = [str(app_root / "services")]
+        sys.modules["services"] = mod
+
+    return importlib.import_module("services.metrics")
+
+
+metrics_mod = _load_metrics()
+Histogram = metrics_mod.Histogram
+
+
+class TestHistogram(unittest.TestCase):
+    def test_buckets_are_cumulative(self):
+        histogram = Histogram((0.1, 1.0))
+        for value in (0.05, 0.5, 5.0):
+            histogram.observe(value)
+        self.assertEqual(histogram.counts, [1, 2])
+        lines = Histogram.render("t", "Test.", {'op="x"': histogram})
+        self.assertIn('t_bucket{op="x",le="+Inf"} 3', lines)
+        self.assertIn('t_sum{op="x"} 5.550000', lines)
+        self.assertAlmostEqual(histogram.mean, 1.85)
+
+    def test_default_buckets_are_latencies(self):
+        self.assertEqual(Histogram().buckets, metrics_mod.LATENCY_BUCKETS)
+
+
+if __name__ == "__main__":
+    unittest.main()
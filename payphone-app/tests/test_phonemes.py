@@ -0,0 +1,146 @@
+"""Tests for the word-level phoneme cache (services/phonemes.py)."""
+
+import importlib
+import re
+import sys
+import threading
+import types
+import unittest
+from pathlib import Path
+
+
+def _load_phonemes():
+    """Load services.phonemes without importing the services package."""
+    app_root = Path(__file__).resolve().parent.parent
+    if str(app_root) not in sys.path:
+        sys.path.insert(0, str(app_root))
+
+    if "services" not in sys.modules:
+        mod = types.ModuleType("services")
+        mod.__path__ = [str(app_root / "services")]
+        sys.modules["services"] = mod
+
+    return importlib.import_module("services.phonemes")
+
+
+phonemes_mod = _load_phonemes()
+PhonemeCache = phonemes_mod.PhonemeCache
+
+
+class _FakeG2P:
+    """espeak-shaped output: one token per word, punctuation attached.
+
+    Words become "/word/"; numbers expand to two words, as espeak does
+    for "555" (so the output can't be aligned word by word).
+    """
+
+    def __init__(self):
+        self.calls: list[str] = []
+
+    def __call__(self, text):
+        self.calls.append(text)
+        out = re.sub(r"[A-Za-z]+(?:'[A-Za-z]+)*", lambda m: f"/{m.group(0).lower()}/", text)
+        return re.sub(r"\d+", "/num/ /ber/", out)
+
+
+class TestPhonemeCache(unittest.TestCase):
+    def test_known_words_skip_g2p(self):
+        g2p = _FakeG2P()
+        cache = PhonemeCache(g2p)
+
+        first = cache.phonemize("Hello there, caller.")
+        second = cache.phonemize("Hello caller, hello there!")
+
+        self.assertEqual(first, "/hello/ /there/, /caller/.")
+        self.assertEqual(second, "/hello/ /caller/, /hello/ /there/!")
+        self.assertEqual(g2p.calls, ["Hello there, caller."])
+        self.assertEqual(cache.stats()["hits"], 1)
+        self.assertEqual(cache.stats()["misses"], 1)
+
+    def test_assembled_matches_direct_g2p(self):
+        g2p = _FakeG2P()
+        cache = PhonemeCache(g2p)
+        cache.phonemize("You can't dial the operator.")
+        cache.phonemize("Please hold; the line is busy!")
+
+        text = "The operator can't hold the line."
+        self.assertEqual(cache.phonemize(text), g2p(text))
+
+    def test_unknown_word_runs_g2p_on_whole_sentence(self):
+        g2p = _FakeG2P()
+        cache = PhonemeCache(g2p)
+        cache.phonemize("Thanks for calling.")
+        cache.phonemize("Wait for help.")
+        self.assertEqual(g2p.calls, ["Thanks for calling.", "Wait for help."])
+        cache.phonemize("Thanks for help.")
+        self.assertEqual(len(g2p.calls), 2)
+
+    def test_words_are_keyed_by_following_sound(self):
+        g2p = _FakeG2P()
+        cache = PhonemeCache(g2p)
+        cache.phonemize("the pear")
+        cache.phonemize("an apple")
+        cache.phonemize("the apple")  # "the" before a vowel is new
+        cache.phonemize("the pear, the apple")
+        self.assertEqual(g2p.calls, ["the pear", "an apple", "the apple"])
+
+    def test_numbers_cached_as_whole_sentence_only(self):
+        g2p = _FakeG2P()
+        cache = PhonemeCache(g2p)
+        text = "Dial 555 now."
+        self.assertEqual(cache.phonemize(text), "/dial/ /num/ /ber/ /now/.")
+        self.assertEqual(cache.phonemize(text), "/dial/ /num/ /ber/ /now/.")
+        self.assertEqual(len(g2p.calls), 1)
+        self.assertEqual(cache.stats()["words"], 0)
+
+    def test_misaligned_output_is_not_learned(self):
+        cache = PhonemeCache(lambda text: "/merged/")
+        cache.phonemize("of the")
+        self.assertEqual(cache.stats()["words"], 0)
+
+    def test_acronyms_keep_case(self):
+        g2p = _FakeG2P()
+        cache = PhonemeCache(g2p)
+        cache.phonemize("us and them")
+        cache.phonemize("US and them")
+        self.assertEqual(len(g2p.calls), 2)
+
+    def test_lru_eviction(self):
+        g2p = _FakeG2P()
+        cache = PhonemeCache(g2p, max_words=2)
+        cache.phonemize("alpha.")
+        cache.phonemize("beta.")
+        cache.phonemize("gamma.")  # evicts alpha
+        self.assertEqual(cache.stats()["words"], 2)
+        cache.phonemize("beta.")
+        cache.phonemize("alpha.")
+        self.assertEqual(g2p.calls, ["alpha.", "beta.", "gamma.", "alpha."])
+
+    def test_concurrent_use(self):
+        cache = PhonemeCache(_FakeG2P(), max_words=50)
+        sentences = [f"word{chr(97 + i % 26)} and more, please." for i in range(200)]
+        errors = []
+
+        def worker(offset):
+            try:
+                for text in sentences[offset::4]:
+                    cache.phonemize(text)
+            except Exception as e:  # pragma: no cover - failure path
+                errors.append(e)
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+        self.assertEqual(cache.stats()["hits"] + cache.stats()["misses"], 200)
+
+    def test_empty_text(self):
+        g2p = _FakeG2P()
+        self.assertEqual(PhonemeCache(g2p).phonemize("   "), "")
+        self.assertEqual(g2p.calls, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
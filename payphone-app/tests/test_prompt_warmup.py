@@ -0,0 +1,237 @@
+"""Tests for system-prompt prefix warmup (services/prompt_warmup.py)."""
+
+import asyncio
+import importlib
+import json
+import sys
+import tempfile
+import types
+import unittest
+from pathlib import Path
+
+
+def _load_modules():
+    """Load services.prompt_warmup and services.llm with settings stubbed."""
+    app_root = Path(__file__).resolve().parent.parent
+    if str(app_root) not in sys.path:
+        sys.path.insert(0, str(app_root))
+
+    for pkg in ("config", "services"):
+        if pkg not in sys.modules:
+            mod = types.ModuleType(pkg)
+            mod.__path__ = [str(app_root / pkg)]
+            sys.modules[pkg] = mod
+
+    if "config.settings" not in sys.modules:
+        settings_mod = types.ModuleType("config.settings")
+        settings_mod.LLMSettings = type("_FakeLLMSettings", (), {})
+        sys.modules["config.settings"] = settings_mod
+
+    warmup = importlib.import_module("services.prompt_warmup")
+    llm = importlib.import_module("services.llm")
+    return warmup, llm
+
+
+warmup_mod, llm_mod = _load_modules()
+PromptWarmer = warmup_mod.PromptWarmer
+
+PROMPTS = {"operator": "OP", "feature:jokes": "JOKES", "persona:grandma": "GRANDMA"}
+
+
+class _FakeOllama:
+    """Records warmed prompts; optional delay and load_duration."""
+
+    def __init__(self, seconds=0.0, load_seconds=0.0):
+        self.seconds = seconds
+        self.load_seconds = load_seconds
+        self.warmed: list[str] = []
+        self.loaded = True
+
+    async def warm(self, prompt):
+        await asyncio.sleep(self.seconds)
+        self.warmed.append(prompt)
+        self.loaded = True
+        return self.load_seconds
+
+    async def is_loaded(self):
+        return self.loaded
+
+
+def _warmer(fake, **kwargs):
+    kwargs.setdefault("idle_seconds", 0.0)
+    kwargs.setdefault("poll_interval", 0.01)
+    return PromptWarmer(PROMPTS, fake.warm, is_loaded=fake.is_loaded, **kwargs)
+
+
+class TestPromptWarmer(unittest.TestCase):
+    def test_plan_ranks_by_usage_then_default_order(self):
+        warmer = _warmer(_FakeOllama(), slots=2)
+        self.assertEqual(warmer.plan(), ["operator", "feature:jokes"])
+        for _ in range(3):
+            warmer.request_started()
+            warmer.request_finished("GRANDMA")
+        warmer.request_started()
+        warmer.request_finished("JOKES")
+        self.assertEqual(warmer.plan(), ["persona:grandma", "feature:jokes"])
+
+    def test_hot_set_is_lru_of_slots(self):
+        fake = _FakeOllama()
+        warmer = _warmer(fake, slots=2)
+
+        async def run():
+            for label in ("operator", "feature:jokes", "persona:grandma"):
+                await warmer.warm_now(label)
+
+        asyncio.run(run())
+        self.assertEqual(fake.warmed, ["OP", "JOKES", "GRANDMA"])
+        self.assertFalse(warmer.is_hot("operator"))
+        self.assertTrue(warmer.is_hot("feature:jokes"))
+        self.assertTrue(warmer.is_hot("persona:grandma"))
+
+    def test_scheduler_warms_plan_when_idle(self):
+        fake = _FakeOllama()
+        warmer = _warmer(fake, slots=2)
+
+        async def run():
+            warmer.start()
+            await asyncio.sleep(0.1)
+            await warmer.stop()
+
+        asyncio.run(run())
+        self.assertEqual(fake.warmed, ["OP", "JOKES"])
+        self.assertEqual(warmer.stats()["warmups"], 2)
+
+    def test_no_warmup_during_requests(self):
+        fake = _FakeOllama()
+        warmer = _warmer(fake, idle_seconds=0.2)
+
+        async def run():
+            warmer.request_started()
+            warmer.start()
+            await asyncio.sleep(0.05)
+            warmer.request_finished("JOKES")
+            await asyncio.sleep(0.05)  # Not idle long enough yet
+            before = list(fake.warmed)
+            await warmer.stop()
+            return before
+
+        self.assertEqual(asyncio.run(run()), [])
+
+    def test_request_preempts_inflight_warmup(self):
+        fake = _FakeOllama(seconds=1.0)
+        warmer = _warmer(fake)
+
+        async def run():
+            warming = asyncio.create_task(warmer.warm_now("operator"))
+            await asyncio.sleep(0.02)
+            warmer.request_started()
+            result = await asyncio.wait_for(warming, 0.5)
+            warmer.request_finished("JOKES")
+            return result
+
+        self.assertFalse(asyncio.run(run()))
+        self.assertEqual(fake.warmed, [])
+        self.assertEqual(warmer.preempted, 1)
+        self.assertTrue(warmer.is_hot("feature:jokes"))
+
+    def test_reload_in_response_rewarms(self):
+        fake = _FakeOllama()
+        warmer = _warmer(fake, slots=2)
+
+        async def run():
+            await warmer.warm_now("operator")
+            await warmer.warm_now("feature:jokes")
+            warmer.request_started()
+            warmer.request_finished("OP", load_seconds=4.0)  # Model was reloaded
+            hot_after_reload = (warmer.is_hot("operator"), warmer.is_hot("feature:jokes"))
+            warmer.start()
+            await asyncio.sleep(0.1)
+            await warmer.stop()
+            return hot_after_reload
+
+        self.assertEqual(asyncio.run(run()), (True, False))
+        self.assertEqual(fake.warmed, ["OP", "JOKES", "JOKES"])
+        self.assertEqual(warmer.reloads, 1)
+
+    def test_unloaded_model_rewarms(self):
+        fake = _FakeOllama()
+        warmer = _warmer(fake)
+
+        async def run():
+            await warmer.warm_now("operator")
+            fake.loaded = False  # e.g. Ollama restarted
+            warmer.start()
+            await asyncio.sleep(0.1)
+            await warmer.stop()
+
+        asyncio.run(run())
+        self.assertEqual(fake.warmed, ["OP", "OP"])
+        self.assertTrue(warmer.is_hot("operator"))
+
+    def test_unknown_prompt_takes_a_slot(self):
+        warmer = _warmer(_FakeOllama())
+
+        async def run():
+            await warmer.warm_now("operator")
+
+        asyncio.run(run())
+        warmer.request_started()
+        warmer.request_finished("a custom system prompt")
+        self.assertFalse(warmer.is_hot("operator"))
+
+    def test_background_request_takes_slot_without_usage(self):
+        warmer = _warmer(_FakeOllama())
+        warmer.request_started()
+        warmer.request_finished("GRANDMA", count_usage=False)
+        self.assertTrue(warmer.is_hot("persona:grandma"))
+        self.assertEqual(warmer.plan(), ["operator"])
+
+    def test_usage_persists(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "usage.json"
+            warmer = _warmer(_FakeOllama(), usage_path=path)
+            warmer.request_started()
+            warmer.request_finished("GRANDMA")
+            warmer.save_usage()
+            self.assertEqual(json.loads(path.read_text()), {"persona:grandma": 1})
+
+            path.write_text(json.dumps({"persona:grandma": 2, "feature:gone": 9}))
+            reloaded = _warmer(_FakeOllama(), usage_path=path)
+            self.assertEqual(reloaded.plan(), ["persona:grandma"])
+
+    def test_corrupt_usage_file_ignored(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "usage.json"
+            path.write_text("{not json")
+            self.assertEqual(_warmer(_FakeOllama(), usage_path=path).plan(), ["operator"])
+
+
+class _FakeBackend:
+    def __init__(self):
+        self.calls = []
+
+    async def chat(self, messages, max_tokens):
+        self.calls.append(messages)
+        return llm_mod.ChatChunk("Hi!", done=True, eval_count=2, load_seconds=0.005)
+
+
+class TestLLMClientWarmupHooks(unittest.TestCase):
+    def test_generate_records_prompt_usage(self):
+        settings = types.SimpleNamespace(
+            model="m", temperature=0.7, top_p=0.9, max_tokens=10, keep_alive="1h",
+            timeout=5.0, tokenizer="", response_cache_enabled=False,
+            spoken_seconds_target=0.0, max_in_flight=1, short_turn_tokens=80,
+        )
+        client = llm_mod.LLMClient(settings, backend=_FakeBackend())
+        client._initialized = True
+        client._warmer = _warmer(_FakeOllama())
+
+        asyncio.run(client.generate("Tell me a joke", system_prompt="JOKES"))
+
+        self.assertEqual(client.warmup_stats()["usage"], {"feature:jokes": 1})
+        self.assertTrue(client._warmer.is_hot("feature:jokes"))
+        self.assertEqual(client._warmer.reloads, 0)  # 5ms load_duration
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,159 @@
+"""Tests for the ready queue of pre-generated first replies (core/ready_queue.py)."""
+
+import asyncio
+import importlib
+import sys
+import types
+import unittest
+from pathlib import Path
+
+
+def _load_ready_queue():
+    """Load core.ready_queue with pydantic settings stubbed."""
+    app_root = Path(__file__).resolve().parent.parent
+    if str(app_root) not in sys.path:
+        sys.path.insert(0, str(app_root))
+
+    for pkg in ("config", "core", "services"):
+        if pkg not in sys.modules:
+            mod = types.ModuleType(pkg)
+            mod.__path__ = [str(app_root / pkg)]
+            sys.modules[pkg] = mod
+
+    settings_mod = sys.modules.get("config.settings")
+    if settings_mod is None:
+        settings_mod = types.ModuleType("config.settings")
+        sys.modules["config.settings"] = settings_mod
+    for name in ("Settings", "AudioSettings", "LLMSettings", "TTSSettings"):
+        if not hasattr(settings_mod, name):
+            setattr(settings_mod, name, type(f"_Fake{name}", (), {}))
+
+    return importlib.import_module("core.ready_queue")
+
+
+ready_mod = _load_ready_queue()
+Opener = ready_mod.Opener
+ReadyQueue = ready_mod.ReadyQueue
+
+OPENERS = {
+    "feature:jokes": Opener("feature:jokes", "Tell me a joke.", "You tell jokes.", "am_puck"),
+    "feature:compliment": Opener("feature:compliment", "Compliment me.", "Be kind.", "af_bella"),
+}
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class _Fake:
+    """Generates numbered replies and renders them to fake audio."""
+
+    def __init__(self):
+        self.calls = 0
+        self.gate: asyncio.Event | None = None
+
+    async def generate(self, opener):
+        self.calls += 1
+        if self.gate is not None:
+            await self.gate.wait()
+        return f"{opener.label} reply {self.calls}"
+
+    async def render(self, text, voice):
+        return f"{voice}:{text}".encode()
+
+
+def _queue(fake, **kwargs):
+    kwargs.setdefault("clock", _Clock())
+    return ReadyQueue(OPENERS, fake.generate, fake.render, depth=2, idle_seconds=10, **kwargs)
+
+
+class TestFilling(unittest.TestCase):
+    def test_fills_every_line_to_depth(self):
+        fake = _Fake()
+        queue = _queue(fake)
+
+        self.assertEqual(asyncio.run(queue.fill_once()), 4)
+
+        stats = queue.stats()
+        self.assertEqual({line["ready"] for line in stats["lines"].values()}, {2})
+        self.assertEqual(asyncio.run(queue.fill_once()), 0)  # Full: nothing to do
+
+    def test_take_serves_oldest_with_rendered_audio(self):
+        fake = _Fake()
+        queue = _queue(fake)
+        asyncio.run(queue.fill_once())
+
+        first = queue.take("feature:jokes")
+        self.assertEqual(first.text, "feature:jokes reply 1")
+        self.assertEqual(first.audio, b"am_puck:feature:jokes reply 1")
+        self.assertEqual(first.voice, "am_puck")
+        queue.take("feature:jokes")
+        self.assertIsNone(queue.take("feature:jokes"))
+        self.assertIsNone(queue.take("feature:trivia"))  # Line without an opener
+        self.assertEqual((queue.served, queue.misses), (2, 1))
+
+    def test_waits_for_calls_to_end(self):
+        fake = _Fake()
+        clock = _Clock()
+        queue = _queue(fake, clock=clock)
+
+        queue.call_started()
+        self.assertEqual(asyncio.run(queue.fill_once()), 0)
+        queue.call_finished()
+        clock.now += 5
+        self.assertEqual(asyncio.run(queue.fill_once()), 0)  # Not idle long enough
+        clock.now += 5
+        self.assertEqual(asyncio.run(queue.fill_once()), 4)
+
+    def test_call_preempts_in_flight_fill(self):
+        fake = _Fake()
+        fake.gate = asyncio.Event()  # Generation never finishes on its own
+        queue = _queue(fake)
+
+        async def scenario():
+            fill = asyncio.create_task(queue.fill_once())
+            await asyncio.sleep(0.01)
+            queue.call_started()
+            return await fill
+
+        self.assertEqual(asyncio.run(scenario()), 0)
+        self.assertEqual(queue.preempted, 1)
+        self.assertEqual(queue.stats()["lines"]["feature:jokes"]["ready"], 0)
+
+    def test_stale_replies_are_replaced(self):
+        fake = _Fake()
+        clock = _Clock()
+        queue = _queue(fake, clock=clock, max_age=60)
+        asyncio.run(queue.fill_once())
+
+        clock.now += 30
+        self.assertEqual(queue.stats()["lines"]["feature:jokes"]["oldest_age"], 30)
+        clock.now += 31
+        self.assertEqual(asyncio.run(queue.fill_once()), 4)
+        self.assertEqual(queue.replaced, 4)
+        self.assertEqual(queue.take("feature:jokes").text, "feature:jokes reply 5")
+
+    def test_failed_generation_ends_pass(self):
+        fake = _Fake()
+        fake.generate = lambda opener: asyncio.sleep(0, result="")
+        queue = _queue(fake)
+
+        self.assertEqual(asyncio.run(queue.fill_once()), 0)
+        self.assertEqual(queue.generated, 0)
+
+
+class TestDirectoryOpeners(unittest.TestCase):
+    def test_dial_a_joke_has_an_opener(self):
+        openers = ready_mod.directory_openers()
+        jokes = openers["feature:jokes"]
+        self.assertIn("joke", jokes.prompt.lower())
+        self.assertTrue(jokes.voice)
+        self.assertNotIn("feature:operator", openers)
+
+
+if __name__ == "__main__":
+    unittest.main()
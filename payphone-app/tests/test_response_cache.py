@@ -0,0 +1,278 @@
+"""Tests for the LLM response cache (services/response_cache.py)."""
+
+import asyncio
+import importlib
+import sys
+import types
+import unittest
+from pathlib import Path
+
+
+def _load_modules():
+    """Load services.response_cache and services.llm with settings stubbed."""
+    app_root = Path(__file__).resolve().parent.parent
+    if str(app_root) not in sys.path:
+        sys.path.insert(0, str(app_root))
+
+    for pkg in ("config", "services"):
+        if pkg not in sys.modules:
+            mod = types.ModuleType(pkg)
+            mod.__path__ = [str(app_root / pkg)]
+            sys.modules[pkg] = mod
+
+    if "config.settings" not in sys.modules:
+        settings_mod = types.ModuleType("config.settings")
+        settings_mod.LLMSettings = type("_FakeLLMSettings", (), {})
+        sys.modules["config.settings"] = settings_mod
+
+    return (
+        importlib.import_module("services.response_cache"),
+        importlib.import_module("services.llm"),
+    )
+
+
+cache_mod, llm_mod = _load_modules()
+ResponseCache = cache_mod.ResponseCache
+normalize_request = cache_mod.normalize_request
+ConversationContext = llm_mod.ConversationContext
+
+KEY = ("feature:jokes", "joke", "")
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestNormalize(unittest.TestCase):
+    def test_filler_and_plurals_share_a_key(self):
+        self.assertEqual(normalize_request("Um, can you tell me a joke please?"), "joke")
+        self.assertEqual(normalize_request("Tell me jokes!"), "joke")
+        self.assertEqual(normalize_request("What's my FORTUNE"), "what fortune")
+        self.assertEqual(normalize_request("Tell me one"), "")
+
+    def test_long_requests_are_not_cached(self):
+        long_request = "my cat knocked over a vase and my wife says I'm to blame"
+        self.assertIsNone(normalize_request(long_request))
+        self.assertIsNone(ResponseCache.key("feature:jokes", "word " * 20))
+        self.assertEqual(ResponseCache.key("feature:jokes", "joke"), KEY)
+
+    def test_greetings_are_not_filler(self):
+        self.assertEqual(normalize_request("Hello?"), "hello")
+        self.assertEqual(normalize_request("hi there"), "hi there")
+
+    def test_empty_request_only_cached_as_opener(self):
+        self.assertIsNone(ResponseCache.key("feature:jokes", "go ahead"))
+        self.assertIsNone(ResponseCache.key("feature:jokes", "Another one?"))
+        self.assertEqual(
+            ResponseCache.key("feature:jokes", "Tell me one.", opener=True),
+            ("feature:jokes", "", ""),
+        )
+
+    def test_later_turns_are_keyed_on_the_last_reply(self):
+        france = ResponseCache.key("feature:jokes", "Paris", "Capital of France?")
+        spain = ResponseCache.key("feature:jokes", "Paris", "Capital of Spain?")
+        self.assertNotEqual(france, spain)
+        self.assertNotEqual(france, ResponseCache.key("feature:jokes", "Paris"))
+        self.assertEqual(france, ResponseCache.key("feature:jokes", "paris!", "Capital of France?"))
+
+
+class TestResponseCache(unittest.TestCase):
+    def _full(self, **kwargs):
+        cache = ResponseCache(variants=3, **kwargs)
+        for text in ("Joke A.", "Joke B.", "Joke C."):
+            cache.put(KEY, text)
+        return cache
+
+    def test_misses_until_all_variants_generated(self):
+        cache = ResponseCache(variants=3)
+        cache.put(KEY, "Joke A.")
+        cache.put(KEY, "Joke A.")  # Duplicate ignored
+        cache.put(KEY, "Joke B.")
+        self.assertIsNone(cache.get(KEY))
+        cache.put(KEY, "Joke C.")
+        self.assertIsNotNone(cache.get(KEY))
+        self.assertEqual(cache.stats()["misses"], 1)
+
+    def test_rotates_least_served_and_avoids_heard(self):
+        cache = self._full()
+        served = [cache.get(KEY).text for _ in range(6)]
+        self.assertEqual(served, ["Joke A.", "Joke B.", "Joke C."] * 2)
+        self.assertEqual(cache.get(KEY, avoid=["Joke A."]).text, "Joke B.")
+        self.assertIsNone(cache.get(KEY, avoid=["Joke A.", "Joke B.", "Joke C."]))
+
+    def test_variants_expire(self):
+        clock = _Clock()
+        cache = self._full(ttl_seconds=60, clock=clock)
+        clock.now = 61
+        self.assertIsNone(cache.get(KEY))
+        self.assertEqual(cache.stats()["keys"], 0)
+
+    def test_put_beyond_variants_replaces_oldest(self):
+        cache = self._full()
+        cache.put(KEY, "Joke D.")
+        texts = {cache.get(KEY).text for _ in range(3)}
+        self.assertEqual(texts, {"Joke B.", "Joke C.", "Joke D."})
+
+    def test_least_recently_used_keys_evicted(self):
+        cache = ResponseCache(variants=1, max_keys=2)
+        for topic in ("a", "b"):
+            cache.put(("f", topic, True), topic)
+        cache.get(("f", "a", True))
+        cache.put(("f", "c", True), "c")
+        self.assertIsNotNone(cache.get(("f", "a", True)))
+        self.assertIsNone(cache.get(("f", "b", True)))
+
+    def test_audio_is_bounded(self):
+        cache = self._full(max_audio_bytes=10)
+        first, second = cache.get(KEY), cache.get(KEY)
+        cache.attach_audio(first, "af_bella", b"x" * 6)
+        cache.attach_audio(second, "af_bella", b"y" * 6)
+        self.assertIsNone(first.audio)
+        self.assertEqual(second.audio, b"y" * 6)
+        self.assertEqual(cache.stats()["audio_bytes"], 6)
+
+    def test_audio_not_attached_to_evicted_reply(self):
+        clock = _Clock()
+        cache = self._full(ttl_seconds=60, clock=clock)
+        reply = cache.get(KEY)
+        clock.now = 61
+        cache.put(KEY, "Fresh joke.")  # Expires the old variants
+        cache.attach_audio(reply, "af_bella", b"x" * 6)
+        self.assertIsNone(reply.audio)
+        self.assertEqual(cache.stats()["audio_bytes"], 0)
+
+
+class _JokeBackend:
+    """Tells a different joke on each call."""
+
+    def __init__(self):
+        self.calls = 0
+
+    async def chat(self, messages, max_tokens):
+        self.calls += 1
+        return llm_mod.ChatChunk(f"Joke {self.calls}.", done=True, eval_count=3)
+
+    async def stream(self, messages, max_tokens):
+        self.calls += 1
+        yield llm_mod.ChatChunk(f"Joke {self.calls}")
+        yield llm_mod.ChatChunk(".", done=True)
+
+
+def _client(backend, variants=2):
+    settings = types.SimpleNamespace(
+        model="m", max_tokens=10, timeout=5.0, first_token_timeout=5.0,
+        inter_token_timeout=5.0, tokenizer="", response_cache_enabled=True,
+        response_cache_labels="feature:jokes, feature:fortune", response_cache_variants=variants,
+        response_cache_ttl=3600.0, response_cache_max_keys=16, response_cache_audio_mb=1.0,
+        spoken_seconds_target=0.0, max_in_flight=1, short_turn_tokens=80,
+    )
+    client = llm_mod.LLMClient(settings, backend=backend)
+    client._initialized = True
+    return client
+
+
+class TestClientResponseCache(unittest.TestCase):
+    def test_generate_serves_after_variants_filled(self):
+        backend = _JokeBackend()
+        client = _client(backend)
+
+        async def scenario():
+            return [
+                await client.generate("Tell me a joke!", context=ConversationContext(),
+                                      label="feature:jokes")
+                for _ in range(4)
+            ]
+
+        responses = asyncio.run(scenario())
+        self.assertEqual(backend.calls, 2)
+        texts = [r.text for r in responses]
+        self.assertEqual(texts, ["Joke 1.", "Joke 2.", "Joke 1.", "Joke 2."])
+        self.assertIsNone(responses[0].cached_reply)
+        self.assertIsNotNone(responses[2].cached_reply)
+
+    def test_hit_is_recorded_in_context_and_not_repeated(self):
+        backend = _JokeBackend()
+        client = _client(backend)
+
+        def mid_call(*heard):
+            ctx = ConversationContext()
+            for reply in (*heard, "Welcome to Dial-A-Joke!"):
+                ctx.add_user_message("hi")
+                ctx.add_assistant_message(reply)
+            return ctx
+
+        async def scenario():
+            for _ in range(2):  # Fills the key (Joke 1, Joke 2)
+                await client.generate("a joke", context=mid_call(), label="feature:jokes")
+            ctx = mid_call("Joke 1.")
+            await client.generate("a joke", context=ctx, label="feature:jokes")
+            return ctx
+
+        ctx = asyncio.run(scenario())
+        replies = [m.content for m in ctx.messages if m.role == "assistant"]
+        self.assertEqual(replies, ["Joke 1.", "Welcome to Dial-A-Joke!", "Joke 2."])
+        self.assertEqual(backend.calls, 2)
+
+    def test_answer_not_served_for_another_question(self):
+        backend = _JokeBackend()
+        client = _client(backend, variants=1)
+
+        def asked(question):
+            ctx = ConversationContext()
+            ctx.add_user_message("quiz me")
+            ctx.add_assistant_message(question)
+            return ctx
+
+        async def scenario():
+            await client.generate("Paris", context=asked("Capital of France?"),
+                                  label="feature:jokes")
+            spain = await client.generate("Paris", context=asked("Capital of Spain?"),
+                                          label="feature:jokes")
+            france = await client.generate("Paris", context=asked("Capital of France?"),
+                                           label="feature:jokes")
+            return spain, france
+
+        spain, france = asyncio.run(scenario())
+        self.assertIsNone(spain.cached_reply)
+        self.assertEqual(france.text, "Joke 1.")
+        self.assertEqual(backend.calls, 2)
+
+    def test_uncached_label_always_generates(self):
+        backend = _JokeBackend()
+        client = _client(backend, variants=1)
+
+        async def scenario():
+            for _ in range(3):
+                await client.generate(
+                    "hello", context=ConversationContext(), label="operator"
+                )
+
+        asyncio.run(scenario())
+        self.assertEqual(backend.calls, 3)
+        self.assertEqual(client.reply_cache_stats()["keys"], 0)
+
+    def test_streaming_stores_completed_reply(self):
+        backend = _JokeBackend()
+        client = _client(backend, variants=1)
+
+        async def scenario():
+            ctx = ConversationContext()
+            tokens = [t async for t in client.generate_streaming(
+                "What's my fortune?", context=ctx, label="feature:fortune")]
+            reply = client.lookup_reply(
+                "what's my fortune", "feature:fortune", ConversationContext()
+            )
+            return "".join(tokens), reply
+
+        text, reply = asyncio.run(scenario())
+        self.assertEqual(text, "Joke 1.")
+        self.assertEqual(reply.text, "Joke 1.")
+        self.assertEqual(backend.calls, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,215 @@
+"""Tests for SentenceBuffer (services/llm.py) over recorded token streams."""
+
+import importlib
+import json
+import random
+import re
+import sys
+import types
+import unittest
+from itertools import pairwise
+from pathlib import Path
+
+DATA = Path(__file__).resolve().parent / "data" / "token_streams.jsonl"
+
+
+def _load_llm():
+    """Load services.llm with settings stubbed."""
+    app_root = Path(__file__).resolve().parent.parent
+    if str(app_root) not in sys.path:
+        sys.path.insert(0, str(app_root))
+
+    for pkg in ("config", "services"):
+        if pkg not in sys.modules:
+            mod = types.ModuleType(pkg)
+            mod.__path__ = [str(app_root / pkg)]
+            sys.modules[pkg] = mod
+
+    if "config.settings" not in sys.modules:
+        settings_mod = types.ModuleType("config.settings")
+        settings_mod.LLMSettings = type("_FakeLLMSettings", (), {})
+        sys.modules["config.settings"] = settings_mod
+
+    return importlib.import_module("services.llm")
+
+
+llm_mod = _load_llm()
+SentenceBuffer = llm_mod.SentenceBuffer
+
+STREAMS = [json.loads(line) for line in DATA.read_text().splitlines() if line.strip()]
+
+
+def _pieces(buffer, tokens):
+    """Feed tokens through buffer and return every piece, flush included."""
+    pieces = [piece for token in tokens if (piece := buffer.add_token(token))]
+    while tail := buffer.flush():
+        pieces.append(tail)
+    return pieces
+
+
+def _rechunk(text, rng, longest=8):
+    """Split text into random tokens of 1-longest characters."""
+    tokens, i = [], 0
+    while i < len(text):
+        size = rng.randint(1, longest)
+        tokens.append(text[i:i + size])
+        i += size
+    return tokens
+
+
+def _letters(text):
+    """Text without whitespace or quotes, which pieces may drop at their edges."""
+    return re.sub(r"[\s\"”’)\]]", "", text)
+
+
+class TestPolicy(unittest.TestCase):
+    def test_first_piece_ends_at_clause_break(self):
+        pieces = _pieces(SentenceBuffer(), ["Well", " hello", " there", ",", " caller", "!"])
+        self.assertEqual(pieces, ["Well hello there,", "caller!"])
+
+    def test_later_pieces_end_at_sentence_ends(self):
+        tokens = ["Hi", " there", " friend", ".", " One", ",", " two", ",", " three", "."]
+        self.assertEqual(
+            _pieces(SentenceBuffer(), tokens), ["Hi there friend.", "One, two, three."]
+        )
+
+    def test_numbers_are_not_boundaries(self):
+        tokens = ["It", "'s", " ", "3", ":", "4", "5", " and", " ", "7", "2", ".", "5", " degrees"]
+        self.assertEqual(_pieces(SentenceBuffer(), tokens), ["It's 3:45 and 72.5 degrees"])
+
+    def test_period_after_number_ends_sentence(self):
+        tokens = ["The", " answer", " is", " ", "4", "2", ".", " Next", " up", "."]
+        self.assertEqual(_pieces(SentenceBuffer(), tokens), ["The answer is 42.", "Next up."])
+
+    def test_abbreviations_are_not_boundaries(self):
+        tokens = ["Ask", " Dr", ".", " Watson", " e", ".g", ".", " today", ".", " Bye", " now", "."]
+        self.assertEqual(
+            _pieces(SentenceBuffer(), tokens), ["Ask Dr. Watson e.g. today.", "Bye now."]
+        )
+
+    def test_closing_quote_stays_with_its_piece(self):
+        buffer = SentenceBuffer()
+        tokens = ['"', "Call", " me", " later", ',"', " she", " said", " softly", ".", ' "', "Bye",
+                  " for", " now", '!"']
+        self.assertEqual(
+            _pieces(buffer, tokens), ['"Call me later,"', "she said softly.", '"Bye for now!"']
+        )
+
+    def test_late_closing_quote_joins_its_piece(self):
+        tokens = ['"', "Call", " me", " later", ",", '"', " she", " said", "."]
+        self.assertEqual(_pieces(SentenceBuffer(), tokens), ['"Call me later,"', "she said."])
+        tokens = ["He", " said", ' "', "hi", " there", ".", '" Then', " he", " left", "."]
+        self.assertEqual(
+            _pieces(SentenceBuffer(), tokens), ['He said "hi there."', "Then he left."]
+        )
+
+    def test_repeated_sentence_ends_stay_together(self):
+        tokens = ["Is", " that", " really", " so", "?!", " Well", " then", "..."]
+        self.assertEqual(_pieces(SentenceBuffer(), tokens), ["Is that really so?!", "Well then..."])
+
+    def test_several_sentences_in_one_token(self):
+        buffer = SentenceBuffer()
+        self.assertEqual(buffer.add_token("First one here. Second one here. Th"), "First one here.")
+        self.assertEqual(buffer.add_token("ird"), "Second one here.")
+        self.assertEqual(buffer.flush(), "Third")
+
+    def test_max_length_cuts_at_clause_then_space(self):
+        buffer = SentenceBuffer(max_length=30)
+        text = "So I went down to the shore, and then all along the coast to town"
+        pieces = _pieces(buffer, [" " + word for word in text.split()])
+        self.assertEqual(pieces[0], "So I went down to the shore,")
+        self.assertTrue(all(len(piece) <= 30 for piece in pieces), pieces)
+        self.assertEqual(" ".join(pieces), text)
+
+    def test_token_past_max_length_is_not_appended(self):
+        tokens = ["One", " two", " three", " four", " five", " sixteen"]
+        pieces = _pieces(SentenceBuffer(max_length=24), tokens)
+        self.assertEqual(pieces, ["One two three four five", "sixteen"])
+
+    def test_max_wait_forces_a_piece(self):
+        now = [0.0]
+        buffer = SentenceBuffer(max_wait=2.0, clock=lambda: now[0])
+        self.assertIsNone(buffer.add_token("Slowly the model"))
+        now[0] = 1.0
+        self.assertIsNone(buffer.add_token(" keeps on"))
+        now[0] = 2.5
+        self.assertEqual(buffer.add_token(" going"), "Slowly the model keeps on")
+        self.assertEqual(buffer.flush(), "going")
+
+    def test_clear_makes_the_next_piece_first_again(self):
+        buffer = SentenceBuffer()
+        _pieces(buffer, ["Hello there, friend", "."])
+        buffer.clear()
+        self.assertEqual(buffer.add_token("Good morning, all"), "Good morning,")
+
+
+class TestRecordedStreams(unittest.TestCase):
+    def test_streams_keep_their_text(self):
+        for stream in STREAMS:
+            with self.subTest(stream["label"]):
+                pieces = _pieces(SentenceBuffer(), stream["tokens"])
+                self.assertEqual(_letters("".join(pieces)), _letters("".join(stream["tokens"])))
+
+    def test_first_piece_is_a_clause(self):
+        for stream in STREAMS:
+            with self.subTest(stream["label"]):
+                first = _pieces(SentenceBuffer(), stream["tokens"])[0]
+                self.assertGreaterEqual(len(first), 10)
+                self.assertLessEqual(len(first), 200)
+
+    def test_numbers_are_never_split(self):
+        for stream in STREAMS:
+            pieces = _pieces(SentenceBuffer(), stream["tokens"])
+            for before, after in pairwise(pieces):
+                self.assertFalse(
+                    re.search(r"\d[.,:]$", before) and after[0].isdigit(), (before, after)
+                )
+
+
+class TestFuzz(unittest.TestCase):
+    """Random re-chunkings of the recorded replies."""
+
+    ROUNDS = 25
+
+    def test_chunking_keeps_text_and_bounds(self):
+        rng = random.Random(50)
+        for stream in STREAMS:
+            text = "".join(stream["tokens"])
+            for _ in range(self.ROUNDS):
+                tokens = _rechunk(text, rng)
+                pieces = _pieces(SentenceBuffer(min_length=10, max_length=60), tokens)
+                self.assertEqual(_letters("".join(pieces)), _letters(text), stream["label"])
+                for piece in pieces[:-1]:
+                    self.assertGreaterEqual(len(piece), 10, (stream["label"], pieces))
+                for piece in pieces:
+                    self.assertLessEqual(len(piece), 60, (stream["label"], pieces))
+
+    def test_long_tokens_keep_bounds(self):
+        tokens = ["Hello there friend", " this is a long run of words without any breaks at all"]
+        pieces = _pieces(SentenceBuffer(min_length=5, max_length=20), tokens)
+        self.assertEqual(
+            pieces,
+            ["Hello there friend", "this is a long run", "of words without any", "breaks at all"],
+        )
+        rng = random.Random(52)
+        for stream in STREAMS:
+            text = "".join(stream["tokens"])
+            tokens = _rechunk(text, rng, longest=80)
+            pieces = _pieces(SentenceBuffer(min_length=10, max_length=60), tokens)
+            self.assertEqual(_letters("".join(pieces)), _letters(text), stream["label"])
+            self.assertLessEqual(max(map(len, pieces)), 60, (stream["label"], pieces))
+
+    def test_pieces_do_not_depend_on_chunking(self):
+        def pieces(tokens):
+            return _pieces(SentenceBuffer(max_length=10_000), tokens)
+
+        rng = random.Random(51)
+        for stream in STREAMS:
+            expected = pieces(stream["tokens"])
+            text = "".join(stream["tokens"])
+            for _ in range(self.ROUNDS):
+                self.assertEqual(pieces(_rechunk(text, rng)), expected, stream["label"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,428 @@
+"""Tests for VoicePipeline.speak_streaming() lookahead synthesis.
+
+Loads core/pipeline.py with config.settings stubbed, following the same
+pattern as test_core_components.py. The pipeline is built without
+__init__ and driven with a fake TTS and a fake AudioSocket protocol.
+"""
+
+import asyncio
+import importlib
+import sys
+import tempfile
+import time
+import types
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+
+
+class _FakeAudioSettings:
+    output_sample_rate = 8000
+    telephone_lowcut = 300.0
+    telephone_highcut = 3400.0
+    chunk_size = 320
+
+
+def _load_pipeline():
+    """Load core.pipeline without pydantic settings."""
+    app_root = Path(__file__).resolve().parent.parent
+    if str(app_root) not in sys.path:
+        sys.path.insert(0, str(app_root))
+
+    for pkg in ("config", "core", "services"):
+        if pkg not in sys.modules:
+            mod = types.ModuleType(pkg)
+            mod.__path__ = [str(app_root / pkg)]
+            sys.modules[pkg] = mod
+
+    settings_mod = sys.modules.get("config.settings")
+    if settings_mod is None:
+        settings_mod = types.ModuleType("config.settings")
+        sys.modules["config.settings"] = settings_mod
+    for name in ("Settings", "VADSettings", "STTSettings", "LLMSettings", "TTSSettings"):
+        if not hasattr(settings_mod, name):
+            setattr(settings_mod, name, type(f"_Fake{name}", (), {}))
+    if not hasattr(settings_mod, "AudioSettings"):
+        settings_mod.AudioSettings = _FakeAudioSettings
+
+    if "config.prompts" not in sys.modules:
+        prompts_mod = types.ModuleType("config.prompts")
+        prompts_mod.get_system_prompt = lambda **kw: "system prompt"
+        prompts_mod.system_prompt_variants = lambda: {"operator": "system prompt"}
+        prompts_mod.turn_budget = lambda label, max_tokens, spoken_seconds: (
+            max_tokens, spoken_seconds
+        )
+        sys.modules["config.prompts"] = prompts_mod
+
+    pipeline = importlib.import_module("core.pipeline")
+    audio_processor = importlib.import_module("core.audio_processor")
+    return pipeline, audio_processor
+
+
+pipeline_mod, audio_mod = _load_pipeline()
+response_cache_mod = importlib.import_module("services.response_cache")
+tts_mod = importlib.import_module("services.tts")
+tts_cache_mod = importlib.import_module("services.tts_cache")
+ready_queue_mod = importlib.import_module("core.ready_queue")
+llm_mod = importlib.import_module("services.llm")
+VoicePipeline = pipeline_mod.VoicePipeline
+
+SENTENCES = [
+    "First sentence here.",
+    "Second sentence here.",
+    "Third sentence here.",
+    "Fourth sentence here.",
+]
+
+
+class _FakeTTS:
+    """Yields a fixed duration of audio per sentence after a fixed delay."""
+
+    sample_rate = 24000
+    telephone_output = False
+
+    def __init__(self, synth_seconds: float, audio_seconds: float):
+        self.synth_seconds = synth_seconds
+        self.audio_seconds = audio_seconds
+        self.started: list[tuple[str, float]] = []
+
+    async def synthesize_stream(self, text, voice=None, speed=None, priority=1):
+        self.started.append((text, time.perf_counter()))
+        await asyncio.sleep(self.synth_seconds)
+        yield np.full(int(self.audio_seconds * self.sample_rate), 0.1, dtype=np.float32)
+
+
+class _FakeProtocol:
+    is_active = True
+
+    def __init__(self):
+        self.sent: list[float] = []
+        self.on_send = None
+
+    async def send_audio(self, chunk):
+        self.sent.append(time.perf_counter())
+        if self.on_send:
+            self.on_send(len(self.sent))
+        return True
+
+    def has_dtmf(self):
+        return False
+
+
+class _FakeSession:
+    def __init__(self):
+        self.protocol = _FakeProtocol()
+        self.metrics = SimpleNamespace(record_tts_ttfb=lambda ms: None)
+        self.is_active = True
+        self.is_speaking = False
+        self.barge_in_requested = False
+        self.barge_in_audio = None
+        self.current_feature = "operator"
+        self.current_persona = None
+        self.vad_model = None
+        self.prompt_label = "feature:jokes"
+        self.context = None
+        self.cached_reply = None
+
+    def reset_vad_state(self):
+        pass
+
+    def request_barge_in(self):
+        self.barge_in_requested = True
+
+
+def _make_pipeline(tts, lookahead=2):
+    pipeline = VoicePipeline.__new__(VoicePipeline)
+    pipeline.settings = SimpleNamespace(
+        audio=_FakeAudioSettings(),
+        tts=SimpleNamespace(
+            speed=1.0,
+            min_sentence_length=10,
+            sentence_delimiters=".!?",
+            clause_delimiters=",;:",
+            max_sentence_length=200,
+            max_sentence_wait=0.0,
+            lookahead_sentences=lookahead,
+        ),
+        vad=SimpleNamespace(barge_in_enabled=False, barge_in_threshold=0.9),
+    )
+    pipeline.audio_processor = audio_mod.AudioProcessor(_FakeAudioSettings())
+    pipeline.tts = tts
+    pipeline.vad = SimpleNamespace(create_session_state=lambda: None)
+    return pipeline
+
+
+async def _tokens(sentences):
+    for sentence in sentences:
+        for word in sentence.split(" "):
+            yield word + " "
+
+
+class TestSpeakStreamingLookahead(unittest.TestCase):
+    """Synthesis runs ahead of playback, bounded by lookahead_sentences."""
+
+    def test_next_sentence_synthesizes_during_playback(self):
+        tts = _FakeTTS(synth_seconds=0.08, audio_seconds=0.2)
+        pipeline = _make_pipeline(tts)
+        session = _FakeSession()
+
+        completed = asyncio.run(
+            pipeline.speak_streaming(session, _tokens(SENTENCES[:3]), check_barge_in=False)
+        )
+
+        self.assertTrue(completed)
+        self.assertEqual(len(tts.started), 3)
+        first_audio = session.protocol.sent[0]
+        # Sentence 2 started before sentence 1 (0.2s of audio) finished playing
+        self.assertLess(tts.started[1][1], first_audio + 0.15)
+        # No dead air: total time is ~ one synthesis + all playback, not the sum
+        total = session.protocol.sent[-1] - tts.started[0][1]
+        self.assertLess(total, 0.08 + 3 * 0.2 + 0.12)
+
+    def test_lookahead_bounds_sentences_rendered_ahead(self):
+        tts = _FakeTTS(synth_seconds=0.0, audio_seconds=0.1)
+        pipeline = _make_pipeline(tts, lookahead=1)
+        session = _FakeSession()
+        started_at_send: list[int] = []
+        session.protocol.on_send = lambda n: started_at_send.append(len(tts.started))
+
+        completed = asyncio.run(
+            pipeline.speak_streaming(session, _tokens(SENTENCES), check_barge_in=False)
+        )
+
+        self.assertTrue(completed)
+        frames_per_sentence = int(0.1 * 8000 * 2) // 320
+        # While sentence 1 plays, only sentence 2 may be rendered ahead
+        self.assertLessEqual(max(started_at_send[: frames_per_sentence - 1]), 2)
+        self.assertEqual(len(tts.started), 4)
+
+    def test_zero_lookahead_is_sequential(self):
+        tts = _FakeTTS(synth_seconds=0.0, audio_seconds=0.1)
+        pipeline = _make_pipeline(tts, lookahead=0)
+        session = _FakeSession()
+        started_at_send: list[int] = []
+        session.protocol.on_send = lambda n: started_at_send.append(len(tts.started))
+
+        asyncio.run(pipeline.speak_streaming(session, _tokens(SENTENCES[:2]), check_barge_in=False))
+
+        frames_per_sentence = int(0.1 * 8000 * 2) // 320
+        self.assertEqual(max(started_at_send[: frames_per_sentence - 1]), 1)
+
+
+class TestSpeakStreamingBargeIn(unittest.TestCase):
+    """Barge-in stops both stages and drops audio rendered ahead."""
+
+    def test_barge_in_discards_prerendered_audio(self):
+        tts = _FakeTTS(synth_seconds=0.0, audio_seconds=0.2)
+        pipeline = _make_pipeline(tts, lookahead=2)
+        session = _FakeSession()
+
+        def _barge_in(sent):
+            if sent == 3:
+                session.request_barge_in()
+
+        session.protocol.on_send = _barge_in
+
+        completed = asyncio.run(
+            pipeline.speak_streaming(session, _tokens(SENTENCES), check_barge_in=True)
+        )
+
+        self.assertFalse(completed)
+        self.assertFalse(session.is_speaking)
+        # Nothing played after the barge-in, though later sentences were rendered
+        self.assertEqual(len(session.protocol.sent), 3)
+        self.assertLessEqual(len(tts.started), 3)
+
+    def test_barge_in_while_synthesizing_cancels_synthesis(self):
+        tts = _FakeTTS(synth_seconds=0.3, audio_seconds=0.1)
+        pipeline = _make_pipeline(tts)
+        session = _FakeSession()
+
+        async def run():
+            async def barge_in_soon():
+                await asyncio.sleep(0.05)
+                session.request_barge_in()
+
+            barge_in = asyncio.create_task(barge_in_soon())
+            start = time.perf_counter()
+            completed = await pipeline.speak_streaming(
+                session, _tokens(SENTENCES[:1]), check_barge_in=True
+            )
+            await barge_in
+            return completed, time.perf_counter() - start
+
+        completed, elapsed = asyncio.run(run())
+
+        self.assertFalse(completed)
+        self.assertEqual(session.protocol.sent, [])
+        self.assertLess(elapsed, 0.25)
+
+    def test_barge_in_while_waiting_on_llm_interrupts_generator(self):
+        tts = _FakeTTS(synth_seconds=0.0, audio_seconds=0.1)
+        pipeline = _make_pipeline(tts)
+        session = _FakeSession()
+        cancelled = asyncio.Event()
+
+        async def slow_llm():
+            yield "Hello there, caller. "
+            await cancelled.wait()  # The next token never comes on its own
+
+        async def run():
+            async def barge_in_soon():
+                await asyncio.sleep(0.15)
+                session.request_barge_in()
+
+            barge_in = asyncio.create_task(barge_in_soon())
+            start = time.perf_counter()
+            completed = await pipeline.speak_streaming(
+                session, slow_llm(), check_barge_in=True, on_interrupt=cancelled.set
+            )
+            await barge_in
+            return completed, time.perf_counter() - start
+
+        completed, elapsed = asyncio.run(run())
+
+        self.assertFalse(completed)
+        self.assertTrue(cancelled.is_set())
+        self.assertLess(elapsed, 0.15 + 0.1)
+
+
+class TestCachedReplyPlayback(unittest.TestCase):
+    """Response-cache hits skip the LLM, and synthesis once rendered."""
+
+    def _cache_with_reply(self):
+        cache = response_cache_mod.ResponseCache(variants=1)
+        cache.put(("feature:jokes", "joke", ""), "First sentence here.")
+        return cache
+
+    def test_reply_audio_rendered_once(self):
+        tts = _FakeTTS(synth_seconds=0.0, audio_seconds=0.1)
+        pipeline = _make_pipeline(tts)
+        cache = self._cache_with_reply()
+        pipeline.llm = SimpleNamespace(reply_cache=cache)
+        reply = cache.get(("feature:jokes", "joke", ""))
+
+        async def speak_twice():
+            first, second = _FakeSession(), _FakeSession()
+            await pipeline.speak(first, reply.text, check_barge_in=False, reply=reply)
+            # Served via generate_response(): the session hands the reply to speak()
+            second.cached_reply = reply
+            await pipeline.speak(second, reply.text, check_barge_in=False)
+            return first, second
+
+        first, second = asyncio.run(speak_twice())
+        self.assertEqual(len(tts.started), 1)
+        self.assertIsNotNone(reply.audio)
+        self.assertEqual(len(second.protocol.sent), len(first.protocol.sent))
+        self.assertIsNone(second.cached_reply)
+
+    def test_streaming_hit_skips_llm(self):
+        tts = _FakeTTS(synth_seconds=0.0, audio_seconds=0.1)
+        pipeline = _make_pipeline(tts)
+        cache = self._cache_with_reply()
+
+        def _no_llm(**kwargs):
+            raise AssertionError("LLM called on a cache hit")
+
+        pipeline.llm = SimpleNamespace(
+            reply_cache=cache,
+            lookup_reply=lambda prompt, label, context: cache.get((label, "joke", "")),
+            generate_streaming=_no_llm,
+        )
+        session = _FakeSession()
+
+        text, completed = asyncio.run(
+            pipeline.generate_and_speak_streaming(session, "Tell me a joke", check_barge_in=False)
+        )
+
+        self.assertEqual(text, "First sentence here.")
+        self.assertTrue(completed)
+        self.assertGreater(len(session.protocol.sent), 0)
+
+    def test_ready_opener_plays_without_llm_or_tts(self):
+        tts = _FakeTTS(synth_seconds=0.0, audio_seconds=0.1)
+        pipeline = _make_pipeline(tts)
+        pipeline.llm = SimpleNamespace(reply_cache=None)
+        voice = pipeline_mod.get_voice_for_feature(feature="operator")
+        opener = ready_queue_mod.Opener("feature:jokes", "Tell me a joke.", "Be funny.", voice)
+
+        async def generate(_):
+            return "Why did the chicken cross the road?"
+
+        async def render(text, voice):
+            return b"\x00\x01" * 800
+
+        pipeline.ready_queue = ready_queue_mod.ReadyQueue({opener.label: opener}, generate, render)
+        session = _FakeSession()
+        session.context = llm_mod.ConversationContext()
+
+        async def run():
+            await pipeline.ready_queue.fill_once()
+            return await pipeline.speak_opener(session, opener.prompt, check_barge_in=False)
+
+        self.assertTrue(asyncio.run(run()))
+        self.assertEqual(tts.started, [])
+        self.assertEqual(len(session.protocol.sent), 1600 // 320)
+        self.assertEqual(
+            [m.content for m in session.context.messages],
+            ["Tell me a joke.", "Why did the chicken cross the road?"],
+        )
+
+
+def _stalled_remote():
+    """A RemoteTTS whose server stalls, falling back to its clip."""
+    settings = SimpleNamespace(
+        voice="af_nova", speed=1.0, segment_min_chars=20, remote_encoding="s16le",
+        remote_stall_timeout=0.01,
+    )
+    tts = tts_mod.RemoteTTS(settings)
+    tts._initialized = True
+    tts._streaming = True
+    tts._fallback_clip = np.full(2400, 0.1, dtype=np.float32)
+
+    async def stall(body):
+        raise asyncio.TimeoutError("no audio within 0.01s")
+
+    tts._open_stream = stall
+    return tts
+
+
+class TestFallbackAudioNotCached(unittest.TestCase):
+    """Fallback audio from a failed TTS server is played but never kept."""
+
+    def test_stalled_remote_leaves_no_phrase_cache_entry(self):
+        pipeline = _make_pipeline(_stalled_remote())
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = tts_cache_mod.PhraseCache(tmp, model_id="remote")
+            pipeline.phrase_cache = cache
+            audio = asyncio.run(pipeline.render_phrase("Welcome to the operator.", "af_nova"))
+
+            self.assertGreater(len(audio), 0)  # The caller still hears the clip
+            self.assertIsNone(cache.get("Welcome to the operator.", "af_nova", 1.0))
+            self.assertEqual(list(Path(tmp).rglob("*.pcm")), [])
+
+    def test_stalled_remote_reply_audio_not_attached(self):
+        pipeline = _make_pipeline(_stalled_remote())
+        cache = response_cache_mod.ResponseCache(variants=1)
+        cache.put(("feature:jokes", "joke", ""), "First sentence here.")
+        pipeline.llm = SimpleNamespace(reply_cache=cache)
+        reply = cache.get(("feature:jokes", "joke", ""))
+        session = _FakeSession()
+
+        asyncio.run(pipeline.speak(session, reply.text, check_barge_in=False, reply=reply))
+
+        self.assertGreater(len(session.protocol.sent), 0)
+        self.assertIsNone(reply.audio)
+
+    def test_ready_queue_render_skips_fallback(self):
+        pipeline = _make_pipeline(_stalled_remote())
+        audio = asyncio.run(
+            pipeline.render_audio("Why did the chicken cross the road?", "af_nova", fallback=False)
+        )
+        self.assertEqual(audio, b"")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,213 @@
+"""Tests for the STT transcript cache and its WhisperSTT integration.
+
+Uses importlib to load services/stt.py with config.settings stubbed,
+following the same pattern as test_core_components.py.
+"""
+
+import asyncio
+import importlib
+import sys
+import types
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+
+def _load_stt():
+    """Load services.stt without pydantic-backed settings."""
+    app_root = Path(__file__).resolve().parent.parent
+    if str(app_root) not in sys.path:
+        sys.path.insert(0, str(app_root))
+
+    for pkg in ("config", "services"):
+        if pkg not in sys.modules:
+            mod = types.ModuleType(pkg)
+            mod.__path__ = [str(app_root / pkg)]
+            sys.modules[pkg] = mod
+
+    settings_mod = sys.modules.get("config.settings")
+    if settings_mod is None:
+        settings_mod = types.ModuleType("config.settings")
+        sys.modules["config.settings"] = settings_mod
+    if not hasattr(settings_mod, "STTSettings"):
+        settings_mod.STTSettings = _FakeSTTSettings
+
+    return importlib.import_module("services.stt")
+
+
+class _FakeSTTSettings:
+    language = "en"
+    result_cache_enabled = True
+    result_cache_max_entries = 256
+    result_cache_max_seconds = 2.0
+    result_cache_similarity = 0.97
+
+
+stt_mod = _load_stt()
+TranscriptCache = stt_mod.TranscriptCache
+TranscriptionResult = stt_mod.TranscriptionResult
+WhisperSTT = stt_mod.WhisperSTT
+
+SR = 16000
+
+
+def _word(formants, seconds=0.5, pitch=120.0, gain=0.3, lead=0.2, seed=0):
+    """Synthesize a vowel-like utterance with silence padding and line noise."""
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(seconds * SR)) / SR
+    voiced = np.zeros_like(t)
+    half = len(t) // 2
+    for i, (f_a, f_b) in enumerate(formants):
+        # Formant glides between two targets, like a diphthong
+        freq = np.concatenate([np.full(half, f_a), np.linspace(f_a, f_b, len(t) - half)])
+        voiced += np.sin(2 * np.pi * np.cumsum(freq) / SR) / (i + 1)
+    voiced *= 0.5 + 0.5 * np.sin(2 * np.pi * pitch * t)
+    voiced *= np.hanning(len(t))
+    pad = np.zeros(int(lead * SR))
+    audio = np.concatenate([pad, gain * voiced / np.abs(voiced).max(), pad])
+    audio += rng.normal(0, 1e-3, len(audio))
+    return audio.astype(np.float32)
+
+
+YES = [(300, 700), (2200, 1200), (2900, 2500)]
+NO = [(500, 350), (900, 700), (2400, 2300)]
+RUSTLE = [(800, 600), (1800, 1500), (3000, 2800)]  # Handset noise, no speech
+
+
+def _result(text):
+    return TranscriptionResult(text=text, language="en", confidence=0.9, duration_seconds=0.9)
+
+
+class TestTranscriptCache(unittest.TestCase):
+    """Fingerprint matching and LRU bookkeeping."""
+
+    def setUp(self):
+        self.cache = TranscriptCache(max_entries=4)
+
+    def test_repeat_with_different_gain_and_noise_hits(self):
+        self.cache.put(self.cache.fingerprint(_word(YES, seed=1)), _result("yes"))
+        repeat = _word(YES, gain=0.15, lead=0.35, seed=2)
+        hit = self.cache.get(self.cache.fingerprint(repeat))
+        self.assertIsNotNone(hit)
+        self.assertEqual(hit.text, "yes")
+
+    def test_different_utterance_misses(self):
+        self.cache.put(self.cache.fingerprint(_word(YES, seed=1)), _result("yes"))
+        self.assertIsNone(self.cache.get(self.cache.fingerprint(_word(NO, seed=1))))
+        self.assertEqual(self.cache.misses, 1)
+
+    def test_different_duration_misses(self):
+        self.cache.put(self.cache.fingerprint(_word(YES, seed=1)), _result("yes"))
+        longer = _word(YES, seconds=1.2, seed=1)
+        self.assertIsNone(self.cache.get(self.cache.fingerprint(longer)))
+
+    def test_long_audio_not_fingerprinted(self):
+        self.assertIsNone(self.cache.fingerprint(np.zeros(3 * SR, dtype=np.float32) + 0.1))
+
+    def test_silence_not_fingerprinted(self):
+        self.assertIsNone(self.cache.fingerprint(np.zeros(SR, dtype=np.float32)))
+
+    def test_lru_eviction(self):
+        fingerprints = [
+            self.cache.fingerprint(_word(YES, seconds=0.3 + 0.35 * i, lead=0.05, seed=i))
+            for i in range(5)
+        ]
+        for i, fp in enumerate(fingerprints):
+            self.cache.put(fp, _result(f"utterance {i}"))
+        self.assertEqual(len(self.cache), 4)
+        self.assertIsNone(self.cache.get(fingerprints[0]))
+        self.assertEqual(self.cache.get(fingerprints[4]).text, "utterance 4")
+
+
+class TestWhisperSTTResultCache(unittest.TestCase):
+    """WhisperSTT.transcribe() consults the cache before the backend."""
+
+    def _make_stt(self):
+        stt = WhisperSTT(settings=_FakeSTTSettings())
+        stt._initialized = True
+        stt.backend_calls = 0
+
+        async def backend(audio, sample_rate):
+            stt.backend_calls += 1
+            return TranscriptionResult(
+                text="yes", language="en", confidence=0.9, duration_seconds=len(audio) / SR
+            )
+
+        stt._transcribe_backend = backend
+        return stt
+
+    def test_repeat_skips_backend(self):
+        stt = self._make_stt()
+        first = asyncio.run(stt.transcribe(_word(YES, seed=1)))
+        repeat_audio = _word(YES, gain=0.2, lead=0.3, seed=2)
+        second = asyncio.run(stt.transcribe(repeat_audio))
+        self.assertEqual(stt.backend_calls, 1)
+        self.assertEqual(second.text, first.text)
+        self.assertAlmostEqual(second.duration_seconds, len(repeat_audio) / SR)
+
+    def test_new_utterance_calls_backend(self):
+        stt = self._make_stt()
+        asyncio.run(stt.transcribe(_word(YES, seed=1)))
+        asyncio.run(stt.transcribe(_word(NO, seed=1)))
+        self.assertEqual(stt.backend_calls, 2)
+
+    def test_backend_failure_not_cached(self):
+        stt = WhisperSTT(settings=_FakeSTTSettings())
+        stt._initialized = True
+        # Wyoming's answer while unreachable, then once it is back
+        results = [
+            TranscriptionResult(
+                text="", language="en", confidence=0.0, duration_seconds=0.9, failed=True
+            ),
+            _result("yes"),
+        ]
+
+        async def backend(audio, sample_rate):
+            return results.pop(0)
+
+        stt._transcribe_backend = backend
+        failed = asyncio.run(stt.transcribe(_word(YES, seed=1)))
+        recovered = asyncio.run(stt.transcribe(_word(YES, gain=0.2, seed=2)))
+        self.assertEqual(failed.text, "")
+        self.assertEqual(recovered.text, "yes")
+        self.assertEqual(results, [])
+
+    def test_empty_noise_result_is_cached(self):
+        stt = WhisperSTT(settings=_FakeSTTSettings())
+        stt._initialized = True
+        calls = []
+
+        async def backend(audio, sample_rate):
+            # faster-whisper's answer when it finds no speech segments
+            calls.append(1)
+            return TranscriptionResult(
+                text="", language="en", confidence=0.0, duration_seconds=len(audio) / SR
+            )
+
+        stt._transcribe_backend = backend
+        first = asyncio.run(stt.transcribe(_word(RUSTLE, seed=3)))
+        repeat = asyncio.run(stt.transcribe(_word(RUSTLE, gain=0.2, seed=4)))
+        self.assertEqual((first.text, repeat.text), ("", ""))
+        self.assertEqual(len(calls), 1)
+
+    def test_disabled_cache_always_calls_backend(self):
+        settings = _FakeSTTSettings()
+        settings.result_cache_enabled = False
+        stt = WhisperSTT(settings=settings)
+        stt._initialized = True
+        calls = []
+
+        async def backend(audio, sample_rate):
+            calls.append(1)
+            return _result("yes")
+
+        stt._transcribe_backend = backend
+        audio = _word(YES, seed=1)
+        asyncio.run(stt.transcribe(audio))
+        asyncio.run(stt.transcribe(audio))
+        self.assertEqual(len(calls), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,100 @@
+"""Tests for token accounting (services/token_budget.py)."""
+
+import importlib
+import sys
+import tempfile
+import types
+import unittest
+from pathlib import Path
+
+
+def _load_token_budget():
+    """Load services.token_budget without importing the services package."""
+    app_root = Path(__file__).resolve().parent.parent
+    if str(app_root) not in sys.path:
+        sys.path.insert(0, str(app_root))
+    if "services" not in sys.modules:
+        mod = types.ModuleType("services")
+        mod.__path__ = [str(app_root / "services")]
+        sys.modules["services"] = mod
+    return importlib.import_module("services.token_budget")
+
+
+token_budget = _load_token_budget()
+TokenCounter = token_budget.TokenCounter
+MESSAGE_OVERHEAD = token_budget.MESSAGE_OVERHEAD
+
+try:
+    import tokenizers
+except ImportError:
+    tokenizers = None
+
+
+class TestEstimator(unittest.TestCase):
+    def test_words_digits_and_symbols(self):
+        counter = TokenCounter()
+        self.assertEqual(counter.count("Hello there, caller!"), 5)
+        self.assertEqual(counter.count("5-5-5"), 5)  # Digits and hyphens split
+        self.assertEqual(counter.count("1234567"), 3)  # Groups of three digits
+        self.assertEqual(counter.count("internationalization"), 4)  # Long word
+        self.assertEqual(counter.count(""), 0)
+
+    def test_count_messages_adds_template_overhead(self):
+        counter = TokenCounter()
+        messages = [{"role": "system", "content": "Be brief."}, {"role": "user", "content": "Hi"}]
+        self.assertEqual(counter.count_messages(messages), 4 + 2 * MESSAGE_OVERHEAD)
+
+    def test_cache_is_bounded(self):
+        counter = TokenCounter(cache_size=2)
+        for text in ("one", "two", "three"):
+            counter.count(text)
+        self.assertEqual(list(counter._cache), ["two", "three"])
+
+    def test_calibration_moves_scale_toward_observed(self):
+        counter = TokenCounter()
+        messages = [{"role": "system", "content": "word " * 100}]
+        before = counter.count("word " * 100)
+        for _ in range(20):
+            counter.calibrate(messages, 150 + MESSAGE_OVERHEAD)
+        self.assertAlmostEqual(counter.scale, 1.5, places=2)
+        self.assertEqual(counter.calibrations, 20)
+        self.assertEqual(before, 100)
+        self.assertEqual(counter.count("word " * 100), 150)  # Cache was reset
+
+    def test_calibration_ignores_implausible_counts(self):
+        counter = TokenCounter()
+        messages = [{"role": "user", "content": "hi"}]
+        counter.calibrate(messages, 0)
+        counter.calibrate(messages, MESSAGE_OVERHEAD)  # Nothing left for the text
+        self.assertEqual(counter.scale, 1.0)
+        self.assertEqual(counter.calibrations, 0)
+
+    def test_unloadable_tokenizer_falls_back_to_estimate(self):
+        counter = TokenCounter("/nonexistent/tokenizer.json")
+        self.assertEqual(counter.backend, "estimate")
+        self.assertEqual(counter.count("two words"), 2)
+
+    def test_shared_counter_per_spec(self):
+        self.assertIs(token_budget.token_counter(""), token_budget.token_counter(""))
+
+
+@unittest.skipIf(tokenizers is None, "tokenizers not installed")
+class TestTokenizerBackend(unittest.TestCase):
+    def test_counts_with_tokenizer_json(self):
+        from tokenizers import Tokenizer, models, pre_tokenizers
+
+        tokenizer = Tokenizer(models.WordLevel({"hello": 0, "there": 1, "[UNK]": 2}, "[UNK]"))
+        tokenizer.pre_tokenizer = pre_tokenizers.Whitespace()
+        with tempfile.TemporaryDirectory() as tmp:
+            path = str(Path(tmp) / "tokenizer.json")
+            tokenizer.save(path)
+            counter = TokenCounter(path)
+
+        self.assertEqual(counter.backend, "tokenizer")
+        self.assertEqual(counter.count("hello there internationalization"), 3)
+        counter.calibrate([{"role": "user", "content": "hello"}], 50)
+        self.assertEqual(counter.calibrations, 0)  # Exact counts need no calibration
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,167 @@
+"""Tests for the persistent TTS phrase cache (services/tts_cache.py)."""
+
+import importlib
+import sys
+import tempfile
+import types
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+
+
+def _load_tts_cache():
+    """Load services.tts_cache without importing the services package."""
+    app_root = Path(__file__).resolve().parent.parent
+    if str(app_root) not in sys.path:
+        sys.path.insert(0, str(app_root))
+
+    if "services" not in sys.modules:
+        mod = types.ModuleType("services")
+        mod.__path__ = [str(app_root / "services")]
+        sys.modules["services"] = mod
+
+    return importlib.import_module("services.tts_cache")
+
+
+tts_cache_mod = _load_tts_cache()
+PhraseCache = tts_cache_mod.PhraseCache
+model_fingerprint = tts_cache_mod.model_fingerprint
+create_phrase_cache = tts_cache_mod.create_phrase_cache
+
+PCM = bytes(range(256)) * 40
+
+
+class TestPhraseCache(unittest.TestCase):
+    """Round trips, key separation, LRU and persistence."""
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.cache_dir = Path(self._tmp.name)
+        self.cache = PhraseCache(self.cache_dir, model_id="model-a", render_id="8000:300-3400")
+
+    def tearDown(self):
+        self.cache._memory.clear()
+        self._tmp.cleanup()
+
+    def test_miss_then_hit(self):
+        self.assertIsNone(self.cache.get("Hello there.", "af_nova", 1.0))
+        self.cache.put("Hello there.", "af_nova", 1.0, PCM)
+        view = self.cache.get("Hello there.", "af_nova", 1.0)
+        self.assertIsInstance(view, memoryview)
+        self.assertEqual(bytes(view), PCM)
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+
+    def test_view_behaves_like_bytes_for_playback(self):
+        self.cache.put("Hello there.", "af_nova", 1.0, PCM)
+        view = self.cache.get("Hello there.", "af_nova", 1.0)
+        chunks = [view[i : i + 320] for i in range(0, len(view), 320)]
+        self.assertEqual(b"".join(b"\x10" + chunk for chunk in chunks)[1:321], PCM[:320])
+
+    def test_key_covers_voice_speed_and_model(self):
+        self.cache.put("Hello there.", "af_nova", 1.0, PCM)
+        self.assertIsNone(self.cache.get("Hello there.", "am_puck", 1.0))
+        self.assertIsNone(self.cache.get("Hello there.", "af_nova", 1.1))
+        other_model = PhraseCache(self.cache_dir, model_id="model-b", render_id="8000:300-3400")
+        self.assertIsNone(other_model.get("Hello there.", "af_nova", 1.0))
+        other_render = PhraseCache(self.cache_dir, model_id="model-a", render_id="8000:200-3400")
+        self.assertIsNone(other_render.get("Hello there.", "af_nova", 1.0))
+
+    def test_persists_across_instances(self):
+        self.cache.put("Goodbye!", "af_nova", 1.0, PCM)
+        reopened = PhraseCache(self.cache_dir, model_id="model-a", render_id="8000:300-3400")
+        self.assertTrue(reopened.contains("Goodbye!", "af_nova", 1.0))
+        self.assertEqual(bytes(reopened.get("Goodbye!", "af_nova", 1.0)), PCM)
+        reopened._memory.clear()
+
+    def test_memory_lru_is_bounded(self):
+        cache = PhraseCache(self.cache_dir, model_id="model-a", max_memory_entries=2)
+        for i in range(4):
+            cache.put(f"phrase {i}", "af_nova", 1.0, PCM)
+            cache.get(f"phrase {i}", "af_nova", 1.0)
+        self.assertEqual(len(cache._memory), 2)
+        # Evicted entries are still served from disk
+        self.assertEqual(bytes(cache.get("phrase 0", "af_nova", 1.0)), PCM)
+        cache._memory.clear()
+
+    def test_empty_audio_not_stored(self):
+        self.cache.put("Silence.", "af_nova", 1.0, b"")
+        self.assertFalse(self.cache.contains("Silence.", "af_nova", 1.0))
+
+    def test_disk_usage(self):
+        self.cache.put("one", "af_nova", 1.0, PCM)
+        self.cache.put("two", "af_nova", 1.0, PCM[:100])
+        self.assertEqual(self.cache.disk_usage(), (2, len(PCM) + 100))
+
+
+class TestModelFingerprint(unittest.TestCase):
+    """model_fingerprint() tracks model file identity."""
+
+    def test_changes_with_content_and_missing_files(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            model = Path(tmp) / "kokoro.onnx"
+            voices = Path(tmp) / "voices.bin"
+            model.write_bytes(b"weights-v1")
+            voices.write_bytes(b"voices")
+            first = model_fingerprint(model, voices)
+            self.assertEqual(first, model_fingerprint(model, voices))
+
+            model.write_bytes(b"weights-v2")
+            self.assertNotEqual(first, model_fingerprint(model, voices))
+            self.assertIsNone(model_fingerprint(model, Path(tmp) / "missing.bin"))
+
+
+class TestCreatePhraseCache(unittest.TestCase):
+    """create_phrase_cache() builds keys from settings."""
+
+    AUDIO = SimpleNamespace(
+        output_sample_rate=8000, telephone_lowcut=300.0, telephone_highcut=3400.0
+    )
+
+    def _tts_settings(self, tmp, **overrides):
+        values = {
+            "phrase_cache_enabled": True,
+            "phrase_cache_dir": str(Path(tmp) / "cache"),
+            "phrase_cache_memory_entries": 8,
+            "mode": "local",
+            "remote_host": "http://tts:10200",
+            "remote_output": "telephone",
+            "model_path": str(Path(tmp) / "kokoro.onnx"),
+            "voices_path": str(Path(tmp) / "voices.bin"),
+        }
+        values.update(overrides)
+        return SimpleNamespace(**values)
+
+    def test_disabled_without_model_files(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            self.assertIsNone(create_phrase_cache(self._tts_settings(tmp), self.AUDIO))
+
+    def test_disabled_by_setting(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            settings = self._tts_settings(tmp, phrase_cache_enabled=False, mode="remote")
+            self.assertIsNone(create_phrase_cache(settings, self.AUDIO))
+
+    def test_local_mode_uses_model_fingerprint(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            settings = self._tts_settings(tmp)
+            Path(settings.model_path).write_bytes(b"weights")
+            Path(settings.voices_path).write_bytes(b"voices")
+            cache = create_phrase_cache(settings, self.AUDIO)
+            self.assertEqual(
+                cache.model_id, model_fingerprint(settings.model_path, settings.voices_path)
+            )
+            self.assertEqual(cache.render_id, "8000:300.0-3400.0")
+
+    def test_remote_mode_keys_server_rendering(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = create_phrase_cache(self._tts_settings(tmp, mode="remote"), self.AUDIO)
+            self.assertEqual(cache.model_id, f"remote:http://tts:10200:{Path(tmp) / 'kokoro.onnx'}")
+            self.assertEqual(cache.render_id, "8000:300.0-3400.0:server")
+
+            raw = create_phrase_cache(
+                self._tts_settings(tmp, mode="remote", remote_output="raw"), self.AUDIO
+            )
+            self.assertEqual(raw.render_id, "8000:300.0-3400.0")
+
+
+if __name__ == "__main__":
+    unittest.main()
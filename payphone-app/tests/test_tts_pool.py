@@ -0,0 +1,227 @@
+"""Tests for the prioritized TTS worker pool (services/tts_pool.py)."""
+
+import asyncio
+import importlib
+import sys
+import threading
+import time
+import types
+import unittest
+from pathlib import Path
+
+
+def _load_tts_pool():
+    """Load services.tts_pool without importing the services package."""
+    app_root = Path(__file__).resolve().parent.parent
+    if str(app_root) not in sys.path:
+        sys.path.insert(0, str(app_root))
+
+    if "services" not in sys.modules:
+        mod = types.ModuleType("services")
+        mod.__path__ = [str(app_root / "services")]
+        sys.modules["services"] = mod
+
+    return importlib.import_module("services.tts_pool")
+
+
+pool_mod = _load_tts_pool()
+TTSWorkerPool = pool_mod.TTSWorkerPool
+PRIORITY_FIRST = pool_mod.PRIORITY_FIRST
+PRIORITY_NORMAL = pool_mod.PRIORITY_NORMAL
+
+
+class _FakeModel:
+    """Records which jobs ran on it and checks it is never used concurrently."""
+
+    def __init__(self, name, seconds=0.02):
+        self.name = name
+        self.seconds = seconds
+        self.ran: list[str] = []
+        self._in_use = threading.Lock()
+
+    def create(self, text):
+        if not self._in_use.acquire(blocking=False):
+            raise AssertionError(f"model {self.name} used concurrently")
+        try:
+            time.sleep(self.seconds)
+            if text == "boom":
+                raise ValueError("synthesis failed")
+            self.ran.append(text)
+            return f"{self.name}:{text}"
+        finally:
+            self._in_use.release()
+
+
+def _create(model, text):
+    return model.create(text)
+
+
+class TestTTSWorkerPool(unittest.TestCase):
+    """Parallelism, priority ordering, cancellation and errors."""
+
+    def test_jobs_run_in_parallel_across_instances(self):
+        models = [_FakeModel("a", 0.1), _FakeModel("b", 0.1)]
+
+        async def run():
+            pool = TTSWorkerPool(models, _create)
+            pool.start()
+            start = time.perf_counter()
+            results = await asyncio.gather(
+                *(pool.submit(PRIORITY_NORMAL, f"s{i}") for i in range(4))
+            )
+            elapsed = time.perf_counter() - start
+            await pool.shutdown()
+            return results, elapsed
+
+        results, elapsed = asyncio.run(run())
+        self.assertEqual(sorted(r.split(":")[1] for r in results), ["s0", "s1", "s2", "s3"])
+        # Four 100ms jobs on two instances: ~200ms, not ~400ms
+        self.assertLess(elapsed, 0.35)
+        self.assertEqual(len(models[0].ran) + len(models[1].ran), 4)
+
+    def test_first_sentence_jumps_queue(self):
+        model = _FakeModel("a", 0.03)
+
+        async def run():
+            pool = TTSWorkerPool([model], _create)
+            pool.start()
+            busy = asyncio.create_task(pool.submit(PRIORITY_NORMAL, "busy"))
+            await asyncio.sleep(0.01)  # worker is now running "busy"
+            later = [
+                asyncio.create_task(pool.submit(PRIORITY_NORMAL, f"later{i}")) for i in range(3)
+            ]
+            await asyncio.sleep(0)
+            first = asyncio.create_task(pool.submit(PRIORITY_FIRST, "first"))
+            await asyncio.gather(busy, first, *later)
+            stats = pool.stats()
+            await pool.shutdown()
+            return stats
+
+        stats = asyncio.run(run())
+        self.assertEqual(model.ran, ["busy", "first", "later0", "later1", "later2"])
+        self.assertEqual(stats["jobs"], 5)
+        self.assertLess(stats["avg_wait_ms"][PRIORITY_FIRST], stats["avg_wait_ms"][PRIORITY_NORMAL])
+
+    def test_cancelled_queued_job_is_skipped(self):
+        model = _FakeModel("a", 0.03)
+
+        async def run():
+            pool = TTSWorkerPool([model], _create)
+            pool.start()
+            busy = asyncio.create_task(pool.submit(PRIORITY_NORMAL, "busy"))
+            await asyncio.sleep(0.01)
+            doomed = asyncio.create_task(pool.submit(PRIORITY_NORMAL, "doomed"))
+            await asyncio.sleep(0)
+            doomed.cancel()
+            after = await pool.submit(PRIORITY_NORMAL, "after")
+            await busy
+            await pool.shutdown()
+            return after
+
+        self.assertEqual(asyncio.run(run()), "a:after")
+        self.assertNotIn("doomed", model.ran)
+
+    def test_exception_propagates_and_worker_survives(self):
+        model = _FakeModel("a", 0.0)
+
+        async def run():
+            pool = TTSWorkerPool([model], _create)
+            with self.assertRaises(ValueError):
+                await pool.submit(PRIORITY_NORMAL, "boom")
+            result = await pool.submit(PRIORITY_NORMAL, "ok")
+            await pool.shutdown()
+            return result
+
+        self.assertEqual(asyncio.run(run()), "a:ok")
+
+    def test_requires_models(self):
+        with self.assertRaises(ValueError):
+            TTSWorkerPool([], _create)
+
+
+class TestMicroBatching(unittest.TestCase):
+    """Batch collection, batch errors and the metrics exposition."""
+
+    def test_jobs_within_window_run_as_one_batch(self):
+        model = _FakeModel("a", 0.0)
+        batches: list[list[str]] = []
+
+        def create_batch(model, batch):
+            batches.append([args[0] for args in batch])
+            return [f"{model.name}:{args[0]}" for args in batch]
+
+        async def run():
+            pool = TTSWorkerPool(
+                [model], _create, batch_fn=create_batch, max_batch=4, batch_window_ms=50
+            )
+            results = await asyncio.gather(
+                *(pool.submit(PRIORITY_NORMAL, f"s{i}") for i in range(6))
+            )
+            stats = pool.stats()
+            await pool.shutdown()
+            return results, stats
+
+        results, stats = asyncio.run(run())
+        self.assertEqual(results, [f"a:s{i}" for i in range(6)])
+        self.assertEqual(batches, [["s0", "s1", "s2", "s3"], ["s4", "s5"]])
+        self.assertEqual(stats["jobs"], 6)
+        self.assertEqual(stats["avg_batch_size"], 3.0)
+        self.assertEqual(model.ran, [])  # Single-job fn never used
+
+    def test_lone_job_uses_single_fn_after_window(self):
+        model = _FakeModel("a", 0.0)
+
+        def create_batch(model, batch):
+            raise AssertionError("batch_fn called for one job")
+
+        async def run():
+            pool = TTSWorkerPool(
+                [model], _create, batch_fn=create_batch, max_batch=4, batch_window_ms=5
+            )
+            result = await pool.submit(PRIORITY_FIRST, "only")
+            await pool.shutdown()
+            return result
+
+        self.assertEqual(asyncio.run(run()), "a:only")
+
+    def test_batch_failure_fails_every_job(self):
+        def create_batch(model, batch):
+            raise ValueError("batch failed")
+
+        async def run():
+            pool = TTSWorkerPool(
+                [_FakeModel("a", 0.0)],
+                _create,
+                batch_fn=create_batch,
+                max_batch=2,
+                batch_window_ms=50,
+            )
+            return await asyncio.gather(
+                pool.submit(PRIORITY_NORMAL, "x"),
+                pool.submit(PRIORITY_NORMAL, "y"),
+                return_exceptions=True,
+            )
+
+        results = asyncio.run(run())
+        self.assertTrue(all(isinstance(r, ValueError) for r in results))
+
+    def test_metrics_exposition(self):
+        async def run():
+            pool = TTSWorkerPool([_FakeModel("a", 0.0), _FakeModel("b", 0.0)], _create)
+            await asyncio.gather(
+                pool.submit(PRIORITY_FIRST, "x"), pool.submit(PRIORITY_NORMAL, "y")
+            )
+            lines = pool.metrics()
+            await pool.shutdown()
+            return lines
+
+        lines = asyncio.run(run())
+        self.assertIn("tts_workers 2", lines)
+        self.assertIn("tts_jobs_total 2", lines)
+        self.assertIn('tts_queue_wait_seconds_count{priority="0"} 1', lines)
+        self.assertIn('tts_batch_size_bucket{le="1"} 2', lines)
+        self.assertIn("tts_batch_size_count 2", lines)
+
+
+if __name__ == "__main__":
+    unittest.main()
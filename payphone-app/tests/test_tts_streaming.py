@@ -0,0 +1,604 @@
+"""Tests for segment-streaming synthesis, the PCM wire format and the incremental output DSP.
+
+Loads services/tts.py and core/audio_processor.py with config.settings
+stubbed, following the same pattern as test_core_components.py.
+"""
+
+import asyncio
+import base64
+import importlib
+import sys
+import time
+import types
+import unittest
+import warnings
+from itertools import pairwise
+from pathlib import Path
+
+import numpy as np
+from scipy.signal import resample_poly
+
+
+class _FakeAudioSettings:
+    output_sample_rate = 8000
+    telephone_lowcut = 300.0
+    telephone_highcut = 3400.0
+    chunk_size = 320
+
+
+class _FakeTTSSettings:
+    voice = "af_nova"
+    speed = 1.0
+    segment_min_chars = 20
+
+
+def _load_modules():
+    """Load services.tts and core.audio_processor without pydantic settings."""
+    app_root = Path(__file__).resolve().parent.parent
+    if str(app_root) not in sys.path:
+        sys.path.insert(0, str(app_root))
+
+    for pkg in ("config", "core", "services"):
+        if pkg not in sys.modules:
+            mod = types.ModuleType(pkg)
+            mod.__path__ = [str(app_root / pkg)]
+            sys.modules[pkg] = mod
+
+    settings_mod = sys.modules.get("config.settings")
+    if settings_mod is None:
+        settings_mod = types.ModuleType("config.settings")
+        sys.modules["config.settings"] = settings_mod
+    for name, stub in (("AudioSettings", _FakeAudioSettings), ("TTSSettings", _FakeTTSSettings)):
+        if not hasattr(settings_mod, name):
+            setattr(settings_mod, name, stub)
+
+    tts = importlib.import_module("services.tts")
+    audio_processor = importlib.import_module("core.audio_processor")
+    pool = importlib.import_module("services.tts_pool")
+    stream = importlib.import_module("services.tts_stream")
+    return tts, audio_processor, pool, stream
+
+
+tts_mod, audio_mod, pool_mod, stream_mod = _load_modules()
+KokoroTTS = tts_mod.KokoroTTS
+split_segments = tts_mod.split_segments
+RemoteTTS = tts_mod.RemoteTTS
+AudioProcessor = audio_mod.AudioProcessor
+encode_pcm = stream_mod.encode_pcm
+decode_pcm = stream_mod.decode_pcm
+TTSWorkerPool = pool_mod.TTSWorkerPool
+
+
+def _speech(seconds=1.0, rate=24000, seed=0):
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(seconds * rate)) / rate
+    audio = 0.3 * np.sin(2 * np.pi * 440 * t) + 0.05 * rng.standard_normal(len(t))
+    return audio.astype(np.float32)
+
+
+class TestSplitSegments(unittest.TestCase):
+    """Clause splitting for incremental synthesis."""
+
+    def test_short_sentence_not_split(self):
+        self.assertEqual(split_segments("Hello there, friend."), ["Hello there, friend."])
+
+    def test_splits_at_clause_breaks(self):
+        text = "Well, I suppose that, if you really think about it, the answer is forty-two."
+        segments = split_segments(text)
+        self.assertEqual(
+            segments,
+            ["Well, I suppose that,", "if you really think about it,", "the answer is forty-two."],
+        )
+        self.assertEqual(" ".join(segments), text)
+
+    def test_short_pieces_merge(self):
+        segments = split_segments("Yes, no, maybe so, I think you are right about that one.")
+        self.assertEqual(len(segments), 1)
+
+    def test_disabled(self):
+        text = "Well, I suppose that, if you really think about it, the answer is forty-two."
+        self.assertEqual(split_segments(text, min_chars=0), [text])
+
+
+class TestOutputStream(unittest.TestCase):
+    """Incremental resample + telephone filter."""
+
+    def setUp(self):
+        self.processor = AudioProcessor(_FakeAudioSettings())
+
+    def test_segmented_resample_matches_resample_poly(self):
+        audio = _speech()
+        stream = self.processor.create_output_stream(24000)
+        bounds = [0, 1000, 1001, 17000, len(audio)]
+        parts = [stream._resample(audio[a:b]) for a, b in pairwise(bounds)]
+        parts.append(stream._resample(np.zeros(-(-stream._delay // stream._up), dtype=np.float32)))
+        reference = resample_poly(audio, 1, 3)
+        np.testing.assert_allclose(np.concatenate(parts)[: len(reference)], reference, atol=1e-6)
+
+    def test_segment_boundaries_are_seamless(self):
+        audio = _speech()
+        whole = self.processor.create_output_stream(24000)
+        one_shot = whole.process(audio) + whole.flush()
+
+        split = self.processor.create_output_stream(24000)
+        pieces = b"".join(split.process(audio[a : a + 3001]) for a in range(0, len(audio), 3001))
+        pieces += split.flush()
+
+        a = np.frombuffer(one_shot, dtype=np.int16).astype(int)
+        b = np.frombuffer(pieces, dtype=np.int16).astype(int)
+        self.assertEqual(len(a), len(b))
+        self.assertLessEqual(np.abs(a - b).max(), 1)
+
+    def test_without_band_pass_only_converts(self):
+        audio = _speech(0.1, rate=8000)
+        stream = self.processor.create_output_stream(8000, band_pass=False)
+        out = stream.process(audio) + stream.flush()
+        np.testing.assert_array_equal(
+            np.frombuffer(out, dtype=np.int16),
+            (audio.astype(np.float64) * 32767.0).astype(np.int16),
+        )
+        batch = self.processor.process_for_output(audio, from_rate=8000, band_pass=False)
+        np.testing.assert_allclose(
+            np.frombuffer(out, dtype=np.int16), np.frombuffer(batch, dtype=np.int16), atol=1
+        )
+
+    def test_length_matches_batch_processing(self):
+        audio = _speech(0.7)
+        stream = self.processor.create_output_stream(24000)
+        streamed = stream.process(audio) + stream.flush()
+        self.assertEqual(len(streamed), len(self.processor.process_for_output(audio)))
+
+
+class _FakeKokoro:
+    """Fake model: 10ms of audio per character, 20ms synthesis per call."""
+
+    def __init__(self):
+        self.calls: list[tuple[str, float]] = []
+
+    def create(self, text, voice, speed):
+        self.calls.append((text, time.perf_counter()))
+        time.sleep(0.02)
+        return np.full(len(text) * 240, 0.1, dtype=np.float32), 24000
+
+
+class TestSynthesizeStream(unittest.TestCase):
+    """KokoroTTS.synthesize_stream() segment order and prefetch."""
+
+    def _make_tts(self, model):
+        tts = KokoroTTS(settings=_FakeTTSSettings())
+        tts._initialized = True
+        tts._model = model
+        tts._pool = TTSWorkerPool([model], tts._synthesize_with)
+        return tts
+
+    def test_yields_segments_in_order_with_gaps(self):
+        model = _FakeKokoro()
+        tts = self._make_tts(model)
+        text = "Well, I suppose that, if you really think about it, the answer is forty-two."
+
+        async def run():
+            out = [audio async for audio in tts.synthesize_stream(text)]
+            await tts.cleanup()
+            return out
+
+        segments = asyncio.run(run())
+        expected = split_segments(text)
+        self.assertEqual([call[0] for call in model.calls], expected)
+        gap = int(stream_mod.SEGMENT_GAP_SECONDS * 24000)
+        self.assertEqual(len(segments[0]), len(expected[0]) * 240 + gap)
+        self.assertEqual(len(segments[-1]), len(expected[-1]) * 240)
+
+    def test_next_segment_synthesizes_while_current_plays(self):
+        model = _FakeKokoro()
+        tts = self._make_tts(model)
+        text = "Well, I suppose that, if you really think about it, the answer is forty-two."
+
+        async def run():
+            consumed_at = []
+            async for _ in tts.synthesize_stream(text):
+                consumed_at.append(time.perf_counter())
+                await asyncio.sleep(0.1)  # "playback"
+            await tts.cleanup()
+            return consumed_at
+
+        consumed_at = asyncio.run(run())
+        # Segment 2 started synthesizing before segment 1 finished playing
+        self.assertLess(model.calls[1][1], consumed_at[0] + 0.1)
+
+    def test_closing_early_cancels_prefetch(self):
+        model = _FakeKokoro()
+        tts = self._make_tts(model)
+        text = "Well, I suppose that, if you really think about it, the answer is forty-two."
+
+        async def run():
+            stream = tts.synthesize_stream(text)
+            await stream.__anext__()
+            await stream.aclose()
+            await asyncio.sleep(0.1)
+            await tts.cleanup()
+
+        asyncio.run(run())
+        self.assertLessEqual(len(model.calls), 2)
+
+    def test_phoneme_cache_feeds_model_phonemes(self):
+        class _PhonemeKokoro(_FakeKokoro):
+            def create(self, text, voice, speed, is_phonemes=False):
+                self.calls.append((text, is_phonemes))
+                return np.zeros(240, dtype=np.float32), 24000
+
+        model = _PhonemeKokoro()
+        g2p_calls = []
+
+        def g2p(text):
+            g2p_calls.append(text)
+            return " ".join(f"/{word.lower()}/" for word in text.split())
+
+        tts = self._make_tts(model)
+        tts._phonemes = tts_mod.PhonemeCache(g2p)
+
+        async def run():
+            await tts.synthesize("Hello there")
+            await tts.synthesize("hello there")
+            await tts.cleanup()
+
+        asyncio.run(run())
+        self.assertEqual(model.calls, [("/hello/ /there/", True)] * 2)
+        self.assertEqual(g2p_calls, ["Hello there"])
+
+
+class TestPcmEncoding(unittest.TestCase):
+    """Wire encodings for /synthesize/stream."""
+
+    def test_f32_round_trip_is_exact(self):
+        audio = _speech(0.1)
+        np.testing.assert_array_equal(decode_pcm(encode_pcm(audio, "f32le"), "f32le"), audio)
+
+    def test_s16_round_trip_within_one_step(self):
+        audio = _speech(0.1)
+        data = encode_pcm(audio, "s16le")
+        self.assertEqual(len(data), 2 * len(audio))
+        np.testing.assert_allclose(decode_pcm(data, "s16le"), audio, atol=2 / 32768)
+
+    def test_s16_clips_out_of_range(self):
+        decoded = decode_pcm(encode_pcm(np.array([2.0, -2.0], dtype=np.float32), "s16le"), "s16le")
+        np.testing.assert_allclose(decoded, [32767 / 32768, -32767 / 32768])
+
+    def test_mulaw_is_one_byte_per_sample_and_close(self):
+        audio = _speech(0.1)
+        data = encode_pcm(audio, "mulaw")
+        self.assertEqual(len(data), len(audio))
+        decoded = decode_pcm(data, "mulaw")
+        # Companded: error scales with amplitude, ~3% of full scale at worst
+        self.assertLess(np.abs(decoded - audio).max(), 0.03)
+
+    def test_mulaw_matches_g711_reference(self):
+        try:
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore", DeprecationWarning)
+                import audioop
+        except ImportError:
+            self.skipTest("audioop not available (removed in Python 3.13)")
+
+        pcm16 = np.arange(-32768, 32768, dtype=np.int16)
+        expected = audioop.lin2ulaw(pcm16.tobytes(), 2)
+        self.assertEqual(encode_pcm(pcm16, "mulaw"), expected)
+
+        codes = bytes(range(256))
+        expected_pcm = np.frombuffer(audioop.ulaw2lin(codes, 2), dtype=np.int16)
+        np.testing.assert_array_equal(
+            decode_pcm(codes, "mulaw"), expected_pcm.astype(np.float32) / 32768.0
+        )
+
+    def test_int16_input_encodes_losslessly(self):
+        pcm16 = np.array([-32768, -1, 0, 1, 32767], dtype=np.int16)
+        self.assertEqual(encode_pcm(pcm16, "s16le"), pcm16.tobytes())
+        np.testing.assert_array_equal(
+            decode_pcm(encode_pcm(pcm16, "f32le"), "f32le"), pcm16 / 32768.0
+        )
+
+    def test_unknown_encoding(self):
+        with self.assertRaises(ValueError):
+            encode_pcm(np.zeros(4, dtype=np.float32), "mp3")
+
+
+class _FakeRemoteSettings(_FakeTTSSettings):
+    remote_timeout = 5.0
+    remote_streaming = True
+    remote_output = "telephone"
+    remote_encoding = "s16le"
+    remote_pool_size = 4
+    remote_warm_connections = 2
+    remote_keepalive = 60.0
+    remote_connect_timeout = 1.0
+    remote_stall_timeout = 2.0
+    remote_hedge = False
+    remote_fallback = "none"
+    remote_fallback_phrase = "One moment please."
+
+
+class _FakeServerMixin:
+    """Runs RemoteTTS against an in-process server speaking tts_server's protocol."""
+
+    def _run_with_server(
+        self,
+        scenario,
+        streaming=True,
+        audio_settings=None,
+        encoding="s16le",
+        behaviour=None,
+        **overrides,
+    ):
+        """Run scenario(tts) against a fake server.
+
+        behaviour(index, body) returns None (answer normally), "error"
+        (HTTP 500) or a number of seconds to stall before answering.
+        """
+        from aiohttp import web
+
+        requests: list[dict] = []
+        self.health_checks = 0
+
+        async def health(request):
+            self.health_checks += 1
+            return web.json_response(
+                {
+                    "status": "healthy",
+                    "sample_rate": 24000,
+                    "streaming": streaming,
+                    "telephone": streaming,
+                }
+            )
+
+        async def synthesize_stream(request):
+            body = await request.json()
+            requests.append(body)
+            action = behaviour(len(requests) - 1, body) if behaviour else None
+            if action == "error":
+                return web.Response(status=500, text="synthesis failed")
+            segments = split_segments(body["text"], body["segment_min_chars"])
+            if action == "empty":
+                segments = []  # Nothing to say: the stream ends with no audio
+            elif action:
+                await asyncio.sleep(action)
+            telephone = body.get("output") == "telephone"
+            rate = body.get("output_sample_rate", 8000) if telephone else 24000
+            response = web.StreamResponse(
+                headers={"X-Sample-Rate": str(rate), "X-Audio-Encoding": body["encoding"]}
+            )
+            await response.prepare(request)
+            for segment in segments:
+                audio = np.full(len(segment) * rate // 1000, 0.25, dtype=np.float32)
+                data = encode_pcm(audio, body["encoding"])
+                # Odd-sized writes split samples across network reads
+                for start in range(0, len(data), 333):
+                    await response.write(data[start : start + 333])
+                    await asyncio.sleep(0)
+            await response.write_eof()
+            return response
+
+        async def synthesize_json(request):
+            body = await request.json()
+            requests.append(body)
+            audio = np.full(len(body["text"]) * 24, 0.25, dtype=np.float32)
+            return web.json_response(
+                {
+                    "audio": base64.b64encode(audio.tobytes()).decode(),
+                    "sample_rate": 24000,
+                    "duration_seconds": len(audio) / 24000,
+                }
+            )
+
+        async def run():
+            app = web.Application()
+            app.router.add_get("/health", health)
+            app.router.add_post("/synthesize/stream", synthesize_stream)
+            app.router.add_post("/synthesize", synthesize_json)
+            runner = web.AppRunner(app)
+            await runner.setup()
+            site = web.TCPSite(runner, "127.0.0.1", 0)
+            await site.start()
+            port = site._server.sockets[0].getsockname()[1]
+
+            settings = _FakeRemoteSettings()
+            settings.remote_host = f"http://127.0.0.1:{port}"
+            settings.remote_encoding = encoding
+            for name, value in overrides.items():
+                setattr(settings, name, value)
+            tts = RemoteTTS(settings, audio_settings)
+            try:
+                await tts.initialize()
+                return await scenario(tts)
+            finally:
+                await tts.cleanup()
+                await runner.cleanup()
+
+        return asyncio.run(run()), requests
+
+
+class TestRemoteTTSStreaming(_FakeServerMixin, unittest.TestCase):
+    """RemoteTTS streaming, encodings and server-side rendering."""
+
+    def test_stream_yields_decoded_chunks_incrementally(self):
+        text = "Well, I suppose that, if you really think about it, the answer is forty-two."
+
+        async def scenario(tts):
+            return [chunk async for chunk in tts.synthesize_stream(text)]
+
+        chunks, requests = self._run_with_server(scenario)
+        audio = np.concatenate(chunks)
+        self.assertGreater(len(chunks), 1)
+        self.assertEqual(len(audio), sum(len(s) * 24 for s in split_segments(text)))
+        np.testing.assert_allclose(audio, 0.25, atol=1e-4)
+        self.assertEqual(requests[0]["encoding"], "s16le")
+        self.assertEqual(requests[0]["segment_min_chars"], 20)
+
+    def test_synthesize_collects_whole_stream(self):
+        async def scenario(tts):
+            return await tts.synthesize("Hello there.")
+
+        audio, requests = self._run_with_server(scenario)
+        self.assertEqual(len(audio), len("Hello there.") * 24)
+        self.assertEqual(requests[0]["segment_min_chars"], 0)
+
+    def test_server_rendered_telephone_audio(self):
+        text = "Well, I suppose that, if you really think about it, the answer is forty-two."
+
+        async def scenario(tts):
+            chunks = [chunk async for chunk in tts.synthesize_stream(text)]
+            return chunks, tts.sample_rate, tts.telephone_output
+
+        (chunks, rate, telephone), requests = self._run_with_server(
+            scenario, audio_settings=_FakeAudioSettings(), encoding="mulaw"
+        )
+        self.assertEqual(rate, 8000)
+        self.assertTrue(telephone)
+        self.assertEqual(requests[0]["output"], "telephone")
+        self.assertEqual(requests[0]["output_sample_rate"], 8000)
+        self.assertEqual(requests[0]["telephone_highcut"], 3400.0)
+        audio = np.concatenate(chunks)
+        self.assertEqual(len(audio), sum(len(s) * 8 for s in split_segments(text)))
+        np.testing.assert_allclose(audio, 0.25, atol=0.01)
+
+    def test_raw_output_without_audio_settings(self):
+        async def scenario(tts):
+            await tts.synthesize("Hello there.")
+            return tts.sample_rate, tts.telephone_output
+
+        (rate, telephone), requests = self._run_with_server(scenario)
+        self.assertEqual((rate, telephone), (24000, False))
+        self.assertNotIn("output", requests[0])
+
+    def test_falls_back_to_json_on_older_server(self):
+        async def scenario(tts):
+            return [chunk async for chunk in tts.synthesize_stream("Hello there.")]
+
+        chunks, requests = self._run_with_server(scenario, streaming=False)
+        self.assertEqual(len(chunks), 1)
+        self.assertEqual(len(chunks[0]), len("Hello there.") * 24)
+        self.assertNotIn("encoding", requests[0])
+
+
+class TestRemoteTTSResilience(_FakeServerMixin, unittest.TestCase):
+    """Connection warming, retry, hedging and fallback in RemoteTTS."""
+
+    def test_warms_keep_alive_connections(self):
+        async def scenario(tts):
+            return len(tts._session.connector._conns)
+
+        pooled_hosts, _ = self._run_with_server(scenario, remote_warm_connections=3)
+        # Initial health check plus one per warm connection
+        self.assertEqual(self.health_checks, 4)
+        self.assertEqual(pooled_hosts, 1)
+
+    def test_retries_once_after_error(self):
+        async def scenario(tts):
+            audio = await tts.synthesize("Hello there.")
+            return audio, tts.stats()
+
+        (audio, stats), requests = self._run_with_server(
+            scenario, behaviour=lambda index, body: "error" if index == 0 else None
+        )
+        self.assertEqual(len(requests), 2)
+        self.assertEqual(len(audio), len("Hello there.") * 24)
+        self.assertEqual(stats["retries"], 1)
+        self.assertEqual(stats["fallbacks"], 0)
+
+    def test_stall_falls_back_to_clip(self):
+        def stall_after_clip(index, body):
+            return None if body["text"] == "One moment please." else 1.0
+
+        async def scenario(tts):
+            start = time.perf_counter()
+            chunks = [chunk async for chunk in tts.synthesize_stream("Tell me a story.")]
+            return chunks, time.perf_counter() - start, tts.stats()
+
+        (chunks, elapsed, stats), _ = self._run_with_server(
+            scenario,
+            behaviour=stall_after_clip,
+            remote_fallback="clip",
+            remote_stall_timeout=0.2,
+        )
+        self.assertEqual(len(chunks), 1)
+        self.assertEqual(len(chunks[0]), len("One moment please.") * 24)
+        self.assertIsInstance(chunks[0], tts_mod.FallbackAudio)
+        self.assertEqual(stats["fallbacks"], 1)
+        self.assertLess(elapsed, 0.6)
+
+    def test_empty_stream_is_silence_not_fallback(self):
+        async def scenario(tts):
+            chunks = [chunk async for chunk in tts.synthesize_stream("...")]
+            return chunks, tts.stats()
+
+        (chunks, stats), requests = self._run_with_server(
+            scenario,
+            behaviour=lambda index, body: "empty" if body["text"] == "..." else None,
+            remote_fallback="clip",
+        )
+        self.assertEqual(chunks, [])
+        self.assertEqual(stats["fallbacks"], 0)
+        self.assertEqual([body["text"] for body in requests], ["One moment please.", "..."])
+
+    def test_failure_without_fallback_is_silent(self):
+        async def scenario(tts):
+            return [chunk async for chunk in tts.synthesize_stream("Hello there.")]
+
+        chunks, requests = self._run_with_server(scenario, behaviour=lambda index, body: "error")
+        self.assertEqual(chunks, [])
+        self.assertEqual(len(requests), 2)
+
+    def test_local_fallback_matches_server_rendering(self):
+        class _Local:
+            sample_rate = 24000
+
+            async def synthesize(self, text, voice=None, speed=None, priority=1):
+                return _speech(0.5)
+
+            async def cleanup(self):
+                pass
+
+        async def scenario(tts):
+            tts._local = _Local()
+            audio = await tts.synthesize("Hello there.")
+            return audio, tts.stats()
+
+        (audio, stats), _ = self._run_with_server(
+            scenario,
+            audio_settings=_FakeAudioSettings(),
+            behaviour=lambda index, body: "error",
+        )
+        # Rendered to 8kHz like the server would have, plus the filter tail
+        self.assertGreaterEqual(len(audio), 4000)
+        self.assertLess(len(audio), 4100)
+        self.assertIsInstance(audio, tts_mod.FallbackAudio)
+        self.assertEqual(stats["fallbacks"], 1)
+
+    def test_hedges_slow_request(self):
+        def slow_first(index, body):
+            return 0.6 if index == 0 else None
+
+        async def scenario(tts):
+            tts._first_byte_ms.extend([20.0] * 30)
+            start = time.perf_counter()
+            audio = await tts.synthesize("Hello there.")
+            return audio, time.perf_counter() - start, tts.stats()
+
+        (audio, elapsed, stats), requests = self._run_with_server(
+            scenario, behaviour=slow_first, remote_hedge=True
+        )
+        self.assertEqual(len(audio), len("Hello there.") * 24)
+        self.assertEqual(len(requests), 2)
+        self.assertEqual((stats["hedged"], stats["hedge_wins"]), (1, 1))
+        self.assertLess(elapsed, 0.4)
+
+    def test_no_hedge_without_latency_history(self):
+        async def scenario(tts):
+            await tts.synthesize("Hello there.")
+            return tts.stats()
+
+        stats, requests = self._run_with_server(scenario, remote_hedge=True)
+        self.assertEqual(len(requests), 1)
+        self.assertIsNone(stats["hedge_delay_ms"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,506 @@
+"""Tests for the Hailo Whisper Wyoming server's CPU-side components.
+
+Uses importlib to load the server module without hailo_platform or
+transformers (both are imported lazily inside HailoWhisperEngine.initialize).
+"""
+
+import asyncio
+import importlib
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+import types
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+
+def _load_module():
+    """Load services.wyoming_whisper_server without the services package deps."""
+    app_root = Path(__file__).resolve().parent.parent
+    if str(app_root) not in sys.path:
+        sys.path.insert(0, str(app_root))
+
+    if "services" not in sys.modules:
+        mod = types.ModuleType("services")
+        mod.__path__ = [str(app_root / "services")]
+        sys.modules["services"] = mod
+
+    return importlib.import_module("services.wyoming_whisper_server")
+
+
+server_mod = _load_module()
+
+MelSpectrogram = server_mod.MelSpectrogram
+NPUScheduler = server_mod.NPUScheduler
+HailoWhisperEngine = server_mod.HailoWhisperEngine
+FakeWhisperEngine = server_mod.FakeWhisperEngine
+WyomingWhisperServer = server_mod.WyomingWhisperServer
+N_SAMPLES = server_mod.N_SAMPLES
+N_MELS = server_mod.N_MELS
+N_FRAMES = server_mod.N_FRAMES
+SAMPLE_RATE = server_mod.SAMPLE_RATE
+
+
+def _reference_mel(filterbank: np.ndarray, window: np.ndarray, audio: np.ndarray) -> np.ndarray:
+    """Original float64 numpy implementation, kept verbatim for parity checks."""
+    n_fft, hop = server_mod.N_FFT, server_mod.HOP_LENGTH
+    if len(audio) > N_SAMPLES:
+        audio = audio[:N_SAMPLES]
+    else:
+        audio = np.pad(audio, (0, max(0, N_SAMPLES - len(audio))))
+    audio = audio.astype(np.float32)
+    audio_padded = np.pad(audio, (n_fft // 2, n_fft // 2), mode="reflect")
+    n_frames = 1 + (len(audio_padded) - n_fft) // hop
+    frames = np.lib.stride_tricks.as_strided(
+        audio_padded,
+        shape=(n_frames, n_fft),
+        strides=(audio_padded.strides[0] * hop, audio_padded.strides[0]),
+    ).copy()
+    spectrum = np.fft.rfft(frames * window, n=n_fft)
+    magnitudes = (np.abs(spectrum[:-1]) ** 2).T
+    mel_spec = filterbank @ magnitudes
+    log_spec = np.log10(np.maximum(mel_spec, 1e-10))
+    log_spec = np.maximum(log_spec, log_spec.max() - 8.0)
+    return ((log_spec + 4.0) / 4.0).astype(np.float32)
+
+
+def _speechlike(n_samples: int, seed: int = 0) -> np.ndarray:
+    """Harmonic tone bursts plus noise — enough spectral structure for parity."""
+    rng = np.random.default_rng(seed)
+    t = np.arange(n_samples) / SAMPLE_RATE
+    f0 = 120 + 40 * np.sin(2 * np.pi * 0.7 * t)
+    phase = 2 * np.pi * np.cumsum(f0) / SAMPLE_RATE
+    voiced = sum(np.sin(k * phase) / k for k in range(1, 12))
+    envelope = 0.5 * (1 + np.sign(np.sin(2 * np.pi * 2.5 * t)))
+    audio = 0.2 * voiced * envelope + 0.01 * rng.standard_normal(n_samples)
+    return audio.astype(np.float32)
+
+
+class TestMelSpectrogram(unittest.TestCase):
+    """MelSpectrogram: parity with the original float64 implementation."""
+
+    def setUp(self):
+        self.mel = MelSpectrogram()
+
+    def _assert_parity(self, audio):
+        expected = _reference_mel(self.mel._filterbank, self.mel._window, audio)
+        actual = self.mel(audio)
+        self.assertEqual(actual.shape, (N_MELS, N_FRAMES))
+        self.assertEqual(actual.dtype, np.float32)
+        np.testing.assert_allclose(actual, expected, atol=1e-4, rtol=0)
+
+    def test_parity_short_utterance(self):
+        self._assert_parity(_speechlike(SAMPLE_RATE * 2))
+
+    def test_parity_full_window(self):
+        self._assert_parity(_speechlike(N_SAMPLES, seed=1))
+
+    def test_parity_trims_long_audio(self):
+        self._assert_parity(_speechlike(N_SAMPLES + 12345, seed=2))
+
+    def test_parity_shorter_than_fft_window(self):
+        self._assert_parity(_speechlike(150, seed=3))
+
+    def test_parity_silence(self):
+        self._assert_parity(np.zeros(SAMPLE_RATE, dtype=np.float32))
+
+    def test_filterbank_is_sparse(self):
+        nnz = self.mel._filterbank_sparse.nnz
+        self.assertLess(nnz, self.mel._filterbank.size // 10)
+
+    def test_out_buffer_reused(self):
+        out = np.empty((N_MELS, N_FRAMES), dtype=np.float32)
+        result = self.mel(_speechlike(SAMPLE_RATE), out=out)
+        self.assertIs(result, out)
+        np.testing.assert_allclose(out, self.mel(_speechlike(SAMPLE_RATE)), atol=1e-6)
+
+    def test_default_output_is_frame_major(self):
+        """Encoder input (1, 1000, 80) should be a view, not a copy."""
+        result = self.mel(_speechlike(SAMPLE_RATE))
+        self.assertTrue(result.T.flags["C_CONTIGUOUS"])
+
+
+class TestMelStream(unittest.TestCase):
+    """MelStream: chunked feeding matches the one-shot computation."""
+
+    def setUp(self):
+        self.mel = MelSpectrogram()
+
+    def _feed_in_chunks(self, stream, audio, chunk):
+        for i in range(0, len(audio), chunk):
+            stream.feed(audio[i : i + chunk])
+
+    def test_chunked_matches_one_shot(self):
+        audio = _speechlike(SAMPLE_RATE * 3, seed=4)
+        expected = self.mel(audio).copy()
+        for chunk in (1, 160, 2048, 4097):
+            stream = self.mel.stream()
+            self._feed_in_chunks(stream, audio, chunk)
+            np.testing.assert_allclose(stream.finalize(), expected, atol=1e-6)
+
+    def test_frames_computed_as_audio_arrives(self):
+        stream = self.mel.stream()
+        stream.feed(_speechlike(SAMPLE_RATE, seed=5))
+        # 1s of audio: every frame whose window ends within the audio is done
+        self.assertEqual(stream.frames_ready, (SAMPLE_RATE - 200) // 160 + 1)
+
+    def test_no_frames_before_reflection_available(self):
+        stream = self.mel.stream()
+        stream.feed(np.ones(200, dtype=np.float32))
+        self.assertEqual(stream.frames_ready, 0)
+
+    def test_reset_reuses_buffers(self):
+        stream = self.mel.stream()
+        stream.feed(_speechlike(N_SAMPLES + 500, seed=6))
+        stream.finalize()
+        stream.reset()
+        audio = _speechlike(SAMPLE_RATE, seed=7)
+        stream.feed(audio)
+        np.testing.assert_allclose(stream.finalize(), self.mel(audio), atol=1e-6)
+
+    def test_num_samples_capped(self):
+        stream = self.mel.stream()
+        stream.feed(np.zeros(N_SAMPLES + 10, dtype=np.float32))
+        self.assertEqual(stream.num_samples, N_SAMPLES)
+
+
+# ---------------------------------------------------------------------------
+# NPU scheduling tests
+# ---------------------------------------------------------------------------
+
+
+class _FakeTokenizer:
+    def decode(self, tokens, skip_special_tokens=True):
+        return " ".join(str(t) for t in tokens)
+
+
+def _fake_engine(script: list[int], npu_delay: float = 0.0):
+    """HailoWhisperEngine with NPU passes replaced by scripted logits.
+
+    The decoder emits script[i] at generated position i, then EOT.
+    """
+    d_model, seq_len = 8, 16
+    engine = HailoWhisperEngine(Path("unused.hef"), Path("."))
+    engine._encoder_input_shape = (1, N_FRAMES, N_MELS)
+    engine._decoder_seq_len = seq_len
+    rng = np.random.default_rng(0)
+    engine._token_embeddings = rng.standard_normal(
+        (server_mod.SOT_TOKEN + 512, d_model)
+    ).astype(np.float32)
+    engine._tokenizer = _FakeTokenizer()
+    calls = []
+
+    def run_encoder(mel_input):
+        calls.append(("encoder", threading.current_thread().name))
+        time.sleep(npu_delay)
+        return np.zeros((1, 4, d_model), np.float32)
+
+    def run_decoder(encoded, token_embeds):
+        calls.append(("decoder", threading.current_thread().name))
+        engine.embeds_seen.append(token_embeds.copy())
+        time.sleep(npu_delay)
+        position = sum(1 for kind, _ in calls if kind == "decoder") - 1
+        logits = np.zeros((1, seq_len, server_mod.EOT_TOKEN + 1), np.float32)
+        step_tokens = script + [server_mod.EOT_TOKEN]
+        # The engine reads row step - 1; fill every row for simplicity
+        logits[0, :, step_tokens[min(position, len(step_tokens) - 1)]] = 10.0
+        return [logits[..., :20], logits[..., 20:]]
+
+    engine.embeds_seen = []
+    engine._run_encoder = run_encoder
+    engine._run_decoder = run_decoder
+    return engine, calls
+
+
+class TestNPUScheduler(unittest.TestCase):
+    """NPUScheduler: jobs from concurrent requests interleave on one thread."""
+
+    def test_interleaves_requests(self):
+        scheduler = NPUScheduler()
+        order = []
+
+        def job(name):
+            time.sleep(0.005)
+            order.append(name)
+            return name
+
+        async def request(name, n_jobs, delay=0.0):
+            await asyncio.sleep(delay)
+            for i in range(n_jobs):
+                await scheduler.submit("decoder", job, f"{name}{i}")
+
+        async def main():
+            await asyncio.gather(request("A", 6), request("B", 2, delay=0.012))
+
+        asyncio.run(main())
+        scheduler.shutdown()
+        # B's first job must not wait for all of A's jobs
+        self.assertLess(order.index("B0"), order.index("A5"))
+        self.assertLess(order.index("B1"), order.index("A5"))
+
+    def test_stats(self):
+        scheduler = NPUScheduler()
+
+        async def main():
+            await asyncio.gather(
+                *(scheduler.submit("encoder", time.sleep, 0.002) for _ in range(3))
+            )
+
+        asyncio.run(main())
+        stats = scheduler.stats()
+        scheduler.shutdown()
+        self.assertEqual(stats["jobs_completed"], {"encoder": 3})
+        self.assertEqual(stats["queue_depth"], 0)
+        self.assertGreaterEqual(stats["max_queue_depth"], 2)
+        self.assertGreater(stats["avg_wait_ms"], 0.0)
+
+    def test_cancelled_job_leaves_queue(self):
+        scheduler = NPUScheduler()
+
+        async def main():
+            blocker = asyncio.ensure_future(scheduler.submit("encoder", time.sleep, 0.05))
+            waiter = asyncio.ensure_future(scheduler.submit("decoder", time.sleep, 0))
+            await asyncio.sleep(0.01)
+            waiter.cancel()
+            await blocker
+            with self.assertRaises(asyncio.CancelledError):
+                await waiter
+
+        asyncio.run(main())
+        stats = scheduler.stats()
+        scheduler.shutdown()
+        self.assertEqual(stats["queue_depth"], 0)
+        self.assertNotIn("decoder", stats["jobs_completed"])
+
+
+class TestScheduledTranscription(unittest.TestCase):
+    """HailoWhisperEngine.transcribe(): scheduled path matches the blocking one."""
+
+    def test_matches_transcribe_sync(self):
+        mel = MelSpectrogram()(np.zeros(SAMPLE_RATE, dtype=np.float32))
+        engine, _ = _fake_engine([11, 12, 13])
+        expected = engine.transcribe_sync(mel=mel)
+        engine, calls = _fake_engine([11, 12, 13])
+        actual = asyncio.run(engine.transcribe(mel=mel))
+        engine.cleanup()
+        self.assertEqual(expected, "11 12 13")
+        self.assertEqual(actual, expected)
+        # All NPU work ran on the scheduler thread
+        self.assertTrue(all(name.startswith("npu") for _, name in calls))
+
+    def test_cpu_steps_run_off_the_event_loop(self):
+        engine, _ = _fake_engine([11, 12, 13])
+        table = engine._token_embeddings
+        lookups = []
+
+        class Table:
+            # Records whether each embedding lookup ran on the event loop thread
+            shape = table.shape
+
+            def __getitem__(self, index):
+                lookups.append(threading.current_thread() is threading.main_thread())
+                return table[index]
+
+        engine._token_embeddings = Table()
+        mel = np.zeros((N_MELS, N_FRAMES), dtype=np.float32)
+        self.assertEqual(asyncio.run(engine.transcribe(mel=mel)), "11 12 13")
+        engine.cleanup()
+        self.assertTrue(lookups)
+        self.assertFalse(any(lookups))
+
+    def _cancel_midway(self, engine):
+        """Cancel engine.transcribe() 50 ms in; return the scheduler stats."""
+        mel = np.zeros((N_MELS, N_FRAMES), dtype=np.float32)
+
+        async def main():
+            task = asyncio.create_task(engine.transcribe(mel=mel))
+            await asyncio.sleep(0.05)
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+
+        asyncio.run(main())
+        stats = engine.scheduler.stats()
+        engine.cleanup()
+        return stats
+
+    def test_cancel_during_npu_job(self):
+        engine, _ = _fake_engine([11, 12, 13], npu_delay=0.2)
+        self.assertEqual(self._cancel_midway(engine)["active_requests"], 0)
+
+    def test_cancel_during_cpu_step(self):
+        engine, _ = _fake_engine([11, 12, 13])
+        table = engine._token_embeddings
+
+        class SlowTable:
+            shape = table.shape
+
+            def __getitem__(self, index):
+                time.sleep(0.2)
+                return table[index]
+
+        engine._token_embeddings = SlowTable()
+        self.assertEqual(self._cancel_midway(engine)["active_requests"], 0)
+
+
+class TestTokenEmbeddings(unittest.TestCase):
+    """Token embedding table: memory-mapped float32, incremental gather."""
+
+    def _engine_with_table(self, tmp, table):
+        engine = HailoWhisperEngine(Path("unused.hef"), Path(tmp), variant="tiny.en")
+        np.save(engine._token_embed_path, table)
+        return engine
+
+    def test_float32_table_is_memory_mapped(self):
+        table = np.arange(40, dtype=np.float32).reshape(10, 4)
+        with tempfile.TemporaryDirectory() as tmp:
+            loaded = self._engine_with_table(tmp, table)._load_token_embeddings()
+            self.assertIsInstance(loaded, np.memmap)
+            np.testing.assert_array_equal(loaded, table)
+            del loaded
+
+    def test_non_float32_table_converted_once(self):
+        table = np.arange(40, dtype=np.float16).reshape(10, 4)
+        with tempfile.TemporaryDirectory() as tmp:
+            engine = self._engine_with_table(tmp, table)
+            loaded = engine._load_token_embeddings()
+            sidecar = Path(tmp) / "token_embedding_weight_tiny.en.float32.npy"
+            self.assertTrue(sidecar.exists())
+            self.assertEqual(loaded.dtype, np.float32)
+            self.assertIsInstance(loaded, np.memmap)
+            np.testing.assert_array_equal(loaded, table.astype(np.float32))
+            del loaded
+
+    def test_stale_conversion_is_rebuilt(self):
+        original = np.arange(40, dtype=np.float16).reshape(10, 4)
+        with tempfile.TemporaryDirectory() as tmp:
+            engine = self._engine_with_table(tmp, original)
+            engine._load_token_embeddings()  # Writes the float32 copy
+            sidecar = Path(tmp) / "token_embedding_weight_tiny.en.float32.npy"
+            for table in (
+                np.ones((12, 4), dtype=np.float16),  # New shape
+                np.full((12, 4), 2, dtype=np.float16),  # Same shape, newer file
+            ):
+                with self.subTest(shape=table.shape, value=table[0, 0]):
+                    np.save(engine._token_embed_path, table)
+                    mtime = sidecar.stat().st_mtime
+                    os.utime(engine._token_embed_path, (mtime + 10, mtime + 10))
+                    loaded = engine._load_token_embeddings()
+                    np.testing.assert_array_equal(loaded, table.astype(np.float32))
+                    del loaded
+
+    def test_step_embeddings_match_full_gather(self):
+        """Each decoder input equals the original table[decoder_input_ids] gather."""
+        script = [11, 12, 13]
+        engine, _ = _fake_engine(script)
+        mel = np.zeros((N_MELS, N_FRAMES), dtype=np.float32)
+        engine.transcribe_sync(mel=mel)
+
+        prompt = [
+            server_mod.SOT_TOKEN,
+            server_mod.EN_TOKEN,
+            server_mod.TRANSCRIBE_TOKEN,
+            server_mod.NO_TIMESTAMPS_TOKEN,
+        ]
+        seq_len = engine._decoder_seq_len
+        for i, seen in enumerate(engine.embeds_seen):
+            ids = np.zeros(seq_len, dtype=np.int64)
+            tokens = prompt + script[:i]
+            ids[: len(tokens)] = tokens
+            expected = engine._token_embeddings[ids][np.newaxis]
+            np.testing.assert_array_equal(seen, expected)
+
+
+# ---------------------------------------------------------------------------
+# Wyoming protocol tests (fake engine, no NPU)
+# ---------------------------------------------------------------------------
+
+
+async def _wyoming_request(port: int, audio: np.ndarray, rate: int = SAMPLE_RATE) -> dict:
+    """Minimal Wyoming client: audio-start, 4KB audio-chunks, audio-stop."""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    pcm = (audio * 32767).astype(np.int16).tobytes()
+
+    def send(event_type, data, payload=b""):
+        if payload:
+            data = {**data, "payload_length": len(payload)}
+        writer.write((json.dumps({"type": event_type, "data": data}) + "\n").encode())
+        writer.write(payload)
+
+    send("audio-start", {"rate": rate, "width": 2, "channels": 1})
+    for i in range(0, len(pcm), 4095):  # Odd size splits samples across chunks
+        send("audio-chunk", {"rate": rate, "width": 2, "channels": 1}, pcm[i : i + 4095])
+    send("audio-stop", {})
+    await writer.drain()
+    event = json.loads(await reader.readline())
+    writer.close()
+    return event
+
+
+class TestWyomingServerWithFakeEngine(unittest.TestCase):
+    """Full client<->server protocol path without hailo_platform."""
+
+    def _run(self, scenario, **engine_kwargs):
+        engine = FakeWhisperEngine(text="hello payphone", **engine_kwargs)
+        server = WyomingWhisperServer(engine, port=0)
+
+        async def main():
+            serve = asyncio.ensure_future(server.start())
+            while server._server is None:
+                await asyncio.sleep(0.001)
+            port = server._server.sockets[0].getsockname()[1]
+            try:
+                return await scenario(port)
+            finally:
+                await server.stop()
+                await serve
+
+        try:
+            return asyncio.run(main())
+        finally:
+            engine.cleanup()
+
+    def test_transcript_round_trip(self):
+        async def scenario(port):
+            return await _wyoming_request(port, _speechlike(SAMPLE_RATE))
+
+        event = self._run(scenario, encoder_ms=1, decoder_ms=1)
+        self.assertEqual(event, {"type": "transcript", "data": {"text": "hello payphone"}})
+
+    def test_resampled_input(self):
+        async def scenario(port):
+            return await _wyoming_request(port, _speechlike(8000), rate=8000)
+
+        event = self._run(scenario, encoder_ms=1, decoder_ms=1)
+        self.assertEqual(event["data"]["text"], "hello payphone")
+
+    def test_concurrent_requests_share_npu(self):
+        """Both requests complete through one NPU queue (8 jobs x 20ms)."""
+
+        async def scenario(port):
+            audio = _speechlike(SAMPLE_RATE)
+            start = time.monotonic()
+            events = await asyncio.gather(
+                _wyoming_request(port, audio), _wyoming_request(port, audio)
+            )
+            elapsed = time.monotonic() - start
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(b'{"type": "npu-stats", "data": {}}\n')
+            stats = json.loads(await reader.readline())
+            writer.close()
+            return events, elapsed, stats
+
+        events, elapsed, stats = self._run(scenario, encoder_ms=20, decoder_ms=20)
+        self.assertTrue(all(e["data"]["text"] == "hello payphone" for e in events))
+        self.assertLess(elapsed, 0.5)
+        self.assertEqual(stats["type"], "npu-stats")
+        self.assertEqual(stats["data"]["jobs_completed"], {"encoder": 2, "decoder": 6})
+
+
+if __name__ == "__main__":
+    unittest.main()
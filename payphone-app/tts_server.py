@@ -11,24 +11,69 @@ Usage:
     # Or with custom settings
     TTS_SERVER_HOST=0.0.0.0 TTS_SERVER_PORT=10200 python tts_server.py
 
+    # Two model instances synthesizing in parallel, 2 ONNX threads each
+    TTS_SERVER_WORKERS=2 TTS_SERVER_INTRA_OP_THREADS=2 python tts_server.py
+
+    # Micro-batching for models with a batched entry point (create_batch)
+    TTS_SERVER_MAX_BATCH=4 TTS_SERVER_BATCH_WINDOW_MS=5 python tts_server.py
+
 The server exposes:
-    GET  /health     - Health check, returns sample rate
-    POST /synthesize - Synthesize text to audio
+    GET  /health            - Health check, returns sample rate
+    POST /synthesize        - Synthesize text to audio (base64 float32 in JSON)
+    POST /synthesize/stream - Synthesize text to a raw PCM byte stream
+    GET  /metrics           - Latency and batch-size histograms (Prometheus)
+
+/synthesize/stream splits the text at clause breaks and streams each
+segment's audio as soon as it is synthesized (chunked HTTP), while the
+next segment synthesizes. The body is bare PCM in the requested encoding
+(f32le, s16le or mulaw, mono, little-endian); metadata is in the headers
+X-Sample-Rate and X-Audio-Encoding.
+
+With "output": "telephone" the server also resamples to the caller's
+output rate (8kHz) and applies the telephone band-pass, the work the
+client would otherwise do. 8kHz s16le is 6x fewer bytes than 24kHz
+float32; mulaw is 12x.
+
+Concurrent requests are aggregated when the model can batch: a worker
+that picks up a request waits TTS_SERVER_BATCH_WINDOW_MS for others and
+runs up to TTS_SERVER_MAX_BATCH of them in one create_batch() call.
+kokoro-onnx has no batched entry point (its graph takes one style vector
+and speed per run, with no padding mask), so with Kokoro requests are
+dispatched across the TTS_SERVER_WORKERS sessions instead, as they
+arrive.
+
+espeak G2P is memoized per word (services/phonemes.py): sentences made of
+known words go to the model as phonemes without running espeak.
+TTS_SERVER_PHONEME_CACHE sets the word count kept (0 disables).
 
 Requirements:
-    pip install fastapi uvicorn kokoro-onnx numpy
+    pip install fastapi uvicorn kokoro-onnx numpy scipy
 """
 
-import asyncio
 import base64
 import logging
 import os
+import time
+from collections.abc import AsyncIterator
 from contextlib import asynccontextmanager
+from typing import Literal
 
 import numpy as np
 from fastapi import FastAPI, HTTPException
+from fastapi.responses import PlainTextResponse, StreamingResponse
 from pydantic import BaseModel
 
+from services.metrics import LATENCY_BUCKETS, Histogram
+from services.phonemes import PhonemeCache, kokoro_g2p
+from services.tts_pool import PRIORITY_NORMAL, TTSWorkerPool, load_kokoro_instances
+from services.tts_stream import (
+    OutputStream,
+    encode_pcm,
+    split_segments,
+    stream_segments,
+    telephone_filter_sos,
+)
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -41,13 +86,26 @@ HOST = os.getenv("TTS_SERVER_HOST", "0.0.0.0")
 PORT = int(os.getenv("TTS_SERVER_PORT", "10200"))
 MODEL_PATH = os.getenv("TTS_MODEL_PATH", "kokoro-v1.0.onnx")
 VOICES_PATH = os.getenv("TTS_VOICES_PATH", "voices-v1.0.bin")
+WORKERS = int(os.getenv("TTS_SERVER_WORKERS", "1"))
+INTRA_OP_THREADS = int(os.getenv("TTS_SERVER_INTRA_OP_THREADS", "0"))
+MAX_BATCH = int(os.getenv("TTS_SERVER_MAX_BATCH", "4"))
+BATCH_WINDOW_MS = float(os.getenv("TTS_SERVER_BATCH_WINDOW_MS", "5"))
+PHONEME_CACHE_SIZE = int(os.getenv("TTS_SERVER_PHONEME_CACHE", "20000"))
 
-# Global model instance
+# Model instances (first one answers voice listings) and their worker pool
 _model = None
-_lock = asyncio.Lock()
+_pool: TTSWorkerPool | None = None
+_phonemes: PhonemeCache | None = None  # Shared by all instances
 SAMPLE_RATE = 24000
 MAX_TEXT_LENGTH = 2000  # Reject requests exceeding this to prevent DoS
 
+# Request latency histograms for /metrics, by endpoint and phase
+_latency = {
+    "synthesize": Histogram(LATENCY_BUCKETS),
+    "stream_first_audio": Histogram(LATENCY_BUCKETS),
+    "stream_total": Histogram(LATENCY_BUCKETS),
+}
+
 
 class SynthesizeRequest(BaseModel):
     """Request body for synthesis endpoint."""
@@ -55,6 +113,20 @@ class SynthesizeRequest(BaseModel):
     text: str
     voice: str = "af_bella"
     speed: float = 1.0
+    priority: int = PRIORITY_NORMAL  # 0 = first sentence of a turn
+
+
+class StreamRequest(SynthesizeRequest):
+    """Request body for the streaming synthesis endpoint."""
+
+    encoding: Literal["f32le", "s16le", "mulaw"] = "f32le"
+    segment_min_chars: int = 20  # 0 synthesizes the text as one segment
+
+    # "telephone": resample to output_sample_rate and band-pass on the server
+    output: Literal["raw", "telephone"] = "raw"
+    output_sample_rate: int = 8000
+    telephone_lowcut: float = 300.0
+    telephone_highcut: float = 3400.0
 
 
 class SynthesizeResponse(BaseModel):
@@ -72,17 +144,53 @@ class HealthResponse(BaseModel):
     sample_rate: int
     model_loaded: bool
     available_voices: list[str]
+    streaming: bool = True  # /synthesize/stream is available
+    telephone: bool = True  # /synthesize/stream accepts output="telephone"
+
+
+def _create(model, text: str, voice: str, speed: float):
+    """Synthesize on one model instance (runs in a pool worker thread)."""
+    if _phonemes is not None:
+        return model.create(_phonemes.phonemize(text), voice=voice, speed=speed, is_phonemes=True)
+    return model.create(text, voice=voice, speed=speed)
+
+
+def _create_batch(model, batch: list[tuple[str, str, float]]):
+    """Synthesize several requests in one model call (pool worker thread)."""
+    return model.create_batch(
+        [text for text, _, _ in batch],
+        voices=[voice for _, voice, _ in batch],
+        speeds=[speed for _, _, speed in batch],
+    )
 
 
 def load_model():
-    """Load the Kokoro TTS model."""
-    global _model
+    """Load the Kokoro TTS model instances."""
+    global _model, _pool, _phonemes
 
     try:
-        from kokoro_onnx import Kokoro
-
-        logger.info(f"Loading Kokoro model from {MODEL_PATH}")
-        _model = Kokoro(MODEL_PATH, VOICES_PATH)
+        logger.info(f"Loading {WORKERS} Kokoro instance(s) from {MODEL_PATH}")
+        models = load_kokoro_instances(
+            MODEL_PATH, VOICES_PATH, count=WORKERS, intra_op_threads=INTRA_OP_THREADS
+        )
+        _model = models[0]
+        if PHONEME_CACHE_SIZE > 0:
+            _phonemes = PhonemeCache(kokoro_g2p(_model), max_words=PHONEME_CACHE_SIZE)
+        if MAX_BATCH > 1 and hasattr(_model, "create_batch"):
+            logger.info(f"Micro-batching up to {MAX_BATCH} requests within {BATCH_WINDOW_MS}ms")
+            _pool = TTSWorkerPool(
+                models,
+                _create,
+                batch_fn=_create_batch,
+                max_batch=MAX_BATCH,
+                batch_window_ms=BATCH_WINDOW_MS,
+            )
+        else:
+            if MAX_BATCH > 1:
+                logger.info(
+                    f"Model has no batched inference; dispatching to {len(models)} session(s)"
+                )
+            _pool = TTSWorkerPool(models, _create)
         logger.info(f"Model loaded. Available voices: {_model.get_voices()}")
 
     except FileNotFoundError as e:
@@ -103,12 +211,14 @@ async def lifespan(app: FastAPI):
     # Startup: load model
     logger.info("Starting TTS server...")
     load_model()
+    _pool.start()
     logger.info(f"TTS server ready on {HOST}:{PORT}")
 
     yield
 
     # Shutdown: cleanup
     logger.info("Shutting down TTS server...")
+    await _pool.shutdown()
 
 
 app = FastAPI(
@@ -157,41 +267,156 @@ async def synthesize(request: SynthesizeRequest):
             detail=f"Text exceeds maximum length of {MAX_TEXT_LENGTH} characters",
         )
 
-    # Acquire lock to prevent concurrent synthesis (model not thread-safe)
-    async with _lock:
-        loop = asyncio.get_running_loop()
-
-        try:
-            # Run synthesis in executor to avoid blocking
-            samples, sample_rate = await loop.run_in_executor(
-                None,
-                lambda: _model.create(
-                    request.text,
-                    voice=request.voice,
-                    speed=request.speed,
-                ),
-            )
+    try:
+        # Each model instance serves one request at a time; requests beyond
+        # the worker count queue by priority (first sentences go first)
+        start = time.perf_counter()
+        samples, sample_rate = await _pool.submit(
+            request.priority, request.text, request.voice, request.speed
+        )
+        _latency["synthesize"].observe(time.perf_counter() - start)
 
-            # Convert to float32 and encode
-            audio = samples.astype(np.float32)
-            audio_bytes = audio.tobytes()
-            audio_b64 = base64.b64encode(audio_bytes).decode()
+        # Convert to float32 and encode
+        audio = samples.astype(np.float32)
+        audio_bytes = audio.tobytes()
+        audio_b64 = base64.b64encode(audio_bytes).decode()
 
-            duration = len(audio) / sample_rate
+        duration = len(audio) / sample_rate
 
-            logger.debug(
-                f"Synthesized {len(request.text)} chars -> {duration:.2f}s audio"
-            )
+        logger.debug(
+            f"Synthesized {len(request.text)} chars -> {duration:.2f}s audio"
+        )
 
-            return SynthesizeResponse(
-                audio=audio_b64,
-                sample_rate=sample_rate,
-                duration_seconds=duration,
-            )
+        return SynthesizeResponse(
+            audio=audio_b64,
+            sample_rate=sample_rate,
+            duration_seconds=duration,
+        )
 
-        except Exception as e:
-            logger.error(f"Synthesis failed: {e}")
-            raise HTTPException(status_code=500, detail=f"Synthesis failed: {str(e)}")
+    except Exception as e:
+        logger.error(f"Synthesis failed: {e}")
+        raise HTTPException(status_code=500, detail=f"Synthesis failed: {str(e)}")
+
+
+@app.post("/synthesize/stream")
+async def synthesize_stream(request: StreamRequest):
+    """Synthesize text to a stream of raw PCM.
+
+    Args:
+        request: Synthesis parameters plus wire encoding and segmenting.
+
+    Returns:
+        Chunked response of bare PCM, one chunk per clause segment.
+    """
+    if _model is None:
+        raise HTTPException(status_code=503, detail="TTS model not loaded")
+
+    if len(request.text) > MAX_TEXT_LENGTH:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Text exceeds maximum length of {MAX_TEXT_LENGTH} characters",
+        )
+
+    if request.output == "telephone" and not 0 < request.output_sample_rate <= SAMPLE_RATE:
+        raise HTTPException(
+            status_code=400,
+            detail=f"output_sample_rate must be between 1 and {SAMPLE_RATE}",
+        )
+
+    rate = request.output_sample_rate if request.output == "telephone" else SAMPLE_RATE
+    headers = {
+        "X-Sample-Rate": str(rate),
+        "X-Audio-Encoding": request.encoding,
+    }
+    return StreamingResponse(
+        _stream_pcm(request),
+        media_type="application/octet-stream",
+        headers=headers,
+    )
+
+
+async def _stream_pcm(request: StreamRequest) -> AsyncIterator[bytes]:
+    """Synthesize clause segments and encode each for the wire.
+
+    Headers are already sent, so a synthesis failure ends the stream early
+    and the client keeps whatever audio arrived.
+    """
+    if not request.text.strip():
+        return
+
+    # Telephone rendering keeps filter state across segments (no clicks)
+    telephone = None
+    if request.output == "telephone":
+        telephone = OutputStream(
+            SAMPLE_RATE,
+            request.output_sample_rate,
+            telephone_filter_sos(
+                request.output_sample_rate,
+                request.telephone_lowcut,
+                request.telephone_highcut,
+            ),
+        )
+
+    def _encode(audio: np.ndarray) -> bytes:
+        if telephone is None:
+            return encode_pcm(audio, request.encoding)
+        pcm16 = np.frombuffer(telephone.process(audio), dtype=np.int16)
+        return encode_pcm(pcm16, request.encoding)
+
+    async def _synthesize(segment: str, priority: int) -> np.ndarray:
+        samples, _ = await _pool.submit(priority, segment, request.voice, request.speed)
+        return samples.astype(np.float32)
+
+    segments = split_segments(request.text, request.segment_min_chars)
+    start = time.perf_counter()
+    first = True
+    try:
+        async for audio in stream_segments(
+            _synthesize, segments, request.priority, PRIORITY_NORMAL, SAMPLE_RATE
+        ):
+            if first:
+                _latency["stream_first_audio"].observe(time.perf_counter() - start)
+                first = False
+            yield _encode(audio)
+    except Exception as e:
+        logger.error(f"Streaming synthesis failed: {e}")
+        return
+
+    if telephone is not None:
+        tail = np.frombuffer(telephone.flush(), dtype=np.int16)
+        if len(tail):
+            yield encode_pcm(tail, request.encoding)
+
+    _latency["stream_total"].observe(time.perf_counter() - start)
+    logger.debug(f"Streamed {len(request.text)} chars in {len(segments)} segment(s)")
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Request latency, queue wait and batch-size histograms.
+
+    Returns:
+        Metrics in the Prometheus text exposition format.
+    """
+    lines = Histogram.render(
+        "tts_request_seconds",
+        "Request latency by endpoint and phase.",
+        {f'phase="{phase}"': histogram for phase, histogram in _latency.items()},
+    )
+    if _pool is not None:
+        lines += _pool.metrics()
+    if _phonemes is not None:
+        stats = _phonemes.stats()
+        lines += [
+            "# HELP tts_phoneme_cache_total Sentences phonemized, by cache result.",
+            "# TYPE tts_phoneme_cache_total counter",
+            f'tts_phoneme_cache_total{{result="hit"}} {stats["hits"]}',
+            f'tts_phoneme_cache_total{{result="miss"}} {stats["misses"]}',
+            "# HELP tts_phoneme_cache_words Words in the phoneme cache.",
+            "# TYPE tts_phoneme_cache_words gauge",
+            f"tts_phoneme_cache_words {stats['words']}",
+        ]
+    return PlainTextResponse("\n".join(lines) + "\n", media_type="text/plain; version=0.0.4")
 
 
 if __name__ == "__main__":
@@ -203,4 +428,6 @@ if __name__ == "__main__":
         port=PORT,
         log_level="info",
         access_log=True,
+        # Longer than the client's pooled keep-alive (TTS_REMOTE_KEEPALIVE)
+        timeout_keep_alive=75,
     )